@@ -0,0 +1,274 @@
+"""
+Write-behind activity logging for the Jira Board Application
+Buffers ActivityLog events in memory and flushes them in batches from a background thread
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityLogBuffer:
+    """
+    Bounded in-memory buffer for activity_log rows
+
+    Events are appended on the request thread without touching the database.
+    A daemon thread drains the buffer with one multi-row INSERT per batch,
+    either when the batch size is reached or when the flush interval elapses.
+    A batch that keeps failing is retried row by row, and rows the database
+    rejects are dropped and logged so one bad event cannot stall the rest.
+
+    Usage:
+        activity_logger.init_app(app)
+        activity_logger.log(user_id, 'task_created', 'task', task.task_id, {'title': task.title})
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.enabled = True
+        self.max_size = 10000
+        self.batch_size = 500
+        self.flush_interval = 2.0
+        self.max_retries = 3
+
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stopping = False
+
+        # Metrics
+        self._enqueued = 0
+        self._flushed = 0
+        self._dropped = 0
+        self._failed_flushes = 0
+        self._consecutive_failures = 0
+        self._rejected = 0
+        self._max_delay = 0.0
+        self._last_delay = 0.0
+        self._last_flush_at = None
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read buffer settings from config and register the shutdown flush"""
+        self.app = app
+        self.enabled = app.config.get('ACTIVITY_LOG_ENABLED', True)
+        self.max_size = app.config.get('ACTIVITY_LOG_BUFFER_SIZE', self.max_size)
+        self.batch_size = app.config.get('ACTIVITY_LOG_BATCH_SIZE', self.batch_size)
+        self.flush_interval = app.config.get('ACTIVITY_LOG_FLUSH_INTERVAL', self.flush_interval)
+        self.max_retries = app.config.get('ACTIVITY_LOG_MAX_RETRIES', self.max_retries)
+        app.extensions['activity_logger'] = self
+
+        # Drain whatever is still buffered when the process exits
+        atexit.register(self.shutdown)
+
+    def log(self, user_id, action, entity_type, entity_id, details=None):
+        """
+        Enqueue an activity event
+
+        Returns:
+            bool: True if the event was buffered, False if it was dropped
+        """
+        if not self.enabled or user_id is None or entity_id is None:
+            return False
+
+        row = {
+            'log_id': uuid.uuid4(),
+            'user_id': _as_uuid(user_id),
+            'action': action,
+            'entity_type': entity_type,
+            'entity_id': _as_uuid(entity_id),
+            'details': details,
+            'timestamp': datetime.utcnow()
+        }
+
+        with self._lock:
+            if len(self._buffer) >= self.max_size:
+                self._dropped += 1
+                return False
+            self._buffer.append((time.monotonic(), row))
+            self._enqueued += 1
+            if len(self._buffer) >= self.batch_size:
+                self._wakeup.notify()
+
+        self._ensure_worker()
+        return True
+
+    def flush(self):
+        """Write every buffered event to the database, batch by batch"""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    if not self._buffer:
+                        break
+                    count = min(self.batch_size, len(self._buffer))
+                    batch = [self._buffer.popleft() for _ in range(count)]
+                if not self._write_batch(batch):
+                    break
+                written += len(batch)
+        return written
+
+    def shutdown(self):
+        """Stop the worker thread and flush the remaining events"""
+        with self._lock:
+            self._stopping = True
+            self._wakeup.notify()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def stats(self):
+        """Snapshot of buffer metrics (dropped and delayed events)"""
+        with self._lock:
+            pending = len(self._buffer)
+            oldest_age = time.monotonic() - self._buffer[0][0] if self._buffer else 0.0
+            return {
+                'enabled': self.enabled,
+                'pending': pending,
+                'capacity': self.max_size,
+                'enqueued': self._enqueued,
+                'flushed': self._flushed,
+                'dropped': self._dropped,
+                'failed_flushes': self._failed_flushes,
+                'rejected': self._rejected,
+                'oldest_pending_seconds': round(oldest_age, 3),
+                'last_flush_delay_seconds': round(self._last_delay, 3),
+                'max_flush_delay_seconds': round(self._max_delay, 3),
+                'last_flush_at': self._last_flush_at.isoformat() if self._last_flush_at else None
+            }
+
+    def _ensure_worker(self):
+        """Start the flush thread lazily (and again after a fork)"""
+        pid = os.getpid()
+        if self._thread is not None and self._thread.is_alive() and self._pid == pid:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == pid:
+                return
+            self._pid = pid
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name='activity-log-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                # Back off after a failed flush instead of retrying a full buffer in a tight loop
+                if not self._stopping and (len(self._buffer) < self.batch_size or self._consecutive_failures):
+                    self._wakeup.wait(timeout=self.flush_interval)
+                if self._stopping:
+                    return
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Activity log flush failed')
+
+    def _write_batch(self, batch):
+        """Insert one batch with a single multi-row INSERT"""
+        from extensions import db
+        from models.system_models import ActivityLog
+
+        if self.app is None:
+            self._requeue(batch)
+            return False
+
+        if self._consecutive_failures >= self.max_retries:
+            return self._write_rows(batch)
+
+        rows = [row for _, row in batch]
+        try:
+            with self.app.app_context():
+                with db.engine.begin() as conn:
+                    conn.execute(ActivityLog.__table__.insert().values(rows))
+        except Exception:
+            logger.exception('Activity log batch insert failed', extra={'batch_size': len(rows)})
+            self._failed_flushes += 1
+            self._consecutive_failures += 1
+            self._requeue(batch)
+            return False
+
+        self._consecutive_failures = 0
+        self._record_flush(batch, len(batch))
+        return True
+
+    def _write_rows(self, batch):
+        """
+        Insert a batch that keeps failing one row per transaction, dropping rows
+        the database rejects; a lost connection requeues the unwritten rows
+        """
+        from sqlalchemy.exc import OperationalError
+        from extensions import db
+        from models.system_models import ActivityLog
+
+        written = 0
+        with self.app.app_context():
+            for position, (_, row) in enumerate(batch):
+                try:
+                    with db.engine.begin() as conn:
+                        conn.execute(ActivityLog.__table__.insert().values(row))
+                except OperationalError:
+                    logger.exception('Activity log row insert failed', extra={'batch_size': len(batch)})
+                    self._failed_flushes += 1
+                    self._requeue(batch[position:])
+                    if written:
+                        self._record_flush(batch, written)
+                    return False
+                except Exception:
+                    logger.exception('Activity log row rejected', extra={
+                        'log_id': str(row['log_id']), 'action': row['action'], 'entity_type': row['entity_type']
+                    })
+                    with self._lock:
+                        self._rejected += 1
+                    continue
+                written += 1
+
+        self._consecutive_failures = 0
+        self._record_flush(batch, written)
+        return True
+
+    def _record_flush(self, batch, written):
+        delay = time.monotonic() - batch[0][0]
+        with self._lock:
+            self._flushed += written
+            self._last_delay = delay
+            self._max_delay = max(self._max_delay, delay)
+            self._last_flush_at = datetime.utcnow()
+
+    def _requeue(self, batch):
+        """Put a failed batch back at the front, dropping what no longer fits"""
+        with self._lock:
+            room = self.max_size - len(self._buffer)
+            keep = batch[:max(room, 0)]
+            self._dropped += len(batch) - len(keep)
+            self._buffer.extendleft(reversed(keep))
+
+
+def _as_uuid(value):
+    """Current user ids arrive as strings from the login loader"""
+    if isinstance(value, uuid.UUID):
+        return value
+    return uuid.UUID(str(value))
+
+
+activity_logger = ActivityLogBuffer()
+
+
+def log_activity(user, action, entity_type, entity_id, details=None):
+    """Convenience wrapper used by controllers; never raises"""
+    try:
+        user_id = getattr(user, 'user_id', user)
+        return activity_logger.log(user_id, action, entity_type, entity_id, details)
+    except Exception:
+        return False
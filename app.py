@@ -3,19 +3,65 @@ from flask_login import LoginManager
 from config import Config
 from extensions import db, login_manager
 from error_handling import register_error_handlers
-import os
-from sqlalchemy import text
+from activity_logging import activity_logger
+from dependency_graph import dependency_graphs
+from epic_progress import epic_summaries
+from structured_logging import structured_logging
+from db_routing import db_router
+from index_advisor import query_recorder
+from db_maintenance import maintenance_jobs
+from runtime_metrics import runtime_metrics
+from endpoint_latency import endpoint_latency
+from fragment_cache import fragment_cache
+from response_compression import response_compression
+from session_store import session_store
+from login_pipeline import login_pipeline
+import logging
 
 # Import all models to ensure they're registered with SQLAlchemy
 import models
 
+logger = logging.getLogger(__name__)
+
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
     
-    # Initialize extensions
+    # Non-blocking JSON logging with request context; first so startup is logged too
+    structured_logging.init_app(app)
+
+    # Per-endpoint latency histograms; registered early so the timing covers the other request hooks
+    endpoint_latency.init_app(app)
+    
+    # Initialize extensions; replica binds and pool options must exist before the engines
+    db_router.init_app(app)
     db.init_app(app)
     login_manager.init_app(app)
+
+    # Session data in the user_session table; the cookie only carries a revocable token
+    session_store.init_app(app)
+
+    # Throttled password verification on a bounded hash worker pool
+    login_pipeline.init_app(app)
+    
+    # Buffered activity log; flushes remaining events on shutdown
+    activity_logger.init_app(app)
+    
+    # Background VACUUM / analysis / integrity jobs for the admin maintenance endpoints
+    maintenance_jobs.init_app(app)
+    
+    # Sampled process/pool/database health for the dashboard and /metrics
+    runtime_metrics.init_app(app)
+
+    # gzip/brotli for HTML, JSON and streamed exports the client accepts
+    response_compression.init_app(app)
+
+    # Opt-in recording of the statement workload for the index advisor
+    query_recorder.init_app(app)
+    
+    # Per-project dependency graph cache, invalidated on dependency writes
+    dependency_graphs.init_app(app)
+    epic_summaries.init_app(app)
     
     # Configure login manager  
     setattr(login_manager, 'login_view', 'auth.login')
@@ -54,76 +100,142 @@ def create_app():
     try:
         from routes.auth_routes import auth_bp
         app.register_blueprint(auth_bp, url_prefix='/auth')
-        print("✅ Auth routes registered")
+        logger.debug("Auth routes registered")
     except ImportError as e:
-        print(f"❌ Auth routes failed: {e}")
+        logger.error("Auth routes failed: %s", e)
 
     try:
         from routes.dashboard_routes import dashboard_bp
         app.register_blueprint(dashboard_bp)
-        print("✅ Dashboard routes registered")
+        logger.debug("Dashboard routes registered")
     except ImportError as e:
-        print(f"❌ Dashboard routes failed: {e}")
+        logger.error("Dashboard routes failed: %s", e)
 
     try:
         from routes.project_routes import project_bp
         app.register_blueprint(project_bp, url_prefix='/projects')
-        print("✅ Project routes registered")
+        logger.debug("Project routes registered")
     except ImportError as e:
-        print(f"❌ Project routes failed: {e}")
+        logger.error("Project routes failed: %s", e)
 
     try:
         from routes.team_routes import team_bp
         app.register_blueprint(team_bp, url_prefix='/teams')
-        print("✅ Team routes registered")
+        logger.debug("Team routes registered")
     except ImportError as e:
-        print(f"❌ Team routes failed: {e}")
+        logger.error("Team routes failed: %s", e)
 
     try:
         from routes.admin_routes import admin_bp
         app.register_blueprint(admin_bp)  # admin_bp already has url_prefix='/admin'
-        print("✅ Admin routes registered")
+        logger.debug("Admin routes registered")
     except ImportError as e:
-        print(f"❌ Admin routes failed: {e}")
+        logger.error("Admin routes failed: %s", e)
 
     try:
         from routes.user_routes import user_bp
         app.register_blueprint(user_bp, url_prefix='/users')
-        print("✅ User routes registered")
+        logger.debug("User routes registered")
     except ImportError as e:
-        print(f"❌ User routes failed: {e}")
+        logger.error("User routes failed: %s", e)
 
     try:
         from routes.task_routes import task_bp
         app.register_blueprint(task_bp, url_prefix='/tasks')
-        print("✅ Task routes registered")
+        logger.debug("Task routes registered")
     except ImportError as e:
-        print(f"❌ Task routes failed: {e}")
+        logger.error("Task routes failed: %s", e)
 
     try:
         from routes.report_routes import report_bp
         app.register_blueprint(report_bp, url_prefix='/reports')
-        print("✅ Report routes registered")
+        logger.debug("Report routes registered")
     except ImportError as e:
-        print(f"❌ Report routes failed: {e}")
+        logger.error("Report routes failed: %s", e)
 
     try:
         from routes.profile_routes import profile_bp
         app.register_blueprint(profile_bp)
-        print("✅ Profile routes registered")
+        logger.debug("Profile routes registered")
     except ImportError as e:
-        print(f"❌ Profile routes failed: {e}")
+        logger.error("Profile routes failed: %s", e)
 
     try:
         from routes.goal_routes import goal_bp
         app.register_blueprint(goal_bp, url_prefix='/goals')
-        print("✅ Goal routes registered")
+        logger.debug("Goal routes registered")
+    except ImportError as e:
+        logger.error("Goal routes failed: %s", e)
+
+    try:
+        from routes.audit_routes import audit_bp
+        app.register_blueprint(audit_bp, url_prefix='/audit')
+        logger.debug("Audit routes registered")
     except ImportError as e:
-        print(f"❌ Goal routes failed: {e}")
+        logger.error("Audit routes failed: %s", e)
+
+    # Register log partition maintenance commands (flask logs partition / purge)
+    from log_partitions import register_partition_commands
+    register_partition_commands(app)
+
+    # Register report rollup commands (flask reports refresh)
+    from report_engine import register_report_commands
+    register_report_commands(app)
+
+    # Register time tracking commands (flask timesheets reconcile)
+    from time_tracking import register_time_commands
+    register_time_commands(app)
+
+    # Register project health commands (flask health rescore)
+    from project_health import register_health_commands
+    register_health_commands(app)
+
+    # Register project access commands (flask access rebuild)
+    from project_access import register_access_commands
+    register_access_commands(app)
+
+    # Register database replica commands (flask replicas status)
+    from db_routing import register_replica_commands
+    register_replica_commands(app)
+
+    # Register schema migration commands (flask db upgrade / status / seed)
+    from schema_migrations import register_migration_commands
+    register_migration_commands(app)
+
+    # Register index advisor commands (flask indexes workload / advise / verify)
+    from index_advisor import register_index_commands
+    register_index_commands(app)
+
+    # Register startup profiling commands (flask startup profile)
+    from startup import register_startup_commands, preload_lazy_modules
+    register_startup_commands(app)
+    if not app.config.get('LAZY_CONTROLLERS', True):
+        preload_lazy_modules()
 
     # Register permissions context processor
     from permissions import register_permission_context_processors
     register_permission_context_processors(app)
+
+    # {% cache %} tag for sidebars and navigation, keyed by role/permission set
+    fragment_cache.init_app(app)
+
+    # Compiled template bytecode on disk; no template reloading outside debug mode
+    from template_cache import init_template_cache, register_template_commands
+    init_template_cache(app)
+
+    # Register template commands (flask templates compile / clear)
+    register_template_commands(app)
+
+    # Fingerprinted, precompressed static bundles and the asset_urls() template helper
+    from static_assets import static_assets, register_asset_commands
+    static_assets.init_app(app)
+
+    # Register static asset commands (flask assets build)
+    register_asset_commands(app)
+
+    # Register session store commands (flask sessions sweep / revoke / stats)
+    from session_store import register_session_commands
+    register_session_commands(app)
     
     # Add direct goals route
     @app.route('/goals')
@@ -134,113 +246,12 @@ def create_app():
 
     return app
 
-def execute_sql_file(file_path):
-    """Execute SQL commands from a file"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            sql_content = file.read()
-        
-        # Always start with a clean transaction
-        try:
-            db.session.rollback()
-        except:
-            pass
-            
-        sql_commands = sql_content.split(';')
-        
-        for command in sql_commands:
-            command = command.strip()
-            if command and not command.startswith('--'):
-                try:
-                    db.session.execute(text(command))
-                except Exception:
-                    # Rollback and start fresh after each error
-                    try:
-                        db.session.rollback()
-                    except:
-                        pass
-                    continue
-        
-        # Try to commit, if it fails, rollback
-        try:
-            db.session.commit()
-            print(f"✅ Successfully executed SQL file: {file_path}")
-            return True
-        except Exception as e:
-            print(f"❌ Commit failed: {e}")
-            try:
-                db.session.rollback()
-            except:
-                pass
-            return False
-            
-    except Exception as e:
-        print(f"❌ Error executing SQL file: {e}")
-        try:
-            db.session.rollback()
-        except:
-            pass
-        return False
-
-def init_database():
-    """Initialize database with sample data"""
-    print("🔄 Initializing database...")
-    
-    # Always start with a clean transaction state
-    try:
-        db.session.rollback()
-    except:
-        pass
-    
-    # Create tables
-    try:
-        db.create_all()
-        print("✅ Database tables created")
-    except Exception as e:
-        print(f"⚠️  Table creation warning: {e}")
-        # Clear any failed transaction
-        try:
-            db.session.rollback()
-        except:
-            pass
-    
-    # Load sample data if file exists
-    sample_data_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sample_data.sql')
-    if os.path.exists(sample_data_file):
-        print("🔄 Loading sample data...")
-        execute_sql_file(sample_data_file)
-        print("ℹ️  Run 'python update_passwords.py' to set passwords for sample users")
-    
-    # Ensure we end with a clean transaction state
-    try:
-        db.session.commit()
-    except:
-        try:
-            db.session.rollback()
-        except:
-            pass
-    
-    print("✅ Database initialization complete!")
-
 if __name__ == '__main__':
     app = create_app()
     
+    # One version query when the schema is current; 'flask db seed' loads sample data
+    from schema_migrations import check_schema
     with app.app_context():
-        # Clear any aborted transactions first
-        try:
-            db.session.rollback()
-            print("🔄 Cleared any pending transactions")
-        except:
-            pass
-            
-        try:
-            init_database()
-        except Exception as e:
-            print(f"❌ Database initialization failed: {e}")
-            # Try to clear the failed transaction
-            try:
-                db.session.rollback()
-            except:
-                pass
+        check_schema(auto_upgrade=app.config.get('MIGRATE_ON_STARTUP', False))
     
     app.run(debug=True)
@@ -9,6 +9,10 @@ from models.role_models import Role
 from models.project_models import Project
 from models.task_models import Task
 from extensions import db
+from session_store import session_store
+import logging
+
+logger = logging.getLogger(__name__)
 
 @require_permission('admin_panel')
 def admin_dashboard():
@@ -70,6 +74,7 @@ def admin_dashboard():
                              health_checks=health_checks)
         
     except Exception as e:
+        logger.exception('admin_dashboard failed')
         flash(f'Error loading admin dashboard: {e}', 'danger')
         return render_template('admin_dashboard.html',
                              stats={},
@@ -105,6 +110,7 @@ def admin_users():
         return render_template('user_management_multi_role.html', users=users, teams=teams)
         
     except Exception as e:
+        logger.exception('admin_users failed')
         flash(f'Error loading users: {e}', 'danger')
         return render_template('user_management_multi_role.html', users=[], teams=[])
 
@@ -140,6 +146,7 @@ def get_user_roles(user_id):
         return jsonify({'success': True, 'roles': roles_data})
         
     except Exception as e:
+        logger.exception('get_user_roles failed')
         return jsonify({'success': False, 'message': str(e)}), 500
 
 @require_permission('user_edit')
@@ -178,6 +185,7 @@ def add_user_role():
             return jsonify({'success': False, 'message': 'User already has this role'})
             
     except Exception as e:
+        logger.exception('add_user_role failed')
         db.session.rollback()
         return jsonify({'success': False, 'message': str(e)}), 500
 
@@ -209,6 +217,7 @@ def remove_user_role():
             return jsonify({'success': False, 'message': 'Role not found for this user'})
             
     except Exception as e:
+        logger.exception('remove_user_role failed')
         db.session.rollback()
         return jsonify({'success': False, 'message': str(e)}), 500
 
@@ -235,6 +244,7 @@ def set_primary_role():
             return jsonify({'success': False, 'message': 'Role not found for this user'})
             
     except Exception as e:
+        logger.exception('set_primary_role failed')
         db.session.rollback()
         return jsonify({'success': False, 'message': str(e)}), 500
 
@@ -259,6 +269,7 @@ def pending_users():
         return render_template('admin_pending_users.html', pending_users=pending_users)
         
     except Exception as e:
+        logger.exception('pending_users failed')
         flash(f'Error loading pending users: {e}', 'danger')
         return render_template('admin_pending_users.html', pending_users=[])
 
@@ -286,11 +297,14 @@ def toggle_user_status(user_id):
         user.updated_at = datetime.utcnow()
         
         db.session.commit()
+        if not user.is_approved:
+            session_store.revoke_user(user.user_id)
         
         action = 'activated' if user.is_approved else 'deactivated'
         flash(f'User {action} successfully!', 'success')
         
     except Exception as e:
+        logger.exception('toggle_user_status failed')
         db.session.rollback()
         flash(f'Error updating user status: {e}', 'danger')
     
@@ -312,6 +326,7 @@ def approve_user(user_id):
             flash('User not found.', 'danger')
             
     except Exception as e:
+        logger.exception('approve_user failed')
         db.session.rollback()
         flash(f'Error approving user: {e}', 'danger')
     
@@ -323,12 +338,15 @@ def delete_user(user_id):
     try:
         user = User.query.get(user_id)
         if user:
+            user_id = user.user_id
             db.session.delete(user)
             db.session.commit()
+            session_store.revoke_user(user_id)
             return jsonify({'success': True, 'message': 'User deleted successfully'})
         else:
             return jsonify({'success': False, 'message': 'User not found'})
     except Exception as e:
+        logger.exception('delete_user failed')
         db.session.rollback()
         return jsonify({'success': False, 'message': str(e)})
 
@@ -359,6 +377,7 @@ def create_user():
         return jsonify({'success': True, 'message': 'User created successfully'})
         
     except Exception as e:
+        logger.exception('create_user failed')
         db.session.rollback()
         return jsonify({'success': False, 'message': str(e)})
 
@@ -374,6 +393,7 @@ def bulk_actions():
     
     try:
         success_count = 0
+        revoked = []
         
         for user_id in user_ids:
             user = User.query.get(user_id)
@@ -385,8 +405,10 @@ def bulk_actions():
                 success_count += 1
             elif action == 'deactivate':
                 user.is_approved = False
+                revoked.append(user.user_id)
                 success_count += 1
             elif action == 'delete':
+                revoked.append(user.user_id)
                 db.session.delete(user)
                 success_count += 1
             elif action == 'change_role':
@@ -398,9 +420,12 @@ def bulk_actions():
                         success_count += 1
         
         db.session.commit()
+        for user_id in revoked:
+            session_store.revoke_user(user_id)
         return jsonify({'success': True, 'message': f'{action.title()} completed for {success_count} users'})
         
     except Exception as e:
+        logger.exception('bulk_actions failed')
         db.session.rollback()
         return jsonify({'success': False, 'message': str(e)})
 
@@ -418,17 +443,127 @@ def test_email():
     # In a real application, you would test the email settings
     return jsonify({'success': True, 'message': 'Test email sent successfully'})
 
-@require_permission('system_maintenance')
+def _start_maintenance_job(kind):
+    """Queue a background maintenance job and return its handle (202)"""
+    from db_maintenance import maintenance_jobs
+    try:
+        payload = request.get_json(silent=True) or {}
+        tables = payload.get('tables') or request.form.getlist('tables')
+        run_id, started = maintenance_jobs.submit(kind, requested_by=current_user.user_id, tables=tables)
+        return jsonify({
+            'success': True,
+            'job_id': str(run_id),
+            'started': started,
+            'message': f'Database {kind} job started' if started else f'A database {kind} job is already running',
+            'status_url': url_for('admin.db_job', job_id=run_id),
+            'events_url': url_for('admin.db_job_events', job_id=run_id)
+        }), 202
+    except Exception as e:
+        logger.exception('Starting database %s job failed', kind)
+        db.session.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@require_permission('database_manage')
 def database_optimize():
-    """Optimize database"""
-    return jsonify({'success': True, 'message': 'Database optimized successfully'})
+    """VACUUM (ANALYZE) the requested tables, or those with the most dead tuples"""
+    return _start_maintenance_job('optimize')
 
-@require_permission('system_maintenance')
+@require_permission('database_manage')
 def database_analyze():
-    """Analyze database"""
-    return jsonify({'success': True, 'message': 'Database analysis completed'})
+    """Bloat estimates, unused indexes and sequential scan statistics"""
+    return _start_maintenance_job('analyze')
 
-@require_permission('system_maintenance')
+@require_permission('database_manage')
 def database_integrity():
-    """Check database integrity"""
-    return jsonify({'success': True, 'message': 'Database integrity check completed - no issues found'})
+    """Orphaned foreign keys and other integrity checks"""
+    return _start_maintenance_job('integrity')
+
+@require_permission('database_manage')
+def database_job_status(job_id):
+    """Status, progress and (once finished) results of a maintenance job"""
+    from db_maintenance import get_run
+    run = get_run(job_id)
+    if run is None:
+        return jsonify({'success': False, 'message': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': run.to_dict()})
+
+@require_permission('database_manage')
+def database_job_events(job_id):
+    """Server-sent progress events of a maintenance job until it finishes"""
+    from flask import Response, stream_with_context, current_app
+    from db_maintenance import get_run, progress_events
+    run = get_run(job_id)
+    if run is None:
+        return jsonify({'success': False, 'message': 'Job not found'}), 404
+    interval = current_app.config.get('MAINTENANCE_STREAM_INTERVAL', 1.0)
+    return Response(stream_with_context(progress_events(run.run_id, interval)),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@require_permission('database_manage')
+def database_job_history():
+    """Recent maintenance runs with their result summaries, for trend display"""
+    from flask import current_app
+    from db_maintenance import run_history
+    kind = request.args.get('kind')
+    limit = current_app.config.get('MAINTENANCE_HISTORY_LIMIT', 30)
+    return jsonify({'success': True, 'runs': run_history(kind, limit)})
+
+@require_permission('admin_panel')
+def activity_log_stats():
+    """Write-behind activity log buffer metrics (pending, dropped, flush delay)"""
+    from activity_logging import activity_logger
+    return jsonify({'success': True, 'stats': activity_logger.stats()})
+
+@require_permission('admin_panel')
+def runtime_metrics_history():
+    """Current system health plus the sampled history of this worker, e.g. ?fields=rss_bytes,db_latency_seconds"""
+    from runtime_metrics import runtime_metrics
+    fields = [field for field in request.args.get('fields', '').split(',') if field]
+    return jsonify({'success': True, 'health': runtime_metrics.system_health(),
+                    'interval': runtime_metrics.interval, 'samples': runtime_metrics.history(fields)})
+
+@require_permission('admin_panel')
+def compression_stats():
+    """Responses compressed per encoding, bytes saved and why others were sent uncompressed"""
+    from response_compression import response_compression
+    return jsonify({'success': True, 'stats': response_compression.stats()})
+
+@require_permission('admin_panel')
+def session_store_stats():
+    """Server-side session cache hit rate and expired sessions swept by this worker"""
+    return jsonify({'success': True, 'stats': session_store.stats()})
+
+@require_permission('admin_panel')
+def login_pipeline_stats():
+    """Login outcomes, throttled attempts and password hash pool occupancy"""
+    from login_pipeline import login_pipeline
+    return jsonify({'success': True, 'stats': login_pipeline.stats()})
+
+@require_permission('admin_panel')
+def fragment_cache_stats():
+    """Sidebar/navigation fragment cache hit rate and size"""
+    from fragment_cache import fragment_cache
+    return jsonify({'success': True, 'stats': fragment_cache.stats()})
+
+@require_permission('admin_panel')
+def endpoint_latency_view():
+    """p50/p95/p99 per route and the slow-request samples of this worker"""
+    from endpoint_latency import endpoint_latency
+    export = endpoint_latency.export()
+    return render_template('admin_latency.html', endpoints=export['endpoints'],
+                           slow_requests=export['slow_requests'], since=export['since'][:19].replace('T', ' '),
+                           slow_threshold_ms=export['slow_threshold_ms'])
+
+@require_permission('admin_panel')
+def endpoint_latency_export():
+    """Histograms with raw bucket counts (mergeable across workers) and slow-request samples as JSON"""
+    from endpoint_latency import endpoint_latency
+    return jsonify({'success': True, **endpoint_latency.export()})
+
+@require_permission('admin_panel')
+def endpoint_latency_reset():
+    """Start a fresh measurement window, e.g. after a deploy"""
+    from endpoint_latency import endpoint_latency
+    endpoint_latency.reset()
+    return jsonify({'success': True, 'message': 'Latency histograms reset'})
@@ -8,6 +8,7 @@ from extensions import db
 from permissions import require_role
 import uuid
 from datetime import datetime
+import logging
 
 # Try to import optional models
 try:
@@ -25,6 +26,8 @@ try:
 except ImportError:
     Developer = None
 
+logger = logging.getLogger(__name__)
+
 @login_required
 @require_role('admin')
 def team_management():
@@ -101,6 +104,7 @@ def create_team():
             })
             
         except Exception as e:
+            logger.exception('create_team failed')
             db.session.rollback()
             return jsonify({'error': 'Failed to create team'}), 500
     
@@ -126,4 +130,5 @@ def get_unassigned_users():
         return jsonify(users_data)
         
     except Exception as e:
+        logger.exception('get_unassigned_users failed')
         return jsonify({'error': 'Failed to fetch users'}), 500
@@ -8,11 +8,15 @@ from forms.attachment_forms import AttachmentForm
 from datetime import datetime
 import uuid
 import os
+import logging
+
+logger = logging.getLogger(__name__)
 
 @login_required
 def upload_attachment_task(task_id):
     task = Task.query.get_or_404(task_id)
     if current_user.role.role_name not in [RoleName.manager, RoleName.developer] or (current_user.role.role_name == RoleName.developer and task.assigned_to_id != current_user.user_id):
+        logger.info('Access denied', extra={'action': 'upload_attachment_task', 'task_id': str(task_id)})
         flash('Unauthorized access.', 'danger')
         return redirect(url_for('dashboard.dashboard_page'))
     form = AttachmentForm()
@@ -31,6 +35,8 @@ def upload_attachment_task(task_id):
         )
         db.session.add(attachment)
         db.session.commit()
+        logger.info('Attachment uploaded', extra={'attachment_id': str(attachment.attachment_id),
+                                                  'task_id': str(task_id), 'file_name': file_name})
         flash('Attachment uploaded successfully!', 'success')
         return redirect(url_for('project.get_project', project_id=task.project_id))
     return render_template('upload_task_attachment.html', form=form, task=task)
@@ -39,6 +45,7 @@ def upload_attachment_task(task_id):
 def upload_attachment_ticket(ticket_id):
     ticket = Ticket.query.get_or_404(ticket_id)
     if current_user.role.role_name not in [RoleName.client, RoleName.manager] or ticket.raised_by_id != current_user.user_id:
+        logger.info('Access denied', extra={'action': 'upload_attachment_ticket', 'ticket_id': str(ticket_id)})
         flash('Unauthorized access.', 'danger')
         return redirect(url_for('dashboard.dashboard_page'))
     form = AttachmentForm()
@@ -57,6 +64,8 @@ def upload_attachment_ticket(ticket_id):
         )
         db.session.add(attachment)
         db.session.commit()
+        logger.info('Attachment uploaded', extra={'attachment_id': str(attachment.attachment_id),
+                                                  'ticket_id': str(ticket_id), 'file_name': file_name})
         flash('Attachment uploaded successfully!', 'success')
         return redirect(url_for('ticket.tickets'))
     return render_template('upload_ticket_attachment.html', form=form, ticket=ticket)
\ No newline at end of file
@@ -1,12 +1,155 @@
-from flask import render_template, redirect, url_for, flash
-from flask_login import login_required, current_user
+from flask import render_template, request, Response, stream_with_context, flash
+from flask_login import login_required
 from models.audit_log_models import AuditLog
-from models.models_models import db, RoleName
+from models.user_models import User
+from models.models_models import db
+from permissions import require_permission
+from sqlalchemy import select, tuple_
+from datetime import datetime
+import csv
+import io
+import json
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+EXPORT_BATCH_SIZE = 1000
+
+def _parse_datetime(value):
+    """Accept YYYY-MM-DD or full ISO timestamps from query args"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+def _parse_uuid(value):
+    try:
+        return uuid.UUID(value) if value else None
+    except ValueError:
+        return None
+
+def encode_cursor(log):
+    """Keyset cursor for the last row on a page: '<created_at>~<log_id>'"""
+    return f'{log.created_at.isoformat()}~{log.log_id}'
+
+def decode_cursor(value):
+    if not value or '~' not in value:
+        return None
+    created_at, log_id = value.split('~', 1)
+    created_at, log_id = _parse_datetime(created_at), _parse_uuid(log_id)
+    if created_at is None or log_id is None:
+        return None
+    return created_at, log_id
+
+def _audit_filters(args):
+    """Read user/action/time-range filters from request args"""
+    return {
+        'user_id': _parse_uuid(args.get('user_id')),
+        'action': (args.get('action') or '').strip() or None,
+        'start': _parse_datetime(args.get('start')),
+        'end': _parse_datetime(args.get('end'))
+    }
+
+def _filtered_audit_query(filters):
+    """Base select for audit rows; every filter maps onto the (user_id, created_at) / (created_at) indexes"""
+    stmt = select(AuditLog, User.username).outerjoin(User, User.user_id == AuditLog.user_id)
+    if filters['user_id']:
+        stmt = stmt.where(AuditLog.user_id == filters['user_id'])
+    if filters['action']:
+        stmt = stmt.where(AuditLog.action == filters['action'])
+    if filters['start']:
+        stmt = stmt.where(AuditLog.created_at >= filters['start'])
+    if filters['end']:
+        stmt = stmt.where(AuditLog.created_at < filters['end'])
+    return stmt.order_by(AuditLog.created_at.desc(), AuditLog.log_id.desc())
 
 @login_required
+@require_permission('admin_panel')
 def get_audit_logs():
-    if current_user.role.role_name != RoleName.admin:
-        flash('Only admins can view audit logs.', 'danger')
-        return redirect(url_for('dashboard.dashboard_page'))
-    logs = AuditLog.query.all()
-    return render_template('list_audit.html', logs=logs)
\ No newline at end of file
+    """Keyset-paginated audit log viewer, newest first"""
+    filters = _audit_filters(request.args)
+    try:
+        page_size = min(max(int(request.args.get('limit', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        page_size = DEFAULT_PAGE_SIZE
+
+    stmt = _filtered_audit_query(filters)
+    cursor = decode_cursor(request.args.get('after'))
+    if cursor:
+        stmt = stmt.where(tuple_(AuditLog.created_at, AuditLog.log_id) < cursor)
+
+    try:
+        rows = db.session.execute(stmt.limit(page_size + 1)).all()
+    except Exception as e:
+        logger.exception('get_audit_logs failed')
+        db.session.rollback()
+        flash(f'Error loading audit logs: {e}', 'danger')
+        rows = []
+
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = encode_cursor(rows[-1][0]) if has_next else None
+
+    # Only keep non-empty filters in pagination/export links
+    filter_args = {key: value for key, value in request.args.items() if key in ('user_id', 'action', 'start', 'end') and value}
+
+    return render_template('admin_audit.html',
+                           logs=[{'log': log, 'username': username} for log, username in rows],
+                           next_cursor=next_cursor,
+                           page_size=page_size,
+                           filters=filter_args)
+
+@login_required
+@require_permission('admin_panel')
+def export_audit_logs():
+    """Stream filtered audit logs as CSV or JSONL without loading them into memory"""
+    export_format = request.args.get('format', 'csv').lower()
+    if export_format not in ('csv', 'jsonl'):
+        return Response('Unsupported export format', status=400)
+
+    filters = _audit_filters(request.args)
+    # yield_per makes the driver use a server-side cursor and fetch in fixed-size batches
+    stmt = _filtered_audit_query(filters).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    fields = ['log_id', 'created_at', 'user_id', 'username', 'action', 'description']
+
+    def rows():
+        for log, username in db.session.execute(stmt):
+            yield {
+                'log_id': str(log.log_id),
+                'created_at': log.created_at.isoformat() if log.created_at else None,
+                'user_id': str(log.user_id),
+                'username': username,
+                'action': log.action,
+                'description': log.description
+            }
+
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fields)
+        writer.writeheader()
+        for row in rows():
+            writer.writerow(row)
+            if buffer.tell() >= 64 * 1024:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    def generate_jsonl():
+        for row in rows():
+            yield json.dumps(row) + '\n'
+
+    timestamp = datetime.utcnow().strftime('%Y%m%d%H%M%S')
+    if export_format == 'csv':
+        body, mimetype = generate_csv(), 'text/csv'
+    else:
+        body, mimetype = generate_jsonl(), 'application/x-ndjson'
+
+    return Response(stream_with_context(body), mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename=audit_log_{timestamp}.{export_format}'
+    })
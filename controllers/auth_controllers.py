@@ -1,11 +1,15 @@
-from flask import request, render_template, redirect, url_for, flash
+from flask import request, render_template, redirect, url_for, flash, session, make_response
 from flask_login import login_user, logout_user, login_required, current_user, UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 from permissions import require_permission
+from login_pipeline import login_pipeline, LoginThrottled, LoginBusy
 from models.user_models import User
 from models.role_models import Role
 from models.models_models import db, RoleName
 import uuid
+import logging
+
+logger = logging.getLogger(__name__)
 
 def load_user(user_id):
     """Load user for Flask-Login - SIMPLE VERSION"""
@@ -52,9 +56,7 @@ def load_user(user_id):
                 def get_id(self):
                     return self.user_id
             
-            # print(f"🔍 LOAD_USER: role_name from DB = '{user_data[4]}'")
             user = SimpleUser(user_data[0], user_data[1], user_data[2], user_data[3], user_data[4])
-            # print(f"🔍 LOAD_USER: user.role_name = '{user.role_name}'")
             cur.close()
             conn.close()
             return user
@@ -64,8 +66,15 @@ def load_user(user_id):
         return None
         
     except Exception:
+        logger.exception('load_user failed')
         return None
 
+def _retry_later(status, retry_after):
+    """The login form again with a Retry-After header"""
+    response = make_response(render_template('auth_login.html'), status)
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
 def login():
     if current_user.is_authenticated:
         return redirect(url_for('dashboard.dashboard_page'))
@@ -74,9 +83,6 @@ def login():
         email = request.form.get('email')
         password = request.form.get('password')
         
-        # Remove debug output for production
-        # print(f"🔍 LOGIN ATTEMPT: email='{email}', password='{'*' * len(password) if password else 'None'}'")
-        
         if email and password:
             try:
                 # Clear any aborted transactions before query
@@ -85,39 +91,40 @@ def login():
                 except:
                     pass
                     
-                user = User.query.filter_by(email=email).first()
-                # print(f"🔍 USER FOUND: {user is not None}")
+                user = login_pipeline.authenticate(email, password)
                 
                 if user:
-                    # print(f"🔍 USER DETAILS: {user.username} ({user.email})")
-                    password_match = user.check_password(password)
-                    # print(f"🔍 PASSWORD MATCH: {password_match}")
+                    remember = bool(request.form.get('remember'))
+                    from session_store import session_store
+                    if session_store.enabled:
+                        # "Remember me" extends the revocable server-side session instead of
+                        # setting Flask-Login's remember cookie, which logs in without one
+                        session_store.rotate(session)
+                        session.permanent = remember
+                        remember = False
+                    login_user(user, remember=remember)
+                    flash('Login successful!', 'success')
                     
-                    if password_match:
-                        login_user(user, remember=bool(request.form.get('remember')))
-                        # print("✅ LOGIN_USER CALLED")
-                        flash('Login successful!', 'success')
-                        
-                        next_page = request.args.get('next')
-                        redirect_url = next_page if next_page else url_for('dashboard.dashboard_page')
-                        # print(f"🔄 REDIRECTING TO: {redirect_url}")
-                        return redirect(redirect_url)
-                    else:
-                        # print("❌ PASSWORD MISMATCH")
-                        flash('Invalid email or password.', 'danger')
+                    next_page = request.args.get('next')
+                    redirect_url = next_page if next_page else url_for('dashboard.dashboard_page')
+                    return redirect(redirect_url)
                 else:
-                    # print("❌ USER NOT FOUND")
                     flash('Invalid email or password.', 'danger')
+            except LoginThrottled as e:
+                flash('Too many login attempts. Please wait a moment and try again.', 'warning')
+                return _retry_later(429, e.retry_after)
+            except LoginBusy as e:
+                flash('Login is busy right now. Please try again in a few seconds.', 'warning')
+                return _retry_later(503, e.retry_after)
             except Exception as e:
+                logger.exception('login failed')
                 # Handle aborted transactions with user-friendly message
-                # print(f"❌ LOGIN EXCEPTION: {e}")
                 try:
                     db.session.rollback()
                 except:
                     pass
                 flash('Login temporarily unavailable. Please try again.', 'warning')
         else:
-            # print("❌ MISSING EMAIL OR PASSWORD")
             flash('Please enter both email and password.', 'danger')
     
     return render_template('auth_login.html')
@@ -179,12 +186,12 @@ def register():
             return redirect(url_for('auth.login'))
             
         except Exception as e:
+            logger.exception('register failed')
             try:
                 db.session.rollback()
             except:
                 pass
             flash('Registration failed. Please try again.', 'danger')
-            print(f"Registration error: {e}")  # Log for debugging only
             return render_template('auth_register.html')
     
     return render_template('auth_register.html')
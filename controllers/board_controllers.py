@@ -7,10 +7,14 @@ from models.models_models import db, RoleName
 from forms.board_forms import BoardForm
 from datetime import datetime
 import uuid
+import logging
+
+logger = logging.getLogger(__name__)
 
 @login_required
 def create_board(project_id):
     if current_user.role.role_name != RoleName.manager or not ManagerProject.query.filter_by(manager_id=current_user.manager.manager_id, project_id=project_id).first():
+        logger.info('Access denied', extra={'action': 'create_board', 'project_id': str(project_id)})
         flash('Only managers can create boards.', 'danger')
         return redirect(url_for('dashboard.dashboard_page'))
     project = Project.query.get_or_404(project_id)
@@ -25,6 +29,7 @@ def create_board(project_id):
         )
         db.session.add(board)
         db.session.commit()
+        logger.info('Board created', extra={'board_id': str(board.board_id), 'project_id': str(project_id)})
         flash('Board created successfully!', 'success')
         return redirect(url_for('project.get_project', project_id=project_id))
     return render_template('create_board.html', form=form, project=project)
@@ -33,6 +38,7 @@ def create_board(project_id):
 def get_board(board_id):
     board = Board.query.get_or_404(board_id)
     if current_user.role.role_name != RoleName.manager or not ManagerProject.query.filter_by(manager_id=current_user.manager.manager_id, project_id=board.project_id).first():
+        logger.info('Access denied', extra={'action': 'get_board', 'board_id': str(board_id)})
         flash('Unauthorized access.', 'danger')
         return redirect(url_for('dashboard.dashboard_page'))
     return render_template('board_detail.html', board=board)
\ No newline at end of file
@@ -7,11 +7,15 @@ from models.models_models import db, RoleName
 from forms.comment_forms import CommentForm
 from datetime import datetime
 import uuid
+import logging
+
+logger = logging.getLogger(__name__)
 
 @login_required
 def create_comment_task(task_id):
     task = Task.query.get_or_404(task_id)
     if current_user.role.role_name not in [RoleName.manager, RoleName.developer] or (current_user.role.role_name == RoleName.developer and task.assigned_to_id != current_user.user_id):
+        logger.info('Access denied', extra={'action': 'create_comment_task', 'task_id': str(task_id)})
         flash('Unauthorized access.', 'danger')
         return redirect(url_for('dashboard.dashboard_page'))
     form = CommentForm()
@@ -26,6 +30,7 @@ def create_comment_task(task_id):
         )
         db.session.add(comment)
         db.session.commit()
+        logger.info('Comment added', extra={'comment_id': str(comment.comment_id), 'task_id': str(task_id)})
         flash('Comment added successfully!', 'success')
         return redirect(url_for('project.get_project', project_id=task.project_id))
     return render_template('create_task_comment.html', form=form, task=task)
@@ -34,6 +39,7 @@ def create_comment_task(task_id):
 def create_comment_ticket(ticket_id):
     ticket = Ticket.query.get_or_404(ticket_id)
     if current_user.role.role_name not in [RoleName.client, RoleName.manager] or ticket.raised_by_id != current_user.user_id:
+        logger.info('Access denied', extra={'action': 'create_comment_ticket', 'ticket_id': str(ticket_id)})
         flash('Unauthorized access.', 'danger')
         return redirect(url_for('dashboard.dashboard_page'))
     form = CommentForm()
@@ -48,6 +54,7 @@ def create_comment_ticket(ticket_id):
         )
         db.session.add(comment)
         db.session.commit()
+        logger.info('Comment added', extra={'comment_id': str(comment.comment_id), 'ticket_id': str(ticket_id)})
         flash('Comment added successfully!', 'success')
         return redirect(url_for('ticket.tickets'))
     return render_template('create_ticket_comment.html', form=form, ticket=ticket)
\ No newline at end of file
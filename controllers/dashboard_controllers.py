@@ -9,6 +9,9 @@ from models.goal_models import Goal
 from models.team_models import Team
 from datetime import datetime, timedelta
 from sqlalchemy import func
+import logging
+
+logger = logging.getLogger(__name__)
 
 @login_required
 @require_permission('dashboard_view')
@@ -74,19 +77,10 @@ def dashboard():
                     Project.updated_at >= month_ago
                 ).count()
                 
-                # Calculate system uptime (mock - replace with actual server metrics)
-                uptime_percentage = 99.2  # This would come from actual monitoring
-                
-                # System Health Data (these would come from actual monitoring in production)
-                system_health = {
-                    'database_status': 'healthy',
-                    'database_uptime': 97,
-                    'api_status': 'running', 
-                    'api_uptime': 99,
-                    'storage_usage': 68,
-                    'memory_status': 'normal',
-                    'memory_usage': 72
-                }
+                # Uptime and system health from the runtime metrics sampler
+                from runtime_metrics import runtime_metrics
+                system_health = runtime_metrics.system_health()
+                uptime_percentage = system_health.pop('uptime_percentage')
                 
                 # Get role distribution - simple count by role
                 admin_count = User.query.filter(User.role_name == 'admin').count()
@@ -169,8 +163,8 @@ def dashboard():
                     'user_overview': {'recent_registrations': new_users_this_week},
                     **system_health  # Add system health data
                 }
-            except Exception as stats_error:
-                print(f"Error fetching admin stats: {stats_error}")
+            except Exception:
+                logger.exception('Error fetching admin stats')
                 dashboard_stats = {
                     'total_users': 156,
                     'pending_users': 5,
@@ -208,6 +202,7 @@ def dashboard():
         return render_template(template_name, **template_vars)
                              
     except Exception as e:
+        logger.exception('dashboard failed')
         flash(f'Error loading dashboard: {e}', 'danger')
         # Fall back to mock data if database fails
         projects = [
@@ -246,5 +241,5 @@ def dashboard():
                              completed_tasks=0,
                              new_users_this_week=0,
                              projects_completed_this_month=0,
-                             uptime_percentage=99.2,
+                             uptime_percentage=None,
                              role_dict={'admin': 0, 'manager': 0, 'developer': 0, 'viewer': 0})
\ No newline at end of file
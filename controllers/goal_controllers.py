@@ -3,12 +3,15 @@ from flask_login import login_required, current_user
 from models.goal_models import Goal, GoalStatus, GoalPriority, GoalCategory
 from models.project_models import Project
 from models.user_models import User
-from models.manager_project_models import ManagerProject
 from models.models_models import db
 from forms.goal_forms import GoalForm, GoalFilterForm, GoalProgressForm
 from datetime import datetime
 from permissions import require_permission, require_role
+from project_access import access_level, accessible_project_ids
 import uuid
+import logging
+
+logger = logging.getLogger(__name__)
 
 @login_required
 @require_permission('goal_view')
@@ -21,6 +24,7 @@ def get_goals():
         projects = Project.query.all()
         filter_form.project_id.choices = [('', 'All Projects')] + [(str(p.project_id), p.title) for p in projects]
     except Exception as e:
+        logger.exception('get_goals failed')
         flash(f'Error loading projects: {str(e)}', 'warning')
         filter_form = GoalFilterForm()
         filter_form.project_id.choices = [('', 'All Projects')]
@@ -36,19 +40,11 @@ def get_goals():
             pass
         elif user_role == 'manager':
             # Manager can see team goals and project goals they manage
-            if hasattr(current_user, 'manager'):
-                managed_projects = Project.query.join(ManagerProject).filter(
-                    ManagerProject.manager_id == current_user.manager.manager_id
-                ).all()
-                managed_project_ids = [p.project_id for p in managed_projects]
-                
-                query = query.filter(
-                    (Goal.user_id == current_user.user_id) |
-                    (Goal.project_id.in_(managed_project_ids)) |
-                    (Goal.category.in_([GoalCategory.TEAM, GoalCategory.ORGANIZATIONAL]))
-                )
-            else:
-                query = query.filter(Goal.user_id == current_user.user_id)
+            query = query.filter(
+                (Goal.user_id == current_user.user_id) |
+                (Goal.project_id.in_(accessible_project_ids(current_user, levels=['manager']))) |
+                (Goal.category.in_([GoalCategory.TEAM, GoalCategory.ORGANIZATIONAL]))
+            )
         else:
             # Developer, client, viewer see only their own goals
             query = query.filter(Goal.user_id == current_user.user_id)
@@ -81,6 +77,7 @@ def get_goals():
         }
         
     except Exception as e:
+        logger.exception('get_goals failed')
         # If goal table doesn't exist or other database errors
         flash(f'Database error: {str(e)}. Goal table may not exist.', 'danger')
         goals = []
@@ -129,6 +126,7 @@ def create_goal():
             return redirect(url_for('goal.goals'))
             
         except Exception as e:
+            logger.exception('create_goal failed')
             db.session.rollback()
             flash(f'Error creating goal: {str(e)}', 'danger')
     else:
@@ -267,16 +265,11 @@ def get_goal_stats():
     # Build query based on user role
     query = Goal.query
     if user_role != 'admin':
-        if user_role == 'manager' and hasattr(current_user, 'manager'):
+        if user_role == 'manager':
             # Manager can see team goals and project goals they manage
-            managed_projects = Project.query.join(ManagerProject).filter(
-                ManagerProject.manager_id == current_user.manager.manager_id
-            ).all()
-            managed_project_ids = [p.project_id for p in managed_projects]
-            
             query = query.filter(
                 (Goal.user_id == current_user.user_id) |
-                (Goal.project_id.in_(managed_project_ids)) |
+                (Goal.project_id.in_(accessible_project_ids(current_user, levels=['manager']))) |
                 (Goal.category.in_([GoalCategory.TEAM, GoalCategory.ORGANIZATIONAL]))
             )
         else:
@@ -304,16 +297,12 @@ def can_user_access_goal(user, goal):
         return True
     if goal.user_id == user.user_id:
         return True
-    if user_role == 'manager' and hasattr(user, 'manager'):
+    if user_role == 'manager':
         # Manager can access team/organizational goals and project goals they manage
         if goal.category in [GoalCategory.TEAM, GoalCategory.ORGANIZATIONAL]:
             return True
         if goal.project_id:
-            managed_project = ManagerProject.query.filter_by(
-                manager_id=user.manager.manager_id,
-                project_id=goal.project_id
-            ).first()
-            return managed_project is not None
+            return access_level(user.user_id, goal.project_id) == 'manager'
     
     return False
 
@@ -325,15 +314,11 @@ def can_user_edit_goal(user, goal):
         return True
     if goal.user_id == user.user_id:
         return True
-    if user_role == 'manager' and hasattr(user, 'manager'):
+    if user_role == 'manager':
         # Manager can edit team goals and project goals they manage
         if goal.category == GoalCategory.TEAM:
             return True
         if goal.project_id:
-            managed_project = ManagerProject.query.filter_by(
-                manager_id=user.manager.manager_id,
-                project_id=goal.project_id
-            ).first()
-            return managed_project is not None
+            return access_level(user.user_id, goal.project_id) == 'manager'
     
     return False
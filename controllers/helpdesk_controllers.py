@@ -5,6 +5,9 @@ from models.models_models import db, RoleName, TicketStatus, TicketPriority
 from forms.ticket_forms import HelpdeskForm
 from datetime import datetime
 import uuid
+import logging
+
+logger = logging.getLogger(__name__)
 
 @login_required
 def submit_helpdesk_request():
@@ -22,6 +25,7 @@ def submit_helpdesk_request():
         )
         db.session.add(ticket)
         db.session.commit()
+        logger.info('Helpdesk request submitted', extra={'ticket_id': str(ticket.ticket_id)})
         flash('Helpdesk request submitted successfully!', 'success')
         return redirect(url_for('helpdesk.requests'))
     return render_template('create_helpdesk.html', form=form)
@@ -38,6 +42,7 @@ def get_helpdesk_requests():
 def update_helpdesk_request(ticket_id):
     ticket = db.session.query(Ticket).get_or_404(ticket_id)
     if current_user.role.role_name != RoleName.admin and ticket.raised_by_id != current_user.user_id:
+        logger.info('Access denied', extra={'action': 'update_helpdesk_request', 'ticket_id': str(ticket_id)})
         flash('Unauthorized access.', 'danger')
         return redirect(url_for('dashboard.dashboard_page'))
     form = HelpdeskForm(obj=ticket)
@@ -49,6 +54,7 @@ def update_helpdesk_request(ticket_id):
             ticket.status = form.status.data
             ticket.priority = form.priority.data
         db.session.commit()
+        logger.info('Helpdesk request updated', extra={'ticket_id': str(ticket_id)})
         flash('Helpdesk request updated successfully!', 'success')
         return redirect(url_for('helpdesk.requests'))
     return render_template('edit_helpdesk.html', form=form, ticket=ticket)
\ No newline at end of file
@@ -5,10 +5,14 @@ from models.models_models import db, RoleName
 from forms.notification_forms import NotificationTemplateForm
 from datetime import datetime
 import uuid
+import logging
+
+logger = logging.getLogger(__name__)
 
 @login_required
 def create_notification_template():
     if current_user.role.role_name != RoleName.admin:
+        logger.info('Access denied', extra={'action': 'create_notification_template'})
         flash('Only admins can create notification templates.', 'danger')
         return redirect(url_for('dashboard.dashboard_page'))
     form = NotificationTemplateForm()
@@ -22,6 +26,7 @@ def create_notification_template():
         )
         db.session.add(template)
         db.session.commit()
+        logger.info('Notification template created', extra={'template_id': str(template.template_id)})
         flash('Notification template created successfully!', 'success')
         return redirect(url_for('notification.templates'))
     return render_template('create_notification.html', form=form)
@@ -29,6 +34,7 @@ def create_notification_template():
 @login_required
 def get_notification_templates():
     if current_user.role.role_name != RoleName.admin:
+        logger.info('Access denied', extra={'action': 'get_notification_templates'})
         flash('Only admins can view notification templates.', 'danger')
         return redirect(url_for('dashboard.dashboard_page'))
     templates = NotificationTemplate.query.all()
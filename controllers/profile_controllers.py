@@ -1,6 +1,9 @@
 from flask import render_template, request, flash, redirect, url_for
 from flask_login import login_required, current_user
 from permissions import ROLE_PERMISSIONS, AVAILABLE_PERMISSIONS
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Mock data for roles and profile
 available_roles = ['viewer', 'developer', 'manager', 'client']
@@ -70,6 +73,7 @@ def update_profile():
             'requested_roles': user_profiles.get(user_id, {}).get('requested_roles', [])
         }
         
+        logger.info('Profile updated')
         flash('Profile updated successfully! 🌿', 'success')
         return redirect(url_for('profile.profile'))
     
@@ -88,6 +92,7 @@ def request_role():
             
             if requested_role not in user_profiles[user_id]['requested_roles']:
                 user_profiles[user_id]['requested_roles'].append(requested_role)
+                logger.info('Role requested', extra={'role': requested_role})
                 flash(f'Role request for "{requested_role}" submitted! Admin will review soon. 🌱', 'success')
             else:
                 flash(f'You have already requested "{requested_role}" role! ⏳', 'info')
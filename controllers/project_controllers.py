@@ -1,9 +1,14 @@
-from flask import render_template, redirect, url_for, flash
+from flask import render_template, redirect, url_for, flash, jsonify, request
 from flask_login import login_required, current_user
 from models.project_models import Project
 from models.manager_project_models import ManagerProject
-from models.models_models import db, RoleName
+from models.models_models import db, RoleName, TaskStatus
 from forms.project_forms import ProjectForm
+from activity_logging import log_activity
+from epic_progress import epic_summaries
+from project_health import get_health
+from project_overview import task_breakdown, board_columns, task_page, related_summary
+from project_access import accessible_projects
 from datetime import datetime
 from permissions import (
     require_permission, 
@@ -13,6 +18,9 @@ from permissions import (
     can_user_access_project
 )
 import uuid
+import logging
+
+logger = logging.getLogger(__name__)
 
 @login_required
 @require_permission('project_create')
@@ -29,19 +37,16 @@ def create_project():
         )
         db.session.add(project)
         
-        # Only create manager-project relationship if user is manager
-        if getattr(current_user, 'role_name', None) == 'manager' and hasattr(current_user, 'manager'):
+        # Only create manager-project relationship if user is manager; this also grants project_access
+        if getattr(current_user, 'role_name', None) == 'manager':
             manager_project = ManagerProject(
-                manager_id=current_user.manager.manager_id,
+                manager_id=current_user.user_id,
                 project_id=project.project_id
             )
             db.session.add(manager_project)
         
         db.session.commit()
-        
-        # Calculate initial health score if method exists
-        if hasattr(project, 'calculate_health_score'):
-            project.calculate_health_score()
+        log_activity(current_user, 'project_created', 'project', project.project_id, {'title': project.title})
         
         flash('Project created successfully!', 'success')
         return redirect(url_for('project.projects'))
@@ -52,46 +57,24 @@ def create_project():
 def list_projects():
     """List projects with role-based filtering - Now using decorator-based permissions"""
     user_role = getattr(current_user, 'role_name', None)
-    print(f"🔍 DEBUG: User role: {user_role}")
     
     if user_role == 'admin':
         # Admin can see all projects
         projects = Project.query.all()
-        print(f"🔍 DEBUG: Admin - Found {len(projects)} projects")
-    elif user_role == 'manager' and hasattr(current_user, 'manager'):
-        # Manager can see only assigned projects
-        try:
-            from models.manager_project_models import ManagerProject
-            projects = Project.query.join(ManagerProject).filter(
-                ManagerProject.manager_id == current_user.manager.manager_id
-            ).all()
-            print(f"🔍 DEBUG: Manager - Found {len(projects)} projects")
-        except Exception as e:
-            print(f"🔍 DEBUG: Manager query failed: {e}")
-            # Fallback: show no projects for managers to maintain role-based access
-            projects = []
-            print(f"🔍 DEBUG: Manager fallback - Showing 0 projects for security")
-    elif user_role == 'developer' and hasattr(current_user, 'developer'):
-        # Developer can see only assigned projects
+    elif user_role in ['manager', 'developer']:
+        # Assigned projects (directly or through a team) with one join on project_access
         try:
-            from models.developer_project_models import DeveloperProject
-            projects = Project.query.join(DeveloperProject).filter(
-                DeveloperProject.developer_id == current_user.developer.developer_id
-            ).all()
-            print(f"🔍 DEBUG: Developer - Found {len(projects)} projects")
-        except Exception as e:
-            print(f"🔍 DEBUG: Developer query failed: {e}")
-            # Fallback: show no projects for developers to maintain role-based access
+            projects = accessible_projects(Project.query, current_user).order_by(Project.title).all()
+        except Exception:
+            logger.exception('Accessible project query failed')
+            # Fallback: show no projects to maintain role-based access
             projects = []
-            print(f"🔍 DEBUG: Developer fallback - Showing 0 projects for security")
     else:
         # Clients and other roles see no projects by default
         projects = []
-        print(f"🔍 DEBUG: Other role - Showing 0 projects for security")
     
-    # Debug: Print project details
-    for project in projects:
-        print(f"🔍 DEBUG: Project {project.project_id} - {project.title}")
+    # One sampled debug record per request instead of a line per project
+    logger.debug('Listed projects', extra={'role': user_role, 'project_count': len(projects)})
     
     return render_template('project_list.html', projects=projects)
 
@@ -106,56 +89,59 @@ def get_project(project_id):
         flash('Access denied. You do not have access to this project.', 'danger')
         return redirect(url_for('project.projects'))
     
-    # Calculate and update health score if method exists
-    health_score = None
-    if hasattr(project, 'calculate_health_score'):
-        health_score = project.calculate_health_score()
+    # Persisted score; only recomputed when the project's tasks changed or the TTL expired
+    health = get_health(project_id)
     
     # Get project data based on user role
     user_role = getattr(current_user, 'role_name', None)
     context = {
         'project': project,
-        'health_score': health_score
+        'health': health,
+        'health_score': health['score']
     }
     
-    if user_role in ['admin', 'manager']:
-        # Full access to all project data
-        tasks = getattr(project, 'tasks', [])
-        context.update({
-            'tasks': tasks,
-            'subprojects': getattr(project, 'subprojects', []),
-            'sprints': getattr(project, 'sprints', []),
-            'boards': getattr(project, 'boards', []),
-            'epics': getattr(project, 'epics', []),
-            'team_stats': True
-        })
-    elif user_role == 'developer':
-        # Developer sees limited project info
-        tasks = getattr(project, 'tasks', [])
+    if user_role in ['admin', 'manager', 'developer']:
+        # Aggregates, capped board columns and one keyset page instead of every task
+        task_counts = task_breakdown(project_id)
+        columns = board_columns(project_id)
+        page = task_page(
+            project_id,
+            sort=request.args.get('sort', 'updated'),
+            direction=request.args.get('direction', 'desc'),
+            after=request.args.get('after'),
+            status=request.args.get('status') or None
+        )
+        related = related_summary(project_id)
         context.update({
-            'tasks': tasks,
-            'subprojects': getattr(project, 'subprojects', []),
-            'sprints': getattr(project, 'sprints', [])
+            'task_counts': task_counts,
+            'tasks': page['tasks'],
+            'task_page': page,
+            'related': related,
+            'sprints': related['sprints']
         })
+        if user_role != 'developer':
+            # Full access to all project data
+            context.update({
+                'boards': related['boards'],
+                'epics': epic_summaries.get(project_id),
+                'team_stats': True
+            })
     else:
         # Client/Viewer sees limited public data
-        tasks = []
+        task_counts = {'total': 0, 'by_status': {}, 'by_type': {}, 'by_assignee': []}
+        columns = {}
         context.update({
-            'tasks': tasks,
+            'task_counts': task_counts,
+            'tasks': [],
             'public_boards': []
         })
     
-    # Organize tasks by status for Kanban board
-    todo_tasks = [task for task in tasks if getattr(task, 'status', None) in ['to_do', 'pending', None]]
-    in_progress_tasks = [task for task in tasks if getattr(task, 'status', None) == 'in_progress']
-    review_tasks = [task for task in tasks if getattr(task, 'status', None) in ['review', 'testing']]
-    completed_tasks = [task for task in tasks if getattr(task, 'status', None) in ['done', 'completed']]
-    
+    # Kanban columns hold the most recently updated cards; counts come from the aggregates
     context.update({
-        'todo_tasks': todo_tasks,
-        'in_progress_tasks': in_progress_tasks,
-        'review_tasks': review_tasks,
-        'completed_tasks': completed_tasks
+        'todo_tasks': columns.get(TaskStatus.todo.value, []),
+        'in_progress_tasks': columns.get(TaskStatus.in_progress.value, []),
+        'review_tasks': [task for status in ('review', 'testing') for task in columns.get(status, [])],
+        'completed_tasks': columns.get(TaskStatus.done.value, [])
     })
     
     return render_template('project_detail.html', **context)
@@ -178,11 +164,8 @@ def update_project(project_id):
         project.description = form.description.data
         project.updated_at = datetime.utcnow()
         
-        # Update health score if method exists
-        if hasattr(project, 'calculate_health_score'):
-            project.calculate_health_score()
-        
         db.session.commit()
+        log_activity(current_user, 'project_updated', 'project', project.project_id, {'title': project.title})
         flash('Project updated successfully!', 'success')
         return redirect(url_for('project.detail', project_id=project_id))
     
@@ -215,6 +198,45 @@ def delete_project(project_id):
     
     db.session.delete(project)
     db.session.commit()
+    log_activity(current_user, 'project_deleted', 'project', project_id, {'title': project.title})
     
     flash('Project deleted successfully!', 'success')
-    return redirect(url_for('project.projects'))
\ No newline at end of file
+    return redirect(url_for('project.projects'))
+
+@login_required
+@require_permission('project_view')
+def epic_summary_data(project_id):
+    """Per-epic status counts, hours and overdue tasks for a project (cached)"""
+    Project.query.get_or_404(project_id)
+    if not can_user_access_project(current_user, project_id):
+        return jsonify({'error': 'Access denied'}), 403
+    return jsonify({'project_id': str(project_id), 'epics': epic_summaries.get(project_id)})
+
+@login_required
+@require_permission('project_view')
+def project_health_data(project_id):
+    """Health score and the signals behind it"""
+    Project.query.get_or_404(project_id)
+    if not can_user_access_project(current_user, project_id):
+        return jsonify({'error': 'Access denied'}), 403
+    return jsonify({'project_id': str(project_id), **get_health(project_id)})
+
+@login_required
+@require_permission('project_view')
+def project_tasks_data(project_id):
+    """One keyset page of a project's tasks: ?sort=updated|created|due&direction=&after=&limit=&status="""
+    Project.query.get_or_404(project_id)
+    if not can_user_access_project(current_user, project_id):
+        return jsonify({'error': 'Access denied'}), 403
+    page = task_page(
+        project_id,
+        sort=request.args.get('sort', 'updated'),
+        direction=request.args.get('direction', 'desc'),
+        after=request.args.get('after'),
+        limit=request.args.get('limit', 50, type=int),
+        status=request.args.get('status') or None
+    )
+    for task in page['tasks']:
+        for key in ('due_date', 'created_at', 'updated_at'):
+            task[key] = task[key].isoformat() if task[key] else None
+    return jsonify({'project_id': str(project_id), **page})
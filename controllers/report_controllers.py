@@ -1,16 +1,24 @@
-from flask import render_template, redirect, url_for, flash
+from flask import render_template, redirect, url_for, flash, jsonify, request
 from flask_login import login_required, current_user
 from models.report_models import Report
 from models.project_models import Project
 from models.task_models import Task
 from models.models_models import db, RoleName
 from forms.report_forms import ReportForm
-from datetime import datetime
+from permissions import require_permission, can_user_access_project
+from project_access import accessible_project_ids
+from report_engine import project_report, flow_metrics
+from time_tracking import user_timesheet, project_timesheet, estimate_vs_actual
+from datetime import datetime, date
 import uuid
+import logging
+
+logger = logging.getLogger(__name__)
 
 @login_required
 def create_report(project_id):
     if current_user.role.role_name not in [RoleName.admin, RoleName.manager, RoleName.client]:
+        logger.info('Access denied', extra={'action': 'create_report', 'project_id': str(project_id)})
         flash('Only admins, managers and clients can create reports.', 'danger')
         return redirect(url_for('dashboard.dashboard_page'))
     project = Project.query.get_or_404(project_id)
@@ -28,6 +36,7 @@ def create_report(project_id):
         )
         db.session.add(report)
         db.session.commit()
+        logger.info('Report created', extra={'report_id': str(report.report_id), 'project_id': str(project_id)})
         flash('Report created successfully!', 'success')
         return redirect(url_for('project.get_project', project_id=project_id))
     return render_template('create_report.html', form=form, project=project)
@@ -35,6 +44,7 @@ def create_report(project_id):
 @login_required
 def get_reports():
     if current_user.role.role_name not in [RoleName.admin, RoleName.manager, RoleName.client]:
+        logger.info('Access denied', extra={'action': 'get_reports'})
         flash('Only admins, managers and clients can view reports.', 'danger')
         return redirect(url_for('dashboard.dashboard_page'))
     
@@ -45,4 +55,97 @@ def get_reports():
         reports = Report.query.filter_by(manager_id=current_user.manager.manager_id).all()
     else:
         reports = Report.query.filter_by(client_id=current_user.client.client_id).all()
-    return render_template('report_list.html', reports=reports)
\ No newline at end of file
+    return render_template('report_list.html', reports=reports)
+
+@login_required
+@require_permission('reports_view')
+def project_analytics(project_id):
+    """Burndown, velocity, throughput and open-bug charts rendered from rollup tables"""
+    project = Project.query.get_or_404(project_id)
+    if not can_user_access_project(current_user, project_id):
+        flash('Access denied. You do not have access to this project.', 'danger')
+        return redirect(url_for('report.reports'))
+    return render_template('report_analytics.html', project=project, report=project_report(project_id),
+                           flow=flow_metrics(project_id, days=90))
+
+@login_required
+@require_permission('reports_view')
+def project_analytics_data(project_id):
+    """JSON feed for the analytics charts"""
+    Project.query.get_or_404(project_id)
+    if not can_user_access_project(current_user, project_id):
+        return jsonify({'error': 'Access denied'}), 403
+    return jsonify(project_report(project_id))
+
+@login_required
+@require_permission('reports_view')
+def project_flow_data(project_id):
+    """Cycle/lead-time percentiles, time in status and cumulative flow (?days=365)"""
+    Project.query.get_or_404(project_id)
+    if not can_user_access_project(current_user, project_id):
+        return jsonify({'error': 'Access denied'}), 403
+    days = min(max(request.args.get('days', 365, type=int), 1), 730)
+    return jsonify(flow_metrics(project_id, days=days))
+
+def _timesheet_window():
+    """?start=YYYY-MM-DD&weeks=N from the query string (defaults to the last 4 weeks)"""
+    weeks = min(max(request.args.get('weeks', 4, type=int), 1), 26)
+    try:
+        start = date.fromisoformat(request.args['start']) if request.args.get('start') else None
+    except ValueError:
+        start = None
+    return start, weeks
+
+def _timesheet_scope():
+    """
+    (user id, project id filter) for the timesheet requested with ?user_id=
+
+    Admins may view anyone's timesheet. Managers may view another user's
+    hours only on the projects they manage; everyone else sees their own.
+    """
+    requested = request.args.get('user_id')
+    role = getattr(current_user, 'role_name', None)
+    if requested and role in ['admin', 'manager']:
+        try:
+            user_id = uuid.UUID(requested)
+        except ValueError:
+            return current_user.user_id, None
+        if role == 'admin' or user_id == current_user.user_id:
+            return user_id, None
+        return user_id, accessible_project_ids(current_user, levels=['manager'])
+    return current_user.user_id, None
+
+@login_required
+def timesheet():
+    """Weekly hours per project for one user, served from the weekly rollups"""
+    start, weeks = _timesheet_window()
+    user_id, project_ids = _timesheet_scope()
+    return render_template('report_timesheet.html',
+                           timesheet=user_timesheet(user_id, start=start, weeks=weeks, project_ids=project_ids),
+                           weeks=weeks)
+
+@login_required
+def timesheet_data():
+    """JSON version of the user timesheet"""
+    start, weeks = _timesheet_window()
+    user_id, project_ids = _timesheet_scope()
+    return jsonify(user_timesheet(user_id, start=start, weeks=weeks, project_ids=project_ids))
+
+@login_required
+@require_permission('reports_view')
+def project_timesheet_data(project_id):
+    """Weekly hours per user for a project"""
+    Project.query.get_or_404(project_id)
+    if not can_user_access_project(current_user, project_id):
+        return jsonify({'error': 'Access denied'}), 403
+    start, weeks = _timesheet_window()
+    return jsonify(project_timesheet(project_id, start=start, weeks=weeks))
+
+@login_required
+@require_permission('reports_view')
+def project_estimates_data(project_id):
+    """Estimated vs logged hours per assignee and the largest overruns"""
+    Project.query.get_or_404(project_id)
+    if not can_user_access_project(current_user, project_id):
+        return jsonify({'error': 'Access denied'}), 403
+    return jsonify(estimate_vs_actual(project_id))
@@ -4,10 +4,14 @@ from models.user_models import User
 from models.role_models import Role
 from models.models_models import db, RoleName
 from forms.auth_forms import RoleAssignmentForm
+import logging
+
+logger = logging.getLogger(__name__)
 
 @login_required
 def list_pending_users():
     if current_user.role.role_name != RoleName.admin:
+        logger.info('Access denied', extra={'action': 'list_pending_users'})
         flash('Only admins can view pending users.', 'danger')
         return redirect(url_for('dashboard.dashboard_page'))
     pending_role = Role.query.filter_by(role_name=RoleName.pending).first()
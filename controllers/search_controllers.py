@@ -1,5 +1,8 @@
 from flask import render_template, request
 from flask_login import login_required
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Mock search data
 search_data = {
@@ -45,6 +48,7 @@ def search():
     paginated_results = results[start_idx:end_idx]
     
     total_pages = (len(results) + items_per_page - 1) // items_per_page
+    logger.debug('Search', extra={'query_length': len(query), 'filter_type': filter_type, 'results': len(results)})
     
     return render_template('search_results.html', 
                          results=paginated_results,
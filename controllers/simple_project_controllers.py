@@ -1,5 +1,8 @@
 from flask import render_template, redirect, url_for, flash, request
 from flask_login import login_required, current_user
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Simple mock project data for testing
 mock_projects = [
@@ -125,6 +128,7 @@ def create_project():
                 'manager': current_user.username if hasattr(current_user, 'username') else 'Current User'
             }
             mock_projects.append(new_project)
+            logger.info('Project created', extra={'project_id': new_project['id']})
             flash('Project created successfully!', 'success')
             return redirect(url_for('project.projects'))
         else:
@@ -152,6 +156,7 @@ def update_project(project_id):
         if status:
             project['status'] = status
             
+        logger.info('Project updated', extra={'project_id': project['id']})
         flash('Project updated successfully!', 'success')
         return redirect(url_for('project.projects'))
     
@@ -164,6 +169,7 @@ def delete_project(project_id):
     project = next((p for p in mock_projects if p['id'] == int(project_id)), None)
     if project:
         mock_projects = [p for p in mock_projects if p['id'] != int(project_id)]
+        logger.info('Project deleted', extra={'project_id': project['id']})
         flash('Project deleted successfully!', 'success')
     else:
         flash('Project not found', 'error')
@@ -195,6 +201,7 @@ def create_goal():
                 'category': category or 'General'
             }
             mock_goals.append(new_goal)
+            logger.info('Goal created', extra={'goal_id': new_goal['id']})
             flash('Goal planted successfully! 🌱', 'success')
             return redirect(url_for('project.goals_page'))
         else:
@@ -7,10 +7,14 @@ from models.models_models import db, RoleName
 from forms.sprint_forms import SprintForm
 from datetime import datetime
 import uuid
+import logging
+
+logger = logging.getLogger(__name__)
 
 @login_required
 def create_sprint(project_id):
     if current_user.role.role_name != RoleName.manager or not ManagerProject.query.filter_by(manager_id=current_user.manager.manager_id, project_id=project_id).first():
+        logger.info('Access denied', extra={'action': 'create_sprint', 'project_id': str(project_id)})
         flash('Only managers can create sprints.', 'danger')
         return redirect(url_for('dashboard.dashboard_page'))
     project = Project.query.get_or_404(project_id)
@@ -28,6 +32,7 @@ def create_sprint(project_id):
         )
         db.session.add(sprint)
         db.session.commit()
+        logger.info('Sprint created', extra={'sprint_id': str(sprint.sprint_id), 'project_id': str(project_id)})
         flash('Sprint created successfully!', 'success')
         return redirect(url_for('project.get_project', project_id=project_id))
     return render_template('create_sprint.html', form=form, project=project)
@@ -36,6 +41,7 @@ def create_sprint(project_id):
 def get_sprint(sprint_id):
     sprint = Sprint.query.get_or_404(sprint_id)
     if current_user.role.role_name != RoleName.manager or not ManagerProject.query.filter_by(manager_id=current_user.manager.manager_id, project_id=sprint.project_id).first():
+        logger.info('Access denied', extra={'action': 'get_sprint', 'sprint_id': str(sprint_id)})
         flash('Unauthorized access.', 'danger')
         return redirect(url_for('dashboard.dashboard_page'))
     tasks = sprint.tasks
@@ -7,10 +7,14 @@ from models.models_models import db, RoleName
 from forms.subproject_forms import SubprojectForm
 from datetime import datetime
 import uuid
+import logging
+
+logger = logging.getLogger(__name__)
 
 @login_required
 def create_subproject(project_id):
     if current_user.role.role_name != RoleName.manager or not ManagerProject.query.filter_by(manager_id=current_user.manager.manager_id, project_id=project_id).first():
+        logger.info('Access denied', extra={'action': 'create_subproject', 'project_id': str(project_id)})
         flash('Only managers can create subprojects.', 'danger')
         return redirect(url_for('dashboard.dashboard_page'))
     project = Project.query.get_or_404(project_id)
@@ -25,6 +29,7 @@ def create_subproject(project_id):
         )
         db.session.add(subproject)
         db.session.commit()
+        logger.info('Subproject created', extra={'subproject_id': str(subproject.subproject_id), 'project_id': str(project_id)})
         flash('Subproject created successfully!', 'success')
         return redirect(url_for('project.get_project', project_id=project_id))
     return render_template('create_subproject.html', form=form, project=project)
@@ -33,6 +38,7 @@ def create_subproject(project_id):
 def get_subproject(subproject_id):
     subproject = Subproject.query.get_or_404(subproject_id)
     if current_user.role.role_name != RoleName.manager or not ManagerProject.query.filter_by(manager_id=current_user.manager.manager_id, project_id=subproject.project_id).first():
+        logger.info('Access denied', extra={'action': 'get_subproject', 'subproject_id': str(subproject_id)})
         flash('Unauthorized access.', 'danger')
         return redirect(url_for('dashboard.dashboard_page'))
     tasks = subproject.tasks
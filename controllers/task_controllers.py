@@ -5,8 +5,18 @@ from models.project_models import Project
 from models.manager_project_models import ManagerProject
 from models.models_models import db, RoleName
 from forms.task_forms import TaskForm
+from activity_logging import log_activity
+from time_tracking import add_work_logs
+from dependency_graph import dependency_graphs, add_dependency, remove_dependency, DependencyCycleError
+from task_hierarchy import task_tree, move_subtree, MAX_DEPTH
+from permissions import can_user_access_project
+from project_access import access_level
+from project_cache import as_uuid
 from datetime import datetime
 import uuid
+import logging
+
+logger = logging.getLogger(__name__)
 
 @login_required
 def create_task(project_id):
@@ -31,6 +41,7 @@ def create_task(project_id):
         )
         db.session.add(task)
         db.session.commit()
+        log_activity(current_user, 'task_created', 'task', task.task_id, {'project_id': str(project_id)})
         flash('Task created successfully!', 'success')
         return redirect(url_for('project.get_project', project_id=project_id))
     return render_template('create_task.html', form=form, project=project)
@@ -53,6 +64,7 @@ def update_task(task_id):
         task.assigned_to_id = form.assigned_to.data or None
         task.updated_at = datetime.utcnow()
         db.session.commit()
+        log_activity(current_user, 'task_updated', 'task', task.task_id, {'project_id': str(task.project_id)})
         flash('Task updated successfully!', 'success')
         return redirect(url_for('project.get_project', project_id=task.project_id))
     return render_template('edit_task.html', form=form, task=task)
@@ -66,6 +78,7 @@ def delete_task(task_id):
         return redirect(url_for('dashboard.dashboard_page'))
     db.session.delete(task)
     db.session.commit()
+    log_activity(current_user, 'task_deleted', 'task', task_id, {'project_id': str(project.project_id)})
     flash('Task deleted successfully!', 'success')
     return redirect(url_for('project.get_project', project_id=project.project_id))
 
@@ -89,11 +102,7 @@ def update_task_status(task_id):
     
     # For managers, check if they manage the project
     if user_role == 'manager':
-        manager_project = ManagerProject.query.filter_by(
-            manager_id=current_user.manager.manager_id, 
-            project_id=task.project_id
-        ).first()
-        if not manager_project:
+        if access_level(current_user.user_id, task.project_id) != 'manager':
             return jsonify({'error': 'You do not manage this project'}), 403
     
     data = request.get_json()
@@ -111,6 +120,7 @@ def update_task_status(task_id):
         task.status = new_status
         task.updated_at = datetime.utcnow()
         db.session.commit()
+        log_activity(current_user, 'task_status_changed', 'task', task_id, {'status': new_status})
         
         return jsonify({
             'success': True,
@@ -119,6 +129,7 @@ def update_task_status(task_id):
             'new_status': new_status
         })
     except Exception as e:
+        logger.exception('update_task_status failed')
         db.session.rollback()
         return jsonify({'error': 'Failed to update task status'}), 500
 
@@ -128,7 +139,6 @@ def get_project_tasks(project_id):
     project = Project.query.get_or_404(project_id)
     
     # Check if user has access to this project
-    from permissions import can_user_access_project
     if not can_user_access_project(current_user, project_id):
         return jsonify({'error': 'Access denied'}), 403
     
@@ -152,4 +162,192 @@ def get_project_tasks(project_id):
         
         return jsonify(tasks_data)
     except Exception as e:
-        return jsonify({'error': 'Failed to fetch tasks'}), 500
\ No newline at end of file
+        logger.exception('get_project_tasks failed')
+        return jsonify({'error': 'Failed to fetch tasks'}), 500
+
+def _can_log_work(task):
+    """Admins, the project's managers and the assigned developer may log time on a task"""
+    user_role = getattr(current_user, 'role_name', None)
+    if user_role == 'admin':
+        return True
+    if user_role == 'manager':
+        return access_level(current_user.user_id, task.project_id) == 'manager'
+    return user_role == 'developer' and str(task.assigned_to_id) == str(current_user.user_id)
+
+@login_required
+def log_task_work(task_id):
+    """API endpoint to log hours against a task (JSON or form body)"""
+    task = Task.query.get_or_404(task_id)
+    if not _can_log_work(task):
+        return jsonify({'error': 'You cannot log time on this task'}), 403
+
+    data = request.get_json(silent=True) or request.form
+    try:
+        log_ids = add_work_logs([{
+            'task_id': task_id,
+            'hours': data.get('hours'),
+            'description': data.get('description'),
+            'log_date': data.get('log_date')
+        }], user_id=current_user.user_id)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    log_activity(current_user, 'work_logged', 'task', task_id, {'hours': data.get('hours')})
+    db.session.refresh(task)
+    return jsonify({'success': True, 'log_id': str(log_ids[0]), 'logged_hours': task.logged_hours})
+
+@login_required
+def bulk_log_work():
+    """API endpoint to log many entries at once: {"entries": [{"task_id", "hours", ...}]}"""
+    data = request.get_json(silent=True) or {}
+    entries = data.get('entries')
+    if not isinstance(entries, list) or not entries:
+        return jsonify({'error': 'entries must be a non-empty list'}), 400
+
+    if not all(isinstance(entry, dict) for entry in entries):
+        return jsonify({'error': 'Every entry must be an object'}), 400
+
+    task_ids = set()
+    for entry in entries:
+        try:
+            task_ids.add(uuid.UUID(str(entry.get('task_id'))))
+        except (AttributeError, ValueError):
+            return jsonify({'error': 'Every entry needs a valid task_id'}), 400
+        # Time is always logged as the current user
+        entry.pop('user_id', None)
+
+    tasks = Task.query.filter(Task.task_id.in_(task_ids)).all()
+    if len(tasks) != len(task_ids):
+        return jsonify({'error': 'Unknown task in entries'}), 404
+    denied = [str(task.task_id) for task in tasks if not _can_log_work(task)]
+    if denied:
+        return jsonify({'error': 'You cannot log time on some tasks', 'task_ids': denied}), 403
+
+    try:
+        log_ids = add_work_logs(entries, user_id=current_user.user_id)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'success': True, 'log_ids': [str(log_id) for log_id in log_ids]})
+
+# Dependency graph endpoints
+def _can_manage_task(task):
+    """Admins and the project's managers may restructure a task (dependencies, hierarchy)"""
+    user_role = getattr(current_user, 'role_name', None)
+    if user_role == 'admin':
+        return True
+    return user_role == 'manager' and access_level(current_user.user_id, task.project_id) == 'manager'
+
+@login_required
+def add_task_dependency(task_id):
+    """API endpoint: {"depends_on_task_id": ..., "dependency_type": "blocks"}"""
+    task = Task.query.get_or_404(task_id)
+    if not _can_manage_task(task):
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    data = request.get_json(silent=True) or {}
+    dependency_type = data.get('dependency_type', 'blocks')
+    if dependency_type not in ['blocks', 'relates_to', 'duplicates']:
+        return jsonify({'error': 'Invalid dependency type'}), 400
+    try:
+        blocker = db.session.get(Task, as_uuid(data.get('depends_on_task_id')))
+    except (TypeError, AttributeError, ValueError):
+        return jsonify({'error': 'Invalid depends_on_task_id'}), 400
+    # The other end may live in another project; the caller must be able to see it
+    if blocker is not None and not can_user_access_project(current_user, blocker.project_id):
+        return jsonify({'error': 'Access denied'}), 403
+    try:
+        dependency = add_dependency(task_id, data.get('depends_on_task_id'), dependency_type)
+    except DependencyCycleError as e:
+        return jsonify({'error': str(e)}), 409
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    log_activity(current_user, 'dependency_added', 'task', task_id,
+                 {'depends_on_task_id': str(dependency.depends_on_task_id), 'type': dependency_type})
+    return jsonify({'success': True, 'dependency_id': str(dependency.dependency_id)}), 201
+
+@login_required
+def remove_task_dependency(task_id, dependency_id):
+    """API endpoint to delete a dependency edge"""
+    task = Task.query.get_or_404(task_id)
+    if not _can_manage_task(task):
+        return jsonify({'error': 'Unauthorized'}), 403
+    if not remove_dependency(dependency_id, task.task_id):
+        return jsonify({'error': 'Dependency not found'}), 404
+    log_activity(current_user, 'dependency_removed', 'task', task_id, {'dependency_id': str(dependency_id)})
+    return jsonify({'success': True})
+
+@login_required
+def get_task_blockers(task_id):
+    """API endpoint: direct and transitive blockers and dependents of a task"""
+    task = Task.query.get_or_404(task_id)
+    if not can_user_access_project(current_user, task.project_id):
+        return jsonify({'error': 'Access denied'}), 403
+
+    graph = dependency_graphs.get(task.project_id)
+    return jsonify({
+        'task_id': str(task_id),
+        'blocked_by': [str(blocker) for blocker in graph.blockers(task_id, transitive=False)],
+        'all_blockers': [str(blocker) for blocker in graph.blockers(task_id)],
+        'blocks': [str(dependent) for dependent in graph.dependents(task_id, transitive=False)],
+        'all_dependents': [str(dependent) for dependent in graph.dependents(task_id)]
+    })
+
+@login_required
+def get_dependency_graph(project_id):
+    """API endpoint: topological order and estimated_hours critical path for a project"""
+    Project.query.get_or_404(project_id)
+    if not can_user_access_project(current_user, project_id):
+        return jsonify({'error': 'Access denied'}), 403
+
+    graph = dependency_graphs.get(project_id)
+    cycles = graph.cycles()
+    if cycles:
+        return jsonify({'error': 'Dependency cycle detected', 'task_ids': [str(task) for task in cycles]}), 409
+
+    critical_path = graph.critical_path()
+    return jsonify({
+        'tasks': len(graph),
+        'dependencies': graph.edge_count,
+        'order': [str(task) for task in graph.topological_order()],
+        'critical_path': [str(task) for task in critical_path['task_ids']],
+        'critical_path_hours': critical_path['hours']
+    })
+
+# Subtask hierarchy endpoints
+@login_required
+def get_task_tree(task_id):
+    """API endpoint: a task's full subtree with hour and progress rollups (?depth=N)"""
+    task = Task.query.get_or_404(task_id)
+    if not can_user_access_project(current_user, task.project_id):
+        return jsonify({'error': 'Access denied'}), 403
+    depth = min(max(request.args.get('depth', MAX_DEPTH, type=int), 0), MAX_DEPTH)
+    return jsonify(task_tree(task_id, max_depth=depth))
+
+@login_required
+def move_task_subtree(task_id):
+    """API endpoint: {"parent_task_id": ... or null, "sprint_id": ..., "epic_id": ...}"""
+    task = Task.query.get_or_404(task_id)
+    if not _can_manage_task(task):
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    data = request.get_json(silent=True) or {}
+    try:
+        parent_id = uuid.UUID(data['parent_task_id']) if data.get('parent_task_id') else None
+        sprint_id = uuid.UUID(data['sprint_id']) if data.get('sprint_id') else None
+        epic_id = uuid.UUID(data['epic_id']) if data.get('epic_id') else None
+    except (TypeError, AttributeError, ValueError):
+        return jsonify({'error': 'Invalid id'}), 400
+
+    if parent_id is not None:
+        parent = Task.query.get_or_404(parent_id)
+        if not _can_manage_task(parent):
+            return jsonify({'error': 'Unauthorized for the target parent task'}), 403
+    try:
+        moved = move_subtree(task_id, new_parent_id=parent_id, sprint_id=sprint_id, epic_id=epic_id)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    log_activity(current_user, 'subtree_moved', 'task', task_id,
+                 {'parent_task_id': str(parent_id) if parent_id else None, 'tasks': moved})
+    return jsonify({'success': True, 'moved': moved})
@@ -13,6 +13,9 @@ from models.models_models import db, RoleName
 from forms.team_forms import TeamForm, TeamMembershipForm
 from datetime import datetime
 import uuid
+import logging
+
+logger = logging.getLogger(__name__)
 
 @login_required
 @require_permission('team_create')
@@ -28,6 +31,7 @@ def create_team():
         )
         db.session.add(team)
         db.session.commit()
+        logger.info('Team created', extra={'team_id': str(team.team_id)})
         flash('Team created successfully!', 'success')
         return redirect(url_for('team.teams'))
     return render_template('team_create.html', form=form)
@@ -63,6 +67,7 @@ def add_team_member(team_id):
         )
         db.session.add(developer_team)
         db.session.commit()
+        logger.info('Team member added', extra={'team_id': str(team_id), 'developer_id': str(form.developer_id.data)})
         flash('Developer added to team successfully!', 'success')
         return redirect(url_for('team.get_team', team_id=team_id))
     return render_template('team_add_member.html', form=form, team=team)
@@ -86,6 +91,7 @@ def update_team(team_id):
         team.description = form.description.data
         team.updated_at = datetime.utcnow()
         db.session.commit()
+        logger.info('Team updated', extra={'team_id': str(team_id)})
         flash('Team updated successfully!', 'success')
         return redirect(url_for('team.detail', team_id=team_id))
     
@@ -6,6 +6,9 @@ from models.models_models import db, RoleName
 from forms.ticket_forms import TicketForm
 from datetime import datetime
 import uuid
+import logging
+
+logger = logging.getLogger(__name__)
 
 @login_required
 @require_permission('ticket_create')
@@ -24,6 +27,7 @@ def create_ticket():
         )
         db.session.add(ticket)
         db.session.commit()
+        logger.info('Ticket created', extra={'ticket_id': str(ticket.ticket_id)})
         flash('Ticket created successfully!', 'success')
         return redirect(url_for('ticket.tickets'))
     return render_template('create_ticket.html', form=form)
@@ -60,6 +64,7 @@ def update_ticket(ticket_id):
         ticket.priority = form.priority.data
         ticket.updated_at = datetime.utcnow()
         db.session.commit()
+        logger.info('Ticket updated', extra={'ticket_id': str(ticket_id)})
         flash('Ticket updated successfully!', 'success')
         return redirect(url_for('ticket.tickets'))
     return render_template('edit_ticket.html', form=form, ticket=ticket)
\ No newline at end of file
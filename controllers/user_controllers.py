@@ -1,11 +1,14 @@
-from flask import render_template, redirect, url_for, flash, request, jsonify
+from flask import render_template, redirect, url_for, flash, request, jsonify, session
 from flask_login import login_required, current_user
 from permissions import require_permission, require_role
 from datetime import datetime
-from werkzeug.security import generate_password_hash
 from models.user_models import User
 from models.role_models import Role
 from extensions import db
+from session_store import session_store
+import logging
+
+logger = logging.getLogger(__name__)
 
 @login_required
 @require_permission('profile_edit')
@@ -37,15 +40,21 @@ def update_profile():
                 user.updated_at = datetime.utcnow()
                 
                 if password:
-                    user.password_hash = generate_password_hash(password)
+                    user.set_password(password)
                 
                 db.session.commit()
+                if password:
+                    # Sign out every other session; this one continues under a fresh token
+                    session_store.revoke_user(user.user_id)
+                    if session_store.enabled:
+                        session_store.rotate(session)
                 flash('Profile updated successfully!', 'success')
                 return redirect('/admin/users')
             else:
                 flash('User not found.', 'danger')
                 
         except Exception as e:
+            logger.exception('update_profile failed')
             db.session.rollback()
             flash(f'Error updating profile: {e}', 'danger')
     
@@ -91,6 +100,7 @@ def update_user(user_id):
             flash(f'User {user.username} updated successfully!', 'success')
             return redirect(f'/users/{user_id}')
         except Exception as e:
+            logger.exception('update_user failed')
             db.session.rollback()
             flash(f'Error updating user: {str(e)}', 'error')
     
@@ -125,6 +135,7 @@ def create_user():
             return redirect('/users/')
             
         except Exception as e:
+            logger.exception('create_user failed')
             db.session.rollback()
             flash(f'Error creating user: {str(e)}', 'error')
     
@@ -174,6 +185,7 @@ def get_users():
         return render_template('user_list.html', users=user_list, role_stats=role_stats)
         
     except Exception as e:
+        logger.exception('get_users failed')
         flash(f'Error loading users: {e}', 'danger')
         return render_template('user_list.html', users=[], role_stats={})
 
@@ -194,6 +206,7 @@ def approve_user():
             return jsonify({'success': False, 'message': 'User not found'})
         
     except Exception as e:
+        logger.exception('approve_user failed')
         db.session.rollback()
         return jsonify({'success': False, 'message': f'Error: {e}'})
 
@@ -216,5 +229,6 @@ def delete_user():
             return jsonify({'success': False, 'message': 'User not found'})
         
     except Exception as e:
+        logger.exception('delete_user failed')
         db.session.rollback()
         return jsonify({'success': False, 'message': f'Error: {e}'})
\ No newline at end of file
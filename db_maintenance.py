@@ -0,0 +1,513 @@
+"""
+Database maintenance jobs for the Jira Board Application
+VACUUM (ANALYZE), bloat and pg_stat usage reports and integrity checks run on a
+background worker; every run, its progress and its results are kept in maintenance_run
+"""
+
+import json
+import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import select, update, func, exists, and_, or_, inspect, text
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from extensions import db
+from models.maintenance_models import MaintenanceRun
+from project_cache import as_uuid
+
+logger = logging.getLogger(__name__)
+
+FINISHED = ('succeeded', 'failed')
+ACTIVE = ('queued', 'running')
+
+# The owning process refreshes heartbeat_at of its queued and running runs every
+# HEARTBEAT_INTERVAL seconds; one not refreshed for HEARTBEAT_TIMEOUT was abandoned
+HEARTBEAT_INTERVAL = 15
+HEARTBEAT_TIMEOUT = 120
+
+# Per-tuple overheads used by the bloat estimates (PostgreSQL heap and btree pages)
+HEAP_TUPLE_OVERHEAD = 28  # tuple header + line pointer
+INDEX_TUPLE_OVERHEAD = 16  # index tuple header + line pointer
+PAGE_HEADER = 24
+INDEX_FILLFACTOR = 0.9
+
+
+class ProgressReporter:
+    """Writes a run's status and progress to its maintenance_run row as the job advances"""
+
+    def __init__(self, run_id):
+        self.run_id = run_id
+
+    def _update(self, **values):
+        db.session.execute(update(MaintenanceRun).where(MaintenanceRun.run_id == self.run_id).values(**values))
+        db.session.commit()
+
+    def start(self):
+        now = datetime.utcnow()
+        self._update(status='running', started_at=now, heartbeat_at=now, message='Started')
+
+    def step(self, progress, message):
+        self._update(progress=max(0, min(int(progress), 99)), message=message[:255])
+
+    def finish(self, results, message):
+        self._update(status='succeeded', progress=100, message=message[:255], results=results,
+                     finished_at=datetime.utcnow())
+
+    def fail(self, error):
+        db.session.rollback()
+        self._update(status='failed', message='Failed', error=str(error), finished_at=datetime.utcnow())
+
+
+def _is_postgres(connection):
+    return connection.dialect.name == 'postgresql'
+
+
+def _existing_tables(connection, tables=None):
+    """Tables of the current schema, optionally restricted to the requested ones (unknown names are dropped)"""
+    names = inspect(connection).get_table_names()
+    return [name for name in names if not tables or name in tables]
+
+
+def _vacuum_targets(connection, limit):
+    """Tables with the most dead tuples, then those never analyzed"""
+    return connection.execute(text(
+        "SELECT relname FROM pg_stat_user_tables "
+        "WHERE n_dead_tup > 0 OR coalesce(last_analyze, last_autoanalyze) IS NULL "
+        "ORDER BY n_dead_tup DESC, relname LIMIT :limit"
+    ), {'limit': limit}).scalars().all()
+
+
+def _dead_tuples(connection, table):
+    return connection.execute(
+        text('SELECT n_dead_tup FROM pg_stat_user_tables WHERE relname = :table'), {'table': table}
+    ).scalar()
+
+
+def optimize(reporter, tables=None, config=None):
+    """VACUUM (ANALYZE) the requested tables, or the ones with the most dead tuples"""
+    config = config or {}
+    preparer = db.engine.dialect.identifier_preparer
+    results = {'tables': []}
+    # VACUUM cannot run inside a transaction block
+    with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        if not _is_postgres(connection):
+            reporter.step(10, 'ANALYZE')
+            connection.execute(text('ANALYZE'))
+            reporter.step(50, 'VACUUM')
+            started = time.perf_counter()
+            connection.execute(text('VACUUM'))
+            results['tables'].append({'table': '*', 'duration_ms': round((time.perf_counter() - started) * 1000)})
+            results['summary'] = {'tables_vacuumed': 1}
+            return results
+
+        requested = tables or config.get('MAINTENANCE_VACUUM_TABLES')
+        targets = (_existing_tables(connection, requested) if requested
+                   else _vacuum_targets(connection, config.get('MAINTENANCE_VACUUM_LIMIT', 20)))
+        for position, table in enumerate(targets):
+            reporter.step(100 * position / len(targets), f'VACUUM (ANALYZE) {table}')
+            before = _dead_tuples(connection, table)
+            started = time.perf_counter()
+            connection.execute(text(f'VACUUM (ANALYZE) {preparer.quote(table)}'))
+            results['tables'].append({
+                'table': table,
+                'dead_tuples_before': before,
+                'dead_tuples_after': _dead_tuples(connection, table),
+                'duration_ms': round((time.perf_counter() - started) * 1000)
+            })
+    results['summary'] = {
+        'tables_vacuumed': len(results['tables']),
+        'dead_tuples_before': sum(item['dead_tuples_before'] or 0 for item in results['tables'])
+    }
+    return results
+
+
+def _table_bloat(connection, tables):
+    """Estimated heap bloat from pg_class page counts versus rows times average row width"""
+    rows = connection.execute(text(
+        "SELECT c.relname, c.reltuples, c.relpages, current_setting('block_size')::int AS block_size, "
+        "       coalesce((SELECT sum(s.avg_width) FROM pg_stats s "
+        "                 WHERE s.schemaname = n.nspname AND s.tablename = c.relname), 0) AS row_width "
+        "FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE c.relkind = 'r' AND n.nspname = current_schema()"
+    )).all()
+    estimates = []
+    for row in rows:
+        if tables and row.relname not in tables:
+            continue
+        usable = row.block_size - PAGE_HEADER
+        expected_pages = math.ceil(max(row.reltuples, 0) * (row.row_width + HEAP_TUPLE_OVERHEAD) / usable)
+        bloat_pages = max(row.relpages - expected_pages, 0)
+        estimates.append({
+            'table': row.relname,
+            'size_bytes': row.relpages * row.block_size,
+            'bloat_bytes': bloat_pages * row.block_size,
+            'bloat_ratio': round(bloat_pages / row.relpages, 3) if row.relpages else 0.0
+        })
+    return sorted(estimates, key=lambda item: -item['bloat_bytes'])
+
+
+def _index_bloat(connection, tables):
+    """Estimated btree bloat from index pages versus rows times the indexed columns' average width"""
+    rows = connection.execute(text(
+        "SELECT t.relname AS table_name, ic.relname AS index_name, ic.reltuples, ic.relpages, "
+        "       current_setting('block_size')::int AS block_size, "
+        "       coalesce((SELECT sum(s.avg_width) FROM pg_attribute a "
+        "                 JOIN pg_stats s ON s.schemaname = n.nspname AND s.tablename = t.relname "
+        "                                AND s.attname = a.attname "
+        "                 WHERE a.attrelid = t.oid AND a.attnum = ANY (i.indkey)), 0) AS key_width "
+        "FROM pg_index i "
+        "JOIN pg_class ic ON ic.oid = i.indexrelid "
+        "JOIN pg_class t ON t.oid = i.indrelid "
+        "JOIN pg_namespace n ON n.oid = t.relnamespace "
+        "JOIN pg_am am ON am.oid = ic.relam "
+        "WHERE n.nspname = current_schema() AND am.amname = 'btree'"
+    )).all()
+    estimates = []
+    for row in rows:
+        if tables and row.table_name not in tables:
+            continue
+        usable = (row.block_size - PAGE_HEADER) * INDEX_FILLFACTOR
+        expected_pages = math.ceil(max(row.reltuples, 0) * (row.key_width + INDEX_TUPLE_OVERHEAD) / usable) + 1
+        bloat_pages = max(row.relpages - expected_pages, 0)
+        estimates.append({
+            'table': row.table_name,
+            'index': row.index_name,
+            'size_bytes': row.relpages * row.block_size,
+            'bloat_bytes': bloat_pages * row.block_size,
+            'bloat_ratio': round(bloat_pages / row.relpages, 3) if row.relpages else 0.0
+        })
+    return sorted(estimates, key=lambda item: -item['bloat_bytes'])
+
+
+def _unused_indexes(connection, tables):
+    rows = connection.execute(text(
+        "SELECT s.relname, s.indexrelname, s.idx_scan, pg_relation_size(s.indexrelid) AS size_bytes "
+        "FROM pg_stat_user_indexes s JOIN pg_index i ON i.indexrelid = s.indexrelid "
+        "WHERE s.idx_scan = 0 AND NOT i.indisunique AND NOT i.indisprimary "
+        "ORDER BY size_bytes DESC"
+    )).all()
+    return [{'table': row.relname, 'index': row.indexrelname, 'size_bytes': row.size_bytes}
+            for row in rows if not tables or row.relname in tables]
+
+
+def _table_usage(connection, tables):
+    rows = connection.execute(text(
+        "SELECT relname, n_live_tup, n_dead_tup, seq_scan, seq_tup_read, coalesce(idx_scan, 0) AS idx_scan, "
+        "       greatest(last_vacuum, last_autovacuum) AS last_vacuum, "
+        "       greatest(last_analyze, last_autoanalyze) AS last_analyze, "
+        "       pg_total_relation_size(relid) AS total_bytes "
+        "FROM pg_stat_user_tables ORDER BY seq_tup_read DESC"
+    )).all()
+    return [{
+        'table': row.relname,
+        'live_tuples': row.n_live_tup,
+        'dead_tuples': row.n_dead_tup,
+        'seq_scans': row.seq_scan,
+        'seq_tuples_read': row.seq_tup_read,
+        'index_scans': row.idx_scan,
+        'last_vacuum': row.last_vacuum.isoformat() if row.last_vacuum else None,
+        'last_analyze': row.last_analyze.isoformat() if row.last_analyze else None,
+        'total_bytes': row.total_bytes
+    } for row in rows if not tables or row.relname in tables]
+
+
+def analyze(reporter, tables=None, config=None):
+    """Table/index bloat estimates, unused indexes and sequential scan statistics"""
+    with db.engine.connect() as connection:
+        if not _is_postgres(connection):
+            names = _existing_tables(connection, tables)
+            preparer = connection.dialect.identifier_preparer
+            counts = []
+            for position, table in enumerate(names):
+                reporter.step(100 * position / max(len(names), 1), f'Counting {table}')
+                counts.append({'table': table, 'live_tuples': connection.execute(
+                    text(f'SELECT count(*) FROM {preparer.quote(table)}')).scalar()})
+            return {'tables': counts, 'summary': {'tables': len(counts)}}
+
+        reporter.step(5, 'Table statistics')
+        usage = _table_usage(connection, tables)
+        reporter.step(30, 'Table bloat')
+        table_bloat = _table_bloat(connection, tables)
+        reporter.step(55, 'Index bloat')
+        index_bloat = _index_bloat(connection, tables)
+        reporter.step(80, 'Unused indexes')
+        unused = _unused_indexes(connection, tables)
+        stats_reset = connection.execute(text(
+            'SELECT stats_reset FROM pg_stat_database WHERE datname = current_database()')).scalar()
+
+    seq_heavy = [item for item in usage if item['seq_scans'] > item['index_scans'] and item['live_tuples'] > 1000]
+    return {
+        'stats_since': stats_reset.isoformat() if stats_reset else None,
+        'tables': usage,
+        'table_bloat': table_bloat[:25],
+        'index_bloat': index_bloat[:25],
+        'unused_indexes': unused,
+        'sequential_scans': seq_heavy[:25],
+        'summary': {
+            'table_bloat_bytes': sum(item['bloat_bytes'] for item in table_bloat),
+            'index_bloat_bytes': sum(item['bloat_bytes'] for item in index_bloat),
+            'unused_index_bytes': sum(item['size_bytes'] for item in unused),
+            'unused_indexes': len(unused),
+            'seq_scan_heavy_tables': len(seq_heavy)
+        }
+    }
+
+
+def _orphan_checks(tables):
+    """(name, table, statement) counting child rows whose foreign key matches no parent row, per model foreign key"""
+    from schema_migrations import load_all_models
+
+    load_all_models()
+    checks = []
+    for table in db.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        for constraint in table.foreign_key_constraints:
+            parent = constraint.referred_table
+            if parent.name not in tables:
+                continue
+            pairs = [(element.parent, element.column) for element in constraint.elements]
+            child_columns = ', '.join(child.name for child, _ in pairs)
+            statement = (
+                select(func.count()).select_from(table)
+                .where(*[child.isnot(None) for child, _ in pairs])
+                .where(~exists().where(and_(*[referred == child for child, referred in pairs])))
+            )
+            checks.append((f'{table.name}({child_columns}) -> {parent.name}', table.name, statement))
+    return checks
+
+
+def integrity(reporter, tables=None, config=None):
+    """Orphaned foreign keys, tasks assigned to inactive users and unvalidated constraints"""
+    from models.task_models import Task
+    from models.user_models import User
+
+    with db.engine.connect() as connection:
+        existing = set(_existing_tables(connection))
+        wanted = {name for name in existing if not tables or name in tables}
+        checks = _orphan_checks(wanted)
+        found = []
+        for position, (name, table, statement) in enumerate(checks):
+            reporter.step(90 * position / max(len(checks), 1), f'Checking {name}')
+            count = connection.execute(statement).scalar()
+            found.append({'check': 'orphaned_rows', 'name': name, 'table': table, 'count': count})
+
+        if {'task', 'user'} <= wanted:
+            reporter.step(92, 'Tasks assigned to inactive users')
+            count = connection.execute(
+                select(func.count()).select_from(Task)
+                .join(User, Task.assigned_to_id == User.user_id)
+                .where(User.is_approved.is_(False))
+            ).scalar()
+            found.append({'check': 'inactive_assignee', 'name': 'task.assigned_to_id -> inactive user',
+                          'table': 'task', 'count': count})
+
+        if _is_postgres(connection):
+            reporter.step(96, 'Unvalidated constraints')
+            for row in connection.execute(text(
+                    "SELECT conrelid::regclass::text AS table_name, conname FROM pg_constraint "
+                    "WHERE NOT convalidated AND connamespace = current_schema()::regnamespace")):
+                found.append({'check': 'not_validated', 'name': row.conname, 'table': row.table_name, 'count': 1})
+
+    issues = [item for item in found if item['count']]
+    return {'checks': found, 'issues': issues,
+            'summary': {'checks': len(found), 'issues': len(issues),
+                        'affected_rows': sum(item['count'] for item in issues)}}
+
+
+def fail_abandoned(timeout=None, now=None):
+    """
+    Mark queued or running runs whose heartbeat stopped (worker restarted or crashed) as failed
+
+    Returns:
+        int: Number of runs marked failed
+    """
+    now = now or datetime.utcnow()
+    if timeout is None:
+        timeout = current_app.config.get('MAINTENANCE_HEARTBEAT_TIMEOUT', HEARTBEAT_TIMEOUT)
+    cutoff = now - timedelta(seconds=timeout)
+    result = db.session.execute(
+        update(MaintenanceRun)
+        .where(MaintenanceRun.status.in_(ACTIVE),
+               or_(MaintenanceRun.heartbeat_at < cutoff,
+                   and_(MaintenanceRun.heartbeat_at.is_(None), MaintenanceRun.created_at < cutoff)))
+        .values(status='failed', message='Abandoned', error='The worker running this job stopped',
+                finished_at=now)
+    )
+    db.session.commit()
+    if result.rowcount:
+        logger.warning('Abandoned maintenance runs marked failed', extra={'runs': result.rowcount})
+    return result.rowcount
+
+
+def _active_run_id(kind):
+    return db.session.execute(
+        select(MaintenanceRun.run_id).where(MaintenanceRun.kind == kind, MaintenanceRun.status.in_(ACTIVE))
+    ).scalar()
+
+
+JOBS = {
+    'optimize': optimize,
+    'analyze': analyze,
+    'integrity': integrity
+}
+
+
+def _finished_message(kind, summary):
+    if kind == 'optimize':
+        return f"Vacuumed and analyzed {summary['tables_vacuumed']} tables"
+    if kind == 'integrity':
+        return f"{summary['issues']} issues found" if summary['issues'] else 'No integrity issues found'
+    return 'Analysis complete'
+
+
+class MaintenanceJobs:
+    """
+    One background worker running maintenance jobs in submission order
+
+    Usage:
+        run_id, started = maintenance_jobs.submit('analyze', requested_by=current_user.user_id)
+
+    A kind that is already queued or running in any process is not started
+    twice; its run id is returned instead. A heartbeat thread keeps this
+    process's runs from being taken for abandoned ones.
+    """
+
+    def __init__(self):
+        self.app = None
+        self._executor = None
+        self._heartbeat = None
+        self._stopping = threading.Event()
+        self._active = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['db_maintenance'] = self
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='db-maintenance')
+            self._stopping.clear()
+            self._heartbeat = threading.Thread(target=self._beat, name='db-maintenance-heartbeat', daemon=True)
+            self._heartbeat.start()
+        return self._executor
+
+    def _beat(self):
+        interval = self.app.config.get('MAINTENANCE_HEARTBEAT_INTERVAL', HEARTBEAT_INTERVAL)
+        table = MaintenanceRun.__table__
+        while not self._stopping.wait(interval):
+            with self._lock:
+                run_ids = list(self._active.values())
+            if not run_ids:
+                continue
+            try:
+                with self.app.app_context(), db.engine.begin() as connection:
+                    connection.execute(update(table).where(table.c.run_id.in_(run_ids), table.c.status.in_(ACTIVE))
+                                       .values(heartbeat_at=datetime.utcnow()))
+            except SQLAlchemyError:
+                logger.warning('Maintenance heartbeat failed', exc_info=True)
+
+    def submit(self, kind, requested_by=None, tables=None):
+        """
+        Queue a job
+
+        Returns:
+            tuple: (run_id, started) where started is False if the kind was already active
+        """
+        if kind not in JOBS:
+            raise ValueError(f'Unknown maintenance job {kind!r}')
+        with self._lock:
+            fail_abandoned()
+            active = _active_run_id(kind)
+            if active is not None:
+                return active, False
+            run = MaintenanceRun(kind=kind, message='Queued', heartbeat_at=datetime.utcnow(),
+                                 requested_by_id=as_uuid(requested_by) if requested_by else None)
+            db.session.add(run)
+            try:
+                db.session.commit()
+            except IntegrityError:
+                # Another process queued this kind between the check and the insert
+                db.session.rollback()
+                return _active_run_id(kind), False
+            self._active[kind] = run.run_id
+        self._pool().submit(self._run, run.run_id, kind, list(tables or ()))
+        return run.run_id, True
+
+    def _run(self, run_id, kind, tables):
+        with self.app.app_context():
+            reporter = ProgressReporter(run_id)
+            try:
+                reporter.start()
+                results = JOBS[kind](reporter, tables or None, self.app.config)
+                reporter.finish(results, _finished_message(kind, results.get('summary', {})))
+                logger.info('Maintenance job finished', extra={'job_id': str(run_id), 'kind': kind,
+                                                               'summary': results.get('summary')})
+            except Exception as e:
+                logger.exception('Maintenance job %s failed', kind)
+                reporter.fail(e)
+            finally:
+                with self._lock:
+                    self._active.pop(kind, None)
+                db.session.remove()
+
+    def shutdown(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+            self._stopping.set()
+
+
+maintenance_jobs = MaintenanceJobs()
+
+
+def get_run(run_id):
+    try:
+        return db.session.get(MaintenanceRun, as_uuid(run_id))
+    except (TypeError, ValueError):
+        return None
+
+
+def run_history(kind=None, limit=30):
+    """Most recent runs (newest first) with their summaries, for trend display"""
+    stmt = select(MaintenanceRun).order_by(MaintenanceRun.created_at.desc()).limit(limit)
+    if kind:
+        stmt = stmt.where(MaintenanceRun.kind == kind)
+    return [{**run.to_dict(), 'results': (run.results or {}).get('summary')}
+            for run in db.session.execute(stmt).scalars()]
+
+
+def progress_events(run_id, interval=1.0):
+    """
+    Server-sent events for a run: one event per progress change, the last one with results
+
+    Reads the maintenance_run row, so any worker process can stream any run. A
+    run whose heartbeat stops is marked failed, which ends the stream.
+    """
+    timeout = current_app.config.get('MAINTENANCE_HEARTBEAT_TIMEOUT', HEARTBEAT_TIMEOUT)
+    last = None
+    while True:
+        run = db.session.get(MaintenanceRun, run_id, populate_existing=True)
+        if run is None:
+            yield f"event: error\ndata: {json.dumps({'error': 'Job not found'})}\n\n"
+            return
+        state = run.to_dict()
+        if run.status not in FINISHED:
+            state.pop('results')
+        if state != last:
+            yield f'data: {json.dumps(state, default=str)}\n\n'
+            last = state
+        if run.status in FINISHED:
+            return
+        # End the read transaction so the next poll sees the worker's commits
+        db.session.rollback()
+        if (run.heartbeat_at or run.created_at) < datetime.utcnow() - timedelta(seconds=timeout):
+            fail_abandoned(timeout)
+            continue
+        time.sleep(interval)
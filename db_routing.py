@@ -0,0 +1,216 @@
+"""
+Primary/replica database routing for the Jira Board Application
+Replicas are extra SQLAlchemy binds; plain SELECTs issued while serving a
+read-only endpoint go to one of them, everything else goes to the primary
+"""
+
+import random
+import re
+import time
+import weakref
+from contextlib import contextmanager
+
+import click
+from flask import g, request, session as flask_session, has_app_context
+from sqlalchemy import Select, TextClause, event, text
+from sqlalchemy.engine import Engine
+from flask_sqlalchemy.session import Session
+
+REPLICA_PREFIX = 'replica_'
+STICKY_KEY = '_db_primary_until'
+
+_READ_SQL = re.compile(r'^\s*(SELECT|WITH)\b', re.I)
+_MODIFIES_SQL = re.compile(r'\b(INSERT|UPDATE|DELETE|MERGE)\b|\bFOR\s+(NO\s+KEY\s+)?(UPDATE|SHARE)\b', re.I)
+# Transaction control and session settings never count as a write
+_CONTROL_SQL = re.compile(r'^\s*(BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE|SET|SHOW|PRAGMA|EXPLAIN)\b', re.I)
+
+# Connection -> session that opened it, to notice writes made through session.connection()
+_connection_sessions = weakref.WeakKeyDictionary()
+
+
+def _reads_only(sql):
+    """A SELECT (or WITH ... SELECT) that neither modifies nor locks rows"""
+    return bool(_READ_SQL.match(sql)) and not _MODIFIES_SQL.search(sql)
+
+
+def _pool_options(config, url):
+    """Engine pool options for one database URL"""
+    options = {'pool_pre_ping': config.get('DATABASE_POOL_PRE_PING', True)}
+    if not url.startswith('sqlite'):
+        options.update(
+            pool_size=config.get('DATABASE_POOL_SIZE', 10),
+            max_overflow=config.get('DATABASE_MAX_OVERFLOW', 20),
+            pool_timeout=config.get('DATABASE_POOL_TIMEOUT', 30),
+            pool_recycle=config.get('DATABASE_POOL_RECYCLE', 1800)
+        )
+    return options
+
+
+class RoutingSession(Session):
+    """
+    Session that reads from a replica when one has been chosen for it
+
+    A replica is used only for SELECTs (including read-only text() queries)
+    without FOR UPDATE, outside a flush, and only until the session writes;
+    after that it reads its own writes from the primary for the rest of the
+    request. A write is noted when the SQL is executed, so asking for a
+    connection or running a read through text() does not count as one.
+    """
+
+    def _replica_key(self):
+        key = self.info.get('replica')
+        if key is None and has_app_context():
+            key = g.get('db_replica')
+        return key
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        engines = self._db.engines
+        if bind is not None or engine is not engines.get(None):
+            return engine
+
+        if isinstance(clause, Select):
+            is_read = clause._for_update_arg is None
+        else:
+            is_read = isinstance(clause, TextClause) and _reads_only(clause.text)
+        if not is_read or self._flushing:
+            return engine
+
+        key = self._replica_key()
+        if key is None or self.info.get('db_wrote'):
+            return engine
+        return engines.get(key, engine)
+
+
+@event.listens_for(RoutingSession, 'after_begin')
+def _track_connection(session, transaction, connection):
+    _connection_sessions[connection] = session
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _note_write(connection, cursor, statement, parameters, context, executemany):
+    """Mark the owning session as having written once it runs anything but a plain read"""
+    session = _connection_sessions.get(connection)
+    if session is not None and not _reads_only(statement) and not _CONTROL_SQL.match(statement):
+        session.info['db_wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _stick_to_primary(session):
+    """A user who committed a write keeps reading from the primary for a while"""
+    if session.info.get('db_wrote') and has_app_context():
+        g.db_sticky = True
+
+
+@contextmanager
+def replica_reads(replica=None):
+    """
+    Route this session's reads to a replica, e.g. for background analytics
+
+    Usage:
+        with replica_reads():
+            rows = db.session.execute(select(...)).all()
+    """
+    from extensions import db
+
+    keys = db_router.replica_keys()
+    previous = db.session.info.get('replica')
+    db.session.info['replica'] = replica or (random.choice(keys) if keys else None)
+    try:
+        yield
+    finally:
+        db.session.info['replica'] = previous
+
+
+class DatabaseRouter:
+    """
+    Builds the replica binds and pool options and picks a replica per request
+
+    Config keys: DATABASE_REPLICA_URIS, DATABASE_REPLICA_ENDPOINTS (endpoint
+    names or 'blueprint.' prefixes served from a replica on GET/HEAD),
+    DATABASE_STICKY_SECONDS and DATABASE_POOL_* pool settings.
+
+    Locally, point DATABASE_REPLICA_URIS at a second SQLite file (e.g. a copy
+    of the primary) to exercise the routing without a replicated server.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.endpoints = ()
+        self.sticky_seconds = 10
+
+    def init_app(self, app):
+        """Call before db.init_app(app) so the binds exist when engines are created"""
+        self.app = app
+        config = app.config
+        self.endpoints = tuple(config.get('DATABASE_REPLICA_ENDPOINTS', ()))
+        self.sticky_seconds = config.get('DATABASE_STICKY_SECONDS', self.sticky_seconds)
+
+        config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            **_pool_options(config, config['SQLALCHEMY_DATABASE_URI']),
+            **config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+        }
+        binds = dict(config.get('SQLALCHEMY_BINDS') or {})
+        for index, url in enumerate(config.get('DATABASE_REPLICA_URIS', ())):
+            binds[f'{REPLICA_PREFIX}{index}'] = {'url': url, **_pool_options(config, url)}
+        config['SQLALCHEMY_BINDS'] = binds
+        app.extensions['db_router'] = self
+
+        app.before_request(self._choose_bind)
+        app.after_request(self._remember_write)
+
+    def replica_keys(self):
+        if self.app is None:
+            return []
+        return [key for key in self.app.config.get('SQLALCHEMY_BINDS', {}) if key.startswith(REPLICA_PREFIX)]
+
+    def _is_read_only_endpoint(self):
+        endpoint = request.endpoint or ''
+        return request.method in ('GET', 'HEAD') and any(
+            endpoint == name or (name.endswith('.') and endpoint.startswith(name)) for name in self.endpoints
+        )
+
+    def _choose_bind(self):
+        from extensions import db
+
+        g.db_replica = None
+        db.session.info.pop('db_wrote', None)
+        keys = self.replica_keys()
+        if not keys or not self._is_read_only_endpoint():
+            return
+        if flask_session.get(STICKY_KEY, 0) > time.time():
+            return
+        g.db_replica = random.choice(keys)
+
+    def _remember_write(self, response):
+        if g.get('db_sticky'):
+            flask_session[STICKY_KEY] = time.time() + self.sticky_seconds
+        return response
+
+
+db_router = DatabaseRouter()
+
+
+def register_replica_commands(app):
+    """Register `flask replicas status`"""
+
+    @app.cli.group('replicas')
+    def replicas_cli():
+        """Primary/replica databases"""
+
+    @replicas_cli.command('status')
+    def status_command():
+        """Ping the primary and every replica and show their pool state"""
+        from extensions import db
+
+        for key in [None] + db_router.replica_keys():
+            engine = db.engines[key]
+            started = time.perf_counter()
+            try:
+                with engine.connect() as connection:
+                    connection.execute(text('SELECT 1'))
+                state = f'ok {1000 * (time.perf_counter() - started):.1f}ms'
+            except Exception as e:
+                state = f'unreachable ({e.__class__.__name__})'
+            click.echo(f"{key or 'primary'}: {engine.url.render_as_string(hide_password=True)} {state} "
+                       f"pool={engine.pool.status()}")
@@ -0,0 +1,293 @@
+"""
+Per-project task dependency graph for the Jira Board Application
+Loads a project's 'blocks' edges once into integer-indexed adjacency arrays
+and answers blocker, cycle, ordering and critical path queries in memory
+"""
+
+from array import array
+from collections import deque
+
+from sqlalchemy import event, select, inspect
+from sqlalchemy.orm import Session, aliased
+
+from extensions import db
+from project_cache import ProjectCache, as_uuid, record_task_writes
+from models.project_models import Project
+from models.task_models import Task, TaskDependency
+
+# Only 'blocks' edges constrain ordering; relates_to/duplicates are informational
+ORDERING_TYPES = ('blocks',)
+
+
+class DependencyCycleError(ValueError):
+    """Raised when a new dependency would close a cycle"""
+
+
+def _csr(edge_count, node_count, pairs):
+    """Compressed adjacency: neighbours of i are targets[offsets[i]:offsets[i + 1]]"""
+    offsets = array('l', [0] * (node_count + 1))
+    for source, _ in pairs:
+        offsets[source + 1] += 1
+    for i in range(node_count):
+        offsets[i + 1] += offsets[i]
+    targets = array('l', [0] * edge_count)
+    cursor = array('l', offsets[:-1])
+    for source, target in pairs:
+        targets[cursor[source]] = target
+        cursor[source] += 1
+    return offsets, targets
+
+
+class DependencyGraph:
+    """
+    Immutable snapshot of one project's dependency graph
+
+    Node i is task_ids[i]. `depends_on` edges point from a task to the tasks
+    that block it; `blocks` edges point the other way.
+    """
+
+    def __init__(self, project_id, tasks, edges):
+        self.project_id = project_id
+        self.task_ids = [task_id for task_id, _ in tasks]
+        self.index = {task_id: i for i, task_id in enumerate(self.task_ids)}
+        self.hours = array('d', [float(hours or 0.0) for _, hours in tasks])
+
+        pairs = [(self.index[task_id], self.index[blocker_id]) for task_id, blocker_id in edges
+                 if task_id in self.index and blocker_id in self.index]
+        self.edge_count = len(pairs)
+        self._dep_offsets, self._dep_targets = _csr(len(pairs), len(self.task_ids), pairs)
+        self._blk_offsets, self._blk_targets = _csr(len(pairs), len(self.task_ids), [(b, a) for a, b in pairs])
+
+    def __len__(self):
+        return len(self.task_ids)
+
+    def _depends_on(self, i):
+        return self._dep_targets[self._dep_offsets[i]:self._dep_offsets[i + 1]]
+
+    def _blocks(self, i):
+        return self._blk_targets[self._blk_offsets[i]:self._blk_offsets[i + 1]]
+
+    def _reach(self, start, neighbours):
+        seen = bytearray(len(self.task_ids))
+        stack = list(neighbours(start))
+        found = []
+        while stack:
+            node = stack.pop()
+            if seen[node]:
+                continue
+            seen[node] = 1
+            found.append(node)
+            stack.extend(neighbours(node))
+        return found
+
+    def blockers(self, task_id, transitive=True):
+        """Tasks that must finish before `task_id` (direct blockers only when transitive=False)"""
+        i = self.index.get(task_id)
+        if i is None:
+            return []
+        nodes = self._reach(i, self._depends_on) if transitive else self._depends_on(i)
+        return [self.task_ids[node] for node in nodes]
+
+    def dependents(self, task_id, transitive=True):
+        """Tasks waiting on `task_id`"""
+        i = self.index.get(task_id)
+        if i is None:
+            return []
+        nodes = self._reach(i, self._blocks) if transitive else self._blocks(i)
+        return [self.task_ids[node] for node in nodes]
+
+    def would_create_cycle(self, task_id, depends_on_task_id):
+        """True if making `task_id` depend on `depends_on_task_id` closes a cycle"""
+        if task_id == depends_on_task_id:
+            return True
+        source, target = self.index.get(task_id), self.index.get(depends_on_task_id)
+        if source is None or target is None:
+            return False
+        # A cycle exists if task_id already (transitively) blocks depends_on_task_id
+        seen = bytearray(len(self.task_ids))
+        stack = [target]
+        while stack:
+            node = stack.pop()
+            if node == source:
+                return True
+            if seen[node]:
+                continue
+            seen[node] = 1
+            stack.extend(self._depends_on(node))
+        return False
+
+    def _kahn(self):
+        """Topological order of node indexes (blockers first) plus nodes left on cycles"""
+        remaining = array('l', [self._dep_offsets[i + 1] - self._dep_offsets[i] for i in range(len(self.task_ids))])
+        ready = deque(i for i, count in enumerate(remaining) if count == 0)
+        order = []
+        while ready:
+            node = ready.popleft()
+            order.append(node)
+            for dependent in self._blocks(node):
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        cyclic = [i for i, count in enumerate(remaining) if count > 0]
+        return order, cyclic
+
+    def topological_order(self):
+        """
+        Task ids with every blocker before the tasks it blocks
+
+        Raises:
+            DependencyCycleError: If existing data already contains a cycle
+        """
+        order, cyclic = self._kahn()
+        if cyclic:
+            raise DependencyCycleError(f'{len(cyclic)} tasks are part of a dependency cycle')
+        return [self.task_ids[i] for i in order]
+
+    def cycles(self):
+        """Task ids that sit on (or behind) a cycle; empty for a valid DAG"""
+        return [self.task_ids[i] for i in self._kahn()[1]]
+
+    def critical_path(self):
+        """
+        Longest chain of blocking tasks weighted by estimated_hours
+
+        Returns:
+            dict: {'task_ids': [...] in execution order, 'hours': total}
+        """
+        order, cyclic = self._kahn()
+        if cyclic:
+            raise DependencyCycleError(f'{len(cyclic)} tasks are part of a dependency cycle')
+        if not order:
+            return {'task_ids': [], 'hours': 0.0}
+
+        finish = array('d', self.hours)
+        previous = array('l', [-1] * len(self.task_ids))
+        for node in order:
+            for blocker in self._depends_on(node):
+                if finish[blocker] + self.hours[node] > finish[node]:
+                    finish[node] = finish[blocker] + self.hours[node]
+                    previous[node] = blocker
+
+        end = max(range(len(finish)), key=finish.__getitem__)
+        path = []
+        node = end
+        while node != -1:
+            path.append(self.task_ids[node])
+            node = previous[node]
+        path.reverse()
+        return {'task_ids': path, 'hours': round(finish[end], 2)}
+
+
+def load_graph(project_id):
+    """Build a graph from one query for the project's tasks and one for its edges"""
+    tasks = db.session.execute(
+        select(Task.task_id, Task.estimated_hours).where(Task.project_id == project_id).order_by(Task.created_at)
+    ).all()
+    blocker = aliased(Task)
+    edges = db.session.execute(
+        select(TaskDependency.task_id, TaskDependency.depends_on_task_id)
+        .join(Task, Task.task_id == TaskDependency.task_id)
+        .join(blocker, blocker.task_id == TaskDependency.depends_on_task_id)
+        .where(Task.project_id == project_id,
+               blocker.project_id == project_id,
+               TaskDependency.dependency_type.in_(ORDERING_TYPES))
+    ).all()
+    return DependencyGraph(project_id, tasks, edges)
+
+
+# Invalidated by the session listeners below whenever a dependency or a task's estimate changes
+dependency_graphs = ProjectCache(load_graph, 'DEPENDENCY_GRAPH')
+
+
+def _graph_fields_changed(task):
+    attrs = inspect(task).attrs
+    return attrs.estimated_hours.history.has_changes() or attrs.project_id.history.has_changes()
+
+
+def _invalidate(projects, task_ids):
+    for project_id in projects:
+        if project_id is not None:
+            dependency_graphs.invalidate(project_id)
+    if task_ids:
+        dependency_graphs.invalidate_where(lambda graph: any(task_id in graph.index for task_id in task_ids))
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_dependency_graph_writes(session, flush_context):
+    """
+    Drop graphs touched by dependency writes or task estimate/project changes
+
+    They are dropped again when the transaction ends: a graph rebuilt before
+    the commit holds the old edges (or, in this session, uncommitted ones).
+    """
+    projects = session.info.setdefault('dependency_graph_projects', set())
+    task_ids = session.info.setdefault('dependency_graph_tasks', set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, TaskDependency):
+            task_ids.update((obj.task_id, obj.depends_on_task_id))
+        elif isinstance(obj, Task):
+            if obj in session.new:
+                projects.add(obj.project_id)
+            elif obj in session.deleted or _graph_fields_changed(obj):
+                task_ids.add(obj.task_id)
+                projects.add(obj.project_id)
+    _invalidate(projects, task_ids)
+
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_rollback')
+def _invalidate_dependency_graphs(session):
+    """Drop the graphs written in the transaction that just ended, whether it committed or not"""
+    projects = session.info.pop('dependency_graph_projects', ())
+    task_ids = session.info.pop('dependency_graph_tasks', ())
+    _invalidate(projects, task_ids)
+
+
+def add_dependency(task_id, depends_on_task_id, dependency_type='blocks'):
+    """
+    Record that `task_id` depends on `depends_on_task_id`
+
+    Raises:
+        DependencyCycleError: If a 'blocks' edge would create a cycle
+        ValueError: If either task is missing or the edge already exists
+    """
+    task_id, depends_on_task_id = as_uuid(task_id), as_uuid(depends_on_task_id)
+    task = db.session.get(Task, task_id)
+    blocker = db.session.get(Task, depends_on_task_id)
+    if task is None or blocker is None:
+        raise ValueError('Both tasks must exist')
+
+    existing = TaskDependency.query.filter_by(task_id=task_id, depends_on_task_id=depends_on_task_id,
+                                              dependency_type=dependency_type).first()
+    if existing:
+        raise ValueError('Dependency already exists')
+
+    if dependency_type in ORDERING_TYPES:
+        if task_id == depends_on_task_id:
+            raise DependencyCycleError('A task cannot depend on itself')
+        if task.project_id == blocker.project_id:
+            # Lock the project row so two concurrent edges (A->B, B->A) cannot both pass
+            # the check, then reload rather than trust the cache
+            db.session.execute(select(Project.project_id).where(Project.project_id == task.project_id)
+                               .with_for_update())
+            if dependency_graphs.get(task.project_id, refresh=True).would_create_cycle(task_id, depends_on_task_id):
+                raise DependencyCycleError('This dependency would create a cycle')
+
+    dependency = TaskDependency(task_id=task_id, depends_on_task_id=depends_on_task_id, dependency_type=dependency_type)
+    db.session.add(dependency)
+    # Blocked counts feed the project's health score
+    record_task_writes(db.session, {task.project_id})
+    db.session.commit()
+    return dependency
+
+
+def remove_dependency(dependency_id, task_id):
+    """Delete one of `task_id`'s dependency edges; returns False if the task has no such edge"""
+    dependency = TaskDependency.query.filter_by(dependency_id=as_uuid(dependency_id),
+                                                task_id=as_uuid(task_id)).first()
+    if dependency is None:
+        return False
+    db.session.delete(dependency)
+    record_task_writes(db.session, {dependency.task.project_id})
+    db.session.commit()
+    return True
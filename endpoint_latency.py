@@ -0,0 +1,213 @@
+"""
+Per-endpoint latency histograms for the Jira Board Application
+Request hooks record every response into fixed log-scale buckets per route and keep
+a context sample of requests slower than LATENCY_SLOW_THRESHOLD_MS
+"""
+
+import bisect
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Bucket upper bounds in milliseconds: four per doubling from 0.25 ms to ~65 s,
+# so a percentile read from a bucket is within ~19% of the true value
+BUCKET_BOUNDS_MS = tuple(round(0.25 * 2 ** (step / 4), 4) for step in range(73))
+
+# Query string keys whose values are never copied into slow-request samples
+REDACTED_ARGS = ('password', 'token', 'secret', 'key', 'csrf')
+
+
+class LatencyHistogram:
+    """Counts per bucket plus exact count, sum and max for one endpoint"""
+
+    __slots__ = ('counts', 'count', 'total_ms', 'max_ms', 'errors')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)  # last bucket: beyond the largest bound
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.errors = 0
+
+    def record(self, duration_ms, status):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        if duration_ms > self.max_ms:
+            self.max_ms = duration_ms
+        if status >= 500:
+            self.errors += 1
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the `fraction` quantile (capped at the observed max)"""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                bound = BUCKET_BOUNDS_MS[index] if index < len(BUCKET_BOUNDS_MS) else self.max_ms
+                return round(min(bound, self.max_ms), 2)
+        return round(self.max_ms, 2)
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'mean_ms': round(self.total_ms / self.count, 2) if self.count else None,
+            'p50_ms': self.percentile(0.50),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': round(self.max_ms, 2)
+        }
+
+
+def _safe_args(args):
+    return {key: '***' if any(word in key.lower() for word in REDACTED_ARGS) else values
+            for key, values in args.lists()}
+
+
+class EndpointLatency:
+    """
+    Latency histograms keyed by (endpoint, method) with slow-request capture
+
+    Recording a request is a bisect and a few additions under one lock; the
+    percentiles are only computed when the admin view or export asks. Each
+    worker process keeps its own histograms; the export carries the raw bucket
+    counts so several workers can be merged.
+
+    Usage:
+        endpoint_latency.init_app(app)
+        endpoint_latency.report()        # p50/p95/p99 per route
+        endpoint_latency.slow_requests()
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.enabled = True
+        self.slow_threshold_ms = 1000.0
+        self._histograms = {}
+        self._rules = {}
+        self._slow = deque(maxlen=100)
+        self._lock = threading.Lock()
+        self._started_at = datetime.utcnow()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read thresholds from config and install the request hooks and query counter"""
+        self.app = app
+        self.enabled = app.config.get('LATENCY_TRACKING', True)
+        self.slow_threshold_ms = app.config.get('LATENCY_SLOW_THRESHOLD_MS', self.slow_threshold_ms)
+        self._slow = deque(self._slow, maxlen=app.config.get('LATENCY_SLOW_SAMPLES', 100))
+        app.extensions['endpoint_latency'] = self
+
+        if not self.enabled:
+            return
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        if not event.contains(Engine, 'after_cursor_execute', _count_query):
+            event.listen(Engine, 'after_cursor_execute', _count_query)
+
+    def _start_request(self):
+        g.latency_started = time.perf_counter()
+        g.query_count = 0
+
+    def _finish_request(self, response):
+        started = getattr(g, 'latency_started', None)
+        if started is None:
+            return response
+        duration_ms = (time.perf_counter() - started) * 1000
+        endpoint = request.endpoint or '<unmatched>'
+        key = (endpoint, request.method)
+
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram()
+                self._rules[key] = request.url_rule.rule if request.url_rule else None
+            histogram.record(duration_ms, response.status_code)
+
+        if duration_ms >= self.slow_threshold_ms:
+            self._capture_slow(endpoint, duration_ms, response.status_code)
+        return response
+
+    def _capture_slow(self, endpoint, duration_ms, status):
+        from flask_login import current_user
+
+        user_id = role = None
+        if getattr(current_user, 'is_authenticated', False):
+            user_id = getattr(current_user, 'user_id', None)
+            role = getattr(current_user, 'role_name', None)
+        sample = {
+            'timestamp': datetime.utcnow().isoformat(),
+            'endpoint': endpoint,
+            'method': request.method,
+            'path': request.path,
+            'view_args': {key: str(value) for key, value in (request.view_args or {}).items()},
+            'args': _safe_args(request.args),
+            'status': status,
+            'duration_ms': round(duration_ms, 2),
+            'query_count': getattr(g, 'query_count', None),
+            'user_id': str(user_id) if user_id else None,
+            'role': role,
+            'request_id': getattr(g, 'request_id', None)
+        }
+        with self._lock:
+            self._slow.append(sample)
+        logger.warning('Slow request', extra={key: sample[key] for key in
+                                              ('endpoint', 'duration_ms', 'query_count', 'status')})
+
+    def report(self, sort='p95_ms'):
+        """Per-route summaries, slowest first by `sort`"""
+        with self._lock:
+            rows = [{'endpoint': endpoint, 'method': method, 'rule': self._rules.get((endpoint, method)),
+                     **histogram.summary()}
+                    for (endpoint, method), histogram in self._histograms.items()]
+        return sorted(rows, key=lambda row: row.get(sort) or 0, reverse=True)
+
+    def slow_requests(self):
+        """Captured slow requests, newest first"""
+        with self._lock:
+            return list(reversed(self._slow))
+
+    def export(self):
+        """Machine-readable dump: summaries, raw bucket counts and slow samples"""
+        with self._lock:
+            buckets = {f'{endpoint} {method}': list(histogram.counts)
+                       for (endpoint, method), histogram in self._histograms.items()}
+        return {
+            'pid': os.getpid(),
+            'since': self._started_at.isoformat(),
+            'slow_threshold_ms': self.slow_threshold_ms,
+            'bucket_bounds_ms': list(BUCKET_BOUNDS_MS),
+            'endpoints': self.report(),
+            'buckets': buckets,
+            'slow_requests': self.slow_requests()
+        }
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._rules.clear()
+            self._slow.clear()
+            self._started_at = datetime.utcnow()
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'query_count' in g:
+        g.query_count += 1
+
+
+endpoint_latency = EndpointLatency()
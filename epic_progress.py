@@ -0,0 +1,75 @@
+"""
+Epic progress summaries for the Jira Board Application
+One grouped query per project instead of per-epic `Epic.issues` count queries
+"""
+
+from datetime import datetime
+
+from sqlalchemy import select, func, case, and_
+
+from extensions import db
+from models.models_models import TaskStatus
+from models.task_models import Task
+from models.epic_models import Epic
+from project_cache import ProjectCache
+
+
+def _status_value(status):
+    return status.value if hasattr(status, 'value') else status
+
+
+def load_epic_summaries(project_id, now=None):
+    """
+    Progress of every epic in a project, from a single GROUP BY over epic LEFT JOIN task
+
+    Returns:
+        list: One dict per epic (ordered by target date, then title) with
+              status counts, total/logged hours, overdue and percent done
+    """
+    now = now or datetime.utcnow()
+    overdue = and_(Task.due_date < now, Task.status != TaskStatus.done)
+    rows = db.session.execute(
+        select(Epic.epic_id, Epic.title, Epic.status, Epic.start_date, Epic.target_date,
+               Task.status,
+               func.count(Task.task_id),
+               func.coalesce(func.sum(Task.estimated_hours), 0.0),
+               func.coalesce(func.sum(Task.logged_hours), 0.0),
+               func.coalesce(func.sum(case((overdue, 1), else_=0)), 0))
+        .outerjoin(Task, Task.epic_id == Epic.epic_id)
+        .where(Epic.project_id == project_id)
+        .group_by(Epic.epic_id, Epic.title, Epic.status, Epic.start_date, Epic.target_date, Task.status)
+    ).all()
+
+    epics = {}
+    for epic_id, title, epic_status, start_date, target_date, task_status, count, estimated, logged, late in rows:
+        summary = epics.setdefault(epic_id, {
+            'epic_id': str(epic_id),
+            'title': title,
+            'status': epic_status,
+            'start_date': start_date.isoformat() if start_date else None,
+            'target_date': target_date.isoformat() if target_date else None,
+            'total_tasks': 0,
+            'status_counts': {status.value: 0 for status in TaskStatus},
+            'estimated_hours': 0.0,
+            'logged_hours': 0.0,
+            'overdue_tasks': 0
+        })
+        if task_status is None:
+            continue
+        summary['status_counts'][_status_value(task_status)] = count
+        summary['total_tasks'] += count
+        summary['estimated_hours'] += float(estimated)
+        summary['logged_hours'] += float(logged)
+        summary['overdue_tasks'] += int(late)
+
+    for summary in epics.values():
+        done = summary['status_counts'].get(TaskStatus.done.value, 0)
+        summary['percent_done'] = round(100.0 * done / summary['total_tasks'], 1) if summary['total_tasks'] else 0.0
+        summary['estimated_hours'] = round(summary['estimated_hours'], 2)
+        summary['logged_hours'] = round(summary['logged_hours'], 2)
+
+    return sorted(epics.values(), key=lambda item: (item['target_date'] is None, item['target_date'] or '', item['title']))
+
+
+# Dropped for a project whenever one of its tasks or epics is flushed
+epic_summaries = ProjectCache(load_epic_summaries, 'EPIC_SUMMARY', ttl=300.0, invalidate_on_task_writes=True)
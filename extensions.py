@@ -1,5 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
+from db_routing import RoutingSession
 
-db = SQLAlchemy()
-login_manager = LoginManager()
\ No newline at end of file
+# Reads may be routed to a replica bind (see db_routing.py)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+login_manager = LoginManager()
@@ -0,0 +1,143 @@
+"""
+Permission-keyed template fragment cache for the Jira Board Application
+{% cache 'name', vary... %} blocks are rendered once per role/permission set and
+template version and then served from an in-process LRU
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+
+def _template_version(filename, name):
+    """Short hash of the template source, so an edited template never serves old fragments"""
+    try:
+        with open(filename, 'rb') as file:
+            return hashlib.sha1(file.read()).hexdigest()[:12]
+    except (OSError, TypeError):
+        return name or ''
+
+
+class FragmentCacheExtension(Extension):
+    """
+    Jinja tag caching the rendered body per permission key
+
+        {% cache 'admin_sidebar', request.endpoint %} ... {% endcache %}
+
+    Only role- and permission-dependent markup belongs inside the block; any
+    other value the body uses (the active endpoint above) must be passed as
+    a vary argument. Bodies containing user-specific data must not be cached.
+    """
+
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        vary = []
+        while parser.stream.skip_if('comma'):
+            vary.append(parser.parse_expression())
+        version = _template_version(parser.filename, parser.name)
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        call = self.call_method('_render', [args[0], nodes.List(vary), nodes.Const(version)])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render(self, name, vary, version, caller):
+        return fragment_cache.render(name, tuple(vary), version, caller)
+
+
+class FragmentCache:
+    """
+    LRU of rendered fragments keyed by (name, vary, template version, permission key)
+
+    The permission key is a hash of the active role and its permission set,
+    so every user sharing a role shares the entries. invalidate() drops the
+    entries built from a role's old permissions when they change at runtime.
+
+    Usage:
+        fragment_cache.init_app(app)
+        fragment_cache.invalidate('manager')
+    """
+
+    def __init__(self, app=None):
+        self.enabled = True
+        self.max_entries = 512
+        self._entries = OrderedDict()
+        self._permission_keys = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Register the {% cache %} tag on the app's Jinja environment"""
+        self.enabled = app.config.get('FRAGMENT_CACHE_ENABLED', True)
+        self.max_entries = app.config.get('FRAGMENT_CACHE_SIZE', self.max_entries)
+        app.jinja_env.add_extension(FragmentCacheExtension)
+        app.extensions['fragment_cache'] = self
+
+    def permission_key(self):
+        """Hash of the current user's active role and its permissions; 'anonymous' when logged out"""
+        from flask_login import current_user
+        from permissions import get_user_permissions
+
+        if not getattr(current_user, 'is_authenticated', False):
+            return 'anonymous'
+        role = str(getattr(current_user, 'role_name', None))
+        key = self._permission_keys.get(role)
+        if key is None:
+            permissions = ','.join(sorted(get_user_permissions(current_user)))
+            key = hashlib.sha1(f'{role}:{permissions}'.encode()).hexdigest()[:16]
+            self._permission_keys[role] = key
+        return key
+
+    def render(self, name, vary, version, caller):
+        if not self.enabled:
+            return caller()
+        key = (name, vary, version, self.permission_key())
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return Markup(html)
+            self.misses += 1
+
+        html = caller()
+        with self._lock:
+            self._entries[key] = str(html)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return Markup(html)
+
+    def invalidate(self, role=None):
+        """Drop fragments rendered for one role's permission set, or every fragment when role is None"""
+        with self._lock:
+            if role is None:
+                self._entries.clear()
+                self._permission_keys.clear()
+                return
+            key = self._permission_keys.pop(str(role), None)
+            if key is not None:
+                for stale in [entry for entry in self._entries if entry[3] == key]:
+                    del self._entries[stale]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'capacity': self.max_entries,
+                'roles': len(self._permission_keys),
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+fragment_cache = FragmentCache()
@@ -0,0 +1,568 @@
+"""
+Workload-driven index advice for the Jira Board Application
+Records the normalized statements the app issues, EXPLAINs them against a seeded
+database and proposes indexes whose benefit is measured with the index in place
+"""
+
+import atexit
+import json
+import os
+import re
+import threading
+import time
+from datetime import date, datetime
+
+import click
+from sqlalchemy import event, inspect, text, Boolean
+from sqlalchemy.engine import Engine
+
+from extensions import db
+
+# Statements worth explaining; writes without a WHERE clause never benefit from an index
+EXPLAINABLE = re.compile(r'^\s*(SELECT|WITH|UPDATE|DELETE)\b', re.I)
+MAX_INDEX_NAME = 63
+MAX_INCLUDE_COLUMNS = 4
+
+_IDENT = r'(?:"\w+"|\w+)'
+_PARAM = r'(?:%\(\w+\)s|\?)'
+_PREDICATE = re.compile(
+    rf'(?P<table>{_IDENT})\.(?P<column>{_IDENT})\s*'
+    rf'(?P<op>=|!=|<>|<=|>=|<|>|\bIS\s+NOT\b|\bIS\b|\bNOT\s+IN\b|\bIN\b|\bNOT\s+LIKE\b|\bI?LIKE\b|\bBETWEEN\b)\s*'
+    rf'(?P<value>\(?\s*{_PARAM}|NULL\b|true\b|false\b|\d+(?:\.\d+)?\b|\(\s*SELECT\b)?',
+    re.I
+)
+_ALIAS = re.compile(rf'\b(?:FROM|JOIN)\s+(?P<table>{_IDENT})(?:\s+AS)?\s+(?P<alias>{_IDENT})', re.I)
+_ORDER_BY = re.compile(r'\bORDER BY\s+(?P<items>.+?)(?=\bLIMIT\b|\bOFFSET\b|\bFOR\b|\)|$)', re.I | re.S)
+_SELECT_LIST = re.compile(r'^\s*SELECT\s+(?:DISTINCT\s+)?(?P<items>.+?)\s+FROM\s', re.I | re.S)
+_COLUMN_REF = re.compile(rf'^(?P<table>{_IDENT})\.(?P<column>{_IDENT})(?:\s+(?:AS\s+)?{_IDENT})?$', re.I)
+
+
+def normalize_sql(statement):
+    """Collapse literals, bound parameters and IN lists so equivalent statements share one key"""
+    sql = re.sub(r"'(?:[^']|'')*'", '?', statement)
+    sql = re.sub(_PARAM, '?', sql)
+    sql = re.sub(r'(?<![\w."])\d+(?:\.\d+)?\b', '?', sql)
+    sql = re.sub(r'\(\s*\?(?:\s*,\s*\?)+\s*\)', '(?)', sql)
+    return re.sub(r'\s+', ' ', sql).strip()
+
+
+def _jsonable(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        raise TypeError('binary parameter')
+    return str(value)
+
+
+def _sample_parameters(parameters):
+    """JSON-safe copy of a statement's parameters, or None if they cannot be replayed"""
+    try:
+        if isinstance(parameters, dict):
+            return {key: _jsonable(value) for key, value in parameters.items()}
+        if isinstance(parameters, (list, tuple)):
+            return [_jsonable(value) for value in parameters]
+    except TypeError:
+        return None
+    return None
+
+
+class QueryRecorder:
+    """
+    Aggregates the statements every engine executes, keyed by normalized SQL
+
+    Recording is off unless QUERY_RECORDING is set (e.g. RECORD_QUERIES=1 for a
+    benchmark or test run); the workload is merged into QUERY_WORKLOAD_FILE
+    when the process exits, so several runs add up.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.path = None
+        self.max_statements = 5000
+        self.enabled = False
+        self.queries = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        self.path = app.config.get('QUERY_WORKLOAD_FILE') or os.path.join(app.instance_path, 'query_workload.json')
+        self.max_statements = app.config.get('QUERY_WORKLOAD_MAX', self.max_statements)
+        app.extensions['query_recorder'] = self
+        if app.config.get('QUERY_RECORDING') and not self.enabled:
+            self.enabled = True
+            event.listen(Engine, 'before_cursor_execute', self._before_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_execute)
+            atexit.register(self.save)
+
+    def _before_execute(self, connection, cursor, statement, parameters, context, executemany):
+        connection.info.setdefault('query_started', []).append(time.perf_counter())
+
+    def _after_execute(self, connection, cursor, statement, parameters, context, executemany):
+        started = connection.info.get('query_started')
+        elapsed_ms = (time.perf_counter() - started.pop()) * 1000 if started else 0.0
+        if executemany or not EXPLAINABLE.match(statement):
+            return
+        key = normalize_sql(statement)
+        with self._lock:
+            entry = self.queries.get(key)
+            if entry is None:
+                if len(self.queries) >= self.max_statements:
+                    return
+                entry = self.queries[key] = {
+                    'statement': statement,
+                    'parameters': _sample_parameters(parameters),
+                    'calls': 0,
+                    'total_ms': 0.0
+                }
+            entry['calls'] += 1
+            entry['total_ms'] += elapsed_ms
+
+    def save(self, path=None):
+        """Merge the recorded workload into the workload file and reset the in-memory counts"""
+        path = path or self.path
+        with self._lock:
+            recorded, self.queries = self.queries, {}
+        if not recorded or not path:
+            return 0
+        workload = load_workload(path)
+        for key, entry in recorded.items():
+            merged = workload.setdefault(key, entry)
+            if merged is not entry:
+                merged['calls'] += entry['calls']
+                merged['total_ms'] += entry['total_ms']
+                if merged.get('parameters') is None:
+                    merged['parameters'] = entry['parameters']
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(workload, file, indent=1)
+        return len(recorded)
+
+
+query_recorder = QueryRecorder()
+
+
+def load_workload(path):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+class Plan:
+    """Estimated cost of one statement plus the tables it scans in full and the indexes it uses"""
+
+    def __init__(self, cost, seq_scans, indexes):
+        self.cost = cost
+        self.seq_scans = seq_scans
+        self.indexes = indexes
+
+
+def _walk(node):
+    yield node
+    for child in node.get('Plans', ()):
+        yield from _walk(child)
+
+
+def explain(connection, entry, table_rows=None):
+    """
+    Plan of a recorded statement on this connection
+
+    PostgreSQL reports the planner's total cost. SQLite has no cost model, so
+    every full scan of a table counts that table's rows, and a temporary sort
+    counts the rows of the outermost table scanned at its level of the plan.
+    """
+    parameters = entry['parameters']
+    if isinstance(parameters, list):
+        parameters = tuple(parameters)
+    if connection.dialect.name == 'postgresql':
+        raw = connection.exec_driver_sql('EXPLAIN (FORMAT JSON) ' + entry['statement'], parameters).scalar()
+        plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]['Plan']
+        nodes = list(_walk(plan))
+        return Plan(
+            float(plan['Total Cost']),
+            {node['Relation Name'] for node in nodes if node['Node Type'] == 'Seq Scan'},
+            {node['Index Name'] for node in nodes if 'Index Name' in node}
+        )
+
+    rows = connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + entry['statement'], parameters).all()
+    table_rows = table_rows if table_rows is not None else {}
+    cost, scans, indexes = 0.0, set(), set()
+    driving = {}  # parent plan node -> first table scanned or searched under it
+    for row in rows:
+        parent, detail = row[1], row[-1]
+        source = re.match(r'(?:SCAN|SEARCH) (?:TABLE )?(\w+)', detail)
+        if source:
+            driving.setdefault(parent, source.group(1))
+        match = re.match(r'SCAN (?:TABLE )?(\w+)', detail)
+        if match and 'INDEX' not in detail:
+            scans.add(match.group(1))
+            cost += table_rows.get(match.group(1), 1000)
+        index = re.search(r'USING (?:COVERING )?INDEX (\w+)', detail)
+        if index:
+            indexes.add(index.group(1))
+            cost += 1
+        if 'USE TEMP B-TREE' in detail:
+            cost += table_rows.get(driving.get(parent), 1000)
+    return Plan(cost, scans, indexes)
+
+
+def _unquote(name):
+    return name.strip('"')
+
+
+def _bound_value(statement, parameters, match):
+    """Value bound to the parameter right after a predicate, if it can be resolved"""
+    token = statement[match.start('value'):match.end('value')].strip('( ')
+    if isinstance(parameters, dict):
+        named = re.match(r'%\((\w+)\)s', token)
+        return parameters.get(named.group(1)) if named else None
+    if isinstance(parameters, list) and token == '?':
+        position = statement.count('?', 0, match.start('value'))
+        return parameters[position] if position < len(parameters) else None
+    return None
+
+
+class Candidate:
+    """A proposed index: key columns, optional partial predicate and INCLUDE columns"""
+
+    def __init__(self, table, columns, where=None, include=()):
+        self.table = table
+        self.columns = tuple(columns)
+        self.where = where
+        self.include = tuple(include)
+        self.queries = set()
+        self.benefit = 0.0
+        self.error = None
+
+    @property
+    def key(self):
+        return self.table, self.columns, self.where, self.include
+
+    @property
+    def kind(self):
+        if self.where:
+            return 'partial'
+        if self.include:
+            return 'covering'
+        return 'composite' if len(self.columns) > 1 else 'single'
+
+    @property
+    def name(self):
+        suffix = {'partial': '_part', 'covering': '_cov'}.get(self.kind, '')
+        name = f"idx_{self.table}_{'_'.join(self.columns)}"
+        return name[:MAX_INDEX_NAME - len(suffix)] + suffix
+
+    def ddl(self, preparer):
+        columns = ', '.join(preparer.quote(column) for column in self.columns)
+        sql = f'CREATE INDEX IF NOT EXISTS {self.name} ON {preparer.quote(self.table)} ({columns})'
+        if self.include:
+            sql += f" INCLUDE ({', '.join(preparer.quote(column) for column in self.include)})"
+        if self.where:
+            sql += f' WHERE {self.where}'
+        return sql
+
+
+def _table_references(statement, tables):
+    """alias or table name -> table name for the known tables a statement reads"""
+    references = {name: name for name in tables}
+    for match in _ALIAS.finditer(statement):
+        table, alias = _unquote(match.group('table')), _unquote(match.group('alias'))
+        if table in tables and alias.upper() not in ('ON', 'WHERE', 'JOIN', 'LEFT', 'INNER', 'ORDER', 'GROUP'):
+            references[alias] = table
+    return references
+
+
+def candidates_for(entry, tables, existing, postgres):
+    """
+    Candidate indexes for one recorded statement
+
+    Equality columns lead the key, followed by either the first range column or
+    the ORDER BY columns of the same table. Boolean equality and IS NULL tests
+    become partial-index predicates; on PostgreSQL a narrow select list of the
+    table becomes INCLUDE columns.
+    """
+    statement, parameters = entry['statement'], entry['parameters']
+    references = _table_references(statement, tables)
+    per_table = {}
+
+    for match in _PREDICATE.finditer(statement):
+        table = references.get(_unquote(match.group('table')))
+        column = _unquote(match.group('column'))
+        if table is None or column not in tables[table].c or not match.group('value'):
+            continue
+        predicates = per_table.setdefault(table, {'eq': [], 'range': [], 'partial': [], 'order': []})
+        op, value = match.group('op').upper().split()[0], match.group('value')
+        if op == 'IS' and value.upper() == 'NULL':
+            negated = 'NOT' in match.group('op').upper()
+            predicates['partial'].append(f"{column} IS {'NOT ' if negated else ''}NULL")
+        elif op in ('=', 'IS') and isinstance(tables[table].c[column].type, Boolean):
+            # SQLite renders boolean literals as 1/0
+            literals = {'true': True, 'false': False, '1': True, '0': False}
+            bound = literals.get(value.lower(), _bound_value(statement, parameters, match))
+            if bound in (True, False):
+                literal = 'true' if bound != ('NOT' in match.group('op').upper()) else 'false'
+                predicates['partial'].append(f'{column} = {literal}')
+            else:
+                predicates['eq'].append(column)
+        elif op in ('=', 'IN'):
+            predicates['eq'].append(column)
+        elif op in ('<', '>', '<=', '>=', 'BETWEEN', 'LIKE', 'ILIKE'):
+            predicates['range'].append(column)
+
+    order = _ORDER_BY.search(statement)
+    if order:
+        for item in order.group('items').split(','):
+            reference = _COLUMN_REF.match(re.sub(r'\s+(ASC|DESC|NULLS\s+(FIRST|LAST))\b', '', item.strip(), flags=re.I))
+            table = references.get(_unquote(reference.group('table'))) if reference else None
+            if table is not None:
+                per_table.setdefault(table, {'eq': [], 'range': [], 'partial': [], 'order': []})['order'].append(
+                    _unquote(reference.group('column')))
+
+    selected = {}
+    select_list = _SELECT_LIST.match(statement)
+    if select_list:
+        for item in select_list.group('items').split(','):
+            reference = _COLUMN_REF.match(item.strip())
+            table = references.get(_unquote(reference.group('table'))) if reference else None
+            if table is not None:
+                selected.setdefault(table, []).append(_unquote(reference.group('column')))
+
+    proposals = []
+    for table, predicates in per_table.items():
+        eq = list(dict.fromkeys(predicates['eq']))
+        where = ' AND '.join(sorted(set(predicates['partial']))) or None
+        tails = []
+        if predicates['range']:
+            tails.append([predicates['range'][0]])
+        if predicates['order']:
+            tails.append(predicates['order'])
+        for tail in tails or [[]]:
+            columns = list(dict.fromkeys(eq + [column for column in tail if column not in eq]))
+            if not columns:
+                if not where:
+                    continue
+                # Only a partial predicate: index the filtered column itself instead
+                columns = [where.split()[0]]
+                where = None
+            if any(index[:len(columns)] == tuple(columns) for index in existing.get(table, ())):
+                continue
+            include = ()
+            extra = [column for column in dict.fromkeys(selected.get(table, ())) if column not in columns]
+            if postgres and 0 < len(extra) <= MAX_INCLUDE_COLUMNS:
+                include = extra
+            proposals.append(Candidate(table, columns, where))
+            if include:
+                proposals.append(Candidate(table, columns, where, include))
+    return proposals
+
+
+def _existing_indexes(connection, tables):
+    inspector = inspect(connection)
+    existing = {}
+    for table in tables:
+        try:
+            indexes = [tuple(index['column_names']) for index in inspector.get_indexes(table)]
+            primary = tuple(inspector.get_pk_constraint(table).get('constrained_columns') or ())
+        except Exception:
+            continue
+        existing[table] = indexes + ([primary] if primary else [])
+    return existing
+
+
+def _table_rows(connection, tables):
+    if connection.dialect.name == 'postgresql':
+        return {}
+    preparer = connection.dialect.identifier_preparer
+    return {table: connection.execute(text(f'SELECT count(*) FROM {preparer.quote(table)}')).scalar()
+            for table in tables}
+
+
+def advise(workload, limit=10, min_calls=1):
+    """
+    Propose indexes for a recorded workload
+
+    Each candidate is created inside a transaction that is rolled back, every
+    statement that reads its table is re-EXPLAINed, and its benefit is the
+    call-weighted cost reduction of the statements whose plans use it.
+
+    Returns:
+        dict: Advice report (queries with their baseline cost, indexes best first)
+    """
+    from schema_migrations import load_all_models
+
+    load_all_models()
+    engine = db.engine
+    postgres = engine.dialect.name == 'postgresql'
+    preparer = engine.dialect.identifier_preparer
+    queries = {key: entry for key, entry in workload.items()
+               if entry.get('parameters') is not None and entry['calls'] >= min_calls}
+
+    with engine.connect() as connection:
+        existing_tables = set(inspect(connection).get_table_names())
+        tables = {name: table for name, table in db.metadata.tables.items() if name in existing_tables}
+        existing = _existing_indexes(connection, tables)
+        table_rows = _table_rows(connection, tables)
+
+        baseline, proposals = {}, {}
+        for key, entry in queries.items():
+            try:
+                baseline[key] = explain(connection, entry, table_rows)
+            except Exception:
+                connection.rollback()
+                continue
+            for candidate in candidates_for(entry, tables, existing, postgres):
+                proposals.setdefault(candidate.key, candidate)
+        connection.rollback()
+
+        for candidate in proposals.values():
+            mention = re.compile(rf'(?<![\w"])"?{re.escape(candidate.table)}"?(?![\w"])')
+            affected = {key for key in baseline if mention.search(queries[key]['statement'])}
+            transaction = connection.begin()
+            try:
+                connection.execute(text(candidate.ddl(preparer)))
+                for key in affected:
+                    after = explain(connection, queries[key], table_rows)
+                    if candidate.name in after.indexes and after.cost < baseline[key].cost:
+                        candidate.benefit += queries[key]['calls'] * (baseline[key].cost - after.cost)
+                        candidate.queries.add(key)
+            except Exception as e:
+                candidate.benefit = 0.0
+                candidate.error = str(e).splitlines()[0]
+            finally:
+                transaction.rollback()
+                if not postgres:
+                    # pysqlite commits DDL outside the transaction, so drop the trial index explicitly
+                    connection.execute(text(f'DROP INDEX IF EXISTS {candidate.name}'))
+                    connection.commit()
+
+    chosen = sorted((c for c in proposals.values() if c.benefit > 0), key=lambda c: -c.benefit)
+    # One index per key and table, preferring the variant with the larger benefit
+    picked, seen = [], set()
+    for candidate in chosen:
+        signature = (candidate.table, candidate.columns)
+        if signature not in seen:
+            seen.add(signature)
+            picked.append(candidate)
+
+    return {
+        'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+        'dialect': engine.dialect.name,
+        'queries': {key: {**queries[key], 'cost_before': plan.cost, 'seq_scans': sorted(plan.seq_scans)}
+                    for key, plan in baseline.items()},
+        'indexes': [{
+            'name': candidate.name,
+            'table': candidate.table,
+            'columns': list(candidate.columns),
+            'where': candidate.where,
+            'include': list(candidate.include),
+            'kind': candidate.kind,
+            'ddl': candidate.ddl(preparer),
+            'benefit': round(candidate.benefit, 2),
+            'queries': sorted(key for key in candidate.queries if key in baseline)
+        } for candidate in picked[:limit]]
+    }
+
+
+def write_migration(report, directory=None):
+    """Write the proposed indexes as the next numbered migration; returns its path"""
+    from schema_migrations import MIGRATIONS_DIR, latest_version
+
+    directory = directory or MIGRATIONS_DIR
+    path = os.path.join(directory, f'{latest_version() + 1:04d}_advised_indexes.sql')
+    lines = [f"-- Indexes proposed by 'flask indexes advise' on {report['created_at']} ({report['dialect']})",
+             "-- Benefit is the call-weighted planner cost saved on the recorded workload;",
+             "-- check the plans afterwards with 'flask indexes verify'", '']
+    for index in report['indexes']:
+        lines.append(f"-- {index['kind']}, benefit {index['benefit']}, {len(index['queries'])} statements")
+        lines.append(index['ddl'] + ';')
+        lines.append('')
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('\n'.join(lines))
+    return path
+
+
+def verify(report):
+    """
+    Re-EXPLAIN the advised statements now that the indexes exist
+
+    Returns:
+        list: (index, exists, statements using it, statements, cost before, cost after) per index
+    """
+    engine = db.engine
+    results = []
+    with engine.connect() as connection:
+        tables = {index['table'] for index in report['indexes']}
+        table_rows = _table_rows(connection, tables)
+        inspector = inspect(connection)
+        for index in report['indexes']:
+            exists = index['name'] in {item['name'] for item in inspector.get_indexes(index['table'])}
+            used, before, after = 0, 0.0, 0.0
+            for key in index['queries']:
+                entry = report['queries'][key]
+                plan = explain(connection, entry, table_rows)
+                used += index['name'] in plan.indexes
+                before += entry['calls'] * entry['cost_before']
+                after += entry['calls'] * plan.cost
+            results.append((index, exists, used, len(index['queries']), before, after))
+    return results
+
+
+def register_index_commands(app):
+    """Register `flask indexes workload / advise / verify`"""
+
+    def report_path():
+        return app.config.get('INDEX_ADVICE_FILE') or os.path.join(app.instance_path, 'index_advice.json')
+
+    @app.cli.group('indexes')
+    def indexes_cli():
+        """Workload-driven index advice"""
+
+    @indexes_cli.command('workload')
+    @click.option('--top', default=20, type=int)
+    def workload_command(top):
+        """Show the recorded statements with the most total time"""
+        workload = load_workload(query_recorder.path)
+        if not workload:
+            raise click.ClickException(f'No workload at {query_recorder.path}; run the app or a benchmark '
+                                       f'with RECORD_QUERIES=1 first')
+        entries = sorted(workload.items(), key=lambda item: -item[1]['total_ms'])[:top]
+        for key, entry in entries:
+            click.echo(f"{entry['calls']:>7} calls {entry['total_ms']:>10.1f} ms  {key[:150]}")
+
+    @indexes_cli.command('advise')
+    @click.option('--limit', default=10, type=int, help='Indexes proposed at most')
+    @click.option('--min-calls', default=1, type=int, help='Ignore statements recorded fewer times')
+    @click.option('--write', is_flag=True, help='Write the proposal as the next migration file')
+    def advise_command(limit, min_calls, write):
+        """EXPLAIN the recorded workload and propose indexes with their estimated benefit"""
+        workload = load_workload(query_recorder.path)
+        if not workload:
+            raise click.ClickException(f'No workload at {query_recorder.path}; run the app or a benchmark '
+                                       f'with RECORD_QUERIES=1 first')
+        report = advise(workload, limit=limit, min_calls=min_calls)
+        for index in report['indexes']:
+            click.echo(f"{index['benefit']:>14.1f}  {index['ddl']}  ({len(index['queries'])} statements)")
+        if not report['indexes']:
+            click.echo('No index improves the recorded workload')
+        os.makedirs(os.path.dirname(os.path.abspath(report_path())), exist_ok=True)
+        with open(report_path(), 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=1)
+        if write and report['indexes']:
+            click.echo(f'Wrote {write_migration(report)}; apply it with flask db upgrade, then flask indexes verify')
+
+    @indexes_cli.command('verify')
+    def verify_command():
+        """Check that the advised indexes exist and that the statements' plans now use them"""
+        if not os.path.exists(report_path()):
+            raise click.ClickException('No advice report; run flask indexes advise first')
+        with open(report_path(), 'r', encoding='utf-8') as file:
+            report = json.load(file)
+        failed = False
+        for index, exists, used, total, before, after in verify(report):
+            state = 'missing' if not exists else f'used by {used}/{total} statements'
+            failed = failed or not exists or used == 0
+            click.echo(f"{index['name']}: {state}, cost {before:.1f} -> {after:.1f}")
+        if failed:
+            raise click.ClickException('Some advised indexes are missing or unused')
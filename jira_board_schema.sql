@@ -1,3 +1,13 @@
+-- Applied migration versions (see schema_migrations.py); a database created from
+-- this file is adopted by 'flask db upgrade', whose migrations are idempotent
+CREATE TABLE public.schema_version (
+    version INTEGER PRIMARY KEY,
+    name VARCHAR(200) NOT NULL,
+    checksum VARCHAR(64) NOT NULL,
+    applied_at TIMESTAMP NOT NULL,
+    duration_ms INTEGER
+);
+
 -- Create ENUM types
 CREATE TYPE role_name AS ENUM ('admin', 'manager', 'developer', 'client', 'viewer', 'pending');
 CREATE TYPE task_status AS ENUM ('todo', 'in_progress', 'done', 'blocked');
@@ -60,6 +70,16 @@ CREATE TABLE public.login (
     FOREIGN KEY (user_id) REFERENCES public."user"(user_id)
 );
 
+-- Create user_session table (server-side sessions, see session_store.py)
+CREATE TABLE public.user_session (
+    session_hash BYTEA PRIMARY KEY,
+    user_id UUID,
+    data TEXT NOT NULL,
+    expires_at TIMESTAMP NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES public."user"(user_id) ON DELETE CASCADE
+);
+
 -- Create team table
 CREATE TABLE public.team (
     team_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -244,6 +264,34 @@ CREATE TABLE public.developer_project (
     FOREIGN KEY (project_id) REFERENCES public.project(project_id)
 );
 
+-- Create materialized project access (see project_access.py)
+CREATE TABLE public.project_access (
+    user_id UUID NOT NULL,
+    project_id UUID NOT NULL,
+    access_level VARCHAR(20) NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, project_id),
+    FOREIGN KEY (user_id) REFERENCES public."user"(user_id) ON DELETE CASCADE,
+    FOREIGN KEY (project_id) REFERENCES public.project(project_id) ON DELETE CASCADE
+);
+
+-- Create database maintenance job runs (see db_maintenance.py)
+CREATE TABLE public.maintenance_run (
+    run_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    kind VARCHAR(20) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    progress INTEGER NOT NULL DEFAULT 0,
+    message VARCHAR(255),
+    requested_by_id UUID,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    results JSON,
+    error TEXT,
+    heartbeat_at TIMESTAMP,
+    FOREIGN KEY (requested_by_id) REFERENCES public."user"(user_id) ON DELETE SET NULL
+);
+
 -- Create notification_template table
 CREATE TABLE public.notification_template (
     template_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -331,6 +379,128 @@ CREATE TABLE public.notification (
     FOREIGN KEY (user_id) REFERENCES public."user"(user_id)
 );
 
+-- Create audit_log table (range-partitioned by month; partitions managed by log_partitions.py)
+CREATE TABLE public.audit_log (
+    log_id UUID NOT NULL DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL,
+    action VARCHAR(100) NOT NULL,
+    description TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (log_id, created_at),
+    FOREIGN KEY (user_id) REFERENCES public."user"(user_id)
+) PARTITION BY RANGE (created_at);
+CREATE TABLE public.audit_log_default PARTITION OF public.audit_log DEFAULT;
+
+-- Create activity_log table (range-partitioned by month)
+CREATE TABLE public.activity_log (
+    log_id UUID NOT NULL DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL,
+    action VARCHAR(100) NOT NULL,
+    entity_type VARCHAR(50) NOT NULL,
+    entity_id UUID NOT NULL,
+    details JSON,
+    timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (log_id, timestamp),
+    FOREIGN KEY (user_id) REFERENCES public."user"(user_id)
+) PARTITION BY RANGE (timestamp);
+CREATE TABLE public.activity_log_default PARTITION OF public.activity_log DEFAULT;
+
+-- Create report rollup tables (refreshed by `flask reports refresh`)
+CREATE TABLE public.project_daily_rollup (
+    project_id UUID NOT NULL,
+    day DATE NOT NULL,
+    open_tasks INTEGER NOT NULL DEFAULT 0,
+    in_progress_tasks INTEGER NOT NULL DEFAULT 0,
+    done_tasks INTEGER NOT NULL DEFAULT 0,
+    open_bugs INTEGER NOT NULL DEFAULT 0,
+    remaining_hours DOUBLE PRECISION NOT NULL DEFAULT 0,
+    completed_tasks INTEGER NOT NULL DEFAULT 0,
+    completed_hours DOUBLE PRECISION NOT NULL DEFAULT 0,
+    logged_hours DOUBLE PRECISION NOT NULL DEFAULT 0,
+    computed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (project_id, day),
+    FOREIGN KEY (project_id) REFERENCES public.project(project_id) ON DELETE CASCADE
+);
+
+CREATE TABLE public.sprint_daily_rollup (
+    sprint_id UUID NOT NULL,
+    day DATE NOT NULL,
+    project_id UUID NOT NULL,
+    total_tasks INTEGER NOT NULL DEFAULT 0,
+    done_tasks INTEGER NOT NULL DEFAULT 0,
+    committed_hours DOUBLE PRECISION NOT NULL DEFAULT 0,
+    remaining_hours DOUBLE PRECISION NOT NULL DEFAULT 0,
+    completed_hours DOUBLE PRECISION NOT NULL DEFAULT 0,
+    logged_hours DOUBLE PRECISION NOT NULL DEFAULT 0,
+    computed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (sprint_id, day),
+    FOREIGN KEY (sprint_id) REFERENCES public.sprint(sprint_id) ON DELETE CASCADE,
+    FOREIGN KEY (project_id) REFERENCES public.project(project_id) ON DELETE CASCADE
+);
+
+CREATE TABLE public.rollup_watermark (
+    name VARCHAR(50) PRIMARY KEY,
+    refreshed_at TIMESTAMP NOT NULL
+);
+
+-- Create task status transition log and flow rollups
+CREATE TABLE public.task_status_transition (
+    transition_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    task_id UUID NOT NULL,
+    project_id UUID NOT NULL,
+    from_status VARCHAR(20),
+    to_status VARCHAR(20) NOT NULL,
+    changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    seconds_in_from_status DOUBLE PRECISION,
+    rolled_up_at TIMESTAMP,
+    FOREIGN KEY (task_id) REFERENCES public.task(task_id) ON DELETE CASCADE
+);
+
+CREATE TABLE public.task_status_daily_rollup (
+    project_id UUID NOT NULL,
+    day DATE NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    entered INTEGER NOT NULL DEFAULT 0,
+    exited INTEGER NOT NULL DEFAULT 0,
+    seconds_in_status DOUBLE PRECISION NOT NULL DEFAULT 0,
+    PRIMARY KEY (project_id, day, status)
+);
+
+CREATE TABLE public.task_cycle_time_daily_rollup (
+    project_id UUID NOT NULL,
+    day DATE NOT NULL,
+    metric VARCHAR(10) NOT NULL,
+    bucket INTEGER NOT NULL,
+    task_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (project_id, day, metric, bucket)
+);
+
+-- Create persisted project health scores (see project_health.py)
+CREATE TABLE public.project_health_score (
+    project_id UUID PRIMARY KEY,
+    score DOUBLE PRECISION NOT NULL,
+    overdue_ratio DOUBLE PRECISION NOT NULL DEFAULT 0,
+    blocked_ratio DOUBLE PRECISION NOT NULL DEFAULT 0,
+    throughput_trend DOUBLE PRECISION NOT NULL DEFAULT 0,
+    estimate_overrun DOUBLE PRECISION NOT NULL DEFAULT 0,
+    open_tasks INTEGER NOT NULL DEFAULT 0,
+    stale BOOLEAN NOT NULL DEFAULT FALSE,
+    computed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (project_id) REFERENCES public.project(project_id) ON DELETE CASCADE
+);
+
+-- Create weekly time tracking rollup (maintained on every work log write)
+CREATE TABLE public.weekly_time_rollup (
+    user_id UUID NOT NULL,
+    project_id UUID NOT NULL,
+    week_start DATE NOT NULL,
+    hours DOUBLE PRECISION NOT NULL DEFAULT 0,
+    entries INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, project_id, week_start),
+    FOREIGN KEY (user_id) REFERENCES public."user"(user_id) ON DELETE CASCADE,
+    FOREIGN KEY (project_id) REFERENCES public.project(project_id) ON DELETE CASCADE
+);
+
 -- Create indexes for performance
 CREATE INDEX idx_user_role_id ON public."user"(role_id);
 CREATE INDEX idx_user_roles_user_id ON public.user_roles(user_id);
@@ -342,6 +512,10 @@ CREATE INDEX idx_task_subproject_id ON public.task(subproject_id);
 CREATE INDEX idx_task_sprint_id ON public.task(sprint_id);
 CREATE INDEX idx_task_story_id ON public.task(story_id);
 CREATE INDEX idx_task_assigned_to_id ON public.task(assigned_to_id);
+CREATE INDEX idx_task_project_updated ON public.task(project_id, updated_at, task_id);
+CREATE INDEX idx_task_project_created ON public.task(project_id, created_at, task_id);
+CREATE INDEX idx_task_project_due ON public.task(project_id, due_date, task_id);
+CREATE INDEX idx_task_project_status_updated ON public.task(project_id, status, updated_at);
 CREATE INDEX idx_ticket_raised_by_id ON public.ticket(raised_by_id);
 CREATE INDEX idx_comment_task_id ON public.comment(task_id);
 CREATE INDEX idx_comment_ticket_id ON public.comment(ticket_id);
@@ -368,4 +542,20 @@ CREATE INDEX idx_story_assigned_to_id ON public.story(assigned_to_id);
 CREATE INDEX idx_story_status ON public.story(status);
 CREATE INDEX idx_story_priority ON public.story(priority);
 CREATE INDEX idx_notification_user_id ON public.notification(user_id);
-CREATE INDEX idx_notification_status ON public.notification(status);
\ No newline at end of file
+CREATE INDEX idx_notification_status ON public.notification(status);
+CREATE INDEX idx_audit_log_created_at ON public.audit_log(created_at);
+CREATE INDEX idx_audit_log_user_created ON public.audit_log(user_id, created_at);
+CREATE INDEX idx_activity_log_timestamp ON public.activity_log(timestamp);
+CREATE INDEX idx_activity_log_user_timestamp ON public.activity_log(user_id, timestamp);
+CREATE INDEX ix_sprint_daily_rollup_project_id ON public.sprint_daily_rollup(project_id);
+CREATE INDEX idx_work_log_task_id ON public.work_log(task_id);
+CREATE INDEX idx_work_log_user_date ON public.work_log(user_id, log_date);
+CREATE INDEX idx_task_transition_task_changed ON public.task_status_transition(task_id, changed_at);
+CREATE INDEX idx_task_transition_project_changed ON public.task_status_transition(project_id, changed_at);
+CREATE INDEX idx_task_transition_pending ON public.task_status_transition(changed_at) WHERE rolled_up_at IS NULL;
+CREATE INDEX ix_project_health_score_stale ON public.project_health_score(stale);
+CREATE INDEX idx_project_access_project ON public.project_access(project_id, user_id);
+CREATE INDEX idx_maintenance_run_kind_created ON public.maintenance_run(kind, created_at);
+CREATE UNIQUE INDEX idx_maintenance_run_active_kind ON public.maintenance_run(kind) WHERE status IN ('queued', 'running');
+CREATE INDEX idx_user_session_user ON public.user_session(user_id);
+CREATE INDEX idx_user_session_expires ON public.user_session(expires_at);
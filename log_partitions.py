@@ -0,0 +1,225 @@
+"""
+Monthly range partitioning for the audit_log and activity_log tables
+Creates partitions ahead of time and drops expired ones with DETACH + DROP
+"""
+
+import logging
+import re
+from datetime import datetime
+
+import click
+from sqlalchemy import text
+
+from extensions import db
+
+logger = logging.getLogger(__name__)
+
+# Partitioned log tables and their partition key column
+LOG_TABLES = {
+    'audit_log': 'created_at',
+    'activity_log': 'timestamp'
+}
+
+PARTITION_NAME = re.compile(r'^(?P<table>\w+)_y(?P<year>\d{4})m(?P<month>\d{2})$')
+
+
+def _month_start(value):
+    return datetime(value.year, value.month, 1)
+
+
+def _add_months(month_start, months):
+    index = month_start.year * 12 + (month_start.month - 1) + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month_start):
+    """audit_log + 2026-10 -> audit_log_y2026m10"""
+    return f'{table}_y{month_start.year:04d}m{month_start.month:02d}'
+
+
+def is_postgres(engine=None):
+    engine = engine or db.engine
+    return engine.dialect.name == 'postgresql'
+
+
+def _table_kind(conn, table):
+    """pg_class.relkind: 'p' partitioned, 'r' plain table, None if missing"""
+    return conn.execute(
+        text("SELECT c.relkind FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+             "WHERE n.nspname = current_schema() AND c.relname = :name"),
+        {'name': table}
+    ).scalar()
+
+
+def _create_month_partition(conn, table, column, month_start):
+    name = partition_name(table, month_start)
+    if _table_kind(conn, name) is not None:
+        return name
+
+    month = {'start': month_start, 'end': _add_months(month_start, 1)}
+    bounds = f"FOR VALUES FROM ('{month_start:%Y-%m-%d}') TO ('{month['end']:%Y-%m-%d}')"
+    default = f'{table}_default'
+    in_month = f'{column} >= :start AND {column} < :end'
+    stranded = _table_kind(conn, default) is not None and conn.execute(
+        text(f'SELECT 1 FROM {default} WHERE {in_month} LIMIT 1'), month
+    ).first() is not None
+    if not stranded:
+        conn.execute(text(f'CREATE TABLE {name} PARTITION OF {table} {bounds}'))
+        return name
+
+    # PostgreSQL refuses a partition for a range that already has rows in DEFAULT,
+    # so detach DEFAULT, move that month's rows into the new partition and reattach it
+    conn.execute(text(f'ALTER TABLE {table} DETACH PARTITION {default}'))
+    conn.execute(text(f'CREATE TABLE {name} PARTITION OF {table} {bounds}'))
+    moved = conn.execute(text(
+        f'WITH moved AS (DELETE FROM {default} WHERE {in_month} RETURNING *) '
+        f'INSERT INTO {table} SELECT * FROM moved'
+    ), month).rowcount
+    conn.execute(text(f'ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT'))
+    logger.warning('Log rows moved out of the default partition', extra={'partition': name, 'rows': moved})
+    return name
+
+
+def _stranded_months(conn, table, column):
+    """Months with rows in the DEFAULT partition, i.e. written before their partition existed"""
+    default = f'{table}_default'
+    if _table_kind(conn, default) is None:
+        return []
+    return [_month_start(month) for month in conn.execute(
+        text(f"SELECT DISTINCT date_trunc('month', {column}) FROM {default}")
+    ).scalars()]
+
+
+def _convert_legacy_table(conn, table, column):
+    """Rebuild an existing unpartitioned log table as a partitioned one, keeping its rows"""
+    sa_table = db.metadata.tables[table]
+    legacy = f'{table}_legacy'
+
+    conn.execute(text(f'ALTER TABLE {table} RENAME TO {legacy}'))
+    # Free index names so the partitioned table can reuse them
+    for index_name in [f'{table}_pkey'] + [index.name for index in sa_table.indexes]:
+        conn.execute(text(f'ALTER INDEX IF EXISTS {index_name} RENAME TO {index_name}_legacy'))
+
+    sa_table.create(conn)
+    bounds = conn.execute(text(f'SELECT MIN({column}), MAX({column}) FROM {legacy}')).first()
+    if bounds and bounds[0] is not None:
+        month = _month_start(bounds[0])
+        while month <= bounds[1]:
+            _create_month_partition(conn, table, column, month)
+            month = _add_months(month, 1)
+    conn.execute(text(f'CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT'))
+
+    columns = ', '.join(f'"{col.name}"' for col in sa_table.columns)
+    conn.execute(text(f'INSERT INTO {table} ({columns}) SELECT {columns} FROM {legacy}'))
+    conn.execute(text(f'DROP TABLE {legacy}'))
+
+
+def ensure_partitions(months_ahead=3, months_back=1, now=None):
+    """
+    Make sure every log table is partitioned and has partitions for the
+    current month, the previous `months_back` and the next `months_ahead`,
+    plus any month whose rows landed in the DEFAULT partition meanwhile
+
+    Returns:
+        list: Names of partitions that were checked/created
+    """
+    if not is_postgres():
+        return []
+
+    current = _month_start(now or datetime.utcnow())
+    created = []
+    with db.engine.begin() as conn:
+        for table, column in LOG_TABLES.items():
+            kind = _table_kind(conn, table)
+            if kind is None:
+                db.metadata.tables[table].create(conn)
+            elif kind == 'r':
+                _convert_legacy_table(conn, table, column)
+
+            months = [_add_months(current, offset) for offset in range(-months_back, months_ahead + 1)]
+            for month in sorted(set(months + _stranded_months(conn, table, column))):
+                created.append(_create_month_partition(conn, table, column, month))
+            # Catch-all so inserts never fail when the job has not run in time
+            conn.execute(text(f'CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT'))
+    return created
+
+
+def list_partitions(table):
+    """Monthly partitions of a log table as (name, month_start) tuples, oldest first"""
+    if not is_postgres():
+        return []
+
+    rows = db.session.execute(
+        text("SELECT child.relname FROM pg_inherits i "
+             "JOIN pg_class parent ON parent.oid = i.inhparent "
+             "JOIN pg_class child ON child.oid = i.inhrelid "
+             "WHERE parent.relname = :table"),
+        {'table': table}
+    ).scalars().all()
+
+    partitions = []
+    for name in rows:
+        match = PARTITION_NAME.match(name)
+        if match and match.group('table') == table:
+            partitions.append((name, datetime(int(match.group('year')), int(match.group('month')), 1)))
+    return sorted(partitions, key=lambda item: item[1])
+
+
+def drop_expired_partitions(retention_months, now=None):
+    """
+    Drop whole monthly partitions older than the retention window
+
+    Detaching and dropping a partition is a metadata operation, so the cost does
+    not depend on how many rows the month holds. Expired rows still sitting in
+    the DEFAULT partition are deleted as well.
+
+    Returns:
+        list: Names of dropped partitions
+    """
+    if not is_postgres():
+        return []
+
+    cutoff = _add_months(_month_start(now or datetime.utcnow()), -retention_months)
+    dropped = []
+    for table, column in LOG_TABLES.items():
+        for name, month_start in list_partitions(table):
+            if _add_months(month_start, 1) <= cutoff:
+                with db.engine.begin() as conn:
+                    conn.execute(text(f'ALTER TABLE {table} DETACH PARTITION {name}'))
+                    conn.execute(text(f'DROP TABLE {name}'))
+                dropped.append(name)
+
+        default = f'{table}_default'
+        with db.engine.begin() as conn:
+            if _table_kind(conn, default) is not None:
+                purged = conn.execute(
+                    text(f'DELETE FROM {default} WHERE {column} < :cutoff'), {'cutoff': cutoff}
+                ).rowcount
+                if purged:
+                    logger.warning('Expired log rows deleted from the default partition',
+                                   extra={'partition': default, 'rows': purged})
+    return dropped
+
+
+def register_partition_commands(app):
+    """Register `flask logs ...` maintenance commands (run from cron)"""
+
+    @app.cli.group('logs')
+    def logs_cli():
+        """Audit/activity log partition maintenance"""
+
+    @logs_cli.command('partition')
+    @click.option('--months-ahead', default=None, type=int, help='Future months to pre-create')
+    def partition_command(months_ahead):
+        """Create upcoming monthly partitions"""
+        ahead = months_ahead if months_ahead is not None else app.config.get('LOG_PARTITION_MONTHS_AHEAD', 3)
+        names = ensure_partitions(months_ahead=ahead)
+        click.echo(f'{len(names)} partitions ensured')
+
+    @logs_cli.command('purge')
+    @click.option('--months', default=None, type=int, help='Retention window in months')
+    def purge_command(months):
+        """Drop partitions older than the retention window"""
+        retention = months if months is not None else app.config.get('LOG_RETENTION_MONTHS', 12)
+        dropped = drop_expired_partitions(retention)
+        click.echo(f'Dropped {len(dropped)} partitions' + (f": {', '.join(dropped)}" if dropped else ''))
@@ -0,0 +1,342 @@
+"""
+Login pipeline for the Jira Board Application
+Password hashes are verified in a small bounded worker pool behind per-IP and per-account
+token buckets, and stored hashes are upgraded to the current parameters on successful login
+"""
+
+import inspect
+import logging
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from flask import current_app, request
+from werkzeug.security import check_password_hash, generate_password_hash
+from werkzeug.utils import import_string
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis
+except ImportError:  # optional; only needed for LOGIN_RATE_LIMIT_BACKEND = 'redis'
+    redis = None
+
+WERKZEUG_DEFAULT_METHOD = inspect.signature(generate_password_hash).parameters['method'].default
+
+
+def password_method():
+    """Hash method for new and upgraded passwords: LOGIN_PASSWORD_METHOD, else werkzeug's default"""
+    try:
+        return current_app.config.get('LOGIN_PASSWORD_METHOD') or WERKZEUG_DEFAULT_METHOD
+    except RuntimeError:  # outside an app context
+        return WERKZEUG_DEFAULT_METHOD
+
+
+class LoginThrottled(Exception):
+    """Raised when the client IP or the account has run out of login attempts"""
+
+    def __init__(self, scope, retry_after):
+        super().__init__(f'{scope} login rate limit exceeded')
+        self.scope = scope
+        self.retry_after = max(1, int(retry_after + 0.999))
+
+
+class LoginBusy(Exception):
+    """Raised when every hash worker is busy and the wait queue is full"""
+
+    retry_after = 2
+
+
+class MemoryRateLimitBackend:
+    """
+    Token buckets in this process
+
+    Each worker process counts on its own, so with N workers a client gets up
+    to N times the configured budget; use a shared backend where that matters.
+    The least recently used buckets are dropped beyond max_keys, which only
+    ever hands a client a fresh (full) bucket.
+    """
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, rate, burst, cost=1.0):
+        """
+        Take `cost` tokens from the bucket refilled at `rate` per second up to `burst`
+
+        Returns:
+            tuple: (allowed, seconds until enough tokens are available)
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (cost - tokens) / rate
+
+    def reset(self, key):
+        with self._lock:
+            self._buckets.pop(key, None)
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+_REDIS_CONSUME = """
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local rate, burst, now, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+local tokens, updated = tonumber(bucket[1]), tonumber(bucket[2])
+if tokens == nil then tokens, updated = burst, now end
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimitBackend:
+    """Token buckets shared by every worker and host, updated atomically by a Lua script"""
+
+    def __init__(self, url, prefix='login-rate:'):
+        if redis is None:
+            raise RuntimeError("LOGIN_RATE_LIMIT_BACKEND = 'redis' needs the redis package")
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._consume = self._client.register_script(_REDIS_CONSUME)
+
+    def consume(self, key, rate, burst, cost=1.0):
+        allowed, tokens = self._consume(keys=[self.prefix + key], args=[rate, burst, time.time(), cost])
+        tokens = float(tokens)
+        return bool(allowed), 0.0 if allowed else (cost - tokens) / rate
+
+    def reset(self, key):
+        self._client.delete(self.prefix + key)
+
+
+class LoginPipeline:
+    """
+    Throttled, CPU-bounded password verification for the login form
+
+    A login first takes a token from its client IP's bucket and then from
+    its account's (the normalised email). The IP token costs double while
+    the hash queue is more than half full, so a burst from one address backs
+    off before it crowds out other users. Hash verification runs on at most
+    LOGIN_HASH_WORKERS threads (hashlib releases the GIL while hashing). At
+    most LOGIN_HASH_QUEUE more logins wait for a worker; beyond that a login
+    fails fast with LoginBusy instead of tying up a request thread. Unknown
+    emails are checked against a dummy hash so they take as long as wrong
+    passwords. A successful login refills the account's bucket and replaces
+    a hash made with older parameters.
+
+    Usage:
+        login_pipeline.init_app(app)
+        user = login_pipeline.authenticate(email, password)  # None on bad credentials
+    """
+
+    def __init__(self, app=None):
+        self.workers = 2
+        self.queue_size = 16
+        self.timeout = 5.0
+        self.ip_rate = 10 / 60.0
+        self.ip_burst = 20
+        self.account_rate = 2 / 60.0
+        self.account_burst = 5
+        self.backend = MemoryRateLimitBackend()
+
+        self._executor = None
+        self._pid = None
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._dummy_hash = None
+        self._current_prefix = {}
+        self._counts = {}
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read the pool and rate-limit settings and build the rate-limit backend"""
+        self.workers = app.config.get('LOGIN_HASH_WORKERS', self.workers)
+        self.queue_size = app.config.get('LOGIN_HASH_QUEUE', self.queue_size)
+        self.timeout = app.config.get('LOGIN_HASH_TIMEOUT', self.timeout)
+        self.ip_rate = app.config.get('LOGIN_IP_PER_MINUTE', self.ip_rate * 60) / 60.0
+        self.ip_burst = app.config.get('LOGIN_IP_BURST', self.ip_burst)
+        self.account_rate = app.config.get('LOGIN_ACCOUNT_PER_MINUTE', self.account_rate * 60) / 60.0
+        self.account_burst = app.config.get('LOGIN_ACCOUNT_BURST', self.account_burst)
+        self.backend = self._make_backend(app.config.get('LOGIN_RATE_LIMIT_BACKEND', 'memory'), app.config)
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        app.extensions['login_pipeline'] = self
+
+    @staticmethod
+    def _make_backend(backend, config):
+        """'memory', 'redis', a dotted path to a backend class, or a backend instance"""
+        if backend == 'memory':
+            return MemoryRateLimitBackend(config.get('LOGIN_RATE_LIMIT_MAX_KEYS', 100000))
+        if backend == 'redis':
+            return RedisRateLimitBackend(config['LOGIN_RATE_LIMIT_REDIS_URL'])
+        if isinstance(backend, str):
+            return import_string(backend)()
+        return backend
+
+    # Rate limiting
+
+    def _take(self, scope, key, rate, burst, cost=1.0):
+        try:
+            allowed, retry_after = self.backend.consume(f'{scope}:{key}', rate, burst, cost)
+        except Exception:
+            # A shared backend outage must not lock everyone out; the hash pool still bounds the cost
+            logger.exception('Login rate limit backend failed')
+            return
+        if not allowed:
+            self._count(f'throttled_{scope}')
+            logger.warning('Login throttled', extra={'scope': scope, 'retry_after': round(retry_after, 1)})
+            raise LoginThrottled(scope, retry_after)
+
+    def _pressure(self):
+        capacity = self.workers + self.queue_size
+        return self._in_flight / capacity if capacity else 1.0
+
+    # Hash worker pool
+
+    def _pool(self):
+        """The hash executor, created on first use (and again after a fork)"""
+        pid = os.getpid()
+        if self._executor is not None and self._pid == pid:
+            return self._executor
+        with self._lock:
+            if self._executor is None or self._pid != pid:
+                self._pid = pid
+                self._in_flight = 0
+                self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+        return self._executor
+
+    def _run(self, function, *args):
+        pool = self._pool()
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            self._count('rejected_busy')
+            logger.warning('Login rejected, hash queue full', extra={'in_flight': self._in_flight})
+            raise LoginBusy()
+        with self._lock:
+            self._in_flight += 1
+
+        def release(_):
+            with self._lock:
+                self._in_flight -= 1
+            slots.release()
+
+        future = pool.submit(function, *args)
+        future.add_done_callback(release)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            self._count('rejected_busy')
+            raise LoginBusy()
+
+    def _verify(self, password_hash, password, method):
+        """Worker: check the password; on success also return a new hash if the stored one is outdated"""
+        if not check_password_hash(password_hash, password):
+            return False, None
+        prefix = password_hash.split('$', 1)[0]
+        current = self._current_prefix.get(method)
+        if current is not None and prefix == current:
+            return True, None
+        new_hash = generate_password_hash(password, method=method)
+        self._current_prefix[method] = new_hash.split('$', 1)[0]
+        return True, new_hash if prefix != self._current_prefix[method] else None
+
+    def _burn(self, password, method):
+        """Worker: spend the time of a real verification for an unknown email"""
+        if self._dummy_hash is None:
+            self._dummy_hash = generate_password_hash(secrets.token_hex(16), method=method)
+        check_password_hash(self._dummy_hash, password)
+        return False, None
+
+    # Login
+
+    def authenticate(self, email, password):
+        """
+        The user whose email and password match, or None
+
+        Raises:
+            LoginThrottled: the client IP or the account is out of attempts (answer 429)
+            LoginBusy: no hash worker became free in time (answer 503)
+        """
+        from extensions import db
+        from models.user_models import User
+
+        account = email.strip().lower()
+        self._count('attempts')
+        self._take('ip', request.remote_addr or 'unknown', self.ip_rate, self.ip_burst,
+                   cost=2.0 if self._pressure() >= 0.5 else 1.0)
+        self._take('account', account, self.account_rate, self.account_burst)
+
+        user = User.query.filter_by(email=email).first()
+        method = password_method()
+        if user is None:
+            self._run(self._burn, password, method)
+            self._count('failed')
+            logger.info('Login failed', extra={'reason': 'unknown_email'})
+            return None
+
+        user_id, password_hash = user.user_id, user.password_hash
+        # Release the pooled connection while waiting on the hash
+        db.session.rollback()
+        matched, new_hash = self._run(self._verify, password_hash, password, method)
+        if not matched:
+            self._count('failed')
+            logger.info('Login failed', extra={'reason': 'password_mismatch', 'account': user_id})
+            return None
+
+        self._count('succeeded')
+        try:
+            self.backend.reset(f'account:{account}')
+        except Exception:
+            logger.exception('Login rate limit backend failed')
+        if new_hash is not None:
+            user.password_hash = new_hash
+            db.session.commit()
+            self._count('rehashed')
+            logger.info('Password rehashed', extra={'account': user_id, 'method': method})
+        return user
+
+    def _count(self, name):
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + 1
+
+    def stats(self):
+        """Login outcomes, throttling and hash pool occupancy of this worker"""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'queue_size': self.queue_size,
+                'in_flight': self._in_flight,
+                'backend': type(self.backend).__name__,
+                'ip_limit': {'burst': self.ip_burst, 'per_minute': round(self.ip_rate * 60, 2)},
+                'account_limit': {'burst': self.account_burst, 'per_minute': round(self.account_rate * 60, 2)},
+                'password_method': self._current_prefix.get(password_method()),
+                **{name: self._counts.get(name, 0) for name in (
+                    'attempts', 'succeeded', 'failed', 'rehashed',
+                    'throttled_ip', 'throttled_account', 'rejected_busy')}
+            }
+
+
+login_pipeline = LoginPipeline()
@@ -0,0 +1,524 @@
+"""
+Baseline schema: the model tables that existed when versioned migrations were introduced
+
+The tables are declared here as they were at this version rather than read from
+the models, so applying 0001 always produces the same schema; later changes get
+their own migration. Tables that already exist (databases created from
+jira_board_schema.sql or an old create_all()) are left alone, which is why
+later DDL should be idempotent (IF NOT EXISTS).
+"""
+
+from sqlalchemy import (MetaData, Table, Column, ForeignKey, Index, Enum, String, Text, Integer, BigInteger,
+                        Float, Boolean, Date, DateTime, JSON)
+from sqlalchemy.dialects.postgresql import UUID
+
+metadata = MetaData()
+
+ROLENAME = Enum('admin', 'manager', 'developer', 'client', 'viewer', 'pending', name='rolename')
+TASKSTATUS = Enum('todo', 'in_progress', 'done', name='taskstatus')
+TASKTYPE = Enum('bug', 'feature', 'task', name='tasktype')
+TICKETSTATUS = Enum('open', 'in_progress', 'closed', name='ticketstatus')
+TICKETPRIORITY = Enum('low', 'medium', 'high', name='ticketpriority')
+COMMENTTYPE = Enum('task', 'ticket', name='commenttype')
+GOALPRIORITY = Enum('LOW', 'MEDIUM', 'HIGH', 'URGENT', name='goalpriority')
+GOALSTATUS = Enum('PENDING', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED', name='goalstatus')
+GOALCATEGORY = Enum('PERSONAL', 'TEAM', 'PROJECT', 'ORGANIZATIONAL', name='goalcategory')
+
+Table(
+    'role', metadata,
+    Column('role_id', UUID(as_uuid=True), primary_key=True),
+    Column('role_name', ROLENAME, nullable=False, unique=True)
+)
+
+Table(
+    'user', metadata,
+    Column('user_id', UUID(as_uuid=True), primary_key=True),
+    Column('username', String(80), nullable=False, unique=True),
+    Column('email', String(120), nullable=False, unique=True),
+    Column('password_hash', String(256), nullable=False),
+    Column('role_id', UUID(as_uuid=True), ForeignKey('role.role_id'), nullable=False),
+    Column('contact_no', String(15)),
+    Column('company_name', String(100)),
+    Column('is_approved', Boolean, nullable=False),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False)
+)
+
+Table(
+    'user_roles', metadata,
+    Column('user_id', UUID(as_uuid=True), ForeignKey('user.user_id'), primary_key=True),
+    Column('role_id', UUID(as_uuid=True), ForeignKey('role.role_id'), primary_key=True),
+    Column('assigned_at', DateTime, nullable=False),
+    Column('assigned_by_id', UUID(as_uuid=True), ForeignKey('user.user_id')),
+    Column('is_primary', Boolean),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False)
+)
+
+Table(
+    'login', metadata,
+    Column('login_id', UUID(as_uuid=True), primary_key=True),
+    Column('user_id', UUID(as_uuid=True), ForeignKey('user.user_id'), nullable=False),
+    Column('login_time', DateTime, nullable=False),
+    Column('logout_time', DateTime),
+    Column('session_token', String(256), nullable=False, unique=True),
+    Column('created_at', DateTime, nullable=False)
+)
+
+Table(
+    'admin', metadata,
+    Column('admin_id', UUID(as_uuid=True), primary_key=True),
+    Column('user_id', UUID(as_uuid=True), ForeignKey('user.user_id'), nullable=False, unique=True),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False)
+)
+
+Table(
+    'manager', metadata,
+    Column('manager_id', UUID(as_uuid=True), primary_key=True),
+    Column('user_id', UUID(as_uuid=True), ForeignKey('user.user_id'), nullable=False, unique=True),
+    Column('contact_no', String(15)),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False)
+)
+
+Table(
+    'developer', metadata,
+    Column('developer_id', UUID(as_uuid=True), primary_key=True),
+    Column('user_id', UUID(as_uuid=True), ForeignKey('user.user_id'), nullable=False, unique=True),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False)
+)
+
+Table(
+    'client', metadata,
+    Column('client_id', UUID(as_uuid=True), primary_key=True),
+    Column('user_id', UUID(as_uuid=True), ForeignKey('user.user_id'), nullable=False, unique=True),
+    Column('company_name', String(100)),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False)
+)
+
+Table(
+    'viewer', metadata,
+    Column('viewer_id', UUID(as_uuid=True), primary_key=True),
+    Column('user_id', UUID(as_uuid=True), ForeignKey('user.user_id'), nullable=False, unique=True),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False)
+)
+
+Table(
+    'team', metadata,
+    Column('team_id', UUID(as_uuid=True), primary_key=True),
+    Column('name', String(100), nullable=False),
+    Column('manager_id', UUID(as_uuid=True), ForeignKey('user.user_id'), nullable=False),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False)
+)
+
+Table(
+    'project', metadata,
+    Column('project_id', UUID(as_uuid=True), primary_key=True),
+    Column('title', String(100), nullable=False),
+    Column('description', Text),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False)
+)
+
+Table(
+    'subproject', metadata,
+    Column('subproject_id', UUID(as_uuid=True), primary_key=True),
+    Column('name', String(100), nullable=False),
+    Column('project_id', UUID(as_uuid=True), ForeignKey('project.project_id'), nullable=False),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False)
+)
+
+Table(
+    'sprint', metadata,
+    Column('sprint_id', UUID(as_uuid=True), primary_key=True),
+    Column('name', String(100), nullable=False),
+    Column('project_id', UUID(as_uuid=True), ForeignKey('project.project_id'), nullable=False),
+    Column('subproject_id', UUID(as_uuid=True), ForeignKey('subproject.subproject_id')),
+    Column('start_date', DateTime),
+    Column('end_date', DateTime),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False)
+)
+
+Table(
+    'epic', metadata,
+    Column('epic_id', UUID(as_uuid=True), primary_key=True),
+    Column('title', String(255), nullable=False),
+    Column('description', Text),
+    Column('project_id', UUID(as_uuid=True), ForeignKey('project.project_id'), nullable=False),
+    Column('status', String(50)),
+    Column('start_date', DateTime),
+    Column('target_date', DateTime),
+    Column('created_by_id', UUID(as_uuid=True), ForeignKey('user.user_id'), nullable=False),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False)
+)
+
+Table(
+    'task', metadata,
+    Column('task_id', UUID(as_uuid=True), primary_key=True),
+    Column('title', String(100), nullable=False),
+    Column('description', Text),
+    Column('status', TASKSTATUS, nullable=False),
+    Column('type', TASKTYPE, nullable=False),
+    Column('priority', String(10)),
+    Column('project_id', UUID(as_uuid=True), ForeignKey('project.project_id'), nullable=False),
+    Column('subproject_id', UUID(as_uuid=True), ForeignKey('subproject.subproject_id')),
+    Column('sprint_id', UUID(as_uuid=True), ForeignKey('sprint.sprint_id')),
+    Column('epic_id', UUID(as_uuid=True), ForeignKey('epic.epic_id')),
+    Column('assigned_to_id', UUID(as_uuid=True), ForeignKey('user.user_id')),
+    Column('parent_task_id', UUID(as_uuid=True), ForeignKey('task.task_id')),
+    Column('estimated_hours', Float),
+    Column('logged_hours', Float),
+    Column('due_date', DateTime),
+    Column('labels', JSON),
+    Column('custom_fields', JSON),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False),
+    Index('idx_task_project_created', 'project_id', 'created_at', 'task_id'),
+    Index('idx_task_project_due', 'project_id', 'due_date', 'task_id'),
+    Index('idx_task_project_status_updated', 'project_id', 'status', 'updated_at'),
+    Index('idx_task_project_updated', 'project_id', 'updated_at', 'task_id')
+)
+
+Table(
+    'task_dependency', metadata,
+    Column('dependency_id', UUID(as_uuid=True), primary_key=True),
+    Column('task_id', UUID(as_uuid=True), ForeignKey('task.task_id'), nullable=False),
+    Column('depends_on_task_id', UUID(as_uuid=True), ForeignKey('task.task_id'), nullable=False),
+    Column('dependency_type', String(20)),
+    Column('created_at', DateTime, nullable=False)
+)
+
+Table(
+    'work_log', metadata,
+    Column('log_id', UUID(as_uuid=True), primary_key=True),
+    Column('task_id', UUID(as_uuid=True), ForeignKey('task.task_id'), nullable=False),
+    Column('user_id', UUID(as_uuid=True), ForeignKey('user.user_id'), nullable=False),
+    Column('hours_logged', Float, nullable=False),
+    Column('description', Text),
+    Column('log_date', DateTime, nullable=False),
+    Index('idx_work_log_task_id', 'task_id'),
+    Index('idx_work_log_user_date', 'user_id', 'log_date')
+)
+
+Table(
+    'ticket', metadata,
+    Column('ticket_id', UUID(as_uuid=True), primary_key=True),
+    Column('title', String(100), nullable=False),
+    Column('description', Text),
+    Column('status', TICKETSTATUS, nullable=False),
+    Column('priority', TICKETPRIORITY, nullable=False),
+    Column('raised_by_id', UUID(as_uuid=True), ForeignKey('user.user_id'), nullable=False),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False)
+)
+
+Table(
+    'comment', metadata,
+    Column('comment_id', UUID(as_uuid=True), primary_key=True),
+    Column('content', Text, nullable=False),
+    Column('type', COMMENTTYPE, nullable=False),
+    Column('task_id', UUID(as_uuid=True), ForeignKey('task.task_id')),
+    Column('ticket_id', UUID(as_uuid=True), ForeignKey('ticket.ticket_id')),
+    Column('created_by_id', UUID(as_uuid=True), ForeignKey('user.user_id'), nullable=False),
+    Column('created_at', DateTime, nullable=False)
+)
+
+Table(
+    'attachment', metadata,
+    Column('attachment_id', UUID(as_uuid=True), primary_key=True),
+    Column('file_name', String(100), nullable=False),
+    Column('file_path', String(255), nullable=False),
+    Column('task_id', UUID(as_uuid=True), ForeignKey('task.task_id')),
+    Column('ticket_id', UUID(as_uuid=True), ForeignKey('ticket.ticket_id')),
+    Column('created_by_id', UUID(as_uuid=True), ForeignKey('user.user_id'), nullable=False),
+    Column('created_at', DateTime, nullable=False)
+)
+
+Table(
+    'report', metadata,
+    Column('report_id', UUID(as_uuid=True), primary_key=True),
+    Column('title', String(100), nullable=False),
+    Column('content', Text, nullable=False),
+    Column('task_id', UUID(as_uuid=True), ForeignKey('task.task_id')),
+    Column('project_id', UUID(as_uuid=True), ForeignKey('project.project_id')),
+    Column('manager_id', UUID(as_uuid=True), ForeignKey('manager.manager_id')),
+    Column('client_id', UUID(as_uuid=True), ForeignKey('client.client_id')),
+    Column('created_at', DateTime, nullable=False)
+)
+
+Table(
+    'board', metadata,
+    Column('board_id', UUID(as_uuid=True), primary_key=True),
+    Column('name', String(100), nullable=False),
+    Column('project_id', UUID(as_uuid=True), ForeignKey('project.project_id'), nullable=False),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False)
+)
+
+Table(
+    'goal', metadata,
+    Column('goal_id', UUID(as_uuid=True), primary_key=True),
+    Column('title', String(200), nullable=False),
+    Column('description', Text),
+    Column('project_id', UUID(as_uuid=True), ForeignKey('project.project_id')),
+    Column('user_id', UUID(as_uuid=True), ForeignKey('user.user_id'), nullable=False),
+    Column('priority', GOALPRIORITY, nullable=False),
+    Column('status', GOALSTATUS, nullable=False),
+    Column('target_date', DateTime),
+    Column('completion_date', DateTime),
+    Column('progress_percentage', Float),
+    Column('category', GOALCATEGORY, nullable=False),
+    Column('is_milestone', Boolean),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False)
+)
+
+Table(
+    'dashboard', metadata,
+    Column('dashboard_id', UUID(as_uuid=True), primary_key=True),
+    Column('user_id', UUID(as_uuid=True), ForeignKey('user.user_id'), nullable=False),
+    Column('name', String(100), nullable=False),
+    Column('widgets', JSON),
+    Column('layout', JSON),
+    Column('is_default', Boolean),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False)
+)
+
+Table(
+    'developer_team', metadata,
+    Column('developer_id', UUID(as_uuid=True), ForeignKey('user.user_id'), primary_key=True),
+    Column('team_id', UUID(as_uuid=True), ForeignKey('team.team_id'), primary_key=True)
+)
+
+Table(
+    'developer_project', metadata,
+    Column('developer_id', UUID(as_uuid=True), ForeignKey('user.user_id'), primary_key=True),
+    Column('project_id', UUID(as_uuid=True), ForeignKey('project.project_id'), primary_key=True)
+)
+
+Table(
+    'manager_project', metadata,
+    Column('manager_id', UUID(as_uuid=True), ForeignKey('user.user_id'), primary_key=True),
+    Column('project_id', UUID(as_uuid=True), ForeignKey('project.project_id'), primary_key=True)
+)
+
+Table(
+    'project_access', metadata,
+    Column('user_id', UUID(as_uuid=True), ForeignKey('user.user_id', ondelete='CASCADE'), primary_key=True),
+    Column('project_id', UUID(as_uuid=True), ForeignKey('project.project_id', ondelete='CASCADE'), primary_key=True),
+    Column('access_level', String(20), nullable=False),
+    Column('updated_at', DateTime, nullable=False),
+    Index('idx_project_access_project', 'project_id', 'user_id')
+)
+
+Table(
+    'notification_template', metadata,
+    Column('template_id', UUID(as_uuid=True), primary_key=True),
+    Column('name', String(100), nullable=False),
+    Column('content', Text, nullable=False),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False)
+)
+
+Table(
+    'notification_preference', metadata,
+    Column('preference_id', UUID(as_uuid=True), primary_key=True),
+    Column('user_id', UUID(as_uuid=True), ForeignKey('user.user_id'), nullable=False),
+    Column('event_type', String(50), nullable=False),
+    Column('email_enabled', Boolean),
+    Column('in_app_enabled', Boolean),
+    Column('frequency', String(20)),
+    Column('created_at', DateTime, nullable=False)
+)
+
+Table(
+    'saved_filter', metadata,
+    Column('filter_id', UUID(as_uuid=True), primary_key=True),
+    Column('user_id', UUID(as_uuid=True), ForeignKey('user.user_id'), nullable=False),
+    Column('name', String(100), nullable=False),
+    Column('query', Text, nullable=False),
+    Column('is_public', Boolean),
+    Column('created_at', DateTime, nullable=False)
+)
+
+Table(
+    'automation_rule', metadata,
+    Column('rule_id', UUID(as_uuid=True), primary_key=True),
+    Column('project_id', UUID(as_uuid=True), ForeignKey('project.project_id'), nullable=False),
+    Column('name', String(100), nullable=False),
+    Column('trigger_event', String(50), nullable=False),
+    Column('conditions', JSON),
+    Column('actions', JSON),
+    Column('is_active', Boolean),
+    Column('created_by_id', UUID(as_uuid=True), ForeignKey('user.user_id'), nullable=False),
+    Column('created_at', DateTime, nullable=False)
+)
+
+Table(
+    'integration', metadata,
+    Column('integration_id', UUID(as_uuid=True), primary_key=True),
+    Column('name', String(100), nullable=False),
+    Column('type', String(50), nullable=False),
+    Column('config', JSON),
+    Column('project_id', UUID(as_uuid=True), ForeignKey('project.project_id')),
+    Column('is_active', Boolean),
+    Column('created_by_id', UUID(as_uuid=True), ForeignKey('user.user_id'), nullable=False),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False)
+)
+
+Table(
+    'guest_token', metadata,
+    Column('token_id', UUID(as_uuid=True), primary_key=True),
+    Column('token', String(255), nullable=False, unique=True),
+    Column('created_by_id', UUID(as_uuid=True), ForeignKey('user.user_id'), nullable=False),
+    Column('expires_at', DateTime, nullable=False),
+    Column('usage_limit', Integer),
+    Column('usage_count', Integer),
+    Column('is_active', Boolean),
+    Column('permissions', JSON),
+    Column('created_at', DateTime, nullable=False)
+)
+
+Table(
+    'backup', metadata,
+    Column('backup_id', UUID(as_uuid=True), primary_key=True),
+    Column('project_id', UUID(as_uuid=True), ForeignKey('project.project_id'), nullable=False),
+    Column('created_by_id', UUID(as_uuid=True), ForeignKey('user.user_id'), nullable=False),
+    Column('backup_type', String(20)),
+    Column('file_path', String(500)),
+    Column('size_bytes', BigInteger),
+    Column('status', String(20)),
+    Column('created_at', DateTime, nullable=False),
+    Column('completed_at', DateTime)
+)
+
+Table(
+    'audit_log', metadata,
+    Column('log_id', UUID(as_uuid=True), primary_key=True),
+    Column('user_id', UUID(as_uuid=True), ForeignKey('user.user_id'), nullable=False),
+    Column('action', String(100), nullable=False),
+    Column('description', Text),
+    Column('created_at', DateTime, primary_key=True),
+    Index('idx_audit_log_created_at', 'created_at'),
+    Index('idx_audit_log_user_created', 'user_id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)'
+)
+
+Table(
+    'activity_log', metadata,
+    Column('log_id', UUID(as_uuid=True), primary_key=True),
+    Column('user_id', UUID(as_uuid=True), ForeignKey('user.user_id'), nullable=False),
+    Column('action', String(100), nullable=False),
+    Column('entity_type', String(50), nullable=False),
+    Column('entity_id', UUID(as_uuid=True), nullable=False),
+    Column('details', JSON),
+    Column('timestamp', DateTime, primary_key=True),
+    Index('idx_activity_log_timestamp', 'timestamp'),
+    Index('idx_activity_log_user_timestamp', 'user_id', 'timestamp'),
+    postgresql_partition_by='RANGE (timestamp)'
+)
+
+Table(
+    'project_daily_rollup', metadata,
+    Column('project_id', UUID(as_uuid=True), ForeignKey('project.project_id', ondelete='CASCADE'), primary_key=True),
+    Column('day', Date, primary_key=True),
+    Column('open_tasks', Integer, nullable=False),
+    Column('in_progress_tasks', Integer, nullable=False),
+    Column('done_tasks', Integer, nullable=False),
+    Column('open_bugs', Integer, nullable=False),
+    Column('remaining_hours', Float, nullable=False),
+    Column('completed_tasks', Integer, nullable=False),
+    Column('completed_hours', Float, nullable=False),
+    Column('logged_hours', Float, nullable=False),
+    Column('computed_at', DateTime, nullable=False)
+)
+
+Table(
+    'sprint_daily_rollup', metadata,
+    Column('sprint_id', UUID(as_uuid=True), ForeignKey('sprint.sprint_id', ondelete='CASCADE'), primary_key=True),
+    Column('day', Date, primary_key=True),
+    Column('project_id', UUID(as_uuid=True), ForeignKey('project.project_id', ondelete='CASCADE'), nullable=False),
+    Column('total_tasks', Integer, nullable=False),
+    Column('done_tasks', Integer, nullable=False),
+    Column('committed_hours', Float, nullable=False),
+    Column('remaining_hours', Float, nullable=False),
+    Column('completed_hours', Float, nullable=False),
+    Column('logged_hours', Float, nullable=False),
+    Column('computed_at', DateTime, nullable=False),
+    Index('ix_sprint_daily_rollup_project_id', 'project_id')
+)
+
+Table(
+    'rollup_watermark', metadata,
+    Column('name', String(50), primary_key=True),
+    Column('refreshed_at', DateTime, nullable=False)
+)
+
+Table(
+    'task_status_transition', metadata,
+    Column('transition_id', UUID(as_uuid=True), primary_key=True),
+    Column('task_id', UUID(as_uuid=True), ForeignKey('task.task_id', ondelete='CASCADE'), nullable=False),
+    Column('project_id', UUID(as_uuid=True), nullable=False),
+    Column('from_status', String(20)),
+    Column('to_status', String(20), nullable=False),
+    Column('changed_at', DateTime, nullable=False),
+    Column('seconds_in_from_status', Float),
+    Index('idx_task_transition_project_changed', 'project_id', 'changed_at'),
+    Index('idx_task_transition_task_changed', 'task_id', 'changed_at')
+)
+
+Table(
+    'task_status_daily_rollup', metadata,
+    Column('project_id', UUID(as_uuid=True), primary_key=True),
+    Column('day', Date, primary_key=True),
+    Column('status', String(20), primary_key=True),
+    Column('entered', Integer, nullable=False),
+    Column('exited', Integer, nullable=False),
+    Column('seconds_in_status', Float, nullable=False)
+)
+
+Table(
+    'task_cycle_time_daily_rollup', metadata,
+    Column('project_id', UUID(as_uuid=True), primary_key=True),
+    Column('day', Date, primary_key=True),
+    Column('metric', String(10), primary_key=True),
+    Column('bucket', Integer, primary_key=True),
+    Column('task_count', Integer, nullable=False)
+)
+
+Table(
+    'project_health_score', metadata,
+    Column('project_id', UUID(as_uuid=True), ForeignKey('project.project_id', ondelete='CASCADE'), primary_key=True),
+    Column('score', Float, nullable=False),
+    Column('overdue_ratio', Float, nullable=False),
+    Column('blocked_ratio', Float, nullable=False),
+    Column('throughput_trend', Float, nullable=False),
+    Column('estimate_overrun', Float, nullable=False),
+    Column('open_tasks', Integer, nullable=False),
+    Column('stale', Boolean, nullable=False),
+    Column('computed_at', DateTime, nullable=False),
+    Index('ix_project_health_score_stale', 'stale')
+)
+
+Table(
+    'weekly_time_rollup', metadata,
+    Column('user_id', UUID(as_uuid=True), ForeignKey('user.user_id', ondelete='CASCADE'), primary_key=True),
+    Column('project_id', UUID(as_uuid=True), ForeignKey('project.project_id', ondelete='CASCADE'), primary_key=True),
+    Column('week_start', Date, primary_key=True),
+    Column('hours', Float, nullable=False),
+    Column('entries', Integer, nullable=False)
+)
+
+
+def upgrade(connection):
+    metadata.create_all(connection, checkfirst=True)
@@ -0,0 +1,43 @@
+-- Secondary indexes from jira_board_schema.sql
+-- Story and notification tables (and the story_id columns) exist only in the SQL
+-- schema, not in the models, so their indexes stay in jira_board_schema.sql
+
+CREATE INDEX IF NOT EXISTS idx_user_role_id ON "user"(role_id);
+CREATE INDEX IF NOT EXISTS idx_user_roles_user_id ON user_roles(user_id);
+CREATE INDEX IF NOT EXISTS idx_user_roles_role_id ON user_roles(role_id);
+CREATE INDEX IF NOT EXISTS idx_user_roles_primary ON user_roles(user_id, is_primary) WHERE is_primary = TRUE;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_user_roles_unique_primary ON user_roles(user_id) WHERE is_primary = TRUE;
+CREATE INDEX IF NOT EXISTS idx_task_project_id ON task(project_id);
+CREATE INDEX IF NOT EXISTS idx_task_subproject_id ON task(subproject_id);
+CREATE INDEX IF NOT EXISTS idx_task_sprint_id ON task(sprint_id);
+CREATE INDEX IF NOT EXISTS idx_task_assigned_to_id ON task(assigned_to_id);
+CREATE INDEX IF NOT EXISTS idx_task_project_updated ON task(project_id, updated_at, task_id);
+CREATE INDEX IF NOT EXISTS idx_task_project_created ON task(project_id, created_at, task_id);
+CREATE INDEX IF NOT EXISTS idx_task_project_due ON task(project_id, due_date, task_id);
+CREATE INDEX IF NOT EXISTS idx_task_project_status_updated ON task(project_id, status, updated_at);
+CREATE INDEX IF NOT EXISTS idx_ticket_raised_by_id ON ticket(raised_by_id);
+CREATE INDEX IF NOT EXISTS idx_comment_task_id ON comment(task_id);
+CREATE INDEX IF NOT EXISTS idx_comment_ticket_id ON comment(ticket_id);
+CREATE INDEX IF NOT EXISTS idx_attachment_task_id ON attachment(task_id);
+CREATE INDEX IF NOT EXISTS idx_attachment_ticket_id ON attachment(ticket_id);
+CREATE INDEX IF NOT EXISTS idx_sprint_project_id ON sprint(project_id);
+CREATE INDEX IF NOT EXISTS idx_sprint_subproject_id ON sprint(subproject_id);
+CREATE INDEX IF NOT EXISTS idx_board_project_id ON board(project_id);
+CREATE INDEX IF NOT EXISTS idx_report_project_id ON report(project_id);
+CREATE INDEX IF NOT EXISTS idx_goal_project_id ON goal(project_id);
+CREATE INDEX IF NOT EXISTS idx_goal_user_id ON goal(user_id);
+CREATE INDEX IF NOT EXISTS idx_goal_status ON goal(status);
+CREATE INDEX IF NOT EXISTS idx_goal_priority ON goal(priority);
+CREATE INDEX IF NOT EXISTS idx_goal_target_date ON goal(target_date);
+CREATE INDEX IF NOT EXISTS idx_epic_project_id ON epic(project_id);
+CREATE INDEX IF NOT EXISTS idx_epic_created_by_id ON epic(created_by_id);
+CREATE INDEX IF NOT EXISTS idx_epic_status ON epic(status);
+CREATE INDEX IF NOT EXISTS idx_audit_log_created_at ON audit_log(created_at);
+CREATE INDEX IF NOT EXISTS idx_audit_log_user_created ON audit_log(user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_activity_log_timestamp ON activity_log(timestamp);
+CREATE INDEX IF NOT EXISTS idx_activity_log_user_timestamp ON activity_log(user_id, timestamp);
+CREATE INDEX IF NOT EXISTS ix_sprint_daily_rollup_project_id ON sprint_daily_rollup(project_id);
+CREATE INDEX IF NOT EXISTS idx_task_transition_task_changed ON task_status_transition(task_id, changed_at);
+CREATE INDEX IF NOT EXISTS idx_task_transition_project_changed ON task_status_transition(project_id, changed_at);
+CREATE INDEX IF NOT EXISTS ix_project_health_score_stale ON project_health_score(stale);
+CREATE INDEX IF NOT EXISTS idx_project_access_project ON project_access(project_id, user_id);
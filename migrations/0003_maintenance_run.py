@@ -0,0 +1,31 @@
+"""
+maintenance_run: persisted database maintenance jobs and their results
+"""
+
+from sqlalchemy import MetaData, Table, Column, ForeignKey, Index, String, Text, Integer, DateTime, JSON
+from sqlalchemy.dialects.postgresql import UUID
+
+metadata = MetaData()
+
+# Referenced by the foreign key only; not created here
+Table('user', metadata, Column('user_id', UUID(as_uuid=True), primary_key=True))
+
+maintenance_run = Table(
+    'maintenance_run', metadata,
+    Column('run_id', UUID(as_uuid=True), primary_key=True),
+    Column('kind', String(20), nullable=False),
+    Column('status', String(20), nullable=False),
+    Column('progress', Integer, nullable=False),
+    Column('message', String(255)),
+    Column('requested_by_id', UUID(as_uuid=True), ForeignKey('user.user_id', ondelete='SET NULL')),
+    Column('created_at', DateTime, nullable=False),
+    Column('started_at', DateTime),
+    Column('finished_at', DateTime),
+    Column('results', JSON),
+    Column('error', Text),
+    Index('idx_maintenance_run_kind_created', 'kind', 'created_at')
+)
+
+
+def upgrade(connection):
+    maintenance_run.create(connection, checkfirst=True)
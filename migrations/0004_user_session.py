@@ -0,0 +1,26 @@
+"""
+user_session: server-side session store rows
+"""
+
+from sqlalchemy import MetaData, Table, Column, ForeignKey, Index, LargeBinary, Text, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+
+metadata = MetaData()
+
+# Referenced by the foreign key only; not created here
+Table('user', metadata, Column('user_id', UUID(as_uuid=True), primary_key=True))
+
+user_session = Table(
+    'user_session', metadata,
+    Column('session_hash', LargeBinary(32), primary_key=True),
+    Column('user_id', UUID(as_uuid=True), ForeignKey('user.user_id', ondelete='CASCADE')),
+    Column('data', Text, nullable=False),
+    Column('expires_at', DateTime, nullable=False),
+    Column('created_at', DateTime, nullable=False),
+    Index('idx_user_session_user', 'user_id'),
+    Index('idx_user_session_expires', 'expires_at')
+)
+
+
+def upgrade(connection):
+    user_session.create(connection, checkfirst=True)
@@ -0,0 +1,23 @@
+"""
+task_status_transition.rolled_up_at: marks transitions already folded into the flow rollups
+
+Transitions at or before the old task_flow watermark were counted by earlier
+runs, so they are stamped with it; later ones are left for the next run.
+"""
+
+
+def upgrade(connection):
+    from sqlalchemy import inspect, text
+
+    columns = {column['name'] for column in inspect(connection).get_columns('task_status_transition')}
+    if 'rolled_up_at' not in columns:
+        connection.execute(text('ALTER TABLE task_status_transition ADD COLUMN rolled_up_at TIMESTAMP'))
+        connection.execute(text(
+            "UPDATE task_status_transition "
+            "SET rolled_up_at = (SELECT refreshed_at FROM rollup_watermark WHERE name = 'task_flow') "
+            "WHERE changed_at <= (SELECT refreshed_at FROM rollup_watermark WHERE name = 'task_flow')"
+        ))
+    connection.execute(text(
+        'CREATE INDEX IF NOT EXISTS idx_task_transition_pending '
+        'ON task_status_transition (changed_at) WHERE rolled_up_at IS NULL'
+    ))
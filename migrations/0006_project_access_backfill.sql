@@ -0,0 +1,26 @@
+-- Backfill project_access from manager, developer and team assignments
+-- The table was created empty, so without this every non-admin lost access until
+-- `flask access rebuild` ran. Same grants as project_access._grants(), keeping the
+-- strongest level per user and project; rows that already exist are left alone.
+
+INSERT INTO project_access (user_id, project_id, access_level, updated_at)
+SELECT grants.user_id, grants.project_id,
+       CASE MAX(grants.weight) WHEN 3 THEN 'manager' WHEN 2 THEN 'developer' ELSE 'team' END,
+       CURRENT_TIMESTAMP
+FROM (
+    SELECT manager_project.manager_id AS user_id, manager_project.project_id AS project_id, 3 AS weight
+    FROM manager_project
+    UNION ALL
+    SELECT developer_project.developer_id, developer_project.project_id, 2
+    FROM developer_project
+    UNION ALL
+    SELECT developer_team.developer_id, manager_project.project_id, 1
+    FROM developer_team
+    JOIN team ON team.team_id = developer_team.team_id
+    JOIN manager_project ON manager_project.manager_id = team.manager_id
+) AS grants
+WHERE NOT EXISTS (
+    SELECT 1 FROM project_access
+    WHERE project_access.user_id = grants.user_id AND project_access.project_id = grants.project_id
+)
+GROUP BY grants.user_id, grants.project_id;
@@ -0,0 +1,5 @@
+-- work_log indexes for reconciliation (per task) and timesheets (per user and day)
+-- Databases built by the old create_all() already had work_log, so 0001 skipped it
+
+CREATE INDEX IF NOT EXISTS idx_work_log_task_id ON work_log(task_id);
+CREATE INDEX IF NOT EXISTS idx_work_log_user_date ON work_log(user_id, log_date);
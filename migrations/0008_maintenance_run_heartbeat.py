@@ -0,0 +1,24 @@
+"""
+maintenance_run.heartbeat_at and one active run per kind
+
+Runs left queued or running by an earlier process have no owner, so they are
+marked failed; the unique index then keeps two workers from starting the same
+kind of job at once.
+"""
+
+
+def upgrade(connection):
+    from sqlalchemy import inspect, text
+
+    columns = {column['name'] for column in inspect(connection).get_columns('maintenance_run')}
+    if 'heartbeat_at' not in columns:
+        connection.execute(text('ALTER TABLE maintenance_run ADD COLUMN heartbeat_at TIMESTAMP'))
+    connection.execute(text(
+        "UPDATE maintenance_run SET status = 'failed', message = 'Abandoned', "
+        "error = 'Interrupted before the upgrade to migration 0008', finished_at = CURRENT_TIMESTAMP "
+        "WHERE status IN ('queued', 'running')"
+    ))
+    connection.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_maintenance_run_active_kind "
+        "ON maintenance_run (kind) WHERE status IN ('queued', 'running')"
+    ))
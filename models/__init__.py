@@ -2,7 +2,7 @@
 from .models_models import db
 from .role_models import Role
 from .user_models import User
-from .login_models import Login
+from .login_models import Login, UserSession
 from .team_models import Team
 from .project_models import Project
 from .subproject_models import Subproject
@@ -11,6 +11,8 @@ from .epic_models import Epic
 from .developer_team_models import DeveloperTeam
 from .developer_project_models import DeveloperProject
 from .manager_project_models import ManagerProject
+from .project_access_models import ProjectAccess
+from .maintenance_models import MaintenanceRun
 
 # Add other model imports as needed
 try:
@@ -28,8 +30,14 @@ try:
 except ImportError:
     pass
 
+try:
+    from .audit_log_models import AuditLog
+    from .system_models import ActivityLog
+except ImportError:
+    pass
+
 # Export commonly used models
 __all__ = [
-    'db', 'Role', 'User', 'Login', 'Team', 'Project', 'Subproject', 'Sprint', 'Epic',
-    'DeveloperTeam', 'DeveloperProject', 'ManagerProject'
+    'db', 'Role', 'User', 'Login', 'UserSession', 'Team', 'Project', 'Subproject', 'Sprint', 'Epic',
+    'DeveloperTeam', 'DeveloperProject', 'ManagerProject', 'ProjectAccess', 'MaintenanceRun'
 ]
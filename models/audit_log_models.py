@@ -3,9 +3,16 @@ import uuid
 from datetime import datetime
 
 class AuditLog(db.Model):
+    """Audit trail, range-partitioned by month on created_at (see log_partitions.py)"""
     __tablename__ = 'audit_log'
+    __table_args__ = (
+        db.Index('idx_audit_log_created_at', 'created_at'),
+        db.Index('idx_audit_log_user_created', 'user_id', 'created_at'),
+        {'postgresql_partition_by': 'RANGE (created_at)'}
+    )
+    # Partition key must be part of the primary key on a partitioned table
     log_id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = db.Column(UUID(as_uuid=True), db.ForeignKey('user.user_id'), nullable=False)
     action = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
-    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
\ No newline at end of file
+    created_at = db.Column(db.DateTime, primary_key=True, nullable=False, default=datetime.utcnow)
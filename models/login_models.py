@@ -12,4 +12,18 @@ class Login(db.Model):
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     
     # Relationships
-    user = db.relationship('User', backref='login_sessions')
\ No newline at end of file
+    user = db.relationship('User', backref='login_sessions')
+
+class UserSession(db.Model):
+    """Server-side Flask session, keyed by the SHA-256 of the cookie token (see session_store.py)"""
+    __tablename__ = 'user_session'
+    __table_args__ = (
+        db.Index('idx_user_session_user', 'user_id'),
+        db.Index('idx_user_session_expires', 'expires_at'),
+    )
+
+    session_hash = db.Column(db.LargeBinary(32), primary_key=True)
+    user_id = db.Column(UUID(as_uuid=True), db.ForeignKey('user.user_id', ondelete='CASCADE'))  # NULL: anonymous
+    data = db.Column(db.Text, nullable=False)  # Flask's tagged-JSON session payload
+    expires_at = db.Column(db.DateTime, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
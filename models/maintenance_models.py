@@ -0,0 +1,41 @@
+from .models_models import db, UUID
+from datetime import datetime
+import uuid
+
+class MaintenanceRun(db.Model):
+    """One database maintenance job (optimize / analyze / integrity) and its results (see db_maintenance.py)"""
+    __tablename__ = 'maintenance_run'
+    __table_args__ = (
+        db.Index('idx_maintenance_run_kind_created', 'kind', 'created_at'),
+        # At most one queued or running run per kind, across every worker process
+        db.Index('idx_maintenance_run_active_kind', 'kind', unique=True,
+                 postgresql_where=db.text("status IN ('queued', 'running')"),
+                 sqlite_where=db.text("status IN ('queued', 'running')")),
+    )
+    
+    run_id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = db.Column(db.String(20), nullable=False)  # optimize, analyze, integrity
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, succeeded, failed
+    progress = db.Column(db.Integer, nullable=False, default=0)  # percent
+    message = db.Column(db.String(255))
+    requested_by_id = db.Column(UUID(as_uuid=True), db.ForeignKey('user.user_id', ondelete='SET NULL'))
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)  # refreshed by the owning process while queued or running
+    results = db.Column(db.JSON)
+    error = db.Column(db.Text)
+
+    def to_dict(self):
+        return {
+            'job_id': str(self.run_id),
+            'kind': self.kind,
+            'status': self.status,
+            'progress': self.progress,
+            'message': self.message,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'results': self.results,
+            'error': self.error
+        }
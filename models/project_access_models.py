@@ -0,0 +1,14 @@
+from .models_models import db, UUID
+from datetime import datetime
+
+class ProjectAccess(db.Model):
+    """Materialized project access derived from manager/developer/team assignments (see project_access.py)"""
+    __tablename__ = 'project_access'
+    __table_args__ = (
+        db.Index('idx_project_access_project', 'project_id', 'user_id'),
+    )
+    
+    user_id = db.Column(UUID(as_uuid=True), db.ForeignKey('user.user_id', ondelete='CASCADE'), primary_key=True)
+    project_id = db.Column(UUID(as_uuid=True), db.ForeignKey('project.project_id', ondelete='CASCADE'), primary_key=True)
+    access_level = db.Column(db.String(20), nullable=False)  # manager, developer, team
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -8,4 +8,28 @@ class Project(db.Model):
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ProjectHealthScore(db.Model):
+    """Persisted project health score (see project_health.py)"""
+    __tablename__ = 'project_health_score'
+    project_id = db.Column(UUID(as_uuid=True), db.ForeignKey('project.project_id', ondelete='CASCADE'), primary_key=True)
+    score = db.Column(db.Float, nullable=False)
+    overdue_ratio = db.Column(db.Float, nullable=False, default=0.0)
+    blocked_ratio = db.Column(db.Float, nullable=False, default=0.0)
+    throughput_trend = db.Column(db.Float, nullable=False, default=0.0)  # -1 (falling) .. 1 (rising)
+    estimate_overrun = db.Column(db.Float, nullable=False, default=0.0)  # logged / estimated - 1, floored at 0
+    open_tasks = db.Column(db.Integer, nullable=False, default=0)
+    stale = db.Column(db.Boolean, nullable=False, default=False, index=True)  # set when the project's tasks change
+    computed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'score': self.score,
+            'overdue_ratio': self.overdue_ratio,
+            'blocked_ratio': self.blocked_ratio,
+            'throughput_trend': self.throughput_trend,
+            'estimate_overrun': self.estimate_overrun,
+            'open_tasks': self.open_tasks,
+            'computed_at': self.computed_at.isoformat() if self.computed_at else None
+        }
@@ -11,4 +11,63 @@ class Report(db.Model):
     project_id = db.Column(UUID(as_uuid=True), db.ForeignKey('project.project_id'))
     manager_id = db.Column(UUID(as_uuid=True), db.ForeignKey('manager.manager_id'))
     client_id = db.Column(UUID(as_uuid=True), db.ForeignKey('client.client_id'))
-    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
\ No newline at end of file
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+class ProjectDailyRollup(db.Model):
+    """Per-project daily snapshot feeding throughput and open-bug charts (see report_engine.py)"""
+    __tablename__ = 'project_daily_rollup'
+    project_id = db.Column(UUID(as_uuid=True), db.ForeignKey('project.project_id', ondelete='CASCADE'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    open_tasks = db.Column(db.Integer, nullable=False, default=0)
+    in_progress_tasks = db.Column(db.Integer, nullable=False, default=0)
+    done_tasks = db.Column(db.Integer, nullable=False, default=0)
+    open_bugs = db.Column(db.Integer, nullable=False, default=0)
+    remaining_hours = db.Column(db.Float, nullable=False, default=0.0)
+    completed_tasks = db.Column(db.Integer, nullable=False, default=0)  # completed during this day
+    completed_hours = db.Column(db.Float, nullable=False, default=0.0)
+    logged_hours = db.Column(db.Float, nullable=False, default=0.0)  # WorkLog hours for this day
+    computed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+class SprintDailyRollup(db.Model):
+    """Per-sprint daily snapshot feeding burndown and velocity charts"""
+    __tablename__ = 'sprint_daily_rollup'
+    sprint_id = db.Column(UUID(as_uuid=True), db.ForeignKey('sprint.sprint_id', ondelete='CASCADE'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    project_id = db.Column(UUID(as_uuid=True), db.ForeignKey('project.project_id', ondelete='CASCADE'), nullable=False, index=True)
+    total_tasks = db.Column(db.Integer, nullable=False, default=0)
+    done_tasks = db.Column(db.Integer, nullable=False, default=0)
+    committed_hours = db.Column(db.Float, nullable=False, default=0.0)
+    remaining_hours = db.Column(db.Float, nullable=False, default=0.0)
+    completed_hours = db.Column(db.Float, nullable=False, default=0.0)
+    logged_hours = db.Column(db.Float, nullable=False, default=0.0)
+    computed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+class RollupWatermark(db.Model):
+    """Last successful refresh time of each incremental rollup job"""
+    __tablename__ = 'rollup_watermark'
+    name = db.Column(db.String(50), primary_key=True)
+    refreshed_at = db.Column(db.DateTime, nullable=False)
+
+    @classmethod
+    def get(cls, name):
+        """Return the last refresh time, or None if the job never ran"""
+        row = cls.query.get(name)
+        return row.refreshed_at if row else None
+
+    @classmethod
+    def set(cls, name, refreshed_at):
+        """Record a refresh; caller commits"""
+        row = cls.query.get(name)
+        if row:
+            row.refreshed_at = refreshed_at
+        else:
+            db.session.add(cls(name=name, refreshed_at=refreshed_at))
+
+class WeeklyTimeRollup(db.Model):
+    """Hours logged per user, project and ISO week (maintained by time_tracking.py)"""
+    __tablename__ = 'weekly_time_rollup'
+    user_id = db.Column(UUID(as_uuid=True), db.ForeignKey('user.user_id', ondelete='CASCADE'), primary_key=True)
+    project_id = db.Column(UUID(as_uuid=True), db.ForeignKey('project.project_id', ondelete='CASCADE'), primary_key=True)
+    week_start = db.Column(db.Date, primary_key=True)  # Monday of the week
+    hours = db.Column(db.Float, nullable=False, default=0.0)
+    entries = db.Column(db.Integer, nullable=False, default=0)
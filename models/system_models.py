@@ -70,6 +70,11 @@ class NotificationPreference(db.Model):
 class ActivityLog(db.Model):
     """Activity log for SRS requirement: Real-time collaboration tracking"""
     __tablename__ = 'activity_log'
+    __table_args__ = (
+        db.Index('idx_activity_log_timestamp', 'timestamp'),
+        db.Index('idx_activity_log_user_timestamp', 'user_id', 'timestamp'),
+        {'postgresql_partition_by': 'RANGE (timestamp)'}  # Monthly partitions, see log_partitions.py
+    )
     
     log_id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = db.Column(UUID(as_uuid=True), db.ForeignKey('user.user_id'), nullable=False)
@@ -77,7 +82,7 @@ class ActivityLog(db.Model):
     entity_type = db.Column(db.String(50), nullable=False)  # task, project, comment, etc.
     entity_id = db.Column(UUID(as_uuid=True), nullable=False)
     details = db.Column(db.JSON)  # Additional action details
-    timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    timestamp = db.Column(db.DateTime, primary_key=True, nullable=False, default=datetime.utcnow)
     
     # Relationships
     user = db.relationship('User', backref='activity_logs')
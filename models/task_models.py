@@ -1,9 +1,18 @@
 from .models_models import db, UUID, TaskStatus, TaskType
+from sqlalchemy import event, select, func, inspect, true
+from sqlalchemy.orm import Session
 from datetime import datetime
 import uuid
 
 class Task(db.Model):
     __tablename__ = 'task'
+    __table_args__ = (
+        # Keyset pagination of the project task table (see project_overview.py)
+        db.Index('idx_task_project_updated', 'project_id', 'updated_at', 'task_id'),
+        db.Index('idx_task_project_created', 'project_id', 'created_at', 'task_id'),
+        db.Index('idx_task_project_due', 'project_id', 'due_date', 'task_id'),
+        db.Index('idx_task_project_status_updated', 'project_id', 'status', 'updated_at'),
+    )
     task_id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
@@ -48,6 +57,10 @@ class TaskDependency(db.Model):
 class WorkLog(db.Model):
     """Work log model for SRS requirement: Time Tracking"""
     __tablename__ = 'work_log'
+    __table_args__ = (
+        db.Index('idx_work_log_task_id', 'task_id'),
+        db.Index('idx_work_log_user_date', 'user_id', 'log_date'),
+    )
     
     log_id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     task_id = db.Column(UUID(as_uuid=True), db.ForeignKey('task.task_id'), nullable=False)
@@ -58,4 +71,185 @@ class WorkLog(db.Model):
     
     # Relationships
     task = db.relationship('Task', backref='work_logs')
-    user = db.relationship('User', backref='work_logs')
\ No newline at end of file
+    user = db.relationship('User', backref='work_logs')
+
+class TaskStatusTransition(db.Model):
+    """Append-only log of task status changes, written in the same flush as the change"""
+    __tablename__ = 'task_status_transition'
+    __table_args__ = (
+        db.Index('idx_task_transition_task_changed', 'task_id', 'changed_at'),
+        db.Index('idx_task_transition_project_changed', 'project_id', 'changed_at'),
+        # Transitions not yet folded into the flow rollups (see report_engine.refresh_flow_rollups)
+        db.Index('idx_task_transition_pending', 'changed_at',
+                 postgresql_where=db.text('rolled_up_at IS NULL'),
+                 sqlite_where=db.text('rolled_up_at IS NULL')),
+    )
+
+    transition_id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    task_id = db.Column(UUID(as_uuid=True), db.ForeignKey('task.task_id', ondelete='CASCADE'), nullable=False)
+    project_id = db.Column(UUID(as_uuid=True), nullable=False)
+    from_status = db.Column(db.String(20))  # NULL for the initial status of a new task
+    to_status = db.Column(db.String(20), nullable=False)
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    seconds_in_from_status = db.Column(db.Float)  # time spent in from_status before this change
+    rolled_up_at = db.Column(db.DateTime)  # set by the run that counted this transition
+
+
+class TaskStatusDailyRollup(db.Model):
+    """Per-project, per-status daily flow counts (cumulative flow and time in status)"""
+    __tablename__ = 'task_status_daily_rollup'
+
+    project_id = db.Column(UUID(as_uuid=True), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+    entered = db.Column(db.Integer, nullable=False, default=0)
+    exited = db.Column(db.Integer, nullable=False, default=0)
+    seconds_in_status = db.Column(db.Float, nullable=False, default=0.0)  # summed over tasks that exited
+
+
+class TaskCycleTimeDailyRollup(db.Model):
+    """Daily histogram of cycle and lead times for tasks completed that day"""
+    __tablename__ = 'task_cycle_time_daily_rollup'
+
+    project_id = db.Column(UUID(as_uuid=True), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    metric = db.Column(db.String(10), primary_key=True)  # cycle, lead
+    bucket = db.Column(db.Integer, primary_key=True)  # index into CYCLE_TIME_BUCKETS
+    task_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+def _status_value(value):
+    return value.value if hasattr(value, 'value') else (str(value) if value is not None else None)
+
+
+def _last_transitions(session, task_ids):
+    """The latest transition of each task, read in one query"""
+    if not task_ids:
+        return {}
+    ranked = (
+        select(TaskStatusTransition.task_id, TaskStatusTransition.to_status, TaskStatusTransition.changed_at,
+               func.row_number().over(partition_by=TaskStatusTransition.task_id,
+                                      order_by=TaskStatusTransition.changed_at.desc()).label('position'))
+        .where(TaskStatusTransition.task_id.in_(task_ids))
+        .subquery()
+    )
+    with session.no_autoflush:
+        rows = session.execute(
+            select(ranked.c.task_id, ranked.c.to_status, ranked.c.changed_at).where(ranked.c.position == 1)
+        )
+        return {row.task_id: row for row in rows}
+
+
+def _transition(task_id, project_id, old_status, new_status, previous, created_at, now):
+    entered_at = previous.changed_at if previous else created_at
+    return TaskStatusTransition(
+        task_id=task_id,
+        project_id=project_id,
+        from_status=old_status,
+        to_status=new_status,
+        changed_at=now,
+        seconds_in_from_status=(now - entered_at).total_seconds() if entered_at else None
+    )
+
+
+@event.listens_for(Session, 'before_flush')
+def record_task_status_transitions(session, flush_context, instances):
+    """Append a TaskStatusTransition for every new task and every task whose status changed"""
+    now = datetime.utcnow()
+    for obj in list(session.new):
+        if isinstance(obj, Task) and obj.status is not None:
+            # Column defaults only fire at INSERT time; the transition needs the id now
+            if obj.task_id is None:
+                obj.task_id = uuid.uuid4()
+            session.add(TaskStatusTransition(
+                task_id=obj.task_id,
+                project_id=obj.project_id,
+                from_status=None,
+                to_status=_status_value(obj.status),
+                changed_at=obj.created_at or now
+            ))
+
+    changed = []
+    for obj in list(session.dirty):
+        if isinstance(obj, Task):
+            history = inspect(obj).attrs.status.history
+            if history.added:
+                changed.append((obj, history))
+    if not changed:
+        return
+
+    # The previous status is unknown when the instance was expired before assignment,
+    # so read it from the latest transition (or the stored row for pre-log tasks)
+    last = _last_transitions(session, [obj.task_id for obj, _ in changed])
+    unlogged = [obj.task_id for obj, history in changed if not history.deleted and obj.task_id not in last]
+    stored = {}
+    if unlogged:
+        with session.no_autoflush:
+            stored = dict(session.execute(
+                select(Task.__table__.c.task_id, Task.__table__.c.status)
+                .where(Task.__table__.c.task_id.in_(unlogged))
+            ).all())
+
+    for obj, history in changed:
+        previous = last.get(obj.task_id)
+        if history.deleted:
+            old_status = _status_value(history.deleted[0])
+        elif previous:
+            old_status = previous.to_status
+        else:
+            old_status = _status_value(stored.get(obj.task_id))
+        new_status = _status_value(obj.status)
+        if old_status != new_status:
+            session.add(_transition(obj.task_id, obj.project_id, old_status, new_status,
+                                    previous, obj.created_at, now))
+
+
+def _sets_status(statement, parameters):
+    if isinstance(parameters, (list, tuple)):
+        return any('status' in row for row in parameters)
+    return 'status' in (parameters or {}) or 'status' in statement.compile().params
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def record_bulk_status_transitions(orm_execute_state):
+    """
+    Bulk UPDATEs of task.status run through session.execute() never reach
+    before_flush, so compare the matched rows' statuses before and after the
+    statement. Statements run on a bare connection are still not recorded.
+    """
+    if not orm_execute_state.is_update:
+        return None
+    statement = orm_execute_state.statement
+    table = Task.__table__
+    parameters = orm_execute_state.parameters
+    if not statement.table.compare(table) or not _sets_status(statement, parameters):
+        return None
+
+    session = orm_execute_state.session
+    if isinstance(parameters, (list, tuple)):
+        # ORM bulk UPDATE by primary key
+        match = table.c.task_id.in_([row['task_id'] for row in parameters if 'task_id' in row])
+        parameters = {}
+    else:
+        match = statement.whereclause if statement.whereclause is not None else true()
+    with session.no_autoflush:
+        before = {row.task_id: row for row in session.execute(
+            select(table.c.task_id, table.c.project_id, table.c.status, table.c.created_at).where(match),
+            parameters or {}
+        )}
+    result = orm_execute_state.invoke_statement()
+    if not before:
+        return result
+
+    with session.no_autoflush:
+        after = dict(session.execute(
+            select(table.c.task_id, table.c.status).where(table.c.task_id.in_(list(before)))
+        ).all())
+    last = _last_transitions(session, list(before))
+    now = datetime.utcnow()
+    for task_id, row in before.items():
+        old_status, new_status = _status_value(row.status), _status_value(after.get(task_id))
+        if new_status is not None and old_status != new_status:
+            session.add(_transition(task_id, row.project_id, old_status, new_status,
+                                    last.get(task_id), row.created_at, now))
+    return result
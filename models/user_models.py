@@ -22,7 +22,8 @@ class User(UserMixin, db.Model):
     role = db.relationship('Role', backref='users')
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        from login_pipeline import password_method
+        self.password_hash = generate_password_hash(password, method=password_method())
 
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
@@ -6,6 +6,7 @@ Handles role-based permissions and feature-level access control
 from functools import wraps
 from flask import abort, flash, redirect, url_for, request
 from flask_login import current_user
+from project_access import access_level, is_team_member
 
 # Define all available permissions/features in the system
 AVAILABLE_PERMISSIONS = {
@@ -348,13 +349,12 @@ def can_user_access_team(user, team_id):
     if not user or not user.is_authenticated:
         return False
     
-    # Admin and manager can access all teams
-    if getattr(user, 'role_name', None) in ['admin', 'manager']:
+    # Admin can access all teams
+    if getattr(user, 'role_name', None) == 'admin':
         return True
     
-    # TODO: Check if user is member of the team
-    # This would require a database query to check team membership
-    return True  # For now, allow access
+    # Team manager or member; one indexed lookup, cached for the request
+    return is_team_member(user.user_id, team_id)
 
 def can_user_access_project(user, project_id):
     """
@@ -370,13 +370,12 @@ def can_user_access_project(user, project_id):
     if not user or not user.is_authenticated:
         return False
     
-    # Admin and manager can access all projects
-    if getattr(user, 'role_name', None) in ['admin', 'manager']:
+    # Admin can access all projects
+    if getattr(user, 'role_name', None) == 'admin':
         return True
     
-    # TODO: Check if user is assigned to the project
-    # This would require a database query to check project assignment
-    return True  # For now, allow access
+    # Manager, developer or team assignment via project_access (see project_access.py)
+    return access_level(user.user_id, project_id) is not None
 
 def get_user_permissions(user):
     """
@@ -397,6 +396,23 @@ def get_user_permissions(user):
     
     return ROLE_PERMISSIONS.get(str(user_role), [])
 
+def set_role_permissions(role_name, permissions):
+    """
+    Replace a role's permissions at runtime
+    
+    Args:
+        role_name: Role whose permissions change
+        permissions: Iterable of keys from AVAILABLE_PERMISSIONS
+    """
+    unknown = set(permissions) - set(AVAILABLE_PERMISSIONS)
+    if unknown:
+        raise ValueError(f"Unknown permissions: {', '.join(sorted(unknown))}")
+    ROLE_PERMISSIONS[role_name] = list(permissions)
+    
+    # Cached sidebars/navigation were rendered with the old permission set
+    from fragment_cache import fragment_cache
+    fragment_cache.invalidate(role_name)
+
 def get_available_roles():
     """
     Get list of all available roles in the system
@@ -0,0 +1,215 @@
+"""
+Materialized project access for the Jira Board Application
+One (user_id, project_id, access_level) row per user and project, kept in sync
+with manager, developer and team assignments so that access checks and
+filtered project lists cost a single index probe
+"""
+
+import click
+from flask import g, has_app_context
+from sqlalchemy import select, literal, union_all, delete, insert, exists, and_, or_, event, inspect
+from sqlalchemy.orm import Session
+
+from extensions import db
+from models.project_models import Project
+from models.team_models import Team
+from models.developer_team_models import DeveloperTeam
+from models.developer_project_models import DeveloperProject
+from models.manager_project_models import ManagerProject
+from models.project_access_models import ProjectAccess
+from project_cache import as_uuid
+
+# Weakest first; a user with several grants on one project keeps the strongest
+ACCESS_LEVELS = ('team', 'developer', 'manager')
+_RANK = {level: rank for rank, level in enumerate(ACCESS_LEVELS)}
+
+
+def _grants(user_ids=None):
+    """
+    UNION ALL of every (user_id, project_id, access_level) grant
+
+    manager:   manager_project rows
+    developer: developer_project rows
+    team:      members of a team get the projects its manager manages
+    """
+    managers = select(ManagerProject.manager_id.label('user_id'), ManagerProject.project_id,
+                      literal('manager').label('access_level'))
+    developers = select(DeveloperProject.developer_id, DeveloperProject.project_id, literal('developer'))
+    members = (
+        select(DeveloperTeam.developer_id, ManagerProject.project_id, literal('team'))
+        .join(Team, Team.team_id == DeveloperTeam.team_id)
+        .join(ManagerProject, ManagerProject.manager_id == Team.manager_id)
+    )
+    if user_ids is not None:
+        managers = managers.where(ManagerProject.manager_id.in_(user_ids))
+        developers = developers.where(DeveloperProject.developer_id.in_(user_ids))
+        members = members.where(DeveloperTeam.developer_id.in_(user_ids))
+    return union_all(managers, developers, members)
+
+
+def _strongest(rows):
+    best = {}
+    for user_id, project_id, level in rows:
+        key = (user_id, project_id)
+        if key not in best or _RANK[level] > _RANK[best[key]]:
+            best[key] = level
+    return [{'user_id': user_id, 'project_id': project_id, 'access_level': level}
+            for (user_id, project_id), level in best.items()]
+
+
+def refresh_access(connection, user_ids):
+    """Recompute the access rows of `user_ids` inside the caller's transaction"""
+    user_ids = list({as_uuid(user_id) for user_id in user_ids if user_id is not None})
+    if not user_ids:
+        return 0
+    rows = _strongest(connection.execute(_grants(user_ids)).all())
+    table = ProjectAccess.__table__
+    connection.execute(delete(table).where(table.c.user_id.in_(user_ids)))
+    if rows:
+        connection.execute(insert(table), rows)
+    return len(rows)
+
+
+def rebuild_project_access():
+    """
+    Rebuild the whole table from the assignment tables in one transaction
+
+    Needed after writes that bypass the ORM (raw SQL, bulk Query.delete).
+
+    Returns:
+        int: Number of access rows written
+    """
+    connection = db.session.connection()
+    rows = _strongest(connection.execute(_grants()).all())
+    connection.execute(delete(ProjectAccess.__table__))
+    if rows:
+        connection.execute(insert(ProjectAccess.__table__), rows)
+    db.session.commit()
+    return len(rows)
+
+
+def _request_cache():
+    """Access decisions memoized for the current request (application context)"""
+    if not has_app_context():
+        return None
+    if 'project_access' not in g:
+        g.project_access = {}
+    return g.project_access
+
+
+def access_level(user_id, project_id):
+    """
+    A user's access level on a project, or None; one primary-key probe per request
+
+    Returns:
+        str or None: 'manager', 'developer', 'team' or None
+    """
+    try:
+        key = ('project', as_uuid(user_id), as_uuid(project_id))
+    except (TypeError, ValueError):
+        return None
+    cache = _request_cache()
+    if cache is not None and key in cache:
+        return cache[key]
+    level = db.session.execute(
+        select(ProjectAccess.access_level)
+        .where(ProjectAccess.user_id == key[1], ProjectAccess.project_id == key[2])
+    ).scalar()
+    if cache is not None:
+        cache[key] = level
+    return level
+
+
+def is_team_member(user_id, team_id):
+    """True if the user manages the team or belongs to it; cached per request"""
+    try:
+        key = ('team', as_uuid(user_id), as_uuid(team_id))
+    except (TypeError, ValueError):
+        return False
+    cache = _request_cache()
+    if cache is not None and key in cache:
+        return cache[key]
+    member = exists().where(DeveloperTeam.team_id == key[2], DeveloperTeam.developer_id == key[1])
+    allowed = db.session.execute(
+        select(Team.team_id).where(Team.team_id == key[2], or_(Team.manager_id == key[1], member))
+    ).first() is not None
+    if cache is not None:
+        cache[key] = allowed
+    return allowed
+
+
+def accessible_projects(query, user, levels=None):
+    """
+    Restrict a Project query to the user's projects with one join on project_access
+
+    Admins are not restricted. `levels` optionally limits the access levels counted.
+    """
+    if getattr(user, 'role_name', None) == 'admin':
+        return query
+    query = query.join(ProjectAccess, and_(
+        ProjectAccess.project_id == Project.project_id,
+        ProjectAccess.user_id == as_uuid(user.user_id)
+    ))
+    if levels:
+        query = query.filter(ProjectAccess.access_level.in_(levels))
+    return query
+
+
+def accessible_project_ids(user, levels=None):
+    """Subquery of the project ids a (non-admin) user can access, for IN filters"""
+    stmt = select(ProjectAccess.project_id).where(ProjectAccess.user_id == as_uuid(user.user_id))
+    if levels:
+        stmt = stmt.where(ProjectAccess.access_level.in_(levels))
+    return stmt
+
+
+def _with_previous(obj, attribute):
+    """Current value of an attribute plus the value it had before this flush"""
+    history = inspect(obj).attrs[attribute].history
+    return [getattr(obj, attribute), *(history.deleted or ())]
+
+
+@event.listens_for(Session, 'after_flush')
+def _refresh_flushed_assignments(session, flush_context):
+    """Keep project_access in step with assignment rows written through the ORM"""
+    users, managers, teams = set(), set(), set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, ManagerProject):
+            managers.update(_with_previous(obj, 'manager_id'))
+        elif isinstance(obj, DeveloperProject):
+            users.update(_with_previous(obj, 'developer_id'))
+        elif isinstance(obj, DeveloperTeam):
+            users.update(_with_previous(obj, 'developer_id'))
+        elif isinstance(obj, Team):
+            teams.add(obj.team_id)
+            managers.update(_with_previous(obj, 'manager_id'))
+    if not (users or managers or teams):
+        return
+
+    connection = session.connection()
+    managers.discard(None)
+    users |= managers
+    # Team members inherit their manager's projects, so they change with them
+    if managers or teams:
+        users.update(connection.execute(
+            select(DeveloperTeam.developer_id)
+            .join(Team, Team.team_id == DeveloperTeam.team_id)
+            .where(or_(Team.manager_id.in_(managers), Team.team_id.in_(teams)))
+        ).scalars())
+    refresh_access(connection, users)
+    if has_app_context():
+        g.pop('project_access', None)
+
+
+def register_access_commands(app):
+    """Register `flask access rebuild` (after raw SQL imports; migration 0006 fills the table on upgrade)"""
+
+    @app.cli.group('access')
+    def access_cli():
+        """Materialized project access"""
+
+    @access_cli.command('rebuild')
+    def rebuild_command():
+        """Rebuild project_access from manager, developer and team assignments"""
+        count = rebuild_project_access()
+        click.echo(f'Wrote {count} project access rows')
@@ -0,0 +1,147 @@
+"""
+Per-project in-process caches for the Jira Board Application
+Bounded LRU with a TTL, shared by the dependency graph and epic summaries
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from models.task_models import Task
+from models.epic_models import Epic
+
+# Caches that are dropped for a project whenever one of its tasks is written
+_task_write_caches = []
+# Callables run inside the writing transaction as hook(connection, project_ids)
+_task_write_hooks = []
+
+
+def as_uuid(value):
+    if isinstance(value, uuid.UUID):
+        return value
+    return uuid.UUID(str(value))
+
+
+class ProjectCache:
+    """
+    LRU of values computed per project by `loader(project_id)`
+
+    Entries are invalidated explicitly by writers in this process; the TTL
+    bounds staleness caused by writes from other worker processes.
+
+    Config keys: <config_prefix>_CACHE_SIZE and <config_prefix>_TTL
+    """
+
+    def __init__(self, loader, config_prefix, max_projects=256, ttl=60.0, invalidate_on_task_writes=False):
+        self.loader = loader
+        self.config_prefix = config_prefix
+        self.max_projects = max_projects
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if invalidate_on_task_writes:
+            _task_write_caches.append(self)
+
+    def init_app(self, app):
+        self.max_projects = app.config.get(f'{self.config_prefix}_CACHE_SIZE', self.max_projects)
+        self.ttl = app.config.get(f'{self.config_prefix}_TTL', self.ttl)
+        app.extensions[self.config_prefix.lower()] = self
+
+    def get(self, project_id, refresh=False):
+        """Cached value for a project; refresh=True always reloads it"""
+        project_id = as_uuid(project_id)
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if not refresh and entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(project_id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = self.loader(project_id)
+        with self._lock:
+            self._entries[project_id] = (time.monotonic(), value)
+            self._entries.move_to_end(project_id)
+            while len(self._entries) > self.max_projects:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, project_id=None):
+        """Forget one project's value, or every value when project_id is None"""
+        with self._lock:
+            if project_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(as_uuid(project_id), None)
+
+    def invalidate_where(self, predicate):
+        """Forget every cached value for which predicate(value) is true"""
+        with self._lock:
+            stale = [project_id for project_id, (_, value) in self._entries.items() if predicate(value)]
+            for project_id in stale:
+                del self._entries[project_id]
+
+    def stats(self):
+        with self._lock:
+            return {'projects': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+def invalidate_project(*project_ids):
+    """Drop task-derived cached values for the given projects"""
+    for project_id in project_ids:
+        if project_id is None:
+            continue
+        for cache in _task_write_caches:
+            cache.invalidate(project_id)
+
+
+def on_task_write(hook):
+    """Register hook(connection, project_ids), run in the transaction that writes the tasks"""
+    _task_write_hooks.append(hook)
+    return hook
+
+
+def record_task_writes(session, project_ids):
+    """
+    Note that tasks of `project_ids` changed in the session's current transaction
+
+    Called automatically for ORM flushes; bulk Core UPDATEs on the task table
+    must call it themselves before committing.
+    """
+    project_ids = {project_id for project_id in project_ids if project_id is not None}
+    if not project_ids:
+        return
+    invalidate_project(*project_ids)
+    # A reader may reload the old rows before this transaction commits, so drop them again on commit
+    session.info.setdefault('stale_projects', set()).update(project_ids)
+    if _task_write_hooks:
+        connection = session.connection()
+        for hook in _task_write_hooks:
+            hook(connection, project_ids)
+
+
+@event.listens_for(Session, 'after_flush')
+def _record_flushed_task_writes(session, flush_context):
+    """Every flushed task or epic marks its project (and a task's previous project) as changed"""
+    projects = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, (Task, Epic)):
+            projects.add(obj.project_id)
+            projects.update(inspect(obj).attrs.project_id.history.deleted or ())
+    record_task_writes(session, projects)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_commit(session):
+    invalidate_project(*session.info.pop('stale_projects', ()))
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_stale_projects(session):
+    session.info.pop('stale_projects', None)
@@ -0,0 +1,251 @@
+"""
+Project health scoring for the Jira Board Application
+Scores are computed from aggregate task signals in one query per batch of
+projects, persisted by the rescore job (or by the first view after a change),
+and only recomputed when tasks change or the TTL expires
+"""
+
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from sqlalchemy import select, func, case, and_, update, literal
+from sqlalchemy.orm import aliased
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from extensions import db
+from models.models_models import TaskStatus
+from models.project_models import Project, ProjectHealthScore
+from models.task_models import Task, TaskDependency, TaskStatusTransition
+from project_cache import on_task_write, as_uuid
+
+DEFAULT_TTL = 3600
+THROUGHPUT_WINDOW = timedelta(days=14)
+
+# Points deducted from 100 at the worst value of each signal
+WEIGHTS = {
+    'overdue_ratio': 35,
+    'blocked_ratio': 25,
+    'estimate_overrun': 20,
+    'throughput_decline': 20
+}
+
+
+def _signal_query(project_ids, now):
+    """One grouped SELECT returning the raw health signals of every project in `project_ids`"""
+    is_open = Task.status != TaskStatus.done
+    blocker = aliased(Task)
+    blocked = (
+        select(literal(1))
+        .select_from(TaskDependency)
+        .join(blocker, blocker.task_id == TaskDependency.depends_on_task_id)
+        .where(TaskDependency.task_id == Task.task_id,
+               TaskDependency.dependency_type == 'blocks',
+               blocker.status != TaskStatus.done)
+        .exists()
+    )
+
+    def completed_between(start, end):
+        return (
+            select(literal(1))
+            .select_from(TaskStatusTransition)
+            .where(TaskStatusTransition.task_id == Task.task_id,
+                   TaskStatusTransition.to_status == TaskStatus.done.value,
+                   TaskStatusTransition.changed_at >= start,
+                   TaskStatusTransition.changed_at < end)
+            .exists()
+        )
+
+    def count_if(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+    logged = func.coalesce(Task.logged_hours, 0.0)
+    has_estimate = Task.estimated_hours > 0
+    return (
+        select(
+            Task.project_id,
+            count_if(is_open).label('open_tasks'),
+            count_if(and_(is_open, Task.due_date < now)).label('overdue'),
+            count_if(and_(is_open, blocked)).label('blocked'),
+            count_if(completed_between(now - THROUGHPUT_WINDOW, now)).label('recent_done'),
+            count_if(completed_between(now - 2 * THROUGHPUT_WINDOW, now - THROUGHPUT_WINDOW)).label('prior_done'),
+            func.coalesce(func.sum(case((and_(has_estimate, logged > Task.estimated_hours), logged - Task.estimated_hours),
+                                        else_=0.0)), 0.0).label('over_hours'),
+            func.coalesce(func.sum(case((has_estimate, Task.estimated_hours), else_=0.0)), 0.0).label('estimated_hours')
+        )
+        .where(Task.project_id.in_(project_ids))
+        .group_by(Task.project_id)
+    )
+
+
+def score_signals(open_tasks, overdue, blocked, recent_done, prior_done, over_hours, estimated_hours):
+    """Turn raw signal counts into ratios and a 0-100 score"""
+    overdue_ratio = overdue / open_tasks if open_tasks else 0.0
+    blocked_ratio = blocked / open_tasks if open_tasks else 0.0
+    estimate_overrun = over_hours / estimated_hours if estimated_hours else 0.0
+    busiest = max(recent_done, prior_done)
+    throughput_trend = (recent_done - prior_done) / busiest if busiest else 0.0
+
+    score = 100.0
+    score -= WEIGHTS['overdue_ratio'] * overdue_ratio
+    score -= WEIGHTS['blocked_ratio'] * blocked_ratio
+    score -= WEIGHTS['estimate_overrun'] * min(estimate_overrun, 1.0)
+    score -= WEIGHTS['throughput_decline'] * max(-throughput_trend, 0.0)
+    return {
+        'score': round(max(score, 0.0), 1),
+        'overdue_ratio': round(overdue_ratio, 3),
+        'blocked_ratio': round(blocked_ratio, 3),
+        'throughput_trend': round(throughput_trend, 3),
+        'estimate_overrun': round(estimate_overrun, 3),
+        'open_tasks': int(open_tasks)
+    }
+
+
+def _store(rows, connection=None):
+    """Upsert score rows so concurrent rescoring of one project cannot collide"""
+    insert = pg_insert if db.engine.dialect.name == 'postgresql' else sqlite_insert
+    stmt = insert(ProjectHealthScore.__table__)
+    columns = [column for column in rows[0] if column != 'project_id']
+    (connection or db.session).execute(
+        stmt.on_conflict_do_update(index_elements=['project_id'], set_={column: stmt.excluded[column] for column in columns}),
+        rows
+    )
+
+
+def _compute(project_ids, now, connection=None):
+    """project_id -> score values for the given projects, from one grouped query"""
+    signals = {row.project_id: row for row in (connection or db.session).execute(_signal_query(project_ids, now))}
+    scores = {}
+    for project_id in project_ids:
+        row = signals.get(project_id)
+        scores[project_id] = score_signals(
+            int(row.open_tasks), int(row.overdue), int(row.blocked), int(row.recent_done), int(row.prior_done),
+            float(row.over_hours), float(row.estimated_hours)
+        ) if row else score_signals(0, 0, 0, 0, 0, 0.0, 0.0)
+    return scores
+
+
+def rescore(project_ids, now=None):
+    """
+    Recompute and persist scores for the given projects; caller commits
+
+    The stored rows are locked before the signals are read. A task write that
+    already marked a project stale has committed by then and is included in
+    the new score; one that marks it afterwards waits for this transaction and
+    leaves the fresh score stale again, so clearing the flag never loses a mark.
+
+    Returns:
+        dict: project_id -> score dict
+    """
+    now = now or datetime.utcnow()
+    project_ids = sorted(project_ids)
+    if not project_ids:
+        return {}
+
+    db.session.execute(
+        select(ProjectHealthScore.project_id)
+        .where(ProjectHealthScore.project_id.in_(project_ids))
+        .order_by(ProjectHealthScore.project_id)
+        .with_for_update()
+    )
+    scores = _compute(project_ids, now)
+    _store([{'project_id': project_id, 'stale': False, 'computed_at': now, **values}
+            for project_id, values in scores.items()])
+    return {project_id: {**values, 'computed_at': now.isoformat()} for project_id, values in scores.items()}
+
+
+def _is_fresh(row, now, ttl):
+    return row is not None and not row.stale and row.computed_at > now - timedelta(seconds=ttl)
+
+
+def _rescore_on_read(project_id, now, ttl):
+    """
+    Recompute and store one project's score in its own transaction
+
+    Runs on a separate primary connection so the view's session stays
+    read-only. The row lock works as in rescore(): a task write that marks the
+    project during the recompute waits and leaves it stale again, and
+    concurrent views wait for the first one and then read its score.
+    """
+    table = ProjectHealthScore.__table__
+    with db.engine.begin() as connection:
+        row = connection.execute(select(table).where(table.c.project_id == project_id).with_for_update()).first()
+        if _is_fresh(row, now, ttl):
+            return ProjectHealthScore(**row._mapping).to_dict()
+        values = _compute([project_id], now, connection)[project_id]
+        _store([{'project_id': project_id, 'stale': False, 'computed_at': now, **values}], connection)
+    return {**values, 'computed_at': now.isoformat()}
+
+
+def get_health(project_id, now=None):
+    """
+    Current health of a project, recomputed only if its tasks changed or the TTL expired
+
+    A stale, expired or missing score is recomputed once and stored, so only
+    the first view after a task change pays for the aggregate query.
+
+    Returns:
+        dict: score, signal ratios and computed_at
+    """
+    now = now or datetime.utcnow()
+    ttl = current_app.config.get('PROJECT_HEALTH_TTL', DEFAULT_TTL)
+    project_id = as_uuid(project_id)
+    row = db.session.get(ProjectHealthScore, project_id)
+    if _is_fresh(row, now, ttl):
+        return row.to_dict()
+    return _rescore_on_read(project_id, now, ttl)
+
+
+def rescore_projects(batch_size=200, stale_only=False, now=None):
+    """
+    Batch job: rescore every project (or only stale/expired ones), one grouped query per batch
+
+    Returns:
+        int: Number of projects rescored
+    """
+    now = now or datetime.utcnow()
+    ttl = current_app.config.get('PROJECT_HEALTH_TTL', DEFAULT_TTL)
+    scored = 0
+    last_id = None
+    while True:
+        stmt = select(Project.project_id).order_by(Project.project_id).limit(batch_size)
+        if last_id is not None:
+            stmt = stmt.where(Project.project_id > last_id)
+        if stale_only:
+            stmt = stmt.outerjoin(ProjectHealthScore, ProjectHealthScore.project_id == Project.project_id).where(
+                (ProjectHealthScore.project_id.is_(None)) |
+                (ProjectHealthScore.stale.is_(True)) |
+                (ProjectHealthScore.computed_at <= now - timedelta(seconds=ttl))
+            )
+        batch = db.session.execute(stmt).scalars().all()
+        if not batch:
+            break
+        last_id = batch[-1]
+        rescore(batch, now=now)
+        db.session.commit()
+        scored += len(batch)
+    return scored
+
+
+@on_task_write
+def _mark_stale(connection, project_ids):
+    """Flag stored scores as stale in the same transaction that changes the tasks"""
+    table = ProjectHealthScore.__table__
+    connection.execute(update(table).where(table.c.project_id.in_(project_ids), table.c.stale.is_(False)).values(stale=True))
+
+
+def register_health_commands(app):
+    """Register `flask health rescore` (run from cron, e.g. hourly)"""
+
+    @app.cli.group('health')
+    def health_cli():
+        """Project health scores"""
+
+    @health_cli.command('rescore')
+    @click.option('--stale-only', is_flag=True, help='Only projects whose score is stale or expired')
+    @click.option('--batch-size', default=200, type=int, help='Projects scored per query')
+    def rescore_command(stale_only, batch_size):
+        """Recompute project health scores"""
+        count = rescore_projects(batch_size=batch_size, stale_only=stale_only)
+        click.echo(f'Rescored {count} projects')
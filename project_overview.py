@@ -0,0 +1,237 @@
+"""
+Project detail page queries for the Jira Board Application
+Header aggregates, per-column board cards and a keyset-paginated task table,
+each from a single query and without touching lazy relationships
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import select, func, and_, or_, tuple_
+
+from extensions import db
+from models.models_models import TaskStatus
+from models.task_models import Task
+from models.user_models import User
+from models.sprint_models import Sprint
+from models.board_models import Board
+from models.subproject_models import Subproject
+from models.epic_models import Epic
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+BOARD_COLUMN_LIMIT = 25
+RELATED_PREVIEW = 5
+
+# Sortable task table columns; each is backed by a (project_id, column) index
+TASK_SORTS = {
+    'updated': Task.updated_at,
+    'created': Task.created_at,
+    'due': Task.due_date
+}
+
+
+def _status_value(status):
+    return status.value if hasattr(status, 'value') else status
+
+
+def task_breakdown(project_id):
+    """
+    Task counts by status, type and assignee plus hour totals, from one GROUP BY
+
+    Returns:
+        dict: total, by_status, by_type, by_assignee (largest first), hours
+    """
+    rows = db.session.execute(
+        select(Task.status, Task.type, Task.assigned_to_id, User.username,
+               func.count(Task.task_id),
+               func.coalesce(func.sum(Task.estimated_hours), 0.0),
+               func.coalesce(func.sum(Task.logged_hours), 0.0))
+        .outerjoin(User, User.user_id == Task.assigned_to_id)
+        .where(Task.project_id == project_id)
+        .group_by(Task.status, Task.type, Task.assigned_to_id, User.username)
+    ).all()
+
+    breakdown = {'total': 0, 'by_status': {}, 'by_type': {}, 'by_assignee': {},
+                 'estimated_hours': 0.0, 'logged_hours': 0.0}
+    for status, task_type, assignee_id, username, count, estimated, logged in rows:
+        breakdown['total'] += count
+        status, task_type = _status_value(status), _status_value(task_type)
+        breakdown['by_status'][status] = breakdown['by_status'].get(status, 0) + count
+        breakdown['by_type'][task_type] = breakdown['by_type'].get(task_type, 0) + count
+        assignee = breakdown['by_assignee'].setdefault(assignee_id, {
+            'user_id': str(assignee_id) if assignee_id else None,
+            'username': username or 'Unassigned',
+            'count': 0
+        })
+        assignee['count'] += count
+        breakdown['estimated_hours'] += float(estimated)
+        breakdown['logged_hours'] += float(logged)
+
+    breakdown['by_assignee'] = sorted(breakdown['by_assignee'].values(), key=lambda item: -item['count'])
+    breakdown['estimated_hours'] = round(breakdown['estimated_hours'], 2)
+    breakdown['logged_hours'] = round(breakdown['logged_hours'], 2)
+    return breakdown
+
+
+def _task_columns():
+    return (Task.task_id, Task.title, Task.description, Task.status, Task.type, Task.priority,
+            Task.due_date, Task.estimated_hours, Task.logged_hours, Task.created_at, Task.updated_at,
+            User.username.label('assignee'))
+
+
+def _task_dict(row):
+    progress = 0
+    if row.estimated_hours:
+        progress = min(int(100 * (row.logged_hours or 0.0) / row.estimated_hours), 100)
+    return {
+        'task_id': str(row.task_id),
+        'title': row.title,
+        'description': row.description,
+        'status': _status_value(row.status),
+        'type': _status_value(row.type),
+        'priority': row.priority,
+        'due_date': row.due_date,
+        'estimated_hours': row.estimated_hours,
+        'logged_hours': row.logged_hours or 0.0,
+        'progress': progress,
+        'assignee': row.assignee,
+        'created_at': row.created_at,
+        'updated_at': row.updated_at
+    }
+
+
+def board_columns(project_id, per_column=BOARD_COLUMN_LIMIT):
+    """
+    Most recently updated cards of each status column, from one windowed query
+
+    Returns:
+        dict: status -> list of task dicts (at most `per_column` each)
+    """
+    rank = func.row_number().over(partition_by=Task.status, order_by=(Task.updated_at.desc(), Task.task_id))
+    ranked = (
+        select(*_task_columns(), rank.label('position'))
+        .outerjoin(User, User.user_id == Task.assigned_to_id)
+        .where(Task.project_id == project_id)
+        .subquery()
+    )
+    rows = db.session.execute(
+        select(ranked).where(ranked.c.position <= per_column).order_by(ranked.c.status, ranked.c.position)
+    ).all()
+
+    columns = {}
+    for row in rows:
+        columns.setdefault(_status_value(row.status), []).append(_task_dict(row))
+    return columns
+
+
+def encode_cursor(value, task_id):
+    """Keyset cursor '<sort value>~<task_id>'; an empty value stands for NULL"""
+    return f"{value.isoformat() if value else ''}~{task_id}"
+
+
+def decode_cursor(raw):
+    if not raw or '~' not in raw:
+        return None
+    value, task_id = raw.split('~', 1)
+    try:
+        return (datetime.fromisoformat(value) if value else None), uuid.UUID(task_id)
+    except ValueError:
+        return None
+
+
+def _nullable(column):
+    return Task.__table__.c[column.key].nullable
+
+
+def _after(column, direction, value, task_id):
+    """
+    Rows strictly after the cursor in `column direction, task_id direction` order
+
+    The row-value comparison is a single range on the (project_id, column, task_id)
+    index; only a nullable column (due_date) also has to reach its NULLs, sorted last.
+    """
+    key, cursor = tuple_(column, Task.task_id), (value, task_id)
+    beyond = key > cursor if direction == 'asc' else key < cursor
+    if not _nullable(column):
+        return beyond
+    if value is None:
+        return and_(column.is_(None), Task.task_id > task_id if direction == 'asc' else Task.task_id < task_id)
+    return or_(beyond, column.is_(None))
+
+
+def task_page(project_id, sort='updated', direction='desc', after=None, limit=DEFAULT_PAGE_SIZE, status=None):
+    """
+    One keyset page of a project's tasks
+
+    Args:
+        sort: One of TASK_SORTS
+        direction: 'asc' or 'desc'
+        after: Cursor returned as next_cursor by the previous page
+        status: Optional status filter (unknown values are ignored)
+
+    Returns:
+        dict: tasks, next_cursor (None on the last page), sort, direction, limit
+    """
+    sort = sort if sort in TASK_SORTS else 'updated'
+    direction = 'asc' if direction == 'asc' else 'desc'
+    limit = min(max(int(limit), 1), MAX_PAGE_SIZE)
+    column = TASK_SORTS[sort]
+
+    ordering = column.asc() if direction == 'asc' else column.desc()
+    if _nullable(column):
+        ordering = ordering.nulls_last()
+    id_ordering = Task.task_id.asc() if direction == 'asc' else Task.task_id.desc()
+    stmt = (
+        select(*_task_columns())
+        .outerjoin(User, User.user_id == Task.assigned_to_id)
+        .where(Task.project_id == project_id)
+        .order_by(ordering, id_ordering)
+        .limit(limit + 1)
+    )
+    if status in TaskStatus.__members__:
+        stmt = stmt.where(Task.status == TaskStatus[status])
+    cursor = decode_cursor(after)
+    if cursor:
+        stmt = stmt.where(_after(column, direction, *cursor))
+
+    rows = db.session.execute(stmt).all()
+    has_next = len(rows) > limit
+    tasks = [_task_dict(row) for row in rows[:limit]]
+    next_cursor = None
+    if has_next:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(getattr(last, column.key), last.task_id)
+    return {'tasks': tasks, 'next_cursor': next_cursor, 'sort': sort, 'direction': direction, 'limit': limit}
+
+
+def related_summary(project_id):
+    """
+    Counts of sprints, boards, subprojects and epics (one query) plus short sprint/board previews
+    """
+    def count_of(model):
+        return select(func.count()).select_from(model).where(model.project_id == project_id).scalar_subquery()
+
+    counts = db.session.execute(
+        select(count_of(Sprint).label('sprints'), count_of(Board).label('boards'),
+               count_of(Subproject).label('subprojects'), count_of(Epic).label('epics'))
+    ).one()
+
+    sprints = db.session.execute(
+        select(Sprint.sprint_id, Sprint.name, Sprint.start_date, Sprint.end_date)
+        .where(Sprint.project_id == project_id)
+        .order_by(Sprint.start_date.desc().nulls_last())
+        .limit(RELATED_PREVIEW)
+    ).all() if counts.sprints else []
+    boards = db.session.execute(
+        select(Board.board_id, Board.name)
+        .where(Board.project_id == project_id)
+        .order_by(Board.created_at)
+        .limit(RELATED_PREVIEW)
+    ).all() if counts.boards else []
+
+    return {
+        'counts': dict(counts._mapping),
+        'sprints': [dict(row._mapping) for row in sprints],
+        'boards': [dict(row._mapping) for row in boards]
+    }
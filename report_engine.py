@@ -0,0 +1,568 @@
+"""
+Project analytics engine for the Jira Board Application
+Computes burndown, velocity, throughput and open-bug trend into small daily rollup tables
+"""
+
+from bisect import bisect_left
+import uuid
+from datetime import datetime, date, timedelta
+
+import click
+from sqlalchemy import func, case, and_, or_, select, union, exists
+from sqlalchemy.orm import aliased
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from extensions import db
+from models.models_models import TaskStatus, TaskType
+from models.task_models import Task, WorkLog, TaskStatusTransition, TaskStatusDailyRollup, TaskCycleTimeDailyRollup
+from models.sprint_models import Sprint
+from models.report_models import ProjectDailyRollup, SprintDailyRollup, RollupWatermark
+
+WATERMARK = 'project_reports'
+FLOW_WATERMARK = 'task_flow'
+FLOW_BATCH_SIZE = 5000  # transitions folded and committed per transaction
+
+# Upper bounds (hours) of the cycle/lead time histogram buckets; the last bucket is open-ended
+CYCLE_TIME_BUCKETS = [1, 2, 4, 8, 16, 24, 48, 72, 120, 168, 240, 336, 504, 720, 1080, 1440, 2160]
+
+
+def _day_bounds(day):
+    start = datetime(day.year, day.month, day.day)
+    return start, start + timedelta(days=1)
+
+
+def _is_open():
+    return Task.status != TaskStatus.done
+
+
+def _completed_between(start, end):
+    """A task counts as completed on the day it moved into done"""
+    return exists().where(
+        TaskStatusTransition.task_id == Task.task_id,
+        TaskStatusTransition.to_status == TaskStatus.done.value,
+        TaskStatusTransition.changed_at >= start,
+        TaskStatusTransition.changed_at < end
+    )
+
+
+def changed_project_ids(since):
+    """Projects whose tasks or work logs changed since the last refresh (all projects if never run)"""
+    if since is None:
+        stmt = select(Task.project_id).distinct()
+    else:
+        stmt = union(
+            select(Task.project_id).where(Task.updated_at >= since),
+            select(Task.project_id).join(WorkLog, WorkLog.task_id == Task.task_id).where(WorkLog.log_date >= since)
+        )
+    return [row[0] for row in db.session.execute(stmt)]
+
+
+def _logged_hours_by(group_column, project_ids, start, end):
+    """Sum of WorkLog hours for one day, grouped by project or sprint"""
+    rows = db.session.execute(
+        select(group_column, func.coalesce(func.sum(WorkLog.hours_logged), 0.0))
+        .join(Task, WorkLog.task_id == Task.task_id)
+        .where(Task.project_id.in_(project_ids), WorkLog.log_date >= start, WorkLog.log_date < end)
+        .group_by(group_column)
+    ).all()
+    return {key: float(hours) for key, hours in rows}
+
+
+def _project_rows(project_ids, day):
+    """One grouped query over task for every changed project"""
+    start, end = _day_bounds(day)
+    hours = func.coalesce(Task.estimated_hours, 0.0)
+    completed = _completed_between(start, end)
+
+    stmt = (
+        select(
+            Task.project_id,
+            func.sum(case((_is_open(), 1), else_=0)),
+            func.sum(case((Task.status == TaskStatus.in_progress, 1), else_=0)),
+            func.sum(case((Task.status == TaskStatus.done, 1), else_=0)),
+            func.sum(case((and_(_is_open(), Task.type == TaskType.bug), 1), else_=0)),
+            func.sum(case((_is_open(), hours), else_=0.0)),
+            func.sum(case((completed, 1), else_=0)),
+            func.sum(case((completed, hours), else_=0.0))
+        )
+        .where(Task.project_id.in_(project_ids))
+        .group_by(Task.project_id)
+    )
+    logged = _logged_hours_by(Task.project_id, project_ids, start, end)
+
+    now = datetime.utcnow()
+    return [
+        {
+            'project_id': project_id,
+            'day': day,
+            'open_tasks': int(open_tasks or 0),
+            'in_progress_tasks': int(in_progress or 0),
+            'done_tasks': int(done or 0),
+            'open_bugs': int(open_bugs or 0),
+            'remaining_hours': float(remaining or 0.0),
+            'completed_tasks': int(completed_tasks or 0),
+            'completed_hours': float(completed_hours or 0.0),
+            'logged_hours': logged.get(project_id, 0.0),
+            'computed_at': now
+        }
+        for project_id, open_tasks, in_progress, done, open_bugs, remaining, completed_tasks, completed_hours
+        in db.session.execute(stmt)
+    ]
+
+
+def _sprint_rows(project_ids, day):
+    """One grouped query over task joined to the sprints running on `day`"""
+    start, end = _day_bounds(day)
+    hours = func.coalesce(Task.estimated_hours, 0.0)
+    running = and_(
+        or_(Sprint.start_date.is_(None), Sprint.start_date < end),
+        or_(Sprint.end_date.is_(None), Sprint.end_date >= start)
+    )
+
+    stmt = (
+        select(
+            Task.sprint_id,
+            Sprint.project_id,
+            func.count(Task.task_id),
+            func.sum(case((Task.status == TaskStatus.done, 1), else_=0)),
+            func.sum(hours),
+            func.sum(case((_is_open(), hours), else_=0.0))
+        )
+        .join(Sprint, Sprint.sprint_id == Task.sprint_id)
+        .where(Sprint.project_id.in_(project_ids), running)
+        .group_by(Task.sprint_id, Sprint.project_id)
+    )
+    logged = _logged_hours_by(Task.sprint_id, project_ids, start, end)
+
+    now = datetime.utcnow()
+    return [
+        {
+            'sprint_id': sprint_id,
+            'day': day,
+            'project_id': project_id,
+            'total_tasks': int(total or 0),
+            'done_tasks': int(done or 0),
+            'committed_hours': float(committed or 0.0),
+            'remaining_hours': float(remaining or 0.0),
+            'completed_hours': float(committed or 0.0) - float(remaining or 0.0),
+            'logged_hours': logged.get(sprint_id, 0.0),
+            'computed_at': now
+        }
+        for sprint_id, project_id, total, done, committed, remaining in db.session.execute(stmt)
+    ]
+
+
+def _replace_rows(model, key_column, rows, keys, day):
+    """Swap out the rollup rows for (keys, day) in one DELETE and one multi-row INSERT"""
+    if keys:
+        db.session.execute(
+            model.__table__.delete().where(key_column.in_(keys), model.__table__.c.day == day)
+        )
+    if rows:
+        db.session.execute(model.__table__.insert(), rows)
+
+
+def _update_event_columns(model, key_name, rows, columns):
+    """
+    For an already-closed day only the event columns (completions, logged hours)
+    can be recomputed from history; the snapshot columns keep their recorded values.
+    """
+    table = model.__table__
+    for row in rows:
+        result = db.session.execute(
+            table.update()
+            .where(table.c[key_name] == row[key_name], table.c.day == row['day'])
+            .values({column: row[column] for column in columns})
+        )
+        if result.rowcount == 0:
+            db.session.execute(table.insert(), [row])
+
+
+def refresh_rollups(now=None, full=False):
+    """
+    Incrementally refresh today's rollup rows for projects touched since the last run
+
+    When the previous run happened on an earlier day, that day and every day
+    since are finalized first, so late completions and work logs land on the
+    right date even if the job skipped days.
+
+    Returns:
+        dict: Number of projects and rows refreshed
+    """
+    now = now or datetime.utcnow()
+    since = None if full else RollupWatermark.get(WATERMARK)
+    project_ids = changed_project_ids(since)
+
+    days = [now.date()]
+    if since is not None and since.date() < now.date():
+        days = [since.date() + timedelta(days=offset) for offset in range((now.date() - since.date()).days + 1)]
+
+    project_count = sprint_count = 0
+    if project_ids:
+        for day in days:
+            project_rows = _project_rows(project_ids, day)
+            sprint_rows = _sprint_rows(project_ids, day)
+            if day == now.date():
+                _replace_rows(ProjectDailyRollup, ProjectDailyRollup.project_id, project_rows, project_ids, day)
+                _replace_rows(SprintDailyRollup, SprintDailyRollup.project_id, sprint_rows, project_ids, day)
+            else:
+                _update_event_columns(ProjectDailyRollup, 'project_id', project_rows,
+                                      ['completed_tasks', 'completed_hours', 'logged_hours', 'computed_at'])
+                _update_event_columns(SprintDailyRollup, 'sprint_id', sprint_rows, ['logged_hours', 'computed_at'])
+            project_count += len(project_rows)
+            sprint_count += len(sprint_rows)
+
+    RollupWatermark.set(WATERMARK, now)
+    db.session.commit()
+    return {'projects': len(project_ids), 'project_rows': project_count, 'sprint_rows': sprint_count}
+
+
+def _forward_fill(rows, start, end, fields):
+    """Rollups are only written for changed projects; carry the last value across quiet days"""
+    by_day = {row.day: row for row in rows}
+    series, last = [], None
+    day = start
+    while day <= end:
+        if day in by_day:
+            last = by_day[day]
+        series.append({'day': day.isoformat(), **{field: (getattr(last, field) if last else None) for field in fields}})
+        day += timedelta(days=1)
+    return series
+
+
+def sprint_burndown(sprint):
+    """Remaining hours per day plus the ideal line for one sprint"""
+    rows = SprintDailyRollup.query.filter_by(sprint_id=sprint.sprint_id).order_by(SprintDailyRollup.day).all()
+    if not rows:
+        return {'sprint_id': str(sprint.sprint_id), 'name': sprint.name, 'points': []}
+
+    start = sprint.start_date.date() if sprint.start_date else rows[0].day
+    sprint_end = sprint.end_date.date() if sprint.end_date else max(rows[-1].day, date.today())
+    # Plot up to the latest rollup, not into the future
+    end = min(sprint_end, max(rows[-1].day, start))
+    points = _forward_fill(rows, start, end, ['remaining_hours', 'committed_hours', 'done_tasks', 'total_tasks'])
+
+    committed = rows[0].committed_hours
+    span = max((sprint_end - start).days, 1)
+    for index, point in enumerate(points):
+        point['ideal_hours'] = round(max(committed * (1 - index / span), 0.0), 2)
+    return {'sprint_id': str(sprint.sprint_id), 'name': sprint.name, 'points': points}
+
+
+def velocity(project_id, limit=10):
+    """Completed hours and tasks for the most recent sprints, from each sprint's last rollup row"""
+    last_day = (
+        select(SprintDailyRollup.sprint_id, func.max(SprintDailyRollup.day).label('day'))
+        .where(SprintDailyRollup.project_id == project_id)
+        .group_by(SprintDailyRollup.sprint_id)
+        .subquery()
+    )
+    rows = db.session.execute(
+        select(Sprint.name, Sprint.start_date, SprintDailyRollup.completed_hours, SprintDailyRollup.done_tasks,
+               SprintDailyRollup.committed_hours)
+        .join(last_day, and_(last_day.c.sprint_id == SprintDailyRollup.sprint_id, last_day.c.day == SprintDailyRollup.day))
+        .join(Sprint, Sprint.sprint_id == SprintDailyRollup.sprint_id)
+        .order_by(Sprint.start_date.desc().nullslast())
+        .limit(limit)
+    ).all()
+    return [
+        {
+            'sprint': name,
+            'start_date': start.date().isoformat() if start else None,
+            'completed_hours': completed,
+            'completed_tasks': done,
+            'committed_hours': committed
+        }
+        for name, start, completed, done, committed in reversed(rows)
+    ]
+
+
+def project_trends(project_id, days=90, today=None):
+    """Weekly throughput and daily open-bug trend for the last `days` days"""
+    today = today or date.today()
+    start = today - timedelta(days=days - 1)
+    rows = (ProjectDailyRollup.query
+            .filter(ProjectDailyRollup.project_id == project_id, ProjectDailyRollup.day >= start - timedelta(days=31))
+            .order_by(ProjectDailyRollup.day)
+            .all())
+
+    # Seed the fill with the last row before the window
+    seed = [row for row in rows if row.day < start][-1:]
+    window = seed + [row for row in rows if row.day >= start]
+    bug_trend = _forward_fill(window, start, today, ['open_bugs', 'open_tasks'])
+
+    throughput = {}
+    for row in rows:
+        if row.day < start:
+            continue
+        week = row.day - timedelta(days=row.day.weekday())
+        bucket = throughput.setdefault(week, {'week': week.isoformat(), 'completed_tasks': 0, 'completed_hours': 0.0, 'logged_hours': 0.0})
+        bucket['completed_tasks'] += row.completed_tasks
+        bucket['completed_hours'] += row.completed_hours
+        bucket['logged_hours'] += row.logged_hours
+
+    return {
+        'throughput': [throughput[week] for week in sorted(throughput)],
+        'open_bug_trend': bug_trend
+    }
+
+
+def project_report(project_id):
+    """Everything the analytics page renders, read only from rollup tables"""
+    sprints = Sprint.query.filter_by(project_id=project_id).order_by(Sprint.start_date.desc().nullslast()).limit(3).all()
+    return {
+        'burndown': [sprint_burndown(sprint) for sprint in sprints],
+        'velocity': velocity(project_id),
+        **project_trends(project_id)
+    }
+
+
+def _as_date(value):
+    """func.date() yields a date on PostgreSQL and an ISO string on SQLite"""
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def upsert_add(model, key_columns, rows, add_columns):
+    """INSERT ... ON CONFLICT DO UPDATE SET col = col + excluded.col for each counter column"""
+    if not rows:
+        return
+    insert = pg_insert if db.engine.dialect.name == 'postgresql' else sqlite_insert
+    table = model.__table__
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={column: table.c[column] + stmt.excluded[column] for column in add_columns}
+    )
+    db.session.execute(stmt, rows)
+
+
+def _bucket_index(seconds):
+    return bisect_left(CYCLE_TIME_BUCKETS, max(seconds, 0) / 3600.0)
+
+
+def refresh_flow_rollups(now=None, full=False):
+    """
+    Fold transitions not yet rolled up into the per-status and cycle/lead-time
+    rollups. Counters are only ever incremented, so each batch of transitions
+    is counted and stamped rolled_up_at in the same transaction; a transition
+    that commits after a run has started is left for the next run rather than
+    skipped, and concurrent runs skip each other's locked rows.
+    """
+    now = now or datetime.utcnow()
+    transitions = TaskStatusTransition.__table__
+    if full:
+        db.session.execute(TaskStatusDailyRollup.__table__.delete())
+        db.session.execute(TaskCycleTimeDailyRollup.__table__.delete())
+        db.session.execute(
+            transitions.update().where(transitions.c.rolled_up_at.isnot(None)).values(rolled_up_at=None)
+        )
+
+    status_rows = histogram_rows = 0
+    while True:
+        batch = db.session.execute(
+            select(transitions.c.transition_id)
+            .where(transitions.c.rolled_up_at.is_(None), transitions.c.changed_at <= now)
+            .order_by(transitions.c.changed_at)
+            .limit(FLOW_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not batch:
+            break
+        flow, histogram = _fold_transitions(TaskStatusTransition.transition_id.in_(batch))
+        db.session.execute(
+            transitions.update().where(transitions.c.transition_id.in_(batch)).values(rolled_up_at=now)
+        )
+        db.session.commit()
+        status_rows += flow
+        histogram_rows += histogram
+        if len(batch) < FLOW_BATCH_SIZE:
+            break
+
+    # Kept as the time of the last run; rolled_up_at decides what is counted
+    RollupWatermark.set(FLOW_WATERMARK, now)
+    db.session.commit()
+    return {'status_rows': status_rows, 'histogram_rows': histogram_rows}
+
+
+def _fold_transitions(selected):
+    """Add the selected transitions to the flow rollups; returns the number of rows touched in each"""
+    day = func.date(TaskStatusTransition.changed_at)
+
+    flow = {}
+    entered = db.session.execute(
+        select(TaskStatusTransition.project_id, day, TaskStatusTransition.to_status, func.count())
+        .where(selected)
+        .group_by(TaskStatusTransition.project_id, day, TaskStatusTransition.to_status)
+    )
+    for project_id, on_day, status, count in entered:
+        key = (project_id, _as_date(on_day), status)
+        flow.setdefault(key, {'entered': 0, 'exited': 0, 'seconds_in_status': 0.0})['entered'] += count
+
+    exited = db.session.execute(
+        select(TaskStatusTransition.project_id, day, TaskStatusTransition.from_status, func.count(),
+               func.coalesce(func.sum(TaskStatusTransition.seconds_in_from_status), 0.0))
+        .where(TaskStatusTransition.from_status.isnot(None), selected)
+        .group_by(TaskStatusTransition.project_id, day, TaskStatusTransition.from_status)
+    )
+    for project_id, on_day, status, count, seconds in exited:
+        row = flow.setdefault((project_id, _as_date(on_day), status), {'entered': 0, 'exited': 0, 'seconds_in_status': 0.0})
+        row['exited'] += count
+        row['seconds_in_status'] += float(seconds)
+
+    upsert_add(
+        TaskStatusDailyRollup, ['project_id', 'day', 'status'],
+        [{'project_id': key[0], 'day': key[1], 'status': key[2], **values} for key, values in flow.items()],
+        ['entered', 'exited', 'seconds_in_status']
+    )
+
+    # Cycle time: first move into in_progress -> done. Lead time: created -> done.
+    started = aliased(TaskStatusTransition)
+    first_started = (
+        select(func.min(started.changed_at))
+        .where(started.task_id == TaskStatusTransition.task_id,
+               started.to_status == TaskStatus.in_progress.value,
+               started.changed_at <= TaskStatusTransition.changed_at)
+        .scalar_subquery()
+    )
+    completions = db.session.execute(
+        select(TaskStatusTransition.project_id, TaskStatusTransition.changed_at, first_started, Task.created_at)
+        .join(Task, Task.task_id == TaskStatusTransition.task_id)
+        .where(TaskStatusTransition.to_status == TaskStatus.done.value, selected)
+    )
+    histogram = {}
+    for project_id, done_at, started_at, created_at in completions:
+        for metric, begin in (('cycle', started_at), ('lead', created_at)):
+            if begin is None:
+                continue
+            key = (project_id, done_at.date(), metric, _bucket_index((done_at - begin).total_seconds()))
+            histogram[key] = histogram.get(key, 0) + 1
+
+    upsert_add(
+        TaskCycleTimeDailyRollup, ['project_id', 'day', 'metric', 'bucket'],
+        [{'project_id': key[0], 'day': key[1], 'metric': key[2], 'bucket': key[3], 'task_count': count}
+         for key, count in histogram.items()],
+        ['task_count']
+    )
+    return len(flow), len(histogram)
+
+
+def _histogram_percentile(counts, percentile):
+    """Percentile in hours from bucket counts, interpolated linearly inside the bucket"""
+    total = sum(counts.values())
+    if not total:
+        return None
+    target = total * percentile / 100.0
+    running = 0
+    for bucket in sorted(counts):
+        count = counts[bucket]
+        if running + count >= target:
+            lower = CYCLE_TIME_BUCKETS[bucket - 1] if bucket > 0 else 0
+            if bucket >= len(CYCLE_TIME_BUCKETS):
+                return float(lower)
+            upper = CYCLE_TIME_BUCKETS[bucket]
+            return round(lower + (upper - lower) * (target - running) / count, 1)
+        running += count
+    return float(CYCLE_TIME_BUCKETS[-1])
+
+
+def flow_metrics(project_id, days=365, today=None, percentiles=(50, 85, 95)):
+    """Cycle/lead-time percentiles, average time in status and cumulative flow, read from rollups"""
+    today = today or date.today()
+    start = today - timedelta(days=days - 1)
+
+    histograms = {'cycle': {}, 'lead': {}}
+    rows = db.session.execute(
+        select(TaskCycleTimeDailyRollup.metric, TaskCycleTimeDailyRollup.bucket, func.sum(TaskCycleTimeDailyRollup.task_count))
+        .where(TaskCycleTimeDailyRollup.project_id == project_id, TaskCycleTimeDailyRollup.day >= start)
+        .group_by(TaskCycleTimeDailyRollup.metric, TaskCycleTimeDailyRollup.bucket)
+    )
+    for metric, bucket, count in rows:
+        histograms.setdefault(metric, {})[bucket] = int(count)
+
+    time_in_status = {
+        status: round(seconds / exited / 3600.0, 1) if exited else None
+        for status, exited, seconds in db.session.execute(
+            select(TaskStatusDailyRollup.status, func.sum(TaskStatusDailyRollup.exited), func.sum(TaskStatusDailyRollup.seconds_in_status))
+            .where(TaskStatusDailyRollup.project_id == project_id, TaskStatusDailyRollup.day >= start)
+            .group_by(TaskStatusDailyRollup.status)
+        )
+    }
+
+    # Cumulative flow: tasks in each status at the end of each day
+    wip = {
+        status: int(net or 0)
+        for status, net in db.session.execute(
+            select(TaskStatusDailyRollup.status, func.sum(TaskStatusDailyRollup.entered - TaskStatusDailyRollup.exited))
+            .where(TaskStatusDailyRollup.project_id == project_id, TaskStatusDailyRollup.day < start)
+            .group_by(TaskStatusDailyRollup.status)
+        )
+    }
+    changes = {}
+    for row in TaskStatusDailyRollup.query.filter(TaskStatusDailyRollup.project_id == project_id,
+                                                  TaskStatusDailyRollup.day >= start):
+        changes.setdefault(row.day, []).append((row.status, row.entered - row.exited))
+        wip.setdefault(row.status, 0)
+
+    cumulative_flow = []
+    day = start
+    while day <= today:
+        for status, delta in changes.get(day, []):
+            wip[status] += delta
+        cumulative_flow.append({'day': day.isoformat(), **wip})
+        day += timedelta(days=1)
+
+    return {
+        'cycle_time_hours': {f'p{p}': _histogram_percentile(histograms['cycle'], p) for p in percentiles},
+        'lead_time_hours': {f'p{p}': _histogram_percentile(histograms['lead'], p) for p in percentiles},
+        'completed_tasks': sum(histograms['lead'].values()),
+        'avg_hours_in_status': time_in_status,
+        'cumulative_flow': cumulative_flow
+    }
+
+
+def backfill_transitions(batch_size=1000):
+    """Seed an initial transition for tasks created before the transition log existed"""
+    inserted = 0
+    while True:
+        tasks = db.session.execute(
+            select(Task.task_id, Task.project_id, Task.status, Task.created_at)
+            .where(~exists().where(TaskStatusTransition.task_id == Task.task_id))
+            .limit(batch_size)
+        ).all()
+        if not tasks:
+            break
+        db.session.execute(TaskStatusTransition.__table__.insert(), [
+            {'transition_id': uuid.uuid4(), 'task_id': task_id, 'project_id': project_id,
+             'from_status': None, 'to_status': status.value if hasattr(status, 'value') else str(status),
+             'changed_at': created_at}
+            for task_id, project_id, status, created_at in tasks
+        ])
+        db.session.commit()
+        inserted += len(tasks)
+    return inserted
+
+
+def register_report_commands(app):
+    """Register `flask reports refresh` (run from cron, e.g. every 15 minutes)"""
+
+    @app.cli.group('reports')
+    def reports_cli():
+        """Project analytics rollups"""
+
+    @reports_cli.command('refresh')
+    @click.option('--full', is_flag=True, help='Recompute today for every project and rebuild flow rollups')
+    def refresh_command(full):
+        """Refresh daily report rollups for changed projects"""
+        result = refresh_rollups(full=full)
+        click.echo(f"Refreshed {result['project_rows']} project rows and {result['sprint_rows']} sprint rows "
+                   f"across {result['projects']} projects")
+        flow = refresh_flow_rollups(full=full)
+        click.echo(f"Folded transitions into {flow['status_rows']} status rows and {flow['histogram_rows']} histogram rows")
+
+    @reports_cli.command('backfill-transitions')
+    def backfill_command():
+        """Seed initial status transitions for pre-existing tasks, then rebuild flow rollups"""
+        inserted = backfill_transitions()
+        refresh_flow_rollups(full=True)
+        click.echo(f'Backfilled {inserted} transitions')
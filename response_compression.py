@@ -0,0 +1,213 @@
+"""
+Dynamic response compression for the Jira Board Application
+An after_request hook gzip/brotli-encodes HTML, JSON and text responses the client
+accepts, including streamed exports, and counts the bytes saved
+"""
+
+import logging
+import threading
+import zlib
+
+from flask import request
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only without it
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = (
+    'text/html', 'text/plain', 'text/css', 'text/csv', 'text/xml',
+    'application/json', 'application/javascript', 'application/x-ndjson', 'application/xml',
+    'image/svg+xml'
+)
+
+
+class _Gzip:
+    """Incremental gzip stream (zlib with a gzip header)"""
+
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _Brotli:
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class ResponseCompression:
+    """
+    Content-negotiated compression of dynamic responses
+
+    Buffered responses below COMPRESSION_MIN_SIZE, responses that already
+    carry a Content-Encoding (precompressed static bundles), files, ranges,
+    Cache-Control: no-transform and text/event-stream are left alone.
+    Streamed bodies are compressed chunk by chunk and flushed every
+    COMPRESSION_STREAM_FLUSH_BYTES, so downloads still start immediately.
+
+    Usage:
+        response_compression.init_app(app)
+        response_compression.stats()
+    """
+
+    def __init__(self, app=None):
+        self.enabled = True
+        self.gzip_level = 6
+        self.brotli_quality = 4
+        self.min_size = 1024
+        self.stream_flush_bytes = 16 * 1024
+        self.mimetypes = COMPRESSIBLE_MIMETYPES
+
+        self._lock = threading.Lock()
+        self._compressed = {}
+        self._bytes_in = 0
+        self._bytes_out = 0
+        self._skipped = {}
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read compression settings and install the after_request hook"""
+        self.enabled = app.config.get('COMPRESSION_ENABLED', True)
+        self.gzip_level = app.config.get('COMPRESSION_LEVEL', self.gzip_level)
+        self.brotli_quality = app.config.get('COMPRESSION_BROTLI_QUALITY', self.brotli_quality)
+        self.min_size = app.config.get('COMPRESSION_MIN_SIZE', self.min_size)
+        self.stream_flush_bytes = app.config.get('COMPRESSION_STREAM_FLUSH_BYTES', self.stream_flush_bytes)
+        self.mimetypes = tuple(app.config.get('COMPRESSION_MIMETYPES', self.mimetypes))
+        app.extensions['response_compression'] = self
+        if self.enabled:
+            app.after_request(self.compress_response)
+
+    def choose_encoding(self):
+        """Best encoding the client accepts: br (when available) before gzip; None for identity"""
+        accepted = request.accept_encodings
+        if brotli is not None and accepted['br'] and accepted['br'] >= accepted['gzip']:
+            return 'br'
+        if accepted['gzip']:
+            return 'gzip'
+        return None
+
+    def _compressor(self, encoding):
+        return _Brotli(self.brotli_quality) if encoding == 'br' else _Gzip(self.gzip_level)
+
+    def _skip_reason(self, response):
+        if response.mimetype not in self.mimetypes:
+            return 'mimetype'
+        if response.status_code < 200 or response.status_code in (204, 206, 304) or request.method == 'HEAD':
+            return 'status'
+        if 'Content-Encoding' in response.headers:
+            return 'encoded'
+        if response.direct_passthrough:
+            return 'file'
+        if 'no-transform' in response.headers.get('Cache-Control', ''):
+            return 'no-transform'
+        if not response.is_streamed and (response.content_length or 0) < self.min_size:
+            return 'small'
+        return None
+
+    def compress_response(self, response):
+        if response.mimetype == 'text/event-stream':
+            self._count_skip('event-stream')
+            return response
+        reason = self._skip_reason(response)
+        if reason == 'mimetype':
+            return response
+        # The representation varies with Accept-Encoding whether or not this one is compressed
+        response.vary.add('Accept-Encoding')
+        encoding = self.choose_encoding() if reason is None else None
+        if reason is None and encoding is None:
+            reason = 'not-accepted'
+        if reason is not None:
+            self._count_skip(reason)
+            return response
+
+        if response.is_streamed:
+            response.response = self._stream(response.response, encoding)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            compressor = self._compressor(encoding)
+            compressed = compressor.compress(data) + compressor.finish()
+            if len(compressed) >= len(data):
+                self._count_skip('incompressible')
+                return response
+            response.set_data(compressed)
+            self._count(encoding, len(data), len(compressed))
+
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    def _stream(self, chunks, encoding):
+        compressor = self._compressor(encoding)
+        bytes_in = bytes_out = pending = 0
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                bytes_in += len(chunk)
+                pending += len(chunk)
+                output = compressor.compress(chunk)
+                if pending >= self.stream_flush_bytes:
+                    output += compressor.flush()
+                    pending = 0
+                if output:
+                    bytes_out += len(output)
+                    yield output
+            output = compressor.finish()
+            bytes_out += len(output)
+            yield output
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close is not None:
+                close()
+            self._count(encoding, bytes_in, bytes_out)
+
+    def _count(self, encoding, bytes_in, bytes_out):
+        with self._lock:
+            self._compressed[encoding] = self._compressed.get(encoding, 0) + 1
+            self._bytes_in += bytes_in
+            self._bytes_out += bytes_out
+
+    def _count_skip(self, reason):
+        with self._lock:
+            self._skipped[reason] = self._skipped.get(reason, 0) + 1
+
+    def stats(self):
+        """Compressed responses per encoding, bytes before/after and skip reasons"""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'brotli_available': brotli is not None,
+                'compressed': dict(self._compressed),
+                'bytes_in': self._bytes_in,
+                'bytes_out': self._bytes_out,
+                'bytes_saved': self._bytes_in - self._bytes_out,
+                'ratio': round(self._bytes_out / self._bytes_in, 3) if self._bytes_in else None,
+                'skipped': dict(self._skipped)
+            }
+
+
+response_compression = ResponseCompression()
@@ -1,12 +1,15 @@
 from flask import Blueprint
-from controllers.attachment_controllers import upload_attachment_task, upload_attachment_ticket
+from startup import lazy_import
+
+# Controllers are imported on the first request that uses them (see startup.py)
+attachment_controllers = lazy_import('controllers.attachment_controllers')
 
 attachment_bp = Blueprint('attachment', __name__)
 
 @attachment_bp.route('/task/<uuid:task_id>/upload', methods=['GET', 'POST'])
 def upload_to_task(task_id):
-    return upload_attachment_task(task_id)
+    return attachment_controllers.upload_attachment_task(task_id)
 
 @attachment_bp.route('/ticket/<uuid:ticket_id>/upload', methods=['GET', 'POST'])
 def upload_to_ticket(ticket_id):
-    return upload_attachment_ticket(ticket_id)
\ No newline at end of file
+    return attachment_controllers.upload_attachment_ticket(ticket_id)
\ No newline at end of file
@@ -1,8 +1,15 @@
 from flask import Blueprint
-from controllers.audit_controllers import get_audit_logs
+from startup import lazy_import
+
+# Controllers are imported on the first request that uses them (see startup.py)
+audit_controllers = lazy_import('controllers.audit_controllers')
 
 audit_bp = Blueprint('audit', __name__)
 
 @audit_bp.route('/')
 def logs():
-    return get_audit_logs()
\ No newline at end of file
+    return audit_controllers.get_audit_logs()
+
+@audit_bp.route('/export')
+def export():
+    return audit_controllers.export_audit_logs()
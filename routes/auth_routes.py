@@ -1,20 +1,19 @@
 from flask import Blueprint, render_template
-from controllers.auth_controllers import (
-    register as register_controller,
-    login as login_controller, 
-    logout as logout_controller
-)
+from startup import lazy_import
+
+# Controllers are imported on the first request that uses them (see startup.py)
+auth_controllers = lazy_import('controllers.auth_controllers')
 
 auth_bp = Blueprint('auth', __name__)
 
 @auth_bp.route('/register', methods=['GET', 'POST'])
 def register():
-    return register_controller()
+    return auth_controllers.register()
 
 @auth_bp.route('/login', methods=['GET', 'POST'])
 def login():
-    return login_controller()
+    return auth_controllers.login()
 
 @auth_bp.route('/logout')
 def logout():
-    return logout_controller()
\ No newline at end of file
+    return auth_controllers.logout()
\ No newline at end of file
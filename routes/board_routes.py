@@ -1,12 +1,15 @@
 from flask import Blueprint
-from controllers.board_controllers import create_board, get_board
+from startup import lazy_import
+
+# Controllers are imported on the first request that uses them (see startup.py)
+board_controllers = lazy_import('controllers.board_controllers')
 
 board_bp = Blueprint('board', __name__)
 
 @board_bp.route('/project/<uuid:project_id>/create', methods=['GET', 'POST'])
 def create(project_id):
-    return create_board(project_id)
+    return board_controllers.create_board(project_id)
 
 @board_bp.route('/<uuid:board_id>')
 def detail(board_id):
-    return get_board(board_id)
\ No newline at end of file
+    return board_controllers.get_board(board_id)
\ No newline at end of file
@@ -1,12 +1,15 @@
 from flask import Blueprint
-from controllers.comment_controllers import create_comment_task, create_comment_ticket
+from startup import lazy_import
+
+# Controllers are imported on the first request that uses them (see startup.py)
+comment_controllers = lazy_import('controllers.comment_controllers')
 
 comment_bp = Blueprint('comment', __name__)
 
 @comment_bp.route('/task/<uuid:task_id>/create', methods=['GET', 'POST'])
 def create_on_task(task_id):
-    return create_comment_task(task_id)
+    return comment_controllers.create_comment_task(task_id)
 
 @comment_bp.route('/ticket/<uuid:ticket_id>/create', methods=['GET', 'POST'])
 def create_on_ticket(ticket_id):
-    return create_comment_ticket(ticket_id)
\ No newline at end of file
+    return comment_controllers.create_comment_ticket(ticket_id)
\ No newline at end of file
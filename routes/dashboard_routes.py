@@ -1,5 +1,8 @@
 from flask import Blueprint, render_template
-from controllers.dashboard_controllers import dashboard
+from startup import lazy_import
+
+# Controllers are imported on the first request that uses them (see startup.py)
+dashboard_controllers = lazy_import('controllers.dashboard_controllers')
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
@@ -11,4 +14,4 @@ def landing():
 @dashboard_bp.route('/dashboard')
 def dashboard_page():
     """Dashboard page - login required"""
-    return dashboard()
\ No newline at end of file
+    return dashboard_controllers.dashboard()
\ No newline at end of file
@@ -1,8 +1,15 @@
 from flask import Blueprint
-from controllers.goal_controllers import (
-    get_goals, create_goal, get_goal, update_goal, 
-    delete_goal, update_goal_progress, get_goal_stats
-)
+from startup import lazy_import
+
+# Controllers are imported on the first request that uses them (see startup.py)
+goal_controllers = lazy_import('controllers.goal_controllers')
+get_goals = goal_controllers.view('get_goals')
+create_goal = goal_controllers.view('create_goal')
+get_goal = goal_controllers.view('get_goal')
+update_goal = goal_controllers.view('update_goal')
+delete_goal = goal_controllers.view('delete_goal')
+update_goal_progress = goal_controllers.view('update_goal_progress')
+get_goal_stats = goal_controllers.view('get_goal_stats')
 
 # Create the goal blueprint
 goal_bp = Blueprint('goal', __name__, url_prefix='/goals')
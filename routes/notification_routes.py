@@ -1,12 +1,15 @@
 from flask import Blueprint
-from controllers.notification_controllers import create_notification_template, get_notification_templates
+from startup import lazy_import
+
+# Controllers are imported on the first request that uses them (see startup.py)
+notification_controllers = lazy_import('controllers.notification_controllers')
 
 notification_bp = Blueprint('notification', __name__)
 
 @notification_bp.route('/create', methods=['GET', 'POST'])
 def create():
-    return create_notification_template()
+    return notification_controllers.create_notification_template()
 
 @notification_bp.route('/')
 def templates():
-    return get_notification_templates()
\ No newline at end of file
+    return notification_controllers.get_notification_templates()
\ No newline at end of file
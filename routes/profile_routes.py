@@ -1,19 +1,22 @@
 from flask import Blueprint
-from controllers.profile_controllers import profile, update_profile, request_role
+from startup import lazy_import
+
+# Controllers are imported on the first request that uses them (see startup.py)
+profile_controllers = lazy_import('controllers.profile_controllers')
 
 profile_bp = Blueprint('profile', __name__)
 
 @profile_bp.route('/profile')
 def profile_page():
-    return profile()
+    return profile_controllers.profile()
 
 @profile_bp.route('/profile/update', methods=['POST'])
 def update_profile_page():
-    return update_profile()
+    return profile_controllers.update_profile()
 
 @profile_bp.route('/profile/request-role', methods=['POST'])
 def request_role_page():
-    return request_role()
+    return profile_controllers.request_role()
 
 @profile_bp.route('/switch-role/<role_name>')
 def switch_role_view(role_name):
@@ -1,44 +1,50 @@
 from flask import Blueprint
-from controllers.project_controllers import (
-    create_project, 
-    list_projects, 
-    get_project, 
-    update_project, 
-    delete_project
-)
-from controllers.simple_project_controllers import (
-    goals,
-    create_goal
-)
+from startup import lazy_import
+
+# Controllers are imported on the first request that uses them (see startup.py)
+project_controllers = lazy_import('controllers.project_controllers')
+simple_project_controllers = lazy_import('controllers.simple_project_controllers')
 
 project_bp = Blueprint('project', __name__)
 
 @project_bp.route('/')
 @project_bp.route('/projects')
 def projects():
-    return list_projects()
+    return project_controllers.list_projects()
 
 @project_bp.route('/create', methods=['GET', 'POST'])
 def create():
-    return create_project()
+    return project_controllers.create_project()
 
 @project_bp.route('/<uuid:project_id>')
 def detail(project_id):
-    return get_project(project_id)
+    return project_controllers.get_project(project_id)
 
 @project_bp.route('/<uuid:project_id>/edit', methods=['GET', 'POST'])
 def edit(project_id):
-    return update_project(project_id)
+    return project_controllers.update_project(project_id)
 
 @project_bp.route('/<uuid:project_id>/delete', methods=['POST'])
 def delete(project_id):
-    return delete_project(project_id)
+    return project_controllers.delete_project(project_id)
+
+@project_bp.route('/<uuid:project_id>/epics/summary.json')
+def epic_summary(project_id):
+    return project_controllers.epic_summary_data(project_id)
+
+@project_bp.route('/<uuid:project_id>/health.json')
+def health(project_id):
+    return project_controllers.project_health_data(project_id)
+
+@project_bp.route('/<uuid:project_id>/tasks.json')
+def tasks_page(project_id):
+    return project_controllers.project_tasks_data(project_id)
 
 # Goals routes
 @project_bp.route('/goals')
 def goals_page():
-    return goals()
+    return simple_project_controllers.goals()
 
 @project_bp.route('/goals/create', methods=['GET', 'POST'])
 def create_goal_page():
-    return create_goal()
\ No newline at end of file
+    return simple_project_controllers.create_goal()
\ No newline at end of file
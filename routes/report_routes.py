@@ -1,12 +1,43 @@
 from flask import Blueprint
-from controllers.report_controllers import create_report, get_reports
+from startup import lazy_import
+
+# Controllers are imported on the first request that uses them (see startup.py)
+report_controllers = lazy_import('controllers.report_controllers')
 
 report_bp = Blueprint('report', __name__)
 
 @report_bp.route('/project/<uuid:project_id>/create', methods=['GET', 'POST'])
 def create(project_id):
-    return create_report(project_id)
+    return report_controllers.create_report(project_id)
 
 @report_bp.route('/')
 def reports():
-    return get_reports()
\ No newline at end of file
+    return report_controllers.get_reports()
+
+@report_bp.route('/project/<uuid:project_id>/analytics')
+def analytics(project_id):
+    return report_controllers.project_analytics(project_id)
+
+@report_bp.route('/project/<uuid:project_id>/analytics.json')
+def analytics_data(project_id):
+    return report_controllers.project_analytics_data(project_id)
+
+@report_bp.route('/project/<uuid:project_id>/flow.json')
+def flow_data(project_id):
+    return report_controllers.project_flow_data(project_id)
+
+@report_bp.route('/timesheet')
+def my_timesheet():
+    return report_controllers.timesheet()
+
+@report_bp.route('/timesheet.json')
+def my_timesheet_data():
+    return report_controllers.timesheet_data()
+
+@report_bp.route('/project/<uuid:project_id>/timesheet.json')
+def project_timesheet_json(project_id):
+    return report_controllers.project_timesheet_data(project_id)
+
+@report_bp.route('/project/<uuid:project_id>/estimates.json')
+def estimates_data(project_id):
+    return report_controllers.project_estimates_data(project_id)
\ No newline at end of file
@@ -1,8 +1,11 @@
 from flask import Blueprint
-from controllers.role_controllers import list_pending_users
+from startup import lazy_import
+
+# Controllers are imported on the first request that uses them (see startup.py)
+role_controllers = lazy_import('controllers.role_controllers')
 
 role_bp = Blueprint('role', __name__)
 
 @role_bp.route('/pending-users')
 def pending_users():
-    return list_pending_users()
\ No newline at end of file
+    return role_controllers.list_pending_users()
\ No newline at end of file
@@ -1,8 +1,11 @@
 from flask import Blueprint
-from controllers.search_controllers import search
+from startup import lazy_import
+
+# Controllers are imported on the first request that uses them (see startup.py)
+search_controllers = lazy_import('controllers.search_controllers')
 
 search_bp = Blueprint('search', __name__)
 
 @search_bp.route('/search')
 def search_page():
-    return search()
+    return search_controllers.search()
@@ -1,12 +1,15 @@
 from flask import Blueprint
-from controllers.sprint_controllers import create_sprint, get_sprint
+from startup import lazy_import
+
+# Controllers are imported on the first request that uses them (see startup.py)
+sprint_controllers = lazy_import('controllers.sprint_controllers')
 
 sprint_bp = Blueprint('sprint', __name__)
 
 @sprint_bp.route('/project/<uuid:project_id>/create', methods=['GET', 'POST'])
 def create(project_id):
-    return create_sprint(project_id)
+    return sprint_controllers.create_sprint(project_id)
 
 @sprint_bp.route('/<uuid:sprint_id>')
 def detail(sprint_id):
-    return get_sprint(sprint_id)
\ No newline at end of file
+    return sprint_controllers.get_sprint(sprint_id)
\ No newline at end of file
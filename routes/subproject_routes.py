@@ -1,12 +1,15 @@
 from flask import Blueprint
-from controllers.subproject_controllers import create_subproject, get_subproject
+from startup import lazy_import
+
+# Controllers are imported on the first request that uses them (see startup.py)
+subproject_controllers = lazy_import('controllers.subproject_controllers')
 
 subproject_bp = Blueprint('subproject', __name__)
 
 @subproject_bp.route('/project/<uuid:project_id>/create', methods=['GET', 'POST'])
 def create(project_id):
-    return create_subproject(project_id)
+    return subproject_controllers.create_subproject(project_id)
 
 @subproject_bp.route('/<uuid:subproject_id>')
 def detail(subproject_id):
-    return get_subproject(subproject_id)
\ No newline at end of file
+    return subproject_controllers.get_subproject(subproject_id)
\ No newline at end of file
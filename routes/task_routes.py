@@ -1,25 +1,63 @@
 from flask import Blueprint
-from controllers.task_controllers import create_task, update_task, delete_task, update_task_status, get_project_tasks
+from startup import lazy_import
+
+# Controllers are imported on the first request that uses them (see startup.py)
+task_controllers = lazy_import('controllers.task_controllers')
 
 task_bp = Blueprint('task', __name__)
 
 @task_bp.route('/project/<uuid:project_id>/create', methods=['GET', 'POST'])
 def create(project_id):
-    return create_task(project_id)
+    return task_controllers.create_task(project_id)
 
 @task_bp.route('/<uuid:task_id>/edit', methods=['GET', 'POST'])
 def edit(task_id):
-    return update_task(task_id)
+    return task_controllers.update_task(task_id)
 
 @task_bp.route('/<uuid:task_id>/delete', methods=['POST'])
 def delete(task_id):
-    return delete_task(task_id)
+    return task_controllers.delete_task(task_id)
 
 # API Routes for Kanban Board
 @task_bp.route('/<uuid:task_id>/status', methods=['PUT'])
 def update_status(task_id):
-    return update_task_status(task_id)
+    return task_controllers.update_task_status(task_id)
 
 @task_bp.route('/api/projects/<uuid:project_id>/tasks', methods=['GET'])
 def get_tasks(project_id):
-    return get_project_tasks(project_id)
\ No newline at end of file
+    return task_controllers.get_project_tasks(project_id)
+
+# Time tracking
+@task_bp.route('/<uuid:task_id>/worklog', methods=['POST'])
+def log_work(task_id):
+    return task_controllers.log_task_work(task_id)
+
+@task_bp.route('/worklogs/bulk', methods=['POST'])
+def bulk_worklog():
+    return task_controllers.bulk_log_work()
+
+# Dependency graph
+@task_bp.route('/<uuid:task_id>/dependencies', methods=['POST'])
+def add_dependency(task_id):
+    return task_controllers.add_task_dependency(task_id)
+
+@task_bp.route('/<uuid:task_id>/dependencies/<uuid:dependency_id>', methods=['DELETE'])
+def remove_dependency(task_id, dependency_id):
+    return task_controllers.remove_task_dependency(task_id, dependency_id)
+
+@task_bp.route('/<uuid:task_id>/blockers', methods=['GET'])
+def blockers(task_id):
+    return task_controllers.get_task_blockers(task_id)
+
+@task_bp.route('/api/projects/<uuid:project_id>/dependency-graph', methods=['GET'])
+def dependency_graph(project_id):
+    return task_controllers.get_dependency_graph(project_id)
+
+# Subtask hierarchy
+@task_bp.route('/<uuid:task_id>/tree', methods=['GET'])
+def tree(task_id):
+    return task_controllers.get_task_tree(task_id)
+
+@task_bp.route('/<uuid:task_id>/move', methods=['POST'])
+def move(task_id):
+    return task_controllers.move_task_subtree(task_id)
\ No newline at end of file
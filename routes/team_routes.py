@@ -1,24 +1,27 @@
 from flask import Blueprint
-from controllers.team_controllers import create_team, get_teams, add_team_member, get_team, update_team
+from startup import lazy_import
+
+# Controllers are imported on the first request that uses them (see startup.py)
+team_controllers = lazy_import('controllers.team_controllers')
 
 team_bp = Blueprint('team', __name__)
 
 @team_bp.route('/create', methods=['GET', 'POST'])
 def create():
-    return create_team()
+    return team_controllers.create_team()
 
 @team_bp.route('/')
 def teams():
-    return get_teams()
+    return team_controllers.get_teams()
 
 @team_bp.route('/<uuid:team_id>/add-member', methods=['GET', 'POST'])
 def add_member(team_id):
-    return add_team_member(team_id)
+    return team_controllers.add_team_member(team_id)
 
 @team_bp.route('/<uuid:team_id>')
 def detail(team_id):
-    return get_team(team_id)
+    return team_controllers.get_team(team_id)
 
 @team_bp.route('/<uuid:team_id>/edit', methods=['GET', 'POST'])
 def edit(team_id):
-    return update_team(team_id)
\ No newline at end of file
+    return team_controllers.update_team(team_id)
\ No newline at end of file
@@ -1,16 +1,19 @@
 from flask import Blueprint
-from controllers.ticket_controllers import create_ticket, get_tickets, update_ticket
+from startup import lazy_import
+
+# Controllers are imported on the first request that uses them (see startup.py)
+ticket_controllers = lazy_import('controllers.ticket_controllers')
 
 ticket_bp = Blueprint('ticket', __name__)
 
 @ticket_bp.route('/create', methods=['GET', 'POST'])
 def create():
-    return create_ticket()
+    return ticket_controllers.create_ticket()
 
 @ticket_bp.route('/')
 def tickets():
-    return get_tickets()
+    return ticket_controllers.get_tickets()
 
 @ticket_bp.route('/<uuid:ticket_id>/edit', methods=['GET', 'POST'])
 def edit(ticket_id):
-    return update_ticket(ticket_id)
\ No newline at end of file
+    return ticket_controllers.update_ticket(ticket_id)
\ No newline at end of file
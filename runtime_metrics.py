@@ -0,0 +1,384 @@
+"""
+Runtime metrics for the Jira Board Application
+A background thread samples process, GC, connection pool, database and upload storage
+state into ring buffers for the admin dashboard and the Prometheus /metrics endpoint
+"""
+
+import gc
+import hmac
+import ipaddress
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import deque
+
+from flask import Response, abort, request
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+PREFIX = 'jira_board'
+
+try:
+    _PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+def _rss_bytes():
+    """Current resident set size; falls back to the peak where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+
+def _system_memory():
+    """(total, available) bytes of host memory, or (None, None)"""
+    try:
+        values = {}
+        with open('/proc/meminfo') as meminfo:
+            for line in meminfo:
+                key, value = line.split(':', 1)
+                values[key] = int(value.split()[0]) * 1024
+        return values['MemTotal'], values.get('MemAvailable', values.get('MemFree'))
+    except (OSError, ValueError, KeyError):
+        return None, None
+
+
+def _directory_bytes(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.stat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def _percent(part, whole):
+    return round(part * 100.0 / whole, 1) if whole else None
+
+
+class RuntimeMetrics:
+    """
+    Periodic sampler of runtime state with bounded history
+
+    Requests only bump two counters; everything else (RSS, CPU, GC, pool
+    checkouts, a SELECT 1 round trip, upload disk usage) is read by a daemon
+    thread every METRICS_INTERVAL seconds. Each worker process samples itself.
+
+    Usage:
+        runtime_metrics.init_app(app)
+        runtime_metrics.system_health()   # dashboard figures
+        runtime_metrics.history()         # ring buffer contents
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.enabled = True
+        self.interval = 15.0
+        self.upload_scan_interval = 300.0
+        self.token = None
+        self.require_token = True
+        self.allowed_networks = []
+
+        self._samples = deque(maxlen=240)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+
+        self.started_at = time.time()
+        self._requests = 0
+        self._server_errors = 0
+        self._db_checks = 0
+        self._db_failures = 0
+        self._gc_pause_seconds = 0.0
+        self._gc_started = None
+        self._upload_bytes = None
+        self._upload_scanned_at = 0.0
+        self._last_cpu = None
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read sampler settings, hook request counting and expose /metrics"""
+        self.app = app
+        self.enabled = app.config.get('METRICS_ENABLED', True)
+        self.interval = app.config.get('METRICS_INTERVAL', self.interval)
+        self.upload_scan_interval = app.config.get('METRICS_UPLOAD_SCAN_INTERVAL', self.upload_scan_interval)
+        self._samples = deque(self._samples, maxlen=app.config.get('METRICS_HISTORY', 240))
+        self.token = app.config.get('METRICS_TOKEN')
+        self.require_token = app.config.get('METRICS_REQUIRE_TOKEN', True)
+        self.allowed_networks = [ipaddress.ip_network(network)
+                                 for network in app.config.get('METRICS_ALLOWED_NETWORKS', [])]
+        if self.enabled and self.require_token and not self.token:
+            logger.warning('METRICS_TOKEN is not set; /metrics will refuse every scrape')
+        app.extensions['runtime_metrics'] = self
+
+        if not self.enabled:
+            return
+        if self._record_gc not in gc.callbacks:
+            gc.callbacks.append(self._record_gc)
+        app.before_request(self._ensure_worker)
+        app.after_request(self._count_response)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_endpoint)
+
+    # Request path: a pid comparison and two integer increments
+
+    def _ensure_worker(self):
+        """Start the sampler thread on the first request (and again after a fork)"""
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='runtime-metrics', daemon=True)
+            self._thread.start()
+
+    def _count_response(self, response):
+        self._requests += 1
+        if response.status_code >= 500:
+            self._server_errors += 1
+        return response
+
+    def _record_gc(self, phase, info):
+        if phase == 'start':
+            self._gc_started = time.perf_counter()
+        elif self._gc_started is not None:
+            self._gc_pause_seconds += time.perf_counter() - self._gc_started
+            self._gc_started = None
+
+    # Sampler thread
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception:
+                logger.exception('Runtime metrics sample failed')
+            self._stop.wait(self.interval)
+
+    def stop(self):
+        self._stop.set()
+
+    def sample(self):
+        """Take one sample now and append it to the history"""
+        now = time.time()
+        cpu_seconds = time.process_time()
+        cpu_percent = None
+        if self._last_cpu is not None:
+            wall = now - self._last_cpu[0]
+            cpu_percent = round((cpu_seconds - self._last_cpu[1]) * 100.0 / wall, 1) if wall > 0 else None
+        self._last_cpu = (now, cpu_seconds)
+
+        memory_total, memory_available = _system_memory()
+        sample = {
+            'timestamp': now,
+            'rss_bytes': _rss_bytes(),
+            'memory_total_bytes': memory_total,
+            'memory_available_bytes': memory_available,
+            'cpu_seconds': cpu_seconds,
+            'cpu_percent': cpu_percent,
+            'threads': threading.active_count(),
+            'gc_counts': gc.get_count(),
+            'gc_collections': [generation['collections'] for generation in gc.get_stats()],
+            'gc_collected': [generation['collected'] for generation in gc.get_stats()],
+            'gc_pause_seconds': self._gc_pause_seconds,
+            'requests': self._requests,
+            'server_errors': self._server_errors
+        }
+        with self.app.app_context():
+            sample.update(self._sample_database())
+            sample.update(self._sample_storage(now))
+
+        previous = self._samples[-1] if self._samples else None
+        errors = sample['server_errors'] - previous['server_errors'] if previous else 0
+        sample['healthy'] = sample['db_up'] and errors == 0
+        with self._lock:
+            self._samples.append(sample)
+        return sample
+
+    def _sample_database(self):
+        from extensions import db
+
+        pool = db.engine.pool
+        # QueuePool reports all three; SQLite's static/singleton pools report none
+        counters = {name: getattr(pool, name, None) for name in ('size', 'checkedout', 'overflow')}
+        counters = {name: value() if callable(value) else None for name, value in counters.items()}
+        stats = {
+            'pool_size': counters['size'],
+            'pool_checked_out': counters['checkedout'],
+            'pool_overflow': max(counters['overflow'], 0) if counters['overflow'] is not None else None
+        }
+        self._db_checks += 1
+        started = time.perf_counter()
+        try:
+            with db.engine.connect() as connection:
+                connection.execute(text('SELECT 1'))
+            stats.update(db_up=True, db_latency_seconds=time.perf_counter() - started)
+        except Exception as e:
+            self._db_failures += 1
+            logger.warning('Database health check failed: %s', e)
+            stats.update(db_up=False, db_latency_seconds=None)
+        return stats
+
+    def _sample_storage(self, now):
+        folder = self.app.config.get('UPLOAD_FOLDER', 'static/uploads')
+        if not os.path.isabs(folder):
+            folder = os.path.join(self.app.root_path, folder)
+        if not os.path.isdir(folder):
+            return {'disk_total_bytes': None, 'disk_used_bytes': None, 'upload_bytes': 0}
+        usage = shutil.disk_usage(folder)
+        # Walking the upload tree is the expensive part, so it runs on its own, slower clock
+        if self._upload_bytes is None or now - self._upload_scanned_at >= self.upload_scan_interval:
+            self._upload_bytes = _directory_bytes(folder)
+            self._upload_scanned_at = now
+        return {'disk_total_bytes': usage.total, 'disk_used_bytes': usage.used,
+                'upload_bytes': self._upload_bytes}
+
+    # Readers
+
+    def latest(self):
+        """Most recent sample, or None before the sampler thread's first one"""
+        with self._lock:
+            return self._samples[-1] if self._samples else None
+
+    def history(self, fields=None):
+        """Samples in the ring buffer, oldest first, optionally restricted to `fields`"""
+        with self._lock:
+            samples = list(self._samples)
+        if fields:
+            return [{key: sample.get(key) for key in ('timestamp', *fields)} for sample in samples]
+        return samples
+
+    def system_health(self):
+        """Figures for the admin dashboard's uptime card and system health panel (None until sampled)"""
+        sample = self.latest() or {}
+        with self._lock:
+            samples = list(self._samples)
+        healthy = sum(1 for item in samples if item['healthy'])
+        db_up = sum(1 for item in samples if item['db_up'])
+
+        memory_used = None
+        if sample.get('memory_total_bytes') and sample.get('memory_available_bytes') is not None:
+            memory_used = _percent(sample['memory_total_bytes'] - sample['memory_available_bytes'],
+                                   sample['memory_total_bytes'])
+        latency = sample.get('db_latency_seconds')
+        database_status = None
+        if sample:
+            database_status = ('healthy' if sample['db_up'] and (latency or 0) < 0.5
+                               else 'slow' if sample['db_up'] else 'down')
+        api_uptime = _percent(self._requests - self._server_errors, self._requests)
+        return {
+            'uptime_percentage': _percent(healthy, len(samples)),
+            'uptime_seconds': int(time.time() - self.started_at),
+            'database_status': database_status,
+            'database_uptime': _percent(db_up, len(samples)),
+            'database_latency_ms': round(latency * 1000, 1) if latency is not None else None,
+            'api_status': 'running',
+            'api_uptime': 100.0 if api_uptime is None else api_uptime,
+            'storage_usage': _percent(sample.get('disk_used_bytes'), sample.get('disk_total_bytes')),
+            'upload_bytes': sample.get('upload_bytes'),
+            'memory_status': (None if not sample else 'normal' if memory_used is None or memory_used < 85
+                              else 'high'),
+            'memory_usage': memory_used,
+            'process_rss_bytes': sample.get('rss_bytes'),
+            'cpu_percent': sample.get('cpu_percent'),
+            'pool_checked_out': sample.get('pool_checked_out'),
+            'pool_overflow': sample.get('pool_overflow')
+        }
+
+    def prometheus_text(self):
+        """Latest sample and counters in the Prometheus text format; sampled gauges wait for the first sample"""
+        sample = self.latest() or {}
+        lines = []
+
+        def metric(name, kind, help_text, values):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in values:
+                if value is None:
+                    continue
+                label_text = '{' + ','.join(f'{key}="{val}"' for key, val in labels.items()) + '}' if labels else ''
+                lines.append(f'{name}{label_text} {value!r}' if isinstance(value, float)
+                             else f'{name}{label_text} {value}')
+
+        metric('process_resident_memory_bytes', 'gauge', 'Resident memory size in bytes.',
+               [({}, sample.get('rss_bytes'))])
+        metric('process_cpu_seconds_total', 'counter', 'Total user and system CPU time spent in seconds.',
+               [({}, time.process_time())])
+        metric('process_start_time_seconds', 'gauge', 'Start time of the process since unix epoch in seconds.',
+               [({}, self.started_at)])
+        metric('python_gc_collections_total', 'counter', 'Number of times this generation was collected.',
+               [({'generation': str(gen)}, stats['collections']) for gen, stats in enumerate(gc.get_stats())])
+        metric('python_gc_objects_collected_total', 'counter', 'Objects collected during gc.',
+               [({'generation': str(gen)}, stats['collected']) for gen, stats in enumerate(gc.get_stats())])
+        metric(f'{PREFIX}_gc_pause_seconds_total', 'counter', 'Time spent in garbage collection.',
+               [({}, self._gc_pause_seconds)])
+        metric(f'{PREFIX}_http_responses_total', 'counter', 'Responses served by this process.',
+               [({'class': 'all'}, self._requests), ({'class': '5xx'}, self._server_errors)])
+        metric(f'{PREFIX}_db_pool_size', 'gauge', 'Configured connection pool size.',
+               [({}, sample.get('pool_size'))])
+        metric(f'{PREFIX}_db_pool_checked_out', 'gauge', 'Connections currently checked out of the pool.',
+               [({}, sample.get('pool_checked_out'))])
+        metric(f'{PREFIX}_db_pool_overflow', 'gauge', 'Connections open beyond the pool size.',
+               [({}, sample.get('pool_overflow'))])
+        metric(f'{PREFIX}_db_up', 'gauge', 'Whether the last SELECT 1 round trip succeeded.',
+               [({}, int(sample['db_up']) if 'db_up' in sample else None)])
+        metric(f'{PREFIX}_db_latency_seconds', 'gauge', 'Latency of the last SELECT 1 round trip.',
+               [({}, sample.get('db_latency_seconds'))])
+        metric(f'{PREFIX}_db_checks_total', 'counter', 'Database health checks by outcome.',
+               [({'outcome': 'ok'}, self._db_checks - self._db_failures), ({'outcome': 'failed'}, self._db_failures)])
+        metric(f'{PREFIX}_upload_bytes', 'gauge', 'Bytes stored under the upload folder.',
+               [({}, sample.get('upload_bytes'))])
+        metric(f'{PREFIX}_upload_filesystem_used_bytes', 'gauge', 'Used bytes on the upload filesystem.',
+               [({}, sample.get('disk_used_bytes'))])
+        metric(f'{PREFIX}_upload_filesystem_size_bytes', 'gauge', 'Size of the upload filesystem.',
+               [({}, sample.get('disk_total_bytes'))])
+        metric(f'{PREFIX}_metrics_sample_timestamp_seconds', 'gauge', 'When the exported sample was taken.',
+               [({}, sample.get('timestamp'))])
+
+        compression = self.app.extensions.get('response_compression')
+        if compression is not None:
+            stats = compression.stats()
+            metric(f'{PREFIX}_compressed_responses_total', 'counter', 'Responses compressed, by encoding.',
+                   [({'encoding': encoding}, count) for encoding, count in stats['compressed'].items()])
+            metric(f'{PREFIX}_compression_bytes_in_total', 'counter', 'Response bytes before compression.',
+                   [({}, stats['bytes_in'])])
+            metric(f'{PREFIX}_compression_bytes_out_total', 'counter', 'Response bytes after compression.',
+                   [({}, stats['bytes_out'])])
+        return '\n'.join(lines) + '\n'
+
+    def metrics_endpoint(self):
+        """GET /metrics for Prometheus: bearer METRICS_TOKEN (or, if tokens are not required, an allowed address)"""
+        if not self._scrape_allowed():
+            abort(403)
+        return Response(self.prometheus_text(), mimetype='text/plain; version=0.0.4')
+
+    def _scrape_allowed(self):
+        if self.token:
+            return hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {self.token}')
+        # Behind a reverse proxy every request comes from the proxy's address, so
+        # address-only access has to be switched on explicitly
+        if self.require_token:
+            return False
+        try:
+            address = ipaddress.ip_address(request.remote_addr or '')
+        except ValueError:
+            return False
+        return any(address in network for network in self.allowed_networks)
+
+
+runtime_metrics = RuntimeMetrics()
@@ -0,0 +1,272 @@
+"""
+Versioned schema migrations for the Jira Board Application
+Numbered files in migrations/ are applied in order, each in one transaction
+together with its schema_version row; startup only compares version numbers.
+Migrations declare their own DDL instead of reading the models, so a version
+always produces the same schema.
+"""
+
+import glob
+import hashlib
+import importlib
+import importlib.util
+import logging
+import os
+import re
+import time
+from datetime import datetime
+
+import click
+from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, select, func, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from extensions import db
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MIGRATIONS_DIR = os.path.join(BASE_DIR, 'migrations')
+SAMPLE_DATA_FILE = os.path.join(BASE_DIR, 'sample_data.sql')
+
+# 0001_baseline.py, 0002_schema_indexes.sql, ...
+MIGRATION_FILE = re.compile(r'^(?P<version>\d{4})_(?P<name>\w+)\.(?P<kind>sql|py)$')
+
+# Serializes concurrent deploys/workers on PostgreSQL; any constant shared by all of them works
+ADVISORY_LOCK_KEY = 740_040
+
+# Kept out of db.metadata so create_all() never creates or inspects it
+schema_version = Table(
+    'schema_version', MetaData(),
+    Column('version', Integer, primary_key=True),
+    Column('name', String(200), nullable=False),
+    Column('checksum', String(64), nullable=False),
+    Column('applied_at', DateTime, nullable=False),
+    Column('duration_ms', Integer)
+)
+
+
+class SchemaVersionError(RuntimeError):
+    """Raised when the database schema is behind the code and may not be upgraded automatically"""
+
+
+class Migration:
+    """One numbered migration file: SQL statements or a module with upgrade(connection)"""
+
+    def __init__(self, path):
+        match = MIGRATION_FILE.match(os.path.basename(path))
+        self.path = path
+        self.version = int(match.group('version'))
+        self.name = match.group('name')
+        self.kind = match.group('kind')
+        with open(path, 'rb') as file:
+            self.checksum = hashlib.sha256(file.read()).hexdigest()
+
+    def apply(self, connection):
+        if self.kind == 'sql':
+            with open(self.path, 'r', encoding='utf-8') as file:
+                for statement in split_sql(file.read()):
+                    connection.execute(text(statement))
+        else:
+            spec = importlib.util.spec_from_file_location(f'migration_{self.version:04d}', self.path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            module.upgrade(connection)
+
+    def __repr__(self):
+        return f'<Migration {self.version:04d}_{self.name}>'
+
+
+def split_sql(sql):
+    """Statements of a migration or seed file; full-line '--' comments are dropped"""
+    lines = [line for line in sql.splitlines() if not line.strip().startswith('--')]
+    return [statement.strip() for statement in '\n'.join(lines).split(';') if statement.strip()]
+
+
+def load_all_models():
+    """Import every model module so db.metadata knows all tables (models/__init__ imports only some)"""
+    for path in sorted(glob.glob(os.path.join(BASE_DIR, 'models', '*_models.py'))):
+        module = os.path.basename(path)[:-3]
+        if not module.endswith('_clean'):
+            importlib.import_module(f'models.{module}')
+
+
+def available_migrations(directory=MIGRATIONS_DIR):
+    """Migrations on disk, lowest version first"""
+    migrations = [Migration(path) for path in sorted(glob.glob(os.path.join(directory, '*')))
+                  if MIGRATION_FILE.match(os.path.basename(path))]
+    versions = [migration.version for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise SchemaVersionError(f'Duplicate migration versions in {directory}')
+    return migrations
+
+
+def latest_version():
+    migrations = available_migrations()
+    return migrations[-1].version if migrations else 0
+
+
+def current_version():
+    """Highest applied version; 0 for a database that has never been migrated"""
+    try:
+        with db.engine.connect() as connection:
+            return connection.execute(select(func.max(schema_version.c.version))).scalar() or 0
+    except (OperationalError, ProgrammingError):
+        return 0
+
+
+def applied_migrations():
+    """version -> schema_version row"""
+    schema_version.create(db.engine, checkfirst=True)
+    with db.engine.connect() as connection:
+        return {row.version: row for row in connection.execute(select(schema_version))}
+
+
+def _lock(connection):
+    if connection.dialect.name == 'postgresql':
+        connection.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': ADVISORY_LOCK_KEY})
+
+
+def upgrade(target=None):
+    """
+    Apply pending migrations up to `target` (default: the latest)
+
+    Each migration and its schema_version row commit together, so a failed
+    migration leaves no partial schema change behind and is retried next time.
+
+    Returns:
+        list: Migrations that were applied
+    """
+    schema_version.create(db.engine, checkfirst=True)
+    applied = []
+    for migration in available_migrations():
+        if target is not None and migration.version > target:
+            break
+        with db.engine.begin() as connection:
+            _lock(connection)
+            # Re-check under the lock: another process may have applied it meanwhile
+            done = connection.execute(
+                select(schema_version.c.version).where(schema_version.c.version == migration.version)
+            ).first()
+            if done:
+                continue
+            started = time.perf_counter()
+            migration.apply(connection)
+            duration_ms = int((time.perf_counter() - started) * 1000)
+            connection.execute(schema_version.insert().values(
+                version=migration.version, name=migration.name, checksum=migration.checksum,
+                applied_at=datetime.utcnow(), duration_ms=duration_ms
+            ))
+        logger.info('Applied migration', extra={'version': migration.version, 'migration': migration.name,
+                                                'duration_ms': duration_ms})
+        applied.append(migration)
+
+    if applied:
+        # Monthly audit/activity partitions depend on the date, not the schema version
+        from log_partitions import ensure_partitions
+        ensure_partitions()
+    return applied
+
+
+def check_schema(auto_upgrade=False):
+    """
+    Startup check: one query when the schema is current
+
+    Args:
+        auto_upgrade: Apply pending migrations instead of failing (development)
+
+    Raises:
+        SchemaVersionError: If the schema is behind and auto_upgrade is off
+    """
+    version, latest = current_version(), latest_version()
+    if version >= latest:
+        logger.debug('Schema is current', extra={'schema_version': version})
+        return version
+    if not auto_upgrade:
+        raise SchemaVersionError(f"Database schema is at version {version} but the code expects {latest}; "
+                                 f"run 'flask db upgrade'")
+    logger.info('Upgrading schema', extra={'schema_version': version, 'target_version': latest})
+    upgrade()
+    return latest
+
+
+def execute_sql_file(file_path):
+    """
+    Execute a data file statement by statement, skipping statements that fail
+
+    Returns:
+        tuple: (statements executed, statements skipped)
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        statements = split_sql(file.read())
+
+    executed = skipped = 0
+    for statement in statements:
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(text(statement))
+            executed += 1
+        except Exception as e:
+            skipped += 1
+            logger.debug('SQL statement skipped: %s', e)
+    return executed, skipped
+
+
+def seed_sample_data(file_path=SAMPLE_DATA_FILE, force=False):
+    """
+    Load the sample data set; a no-op when the database already has users unless forced
+
+    Returns:
+        dict or None: executed/skipped statement counts and project access rows, or None if skipped
+    """
+    from models.user_models import User
+    from project_access import rebuild_project_access
+
+    if not force and db.session.execute(select(User.user_id).limit(1)).first() is not None:
+        return None
+    executed, skipped = execute_sql_file(file_path)
+    # Sample assignments are raw SQL, so derive project_access from them here
+    return {'executed': executed, 'skipped': skipped, 'access_rows': rebuild_project_access()}
+
+
+def register_migration_commands(app):
+    """Register `flask db upgrade / status / seed`"""
+
+    @app.cli.group('db')
+    def db_cli():
+        """Schema migrations and sample data"""
+
+    @db_cli.command('upgrade')
+    @click.option('--to', 'target', default=None, type=int, help='Stop after this version')
+    def upgrade_command(target):
+        """Apply pending migrations"""
+        applied = upgrade(target)
+        for migration in applied:
+            click.echo(f'Applied {migration.version:04d}_{migration.name}')
+        click.echo(f'Schema at version {current_version()}')
+
+    @db_cli.command('status')
+    def status_command():
+        """List migrations, whether they are applied and whether applied files changed since"""
+        applied = applied_migrations()
+        for migration in available_migrations():
+            row = applied.get(migration.version)
+            if row is None:
+                state = 'pending'
+            elif row.checksum != migration.checksum:
+                state = f'applied {row.applied_at:%Y-%m-%d %H:%M} (file changed since)'
+            else:
+                state = f'applied {row.applied_at:%Y-%m-%d %H:%M}'
+            click.echo(f'{migration.version:04d}_{migration.name}: {state}')
+
+    @db_cli.command('seed')
+    @click.option('--file', 'file_path', default=SAMPLE_DATA_FILE, type=click.Path(exists=True, dir_okay=False))
+    @click.option('--force', is_flag=True, help='Load even if the database already has users')
+    def seed_command(file_path, force):
+        """Load sample data (after 'flask db upgrade')"""
+        check_schema()
+        result = seed_sample_data(file_path, force=force)
+        if result is None:
+            click.echo('Database already has users; use --force to load the sample data anyway')
+        else:
+            click.echo(f"Executed {result['executed']} statements ({result['skipped']} skipped), "
+                       f"{result['access_rows']} project access rows")
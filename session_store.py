@@ -0,0 +1,339 @@
+"""
+Server-side sessions for the Jira Board Application
+The session cookie carries only a random token; session data lives in the indexed
+user_session table behind an in-process read-through cache, so admins can revoke it
+"""
+
+import hashlib
+import logging
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import click
+from flask.sessions import SessionInterface, SessionMixin, session_json_serializer
+from sqlalchemy import delete, select, update
+from werkzeug.datastructures import CallbackDict
+
+from extensions import db
+
+logger = logging.getLogger(__name__)
+
+
+def _token_hash(token):
+    return hashlib.sha256(token.encode('ascii', 'replace')).digest()
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    """Session dict that remembers its token and whether it changed during the request"""
+
+    def __init__(self, initial=None, token=None, new=False, expires_at=None):
+        def on_update(session):
+            session.modified = True
+
+        super().__init__(initial, on_update)
+        self.token = token
+        self.new = new
+        self.expires_at = expires_at
+        self.modified = False
+
+
+class SessionStore(SessionInterface):
+    """
+    Flask session interface backed by the user_session table
+
+    Opening a session is one cache lookup; a miss is one primary-key SELECT.
+    A row is written when the session changes, and its expiry slides forward
+    at most once per SESSION_REFRESH_INTERVAL. revoke_user() deletes a user's
+    rows and cache entries, which takes effect at once in this worker and
+    within SESSION_CACHE_TTL in the others. A daemon thread deletes expired
+    rows in batches.
+
+    Usage:
+        session_store.init_app(app)
+        session_store.revoke_user(user_id)
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.enabled = True
+        self.lifetime = timedelta(hours=12)
+        self.refresh_interval = timedelta(minutes=5)
+        self.cache_size = 10000
+        self.cache_ttl = 10.0
+        self.sweep_interval = 300.0
+        self.sweep_batch = 1000
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._sweeper = None
+        self._pid = None
+        self._stop = threading.Event()
+        self.hits = 0
+        self.misses = 0
+        self.swept = 0
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Replace the signed-cookie session with this store and start the sweeper on first use"""
+        self.app = app
+        self.enabled = app.config.get('SESSION_STORE_ENABLED', True)
+        self.lifetime = app.config.get('SESSION_LIFETIME', self.lifetime)
+        self.refresh_interval = app.config.get('SESSION_REFRESH_INTERVAL', self.refresh_interval)
+        self.cache_size = app.config.get('SESSION_CACHE_SIZE', self.cache_size)
+        self.cache_ttl = app.config.get('SESSION_CACHE_TTL', self.cache_ttl)
+        self.sweep_interval = app.config.get('SESSION_SWEEP_INTERVAL', self.sweep_interval)
+        self.sweep_batch = app.config.get('SESSION_SWEEP_BATCH', self.sweep_batch)
+        app.extensions['session_store'] = self
+        if self.enabled:
+            app.session_interface = self
+
+    def _lifetime(self, app, session):
+        return app.permanent_session_lifetime if session.permanent else self.lifetime
+
+    # Flask SessionInterface
+
+    def open_session(self, app, request):
+        self._ensure_sweeper()
+        token = request.cookies.get(self.get_cookie_name(app))
+        if token:
+            entry = self._load(_token_hash(token))
+            if entry is not None:
+                user_id, data, expires_at = entry
+                return ServerSideSession(data, token=token, expires_at=expires_at)
+        return ServerSideSession(token=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        key = _token_hash(session.token)
+
+        if not session:
+            if not session.new:
+                self._delete(key)
+                response.delete_cookie(name, domain=domain, path=path,
+                                       secure=self.get_cookie_secure(app),
+                                       samesite=self.get_cookie_samesite(app),
+                                       httponly=self.get_cookie_httponly(app))
+            return
+        response.vary.add('Cookie')
+
+        now = datetime.utcnow()
+        lifetime = self._lifetime(app, session)
+        stale = session.expires_at is None or session.expires_at - now < lifetime - self.refresh_interval
+        if not (session.modified or session.new or stale):
+            return
+
+        expires_at = now + lifetime
+        data = dict(session)
+        if not self._save(key, _user_id(data), data, expires_at, insert=session.new):
+            # Revoked (or swept) while this request ran; never bring the row back
+            response.delete_cookie(name, domain=domain, path=path)
+            return
+        response.set_cookie(
+            name, session.token,
+            expires=self.get_expiration_time(app, session), httponly=self.get_cookie_httponly(app),
+            domain=domain, path=path, secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app)
+        )
+
+    # Storage and cache
+
+    def _load(self, key):
+        """(user_id, data, expires_at) of a live session, or None"""
+        now = datetime.utcnow()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.cache_ttl and entry[3] > now:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                user_id, payload, expires_at = entry[1:]
+                return user_id, session_json_serializer.loads(payload), expires_at
+            self.misses += 1
+
+        from models.login_models import UserSession
+
+        # Always the primary: a replica may not have a session created a moment ago
+        with db.engine.connect() as connection:
+            row = connection.execute(
+                select(UserSession.user_id, UserSession.data, UserSession.expires_at)
+                .where(UserSession.session_hash == key)
+            ).first()
+        if row is None or row.expires_at <= now:
+            with self._lock:
+                self._cache.pop(key, None)
+            return None
+        self._remember(key, (row.user_id, row.data, row.expires_at))
+        return row.user_id, session_json_serializer.loads(row.data), row.expires_at
+
+    def _remember(self, key, entry):
+        """Cache (user_id, serialized payload, expires_at); the payload is parsed per request so
+        requests never share mutable session values"""
+        with self._lock:
+            self._cache[key] = (time.monotonic(), *entry)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _save(self, key, user_id, data, expires_at, insert):
+        """Insert a new session or update an existing one; False if the existing row is gone"""
+        from models.login_models import UserSession
+
+        values = {'user_id': user_id, 'data': session_json_serializer.dumps(data), 'expires_at': expires_at}
+        # Own connection: the request's ORM session may be rolled back or already closed
+        with db.engine.begin() as connection:
+            if insert:
+                connection.execute(UserSession.__table__.insert().values(
+                    session_hash=key, created_at=datetime.utcnow(), **values))
+            elif not connection.execute(
+                    update(UserSession).where(UserSession.session_hash == key).values(**values)).rowcount:
+                with self._lock:
+                    self._cache.pop(key, None)
+                return False
+        self._remember(key, (user_id, values['data'], expires_at))
+        return True
+
+    def _delete(self, key):
+        from models.login_models import UserSession
+
+        with self._lock:
+            self._cache.pop(key, None)
+        with db.engine.begin() as connection:
+            connection.execute(delete(UserSession).where(UserSession.session_hash == key))
+
+    def rotate(self, session):
+        """Give the session a fresh token at login so a token issued before authentication can't be reused"""
+        if not session.new:
+            self._delete(_token_hash(session.token))
+        session.token = secrets.token_urlsafe(32)
+        session.new = True
+
+    def revoke_user(self, user_id):
+        """
+        End every session of a user (deactivation, deletion, password change)
+
+        Returns:
+            int: Sessions deleted
+        """
+        from models.login_models import UserSession
+        from project_cache import as_uuid
+
+        user_id = as_uuid(user_id)
+        with self._lock:
+            for key in [key for key, entry in self._cache.items() if entry[1] == user_id]:
+                del self._cache[key]
+        with db.engine.begin() as connection:
+            deleted = connection.execute(delete(UserSession).where(UserSession.user_id == user_id)).rowcount
+        logger.info('Sessions revoked', extra={'account': str(user_id), 'sessions': deleted})
+        return deleted
+
+    # Expiry sweeper
+
+    def sweep(self):
+        """Delete expired sessions SESSION_SWEEP_BATCH rows at a time; returns the number deleted"""
+        from models.login_models import UserSession
+
+        total = 0
+        while True:
+            now = datetime.utcnow()
+            expired = (select(UserSession.session_hash).where(UserSession.expires_at < now)
+                       .limit(self.sweep_batch).scalar_subquery())
+            with db.engine.begin() as connection:
+                deleted = connection.execute(
+                    delete(UserSession).where(UserSession.session_hash.in_(expired))
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+            total += deleted
+            if deleted < self.sweep_batch:
+                break
+        with self._lock:
+            self.swept += total
+        return total
+
+    def _ensure_sweeper(self):
+        """Start the sweeper thread on the first request (and again after a fork)"""
+        if self._pid == os.getpid() and self._sweeper is not None and self._sweeper.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._sweeper is not None and self._sweeper.is_alive():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._sweeper = threading.Thread(target=self._run_sweeper, name='session-sweeper', daemon=True)
+            self._sweeper.start()
+
+    def _run_sweeper(self):
+        while not self._stop.wait(self.sweep_interval):
+            try:
+                with self.app.app_context():
+                    deleted = self.sweep()
+                if deleted:
+                    logger.info('Expired sessions swept', extra={'sessions': deleted})
+            except Exception:
+                logger.exception('Session sweep failed')
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'cached': len(self._cache),
+                'capacity': self.cache_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'swept': self.swept
+            }
+
+
+def _user_id(data):
+    """Flask-Login's user id from a session payload, as a UUID (None for anonymous sessions)"""
+    from project_cache import as_uuid
+
+    user_id = data.get('_user_id')
+    try:
+        return as_uuid(user_id) if user_id else None
+    except ValueError:
+        return None
+
+
+def register_session_commands(app):
+    """Register `flask sessions sweep / revoke / stats`"""
+
+    @app.cli.group('sessions')
+    def sessions_cli():
+        """Server-side session store"""
+
+    @sessions_cli.command('sweep')
+    def sweep_command():
+        """Delete expired sessions now"""
+        click.echo(f'Deleted {session_store.sweep()} expired sessions')
+
+    @sessions_cli.command('revoke')
+    @click.argument('user_id')
+    def revoke_command(user_id):
+        """End every session of USER_ID"""
+        click.echo(f'Revoked {session_store.revoke_user(user_id)} sessions')
+
+    @sessions_cli.command('stats')
+    def stats_command():
+        """Live and expired session counts"""
+        from sqlalchemy import func
+        from models.login_models import UserSession
+
+        now = datetime.utcnow()
+        live = db.session.scalar(select(func.count()).where(UserSession.expires_at >= now))
+        expired = db.session.scalar(select(func.count()).where(UserSession.expires_at < now))
+        users = db.session.scalar(select(func.count(UserSession.user_id.distinct()))
+                                  .where(UserSession.expires_at >= now))
+        click.echo(f'{live} live sessions for {users} users, {expired} expired awaiting the sweeper')
+
+
+session_store = SessionStore()
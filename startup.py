@@ -0,0 +1,161 @@
+"""
+Startup cost controls for the Jira Board Application
+Deferred controller imports and an import-time / worker boot profile
+"""
+
+import importlib
+import os
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import click
+
+# Every lazily imported module, so eager mode and the profiler can load them all
+_lazy_modules = []
+
+BOOT_SNIPPET = 'from app import create_app; create_app()'
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access
+
+    Route modules hold one of these per controller module, so registering a
+    blueprint does not import its controllers, forms or their dependencies;
+    the first request that calls into the controller does.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def view(self, attribute):
+        """View function named `attribute` that imports the module on its first request"""
+        def view_func(*args, **kwargs):
+            return getattr(self._load(), attribute)(*args, **kwargs)
+        view_func.__name__ = view_func.__qualname__ = attribute
+        return view_func
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'deferred'
+        return f'<LazyModule {self._name} ({state})>'
+
+
+def lazy_import(name):
+    """Return a LazyModule for `name`"""
+    module = LazyModule(name)
+    _lazy_modules.append(module)
+    return module
+
+
+def preload_lazy_modules():
+    """Import every deferred module now (eager startup, e.g. before forking workers)"""
+    for module in _lazy_modules:
+        module._load()
+    return len(_lazy_modules)
+
+
+def lazy_module_status():
+    return {module._name: module.loaded for module in _lazy_modules}
+
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def import_profile(snippet=BOOT_SNIPPET, env=None):
+    """
+    Run `snippet` in a fresh interpreter with -X importtime
+
+    Returns:
+        list: (module, self_us, cumulative_us, depth) in import order
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', snippet],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env={**os.environ, **(env or {})},
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise click.ClickException(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'boot failed')
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def boot_times(runs, env=None):
+    """Wall-clock seconds for `runs` fresh interpreters to build the app"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, '-c', BOOT_SNIPPET],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            env={**os.environ, **(env or {})},
+            capture_output=True, check=True
+        )
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _app_module(name):
+    """Top-level project package or module an import belongs to, or None for third-party/stdlib"""
+    root = os.path.dirname(os.path.abspath(__file__))
+    top = name.split('.')[0]
+    if os.path.isdir(os.path.join(root, top)) or os.path.exists(os.path.join(root, top + '.py')):
+        return top
+    return None
+
+
+def register_startup_commands(app):
+    """Register `flask startup profile`"""
+
+    @app.cli.group('startup')
+    def startup_cli():
+        """Startup cost"""
+
+    @startup_cli.command('profile')
+    @click.option('--top', default=25, type=int, help='Modules listed in the per-module report')
+    @click.option('--runs', default=5, type=int, help='Fresh interpreters timed per startup mode')
+    def profile_command(top, runs):
+        """Per-module import cost of create_app() and worker boot time, lazy vs eager"""
+        rows = import_profile()
+        click.echo(f"{'self ms':>9} {'cumul ms':>9}  module")
+        for module, self_us, cumulative_us, _ in sorted(rows, key=lambda row: -row[1])[:top]:
+            click.echo(f'{self_us / 1000:9.1f} {cumulative_us / 1000:9.1f}  {module}')
+
+        groups = {}
+        for module, self_us, _, _ in rows:
+            group = _app_module(module) or 'third-party / stdlib'
+            groups[group] = groups.get(group, 0) + self_us
+        click.echo('\nSelf time by package:')
+        for group, self_us in sorted(groups.items(), key=lambda item: -item[1]):
+            click.echo(f'{self_us / 1000:9.1f}  {group}')
+
+        click.echo(f'\nWorker boot time over {runs} runs (python -c "{BOOT_SNIPPET}"):')
+        for label, value in (('lazy', '1'), ('eager', '0')):
+            timings = boot_times(runs, env={'LAZY_CONTROLLERS': value})
+            click.echo(f'{label:>6}: median {statistics.median(timings) * 1000:.0f} ms, '
+                       f'min {min(timings) * 1000:.0f} ms, max {max(timings) * 1000:.0f} ms')
@@ -0,0 +1,319 @@
+"""
+Static asset pipeline for the Jira Board Application
+'flask assets build' bundles and minifies the live CSS/JS into content-hashed files
+with gzip/brotli variants; templates resolve them through asset_urls()
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+from datetime import timedelta
+
+import click
+from flask import request, send_from_directory, url_for
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:  # optional; only gzip variants are written without it
+    brotli = None
+
+try:
+    import rcssmin
+    import rjsmin
+except ImportError:  # optional; the built-in minifiers only drop comments and whitespace
+    rcssmin = rjsmin = None
+
+DIST_DIR = 'dist'
+MANIFEST_FILE = 'manifest.json'
+IMMUTABLE = int(timedelta(days=365).total_seconds())
+
+# Copies kept next to the live files; never bundled
+STALE_VARIANT = re.compile(r'(_clean|_messy)\.\w+$|\.backup$')
+
+
+_CSS_TOKENS = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|/\*.*?\*/|\s+', re.S)
+_CSS_TIGHT = re.compile(r'\s*([{};,>])\s*|:\s+')
+
+
+def minify_css(source):
+    """Drop comments, collapse whitespace and tighten around { } ; , > (strings untouched)"""
+    if rcssmin is not None:
+        return rcssmin.cssmin(source)
+
+    def token(match):
+        text = match.group(0)
+        if text.startswith('/*'):
+            return ''
+        if text[0].isspace():
+            return ' '
+        return text
+
+    parts = re.split(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')', _CSS_TOKENS.sub(token, source))
+    for index in range(0, len(parts), 2):
+        parts[index] = _CSS_TIGHT.sub(lambda m: m.group(1) or ':', parts[index])
+    return ''.join(parts).replace(';}', '}').strip()
+
+
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+
+
+def minify_js(source):
+    """
+    Drop comments and indentation, keeping every line break so automatic semicolon insertion is unchanged
+
+    Strings, template literals (including ${} expressions) and regex literals are copied verbatim.
+    """
+    if rjsmin is not None:
+        return rjsmin.jsmin(source)
+
+    out = []
+    i, length = 0, len(source)
+    braces = []  # brace depth per open ${ } expression inside a template literal
+    in_template = False
+
+    def last_significant():
+        for chunk in reversed(out):
+            stripped = chunk.rstrip()
+            if stripped:
+                return stripped[-1]
+        return ''
+
+    while i < length:
+        char = source[i]
+        if in_template:
+            start = i
+            while i < length and source[i] != '`' and not source.startswith('${', i):
+                i += 2 if source[i] == '\\' else 1
+            out.append(source[start:i])
+            if i >= length:
+                break
+            if source[i] == '`':
+                out.append('`')
+                in_template = False
+            else:
+                out.append('${')
+                braces.append(0)
+                in_template = False
+                i += 1
+            i += 1
+            continue
+
+        if char in '"\'':
+            start = i
+            i += 1
+            while i < length and source[i] != char:
+                i += 2 if source[i] == '\\' else 1
+            out.append(source[start:i + 1])
+            i += 1
+        elif char == '`':
+            out.append('`')
+            in_template = True
+            i += 1
+        elif source.startswith('//', i):
+            while i < length and source[i] != '\n':
+                i += 1
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            i = length if end < 0 else end + 2
+        elif char == '/' and (last_significant() in _REGEX_PRECEDERS or
+                              re.search(r'\b(return|typeof|case|do|else|in)\s*$', ''.join(out[-3:]))):
+            start = i
+            i += 1
+            in_class = False
+            while i < length and (source[i] != '/' or in_class):
+                if source[i] == '\\':
+                    i += 1
+                elif source[i] == '[':
+                    in_class = True
+                elif source[i] == ']':
+                    in_class = False
+                i += 1
+            out.append(source[start:i + 1])
+            i += 1
+        elif char.isspace():
+            start = i
+            while i < length and source[i].isspace():
+                i += 1
+            if '\n' not in source[start:i]:
+                out.append(' ')
+            elif out and out[-1] != '\n':
+                out.append('\n')
+        else:
+            if braces:
+                if char == '{':
+                    braces[-1] += 1
+                elif char == '}':
+                    if braces[-1] == 0:
+                        braces.pop()
+                        out.append('}')
+                        in_template = True
+                        i += 1
+                        continue
+                    braces[-1] -= 1
+            out.append(char)
+            i += 1
+
+    return ''.join(out).strip()
+
+
+class StaticAssets:
+    """
+    Bundles from ASSET_BUNDLES, built into static/dist and looked up through the manifest
+
+    Without a manifest (development) asset_urls() returns the unbundled source
+    files, so templates work before 'flask assets build' has run. Built files
+    are served with far-future immutable caching and as precompressed .br/.gz
+    when the client accepts them.
+
+    Usage:
+        {% for url in asset_urls('css/app.css') %}<link rel="stylesheet" href="{{ url }}">{% endfor %}
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.bundles = {}
+        self.manifest = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Load the manifest, expose asset_urls() to templates and route /static/dist"""
+        self.app = app
+        self.bundles = app.config.get('ASSET_BUNDLES', {})
+        for name, sources in self.bundles.items():
+            stale = [source for source in sources if STALE_VARIANT.search(source)]
+            if stale:
+                raise ValueError(f"Bundle {name} lists non-live files: {', '.join(stale)}")
+        self.manifest = self.load_manifest() if app.config.get('ASSET_USE_MANIFEST', True) else {}
+        app.extensions['static_assets'] = self
+        app.add_template_global(self.asset_urls)
+        app.add_url_rule(f'{app.static_url_path}/{DIST_DIR}/<path:filename>', 'asset', self.serve)
+
+    @property
+    def dist_folder(self):
+        return os.path.join(self.app.static_folder, DIST_DIR)
+
+    def load_manifest(self):
+        path = os.path.join(self.dist_folder, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def asset_urls(self, name):
+        """URLs to include for bundle `name`: its built file, or its sources when unbuilt"""
+        built = self.manifest.get(name)
+        if built:
+            return [url_for('asset', filename=built)]
+        return [url_for('static', filename=source) for source in self.bundles.get(name, [name])]
+
+    def serve(self, filename):
+        """A built file, as .br/.gz when accepted, cached for a year"""
+        encodings = request.accept_encodings
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if encodings[encoding] and os.path.exists(os.path.join(self.dist_folder, filename + suffix)):
+                response = send_from_directory(self.dist_folder, filename + suffix, max_age=IMMUTABLE,
+                                               mimetype=_mimetype(filename),
+                                               download_name=os.path.basename(filename))
+                response.headers['Content-Encoding'] = encoding
+                break
+        else:
+            response = send_from_directory(self.dist_folder, filename, max_age=IMMUTABLE)
+        response.headers['Cache-Control'] = f'public, max-age={IMMUTABLE}, immutable'
+        response.vary.add('Accept-Encoding')
+        return response
+
+    def build(self, prune=False):
+        """
+        Write every bundle to static/dist as name.<hash>.ext plus compressed variants and the manifest
+
+        Workers started before the build keep serving pages that point at the
+        previous manifest until they restart, so its files are kept and only
+        older generations are deleted; prune=True deletes the previous one too.
+
+        Returns:
+            list: (bundle, built file, source bytes, minified bytes, gzip bytes, brotli bytes or None)
+        """
+        os.makedirs(self.dist_folder, exist_ok=True)
+        previous = self.load_manifest()
+        manifest, report = {}, []
+        for name, sources in self.bundles.items():
+            contents = []
+            for source in sources:
+                with open(os.path.join(self.app.static_folder, source), 'r', encoding='utf-8') as file:
+                    contents.append(file.read())
+            if name.endswith('.css'):
+                original = '\n'.join(contents)
+                minified = minify_css(original)
+            else:
+                original = ';\n'.join(contents)
+                minified = minify_js(original)
+            data = minified.encode('utf-8')
+
+            stem, extension = os.path.splitext(name)
+            built = f'{stem}.{hashlib.sha256(data).hexdigest()[:10]}{extension}'
+            path = os.path.join(self.dist_folder, built)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as file:
+                file.write(data)
+            gzipped = gzip.compress(data, compresslevel=9, mtime=0)
+            with open(path + '.gz', 'wb') as file:
+                file.write(gzipped)
+            brotli_size = None
+            if brotli is not None:
+                compressed = brotli.compress(data, quality=11)
+                with open(path + '.br', 'wb') as file:
+                    file.write(compressed)
+                brotli_size = len(compressed)
+            manifest[name] = built
+            report.append((name, built, len(original.encode('utf-8')), len(data), len(gzipped), brotli_size))
+
+        self._remove_stale(set(manifest.values()) if prune else set(manifest.values()) | set(previous.values()))
+        # Write then rename so a worker starting mid-build never reads a partial manifest
+        manifest_path = os.path.join(self.dist_folder, MANIFEST_FILE)
+        with open(manifest_path + '.tmp', 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, indent=2, sort_keys=True)
+        os.replace(manifest_path + '.tmp', manifest_path)
+        self.manifest = manifest
+        return report
+
+    def _remove_stale(self, current):
+        """Delete built files (and their .gz/.br variants) that are not in `current`"""
+        for root, _, files in os.walk(self.dist_folder):
+            for name in files:
+                relative = os.path.relpath(os.path.join(root, name), self.dist_folder).replace(os.sep, '/')
+                base = re.sub(r'\.(gz|br)$', '', relative)
+                if relative != MANIFEST_FILE and base not in current:
+                    os.remove(os.path.join(root, name))
+
+
+def _mimetype(filename):
+    return 'text/css' if filename.endswith('.css') else 'application/javascript'
+
+
+def register_asset_commands(app):
+    """Register `flask assets build`"""
+
+    @app.cli.group('assets')
+    def assets_cli():
+        """Static asset bundles"""
+
+    @assets_cli.command('build')
+    @click.option('--prune', is_flag=True, help='Also delete the previous build (only once no worker still uses it)')
+    def build_command(prune):
+        """Bundle, minify, fingerprint and precompress ASSET_BUNDLES into static/dist"""
+        report = static_assets.build(prune=prune)
+        click.echo(f"{'bundle':<22} {'source':>8} {'minified':>9} {'gzip':>7} {'brotli':>7}  file")
+        for name, built, source_size, minified_size, gzip_size, brotli_size in report:
+            click.echo(f"{name:<22} {source_size:>8} {minified_size:>9} {gzip_size:>7} "
+                       f"{brotli_size if brotli_size is not None else '-':>7}  {DIST_DIR}/{built}")
+        if brotli is None:
+            click.echo('brotli is not installed; only .gz variants were written')
+
+
+static_assets = StaticAssets()
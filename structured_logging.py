@@ -0,0 +1,241 @@
+"""
+Structured application logging for the Jira Board Application
+JSON log records are queued on the request thread and written by a background
+listener, so a log call never blocks on stdout or a file
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+from flask import g, request, has_request_context
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+_CONTEXT_FIELDS = ('request_id', 'user_id', 'endpoint', 'method', 'path')
+
+
+def _current_user_id():
+    """Id of the user Flask-Login has already loaded for this request
+
+    Reads g._login_user instead of current_user: touching current_user would run
+    the user loader (a query) from inside a logging call, and a loader that logs
+    its own failure would re-enter this filter without end.
+    """
+    user = g.get('_login_user')
+    try:
+        return getattr(user, 'user_id', None) if user is not None and user.is_authenticated else None
+    except Exception:
+        return None
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamp records with the request id, user id and endpoint of the request that logged them"""
+
+    def filter(self, record):
+        if has_request_context():
+            record.request_id = getattr(g, 'request_id', None)
+            record.user_id = _current_user_id()
+            record.endpoint = request.endpoint
+            record.method = request.method
+            record.path = request.path
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of DEBUG records for configured loggers
+
+    `rates` maps a logger name (or a dotted prefix of one) to the fraction
+    of its DEBUG records kept; the longest matching prefix wins.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = dict(rates or {})
+        self._resolved = {}
+        self.sampled_out = 0
+
+    def rate_for(self, name):
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = 1.0
+            parts = name.split('.')
+            for size in range(len(parts), 0, -1):
+                prefix = '.'.join(parts[:size])
+                if prefix in self.rates:
+                    rate = float(self.rates[prefix])
+                    break
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG:
+            return True
+        rate = self.rate_for(record.name)
+        if rate >= 1.0 or random.random() < rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message, request context and extras"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for field in _CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and key not in entry and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Render the message and traceback on the calling thread, but keep extras for the formatter
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class StructuredLogging:
+    """
+    Queue-based JSON logging plus a per-request access log
+
+    Usage:
+        structured_logging.init_app(app)
+        logger = logging.getLogger(__name__)
+        logger.info('task moved', extra={'task_id': str(task_id)})
+
+    Config keys: LOG_LEVEL, LOG_LEVELS (logger name -> level), LOG_SAMPLE_RATES
+    (logger name -> fraction of DEBUG records kept), LOG_QUEUE_SIZE, LOG_FILE,
+    LOG_REQUESTS
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.handler = None
+        self.sampler = None
+        self._listener = None
+        self._lock = threading.Lock()
+        self.request_logger = logging.getLogger('jira.request')
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Install the queue handler on the root logger and the request hooks on the app"""
+        self.app = app
+        app.extensions['structured_logging'] = self
+
+        with self._lock:
+            if self._listener is None:
+                self._start(app.config)
+        self._apply_levels(app.config)
+
+        # Flask's own stderr handler would bypass the queue
+        from flask.logging import default_handler
+        app.logger.removeHandler(default_handler)
+
+        if app.config.get('LOG_REQUESTS', True):
+            app.before_request(self._start_request)
+            app.after_request(self._finish_request)
+
+    def _start(self, config):
+        log_queue = queue.Queue(maxsize=config.get('LOG_QUEUE_SIZE', 10000))
+        self.handler = NonBlockingQueueHandler(log_queue)
+        # Sample first so dropped DEBUG records never pay for the request context lookup
+        self.sampler = SamplingFilter(config.get('LOG_SAMPLE_RATES', {}))
+        self.handler.addFilter(self.sampler)
+        self.handler.addFilter(RequestContextFilter())
+
+        formatter = JsonFormatter()
+        outputs = [logging.StreamHandler(sys.stderr)]
+        if config.get('LOG_FILE'):
+            outputs.append(logging.handlers.WatchedFileHandler(config['LOG_FILE']))
+        for output in outputs:
+            output.setFormatter(formatter)
+
+        root = logging.getLogger()
+        root.addHandler(self.handler)
+        self._listener = logging.handlers.QueueListener(log_queue, *outputs, respect_handler_level=True)
+        self._listener.start()
+        atexit.register(self.shutdown)
+
+    def _apply_levels(self, config):
+        logging.getLogger().setLevel(config.get('LOG_LEVEL', 'INFO'))
+        for name, level in config.get('LOG_LEVELS', {}).items():
+            logging.getLogger(name).setLevel(level)
+        if self.sampler is not None:
+            self.sampler.rates = dict(config.get('LOG_SAMPLE_RATES', {}))
+            self.sampler._resolved.clear()
+
+    def _start_request(self):
+        g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+        g.request_started = time.perf_counter()
+
+    def _finish_request(self, response):
+        started = getattr(g, 'request_started', None)
+        request_id = getattr(g, 'request_id', None)
+        if request_id:
+            response.headers.setdefault('X-Request-ID', request_id)
+        if started is not None and self.request_logger.isEnabledFor(logging.INFO):
+            self.request_logger.info('request', extra={
+                'status': response.status_code,
+                'duration_ms': round((time.perf_counter() - started) * 1000, 2)
+            })
+        return response
+
+    def stats(self):
+        return {
+            'queued': self.handler.queue.qsize() if self.handler else 0,
+            'dropped': self.handler.dropped if self.handler else 0,
+            'sampled_out': self.sampler.sampled_out if self.sampler else 0
+        }
+
+    def shutdown(self):
+        """Flush queued records; safe to call more than once"""
+        with self._lock:
+            if self._listener is not None:
+                self._listener.stop()
+                self._listener = None
+                logging.getLogger().removeHandler(self.handler)
+
+
+structured_logging = StructuredLogging()
@@ -0,0 +1,240 @@
+"""
+Subtask hierarchy queries for the Jira Board Application
+Fetches a whole task subtree with one recursive CTE instead of walking the
+lazy `subtasks` backref level by level
+"""
+
+from datetime import datetime
+
+from sqlalchemy import select, literal, cast, update, Text
+from sqlalchemy.orm import aliased
+
+from extensions import db
+from dependency_graph import dependency_graphs
+from project_cache import record_task_writes
+from models.models_models import TaskStatus
+from models.task_models import Task
+from models.sprint_models import Sprint
+from models.epic_models import Epic
+
+# Hard cap on tree depth; also stops runaway recursion on corrupt data
+MAX_DEPTH = 20
+PATH_SEPARATOR = '/'
+
+
+def _subtree_cte(root_id, max_depth):
+    """
+    Recursive CTE of (task_id, depth, path) for a task and its descendants
+
+    `path` holds every ancestor id, so a row whose id is already on its own
+    path (a parent_task_id cycle) is not expanded again. max_depth=None
+    follows the tree to the bottom.
+    """
+    anchor = select(
+        Task.task_id,
+        literal(0).label('depth'),
+        cast(Task.task_id, Text).label('path')
+    ).where(Task.task_id == root_id)
+    tree = anchor.cte('task_tree', recursive=True)
+
+    child = aliased(Task)
+    child_key = cast(child.task_id, Text)
+    expand = [child.parent_task_id == tree.c.task_id, ~tree.c.path.contains(child_key)]
+    if max_depth is not None:
+        expand.append(tree.c.depth < max_depth)
+    return tree.union_all(
+        select(
+            child.task_id,
+            tree.c.depth + 1,
+            tree.c.path + PATH_SEPARATOR + child_key
+        ).where(*expand)
+    )
+
+
+def subtree_ids(root_id, max_depth=MAX_DEPTH):
+    """Ids of a task and all of its descendants"""
+    tree = _subtree_cte(root_id, max_depth)
+    return db.session.execute(select(tree.c.task_id)).scalars().all()
+
+
+def ancestor_ids(task_id):
+    """Ids of a task and every task above it, with no depth cap (stops at a parent_task_id cycle)"""
+    anchor = select(
+        Task.task_id,
+        Task.parent_task_id,
+        cast(Task.task_id, Text).label('path')
+    ).where(Task.task_id == task_id)
+    chain = anchor.cte('task_ancestors', recursive=True)
+
+    parent = aliased(Task)
+    parent_key = cast(parent.task_id, Text)
+    chain = chain.union_all(
+        select(
+            parent.task_id,
+            parent.parent_task_id,
+            chain.c.path + PATH_SEPARATOR + parent_key
+        ).where(
+            parent.task_id == chain.c.parent_task_id,
+            ~chain.c.path.contains(parent_key)
+        )
+    )
+    return set(db.session.execute(select(chain.c.task_id)).scalars())
+
+
+def _status_value(status):
+    return status.value if hasattr(status, 'value') else status
+
+
+def _empty_rollup():
+    return {'tasks': 0, 'done': 0, 'estimated_hours': 0.0, 'logged_hours': 0.0, 'status_counts': {}}
+
+
+def _add_rollup(total, part):
+    total['tasks'] += part['tasks']
+    total['done'] += part['done']
+    total['estimated_hours'] += part['estimated_hours']
+    total['logged_hours'] += part['logged_hours']
+    for status, count in part['status_counts'].items():
+        total['status_counts'][status] = total['status_counts'].get(status, 0) + count
+
+
+def task_tree(root_id, max_depth=MAX_DEPTH):
+    """
+    Load a task subtree in one round trip and return it as nested dicts
+
+    Every node carries a `rollup` over itself and its descendants: task
+    count, status counts, estimated and logged hours and percent done.
+    Children are ordered by creation time, then title.
+
+    Returns:
+        dict or None: The root node, or None if the task does not exist
+    """
+    tree = _subtree_cte(root_id, max_depth)
+    rows = db.session.execute(
+        select(Task.task_id, Task.parent_task_id, Task.title, Task.status, Task.type, Task.priority,
+               Task.assigned_to_id, Task.estimated_hours, Task.logged_hours, Task.due_date, Task.created_at,
+               tree.c.depth)
+        .join(tree, tree.c.task_id == Task.task_id)
+        .order_by(tree.c.depth)
+    ).all()
+    if not rows:
+        return None
+
+    nodes = {}
+    for row in rows:
+        if row.task_id in nodes:
+            continue
+        status = _status_value(row.status)
+        nodes[row.task_id] = {
+            'task_id': str(row.task_id),
+            'parent_task_id': str(row.parent_task_id) if row.parent_task_id else None,
+            'title': row.title,
+            'status': status,
+            'type': _status_value(row.type),
+            'priority': row.priority,
+            'assigned_to_id': str(row.assigned_to_id) if row.assigned_to_id else None,
+            'estimated_hours': row.estimated_hours,
+            'logged_hours': row.logged_hours or 0.0,
+            'due_date': row.due_date.isoformat() if row.due_date else None,
+            'depth': row.depth,
+            'children': [],
+            '_created_at': row.created_at
+        }
+
+    root = nodes[rows[0].task_id]
+    for row in rows[1:]:
+        node = nodes[row.task_id]
+        parent = nodes.get(row.parent_task_id)
+        if parent is not None and node is not parent and node not in parent['children']:
+            parent['children'].append(node)
+
+    # Children are always deeper than their parent, so deepest-first is a valid post-order
+    for node in sorted(nodes.values(), key=lambda item: item['depth'], reverse=True):
+        node['children'].sort(key=lambda item: (item['_created_at'], item['title']))
+        rollup = _empty_rollup()
+        _add_rollup(rollup, {
+            'tasks': 1,
+            'done': 1 if node['status'] == TaskStatus.done.value else 0,
+            'estimated_hours': node['estimated_hours'] or 0.0,
+            'logged_hours': node['logged_hours'],
+            'status_counts': {node['status']: 1}
+        })
+        for child in node['children']:
+            _add_rollup(rollup, child['rollup'])
+        rollup['estimated_hours'] = round(rollup['estimated_hours'], 2)
+        rollup['logged_hours'] = round(rollup['logged_hours'], 2)
+        rollup['percent_done'] = round(100.0 * rollup['done'] / rollup['tasks'], 1)
+        node['rollup'] = rollup
+
+    for node in nodes.values():
+        del node['_created_at']
+    return root
+
+
+def move_subtree(task_id, new_parent_id=None, sprint_id=None, epic_id=None):
+    """
+    Re-parent a task and carry its whole subtree along
+
+    The subtree adopts the new parent's project. When that changes the
+    project, sprint and epic are cleared unless new ones are given. Every
+    descendant is updated with a single UPDATE ... WHERE task_id IN (CTE).
+
+    Raises:
+        ValueError: If a task is missing, the new parent is inside the subtree,
+            or the sprint/epic belongs to another project
+
+    Returns:
+        int: Number of tasks moved (the task plus its descendants)
+    """
+    task = db.session.get(Task, task_id)
+    if task is None:
+        raise ValueError('Task not found')
+
+    # The whole subtree moves, however deep; MAX_DEPTH only bounds what is displayed
+    ids = subtree_ids(task_id, max_depth=None)
+    project_id = task.project_id
+    if new_parent_id is not None:
+        parent = db.session.get(Task, new_parent_id)
+        if parent is None:
+            raise ValueError('Parent task not found')
+        # Walk up from the new parent rather than down the (depth-capped) subtree
+        if task.task_id in ancestor_ids(parent.task_id):
+            raise ValueError('A task cannot be moved under its own subtree')
+        project_id = parent.project_id
+
+    for model, target_id, label in ((Sprint, sprint_id, 'Sprint'), (Epic, epic_id, 'Epic')):
+        if target_id is not None:
+            target = db.session.get(model, target_id)
+            if target is None or target.project_id != project_id:
+                raise ValueError(f'{label} does not belong to the target project')
+
+    values = {}
+    if project_id != task.project_id:
+        values.update(project_id=project_id, sprint_id=None, epic_id=None)
+    if sprint_id is not None:
+        values['sprint_id'] = sprint_id
+    if epic_id is not None:
+        values['epic_id'] = epic_id
+
+    old_project_id = task.project_id
+    try:
+        task.parent_task_id = new_parent_id
+        db.session.flush()
+        if values:
+            tree = _subtree_cte(task_id, None)
+            db.session.execute(
+                update(Task.__table__)
+                .where(Task.__table__.c.task_id.in_(select(tree.c.task_id)))
+                .values(updated_at=datetime.utcnow(), **values)
+            )
+            record_task_writes(db.session, {old_project_id, project_id})
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    if 'project_id' in values:
+        dependency_graphs.invalidate(old_project_id)
+        dependency_graphs.invalidate(project_id)
+    db.session.expire_all()
+    return len(ids)
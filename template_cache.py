@@ -0,0 +1,94 @@
+"""
+Template compilation cache for the Jira Board Application
+Compiled Jinja templates are kept as bytecode on disk so new workers skip parsing,
+and 'flask templates compile' builds that cache at deploy time
+"""
+
+import logging
+import os
+import time
+
+import click
+from jinja2 import FileSystemBytecodeCache, TemplateSyntaxError
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_EXTENSIONS = ('.html', '.txt', '.xml')
+
+
+def bytecode_dir(app):
+    return app.config.get('TEMPLATE_BYTECODE_DIR') or os.path.join(app.instance_path, 'jinja_bytecode')
+
+
+def init_template_cache(app):
+    """
+    Wire the bytecode cache into app.jinja_env and settle template auto-reload
+
+    Outside debug mode templates are never re-checked on disk unless
+    TEMPLATES_AUTO_RELOAD is set explicitly; a deploy restarts the workers.
+    With it left at None, app.run(debug=True) still turns reloading on.
+    """
+    if not app.config.get('TEMPLATES_AUTO_RELOAD') and not app.debug:
+        app.jinja_env.auto_reload = False
+
+    if app.config.get('TEMPLATE_BYTECODE_CACHE', True):
+        directory = bytecode_dir(app)
+        os.makedirs(directory, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+
+    if app.config.get('TEMPLATE_PRELOAD', False):
+        loaded, errors = compile_templates(app)
+        logger.info('Templates preloaded', extra={'templates': loaded, 'errors': len(errors)})
+
+
+def template_names(app):
+    return [name for name in app.jinja_env.list_templates() if name.endswith(TEMPLATE_EXTENSIONS)]
+
+
+def compile_templates(app):
+    """
+    Load every template into the environment (and the bytecode cache)
+
+    Returns:
+        tuple: (templates compiled, [(name, lineno, message)] for templates that failed)
+    """
+    compiled = 0
+    errors = []
+    with app.app_context():
+        for name in template_names(app):
+            try:
+                app.jinja_env.get_template(name)
+                compiled += 1
+            except TemplateSyntaxError as e:
+                errors.append((name, e.lineno, e.message))
+    return compiled, errors
+
+
+def register_template_commands(app):
+    """Register `flask templates compile / clear`"""
+
+    @app.cli.group('templates')
+    def templates_cli():
+        """Jinja template bytecode cache"""
+
+    @templates_cli.command('compile')
+    def compile_command():
+        """Compile every template into the bytecode cache; exits non-zero on syntax errors"""
+        if app.jinja_env.bytecode_cache is None:
+            raise click.ClickException('TEMPLATE_BYTECODE_CACHE is off')
+        started = time.perf_counter()
+        compiled, errors = compile_templates(app)
+        for name, lineno, message in errors:
+            click.echo(f'{name}:{lineno}: {message}', err=True)
+        click.echo(f'Compiled {compiled} templates into {bytecode_dir(app)} '
+                   f'in {(time.perf_counter() - started) * 1000:.0f} ms')
+        if errors:
+            raise click.ClickException(f'{len(errors)} template(s) failed to compile')
+
+    @templates_cli.command('clear')
+    def clear_command():
+        """Delete the compiled bytecode"""
+        if app.jinja_env.bytecode_cache is None:
+            raise click.ClickException('TEMPLATE_BYTECODE_CACHE is off')
+        app.jinja_env.bytecode_cache.clear()
+        click.echo(f'Cleared {bytecode_dir(app)}')
@@ -0,0 +1,132 @@
+"""
+Primary/replica routing (db_routing.py) against two SQLite files
+
+The primary and the replica each hold one row naming themselves, so every
+read shows which database served it.
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify
+from sqlalchemy import Column, Integer, MetaData, String, Table, insert, select, text
+
+from db_routing import db_router
+from extensions import db
+
+item = Table('item', MetaData(), Column('id', Integer, primary_key=True), Column('name', String(20)))
+
+
+def _source():
+    return db.session.execute(select(item.c.name).order_by(item.c.id).limit(1)).scalar()
+
+
+def create_app(directory):
+    for name in ('primary', 'replica'):
+        with sqlite3.connect(os.path.join(directory, f'{name}.db')) as connection:
+            connection.execute('CREATE TABLE item (id INTEGER PRIMARY KEY, name VARCHAR(20))')
+            connection.execute('INSERT INTO item (id, name) VALUES (1, ?)', (name,))
+
+    app = Flask(__name__)
+    app.config.update(
+        SECRET_KEY='test',
+        SQLALCHEMY_DATABASE_URI='sqlite:///' + os.path.join(directory, 'primary.db'),
+        DATABASE_REPLICA_URIS=['sqlite:///' + os.path.join(directory, 'replica.db')],
+        DATABASE_REPLICA_ENDPOINTS=['read', 'read_text', 'read_after_connection', 'write_then_read', 'locked'],
+        DATABASE_STICKY_SECONDS=10
+    )
+    db_router.init_app(app)
+    db.init_app(app)
+
+    @app.route('/read')
+    def read():
+        return jsonify(source=_source())
+
+    @app.route('/read-text')
+    def read_text():
+        return jsonify(source=db.session.execute(text('SELECT name FROM item ORDER BY id LIMIT 1')).scalar())
+
+    @app.route('/read-after-connection')
+    def read_after_connection():
+        db.session.connection()
+        return jsonify(source=_source())
+
+    @app.route('/write-then-read')
+    def write_then_read():
+        db.session.execute(text("INSERT INTO item (name) VALUES ('written')"))
+        return jsonify(source=_source())
+
+    @app.route('/unlisted')
+    def unlisted():
+        return jsonify(source=_source())
+
+    @app.route('/locked')
+    def locked():
+        return jsonify(source=db.session.execute(select(item.c.name).limit(1).with_for_update()).scalar())
+
+    @app.route('/write', methods=['POST'])
+    def write():
+        db.session.execute(insert(item).values(name='written'))
+        db.session.commit()
+        return jsonify(success=True)
+
+    @app.teardown_appcontext
+    def remove_session(error):
+        db.session.remove()
+
+    return app
+
+
+class DatabaseRoutingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.app = create_app(self.directory)
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        with self.app.app_context():
+            for engine in db.engines.values():
+                engine.dispose()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def source(self, path):
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()['source']
+
+    def test_reads_on_read_only_endpoints_use_the_replica(self):
+        self.assertEqual(self.source('/read'), 'replica')
+
+    def test_text_select_uses_the_replica(self):
+        self.assertEqual(self.source('/read-text'), 'replica')
+
+    def test_asking_for_a_connection_is_not_a_write(self):
+        self.assertEqual(self.source('/read-after-connection'), 'replica')
+
+    def test_other_endpoints_read_from_the_primary(self):
+        self.assertEqual(self.source('/unlisted'), 'primary')
+
+    def test_select_for_update_uses_the_primary(self):
+        self.assertEqual(self.source('/locked'), 'primary')
+
+    def test_reads_after_a_write_in_the_request_use_the_primary(self):
+        self.assertEqual(self.source('/write-then-read'), 'primary')
+
+    def test_reads_stick_to_the_primary_after_a_committed_write(self):
+        self.assertEqual(self.client.post('/write').status_code, 200)
+        self.assertEqual(self.source('/read'), 'primary')
+
+        with self.client.session_transaction() as session:
+            session['_db_primary_until'] = 0
+        self.assertEqual(self.source('/read'), 'replica')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,407 @@
+"""
+Time tracking service for the Jira Board Application
+Writes WorkLog entries in bulk and keeps Task.logged_hours and the weekly
+per-user/per-project rollups consistent with them
+"""
+
+import uuid
+from collections import defaultdict
+from datetime import datetime, date, timedelta
+
+import click
+from sqlalchemy import func, select, bindparam, case, text
+
+from extensions import db
+from models.task_models import Task, WorkLog
+from models.project_models import Project
+from models.user_models import User
+from models.report_models import WeeklyTimeRollup
+from report_engine import upsert_add
+from project_cache import record_task_writes
+
+# Logged hours may drift from the work log sum by float rounding only
+DRIFT_TOLERANCE = 1e-6
+MAX_HOURS_PER_ENTRY = 24
+
+
+def week_start(value):
+    """Monday of the week containing `value` (date or datetime)"""
+    if isinstance(value, datetime):
+        value = value.date()
+    return value - timedelta(days=value.weekday())
+
+
+def _as_uuid(value):
+    if value is None or isinstance(value, uuid.UUID):
+        return value
+    return uuid.UUID(str(value))
+
+
+def _normalize_entry(entry, user_id):
+    """Validate one work log entry dict and return a work_log row"""
+    if not isinstance(entry, dict):
+        raise ValueError('Each work log entry must be an object')
+    try:
+        hours = float(entry.get('hours', entry.get('hours_logged')))
+    except (TypeError, ValueError):
+        raise ValueError('hours must be a number')
+    if not 0 < hours <= MAX_HOURS_PER_ENTRY:  # also rejects NaN
+        raise ValueError(f'hours must be between 0 and {MAX_HOURS_PER_ENTRY}')
+
+    log_date = entry.get('log_date') or datetime.utcnow()
+    if isinstance(log_date, str):
+        try:
+            log_date = datetime.fromisoformat(log_date)
+        except ValueError:
+            raise ValueError('log_date must be an ISO date')
+    elif isinstance(log_date, date) and not isinstance(log_date, datetime):
+        log_date = datetime.combine(log_date, datetime.min.time())
+    elif not isinstance(log_date, datetime):
+        raise ValueError('log_date must be an ISO date')
+
+    description = entry.get('description')
+    if description is not None and not isinstance(description, str):
+        raise ValueError('description must be text')
+
+    try:
+        task_id = _as_uuid(entry['task_id'])
+        entry_user_id = _as_uuid(entry.get('user_id') or user_id)
+    except (KeyError, ValueError):
+        raise ValueError('task_id and user_id must be valid ids')
+    if entry_user_id is None:
+        raise ValueError('user_id is required')
+
+    return {
+        'log_id': uuid.uuid4(),
+        'task_id': task_id,
+        'user_id': entry_user_id,
+        'hours_logged': hours,
+        'description': description,
+        'log_date': log_date
+    }
+
+
+def _apply_deltas(rows, task_projects, sign=1):
+    """
+    Push work log hours into Task.logged_hours and the weekly rollups
+
+    Each task gets a single `logged_hours = logged_hours + x` UPDATE, so
+    concurrent writers never overwrite each other's totals.
+    """
+    task_hours = defaultdict(float)
+    week_totals = defaultdict(lambda: {'hours': 0.0, 'entries': 0})
+    for row in rows:
+        task_hours[row['task_id']] += row['hours_logged']
+        key = (row['user_id'], task_projects[row['task_id']], week_start(row['log_date']))
+        week_totals[key]['hours'] += sign * row['hours_logged']
+        week_totals[key]['entries'] += sign
+
+    task_table = Task.__table__
+    db.session.execute(
+        task_table.update()
+        .where(task_table.c.task_id == bindparam('b_task_id'))
+        .values(logged_hours=func.coalesce(task_table.c.logged_hours, 0.0) + bindparam('b_delta')),
+        # task_id order, the order reconcile_logged_hours locks rows in, so the two never deadlock
+        [{'b_task_id': task_id, 'b_delta': sign * task_hours[task_id]} for task_id in sorted(task_hours)]
+    )
+    upsert_add(
+        WeeklyTimeRollup, ['user_id', 'project_id', 'week_start'],
+        [{'user_id': key[0], 'project_id': key[1], 'week_start': key[2], **totals} for key, totals in week_totals.items()],
+        ['hours', 'entries']
+    )
+
+
+def _expire_tasks(task_ids):
+    """Drop stale logged_hours from Task objects already loaded in this session"""
+    for obj in list(db.session.identity_map.values()):
+        if isinstance(obj, Task) and obj.task_id in task_ids:
+            db.session.expire(obj, ['logged_hours'])
+
+
+def add_work_logs(entries, user_id=None):
+    """
+    Insert many work log entries in one transaction
+
+    Args:
+        entries: Iterable of dicts with task_id, hours, and optional
+                 user_id, description and log_date
+        user_id: Default user for entries that do not name one
+
+    Returns:
+        list: The new log ids, in input order
+
+    Raises:
+        ValueError: If an entry is invalid or references an unknown task
+    """
+    rows = [_normalize_entry(entry, user_id) for entry in entries]
+    if not rows:
+        return []
+
+    task_ids = {row['task_id'] for row in rows}
+    task_projects = dict(db.session.execute(
+        select(Task.task_id, Task.project_id).where(Task.task_id.in_(task_ids))
+    ).all())
+    missing = task_ids - set(task_projects)
+    if missing:
+        raise ValueError(f'Unknown task ids: {", ".join(sorted(str(task_id) for task_id in missing))}')
+
+    try:
+        db.session.execute(WorkLog.__table__.insert(), rows)
+        _apply_deltas(rows, task_projects)
+        record_task_writes(db.session, set(task_projects.values()))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    _expire_tasks(task_ids)
+    return [row['log_id'] for row in rows]
+
+
+def log_work(task_id, user_id, hours, description=None, log_date=None):
+    """Add a single work log entry; returns its log id"""
+    entry = {'task_id': task_id, 'hours': hours, 'description': description, 'log_date': log_date}
+    return add_work_logs([entry], user_id=user_id)[0]
+
+
+def delete_work_log(log_id):
+    """Remove a work log entry and take its hours back out of the totals"""
+    log = WorkLog.query.get(log_id)
+    if log is None:
+        return False
+    row = {'task_id': log.task_id, 'user_id': log.user_id, 'hours_logged': log.hours_logged, 'log_date': log.log_date}
+    project_id = db.session.execute(select(Task.project_id).where(Task.task_id == log.task_id)).scalar()
+    try:
+        db.session.delete(log)
+        db.session.flush()
+        _apply_deltas([row], {log.task_id: project_id}, sign=-1)
+        record_task_writes(db.session, {project_id})
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    _expire_tasks({row['task_id']})
+    return True
+
+
+def _week_range(start, weeks):
+    first = week_start(start)
+    return [first + timedelta(weeks=offset) for offset in range(weeks)]
+
+
+def _pivot(rows, week_list, label_key):
+    """Turn (key, label, week_start, hours) rows into one hours-per-week series per key"""
+    index = {week: position for position, week in enumerate(week_list)}
+    series = {}
+    for key, label, week, hours in rows:
+        item = series.setdefault(key, {'id': str(key), label_key: label, 'hours': [0.0] * len(week_list)})
+        item['hours'][index[week]] += round(float(hours), 2)
+    for item in series.values():
+        item['total'] = round(sum(item['hours']), 2)
+    totals = [round(sum(item['hours'][position] for item in series.values()), 2) for position in range(len(week_list))]
+    return {
+        'weeks': [week.isoformat() for week in week_list],
+        'rows': sorted(series.values(), key=lambda item: item[label_key] or ''),
+        'totals': totals,
+        'total': round(sum(totals), 2)
+    }
+
+
+def user_timesheet(user_id, start=None, weeks=4, project_ids=None):
+    """
+    Hours per project and week for one user, read from the weekly rollups
+
+    `project_ids` (ids or a subquery of them) limits the projects included.
+    """
+    week_list = _week_range(start or date.today() - timedelta(weeks=weeks - 1), weeks)
+    stmt = (
+        select(WeeklyTimeRollup.project_id, Project.title, WeeklyTimeRollup.week_start, WeeklyTimeRollup.hours)
+        .join(Project, Project.project_id == WeeklyTimeRollup.project_id)
+        .where(WeeklyTimeRollup.user_id == _as_uuid(user_id),
+               WeeklyTimeRollup.week_start >= week_list[0],
+               WeeklyTimeRollup.week_start <= week_list[-1])
+    )
+    if project_ids is not None:
+        stmt = stmt.where(WeeklyTimeRollup.project_id.in_(project_ids))
+    return _pivot(db.session.execute(stmt).all(), week_list, 'project')
+
+
+def project_timesheet(project_id, start=None, weeks=4):
+    """Hours per user and week for one project, read from the weekly rollups"""
+    week_list = _week_range(start or date.today() - timedelta(weeks=weeks - 1), weeks)
+    rows = db.session.execute(
+        select(WeeklyTimeRollup.user_id, User.username, WeeklyTimeRollup.week_start, WeeklyTimeRollup.hours)
+        .join(User, User.user_id == WeeklyTimeRollup.user_id)
+        .where(WeeklyTimeRollup.project_id == _as_uuid(project_id),
+               WeeklyTimeRollup.week_start >= week_list[0],
+               WeeklyTimeRollup.week_start <= week_list[-1])
+    ).all()
+    return _pivot(rows, week_list, 'user')
+
+
+def estimate_vs_actual(project_id, limit=20):
+    """
+    Estimated vs logged hours per assignee, plus the tasks furthest over estimate
+
+    Uses the denormalized Task.logged_hours, so no work log rows are read.
+    """
+    logged = func.coalesce(Task.logged_hours, 0.0)
+    estimated = func.coalesce(Task.estimated_hours, 0.0)
+    by_assignee = db.session.execute(
+        select(Task.assigned_to_id, User.username, func.count(Task.task_id),
+               func.sum(estimated), func.sum(logged),
+               func.sum(case((logged > estimated, 1), else_=0)))
+        .outerjoin(User, User.user_id == Task.assigned_to_id)
+        .where(Task.project_id == project_id, Task.estimated_hours.isnot(None))
+        .group_by(Task.assigned_to_id, User.username)
+    ).all()
+
+    overruns = db.session.execute(
+        select(Task.task_id, Task.title, Task.estimated_hours, logged.label('logged'))
+        .where(Task.project_id == project_id, Task.estimated_hours.isnot(None), logged > estimated)
+        .order_by((logged - estimated).desc())
+        .limit(limit)
+    ).all()
+
+    assignees = [{
+        'user_id': str(user_id) if user_id else None,
+        'username': username or 'Unassigned',
+        'tasks': tasks,
+        'estimated_hours': round(float(estimate or 0), 2),
+        'logged_hours': round(float(actual or 0), 2),
+        'over_estimate_tasks': int(over or 0),
+        'accuracy': round(float(actual) / float(estimate), 2) if estimate else None
+    } for user_id, username, tasks, estimate, actual, over in by_assignee]
+
+    estimated_total = sum(item['estimated_hours'] for item in assignees)
+    logged_total = sum(item['logged_hours'] for item in assignees)
+    return {
+        'estimated_hours': round(estimated_total, 2),
+        'logged_hours': round(logged_total, 2),
+        'accuracy': round(logged_total / estimated_total, 2) if estimated_total else None,
+        'by_assignee': assignees,
+        'overruns': [{
+            'task_id': str(task_id),
+            'title': title,
+            'estimated_hours': estimate,
+            'logged_hours': round(float(actual), 2),
+            'overrun_hours': round(float(actual) - estimate, 2)
+        } for task_id, title, estimate, actual in overruns]
+    }
+
+
+def reconcile_logged_hours(batch_size=500):
+    """
+    Repair Task.logged_hours drift in batches of tasks (keyset over task_id)
+
+    Each batch locks its task rows (FOR UPDATE, in task_id order) and then
+    rewrites the drifted totals with one UPDATE whose correlated SUM reads
+    work_log after the lock. Writers that committed first are counted.
+    Writers still in flight wait on the row lock and add their delta on top
+    of the repaired total. Every batch commits, so the job never holds long
+    locks.
+
+    Returns:
+        dict: Number of tasks checked and repaired
+    """
+    task_table = Task.__table__
+    work_log = WorkLog.__table__
+    logged_sum = (
+        select(func.coalesce(func.sum(work_log.c.hours_logged), 0.0))
+        .where(work_log.c.task_id == task_table.c.task_id)
+        .scalar_subquery()
+    )
+    checked = repaired = 0
+    last_id = None
+    while True:
+        stmt = select(task_table.c.task_id).order_by(task_table.c.task_id).limit(batch_size).with_for_update()
+        if last_id is not None:
+            stmt = stmt.where(task_table.c.task_id > last_id)
+        batch = db.session.execute(stmt).scalars().all()
+        if not batch:
+            db.session.commit()
+            break
+        last_id = batch[-1]
+
+        result = db.session.execute(
+            task_table.update()
+            .where(task_table.c.task_id.in_(batch),
+                   func.abs(func.coalesce(task_table.c.logged_hours, 0.0) - logged_sum) > DRIFT_TOLERANCE)
+            .values(logged_hours=logged_sum)
+        )
+        db.session.commit()
+        checked += len(batch)
+        repaired += result.rowcount
+    return {'checked': checked, 'repaired': repaired}
+
+
+def _lock_rollups():
+    """
+    Block weekly rollup upserts until this transaction commits (PostgreSQL)
+
+    Writers hold ROW EXCLUSIVE while they upsert; SHARE ROW EXCLUSIVE conflicts
+    with it, so a rebuild neither collides with a concurrent insert nor loses
+    its increment. On SQLite the DELETE that follows takes the database write lock.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        db.session.execute(text(f'LOCK TABLE {WeeklyTimeRollup.__tablename__} IN SHARE ROW EXCLUSIVE MODE'))
+
+
+def rebuild_weekly_rollups(since=None):
+    """
+    Recompute weekly rollups from work_log, for every week from `since` onward
+    (all weeks when None), replacing whatever the rollup table holds
+
+    The table is locked and cleared before work_log is read, so every work
+    log entry is either in the rebuilt totals (committed before the lock) or
+    added on top of them by its writer afterwards.
+    """
+    first_week = week_start(since) if since else None
+    _lock_rollups()
+    delete = WeeklyTimeRollup.__table__.delete()
+    if first_week:
+        delete = delete.where(WeeklyTimeRollup.week_start >= first_week)
+    db.session.execute(delete)
+
+    day = func.date(WorkLog.log_date)
+    stmt = (
+        select(WorkLog.user_id, Task.project_id, day, func.sum(WorkLog.hours_logged), func.count())
+        .join(Task, Task.task_id == WorkLog.task_id)
+        .group_by(WorkLog.user_id, Task.project_id, day)
+    )
+    if first_week:
+        stmt = stmt.where(WorkLog.log_date >= datetime.combine(first_week, datetime.min.time()))
+
+    weekly = defaultdict(lambda: {'hours': 0.0, 'entries': 0})
+    for user_id, project_id, on_day, hours, count in db.session.execute(stmt):
+        if isinstance(on_day, str):
+            on_day = date.fromisoformat(on_day)
+        key = (user_id, project_id, week_start(on_day))
+        weekly[key]['hours'] += float(hours)
+        weekly[key]['entries'] += count
+
+    if weekly:
+        db.session.execute(WeeklyTimeRollup.__table__.insert(), [
+            {'user_id': key[0], 'project_id': key[1], 'week_start': key[2], **totals}
+            for key, totals in weekly.items()
+        ])
+    db.session.commit()
+    return len(weekly)
+
+
+def register_time_commands(app):
+    """Register `flask timesheets reconcile` (run nightly from cron)"""
+
+    @app.cli.group('timesheets')
+    def timesheets_cli():
+        """Work log totals and weekly rollups"""
+
+    @timesheets_cli.command('reconcile')
+    @click.option('--batch-size', default=500, type=int, help='Tasks checked per transaction')
+    @click.option('--weeks', default=8, type=int, help='Weekly rollups to rebuild (0 rebuilds all)')
+    def reconcile_command(batch_size, weeks):
+        """Repair logged_hours drift and rebuild recent weekly rollups"""
+        result = reconcile_logged_hours(batch_size=batch_size)
+        click.echo(f"Checked {result['checked']} tasks, repaired {result['repaired']}")
+        since = date.today() - timedelta(weeks=weeks - 1) if weeks > 0 else None
+        rows = rebuild_weekly_rollups(since=since)
+        click.echo(f'Rebuilt {rows} weekly rollup rows')